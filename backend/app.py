@@ -39,6 +39,197 @@ def reset_database():
         db.create_all()
         click.echo("Database reset successfully!")
 
+def _run_with_session(database_url, func):
+    """Run func(session) against --database-url, or the app database by default."""
+    if database_url:
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import Session
+        engine = create_engine(database_url)
+        try:
+            with Session(engine) as session:
+                return func(session)
+        finally:
+            engine.dispose()
+
+    app = create_app()
+    with app.app_context():
+        return func(db.session)
+
+@cli.command("train-model")
+@click.option("--database-url", default=None, help="Read bets from this database instead of the app's")
+@click.option("--model-dir", default=None, help="Artifact root (defaults to MODEL_DIR)")
+@click.option("--holdout-days", default=30, show_default=True, help="Most recent days held out for evaluation")
+@click.option("--epochs", default=5, show_default=True)
+@click.option("--batch-size", default=1024, show_default=True)
+@click.option("--chunk-size", default=50000, show_default=True, help="Rows fetched per database round trip")
+def train_model_command(database_url, model_dir, holdout_days, epochs, batch_size, chunk_size):
+    """Train the bet outcome model from settled bets and write a versioned artifact."""
+    from app.ml.train import train_model
+
+    try:
+        result = _run_with_session(database_url, lambda session: train_model(
+            session,
+            model_dir=model_dir,
+            holdout_days=holdout_days,
+            epochs=epochs,
+            batch_size=batch_size,
+            chunk_size=chunk_size
+        ))
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    click.echo(f"Wrote {result['path']}")
+    click.echo(f"Holdout metrics: {result['holdout_metrics']}")
+
+@cli.command("export-numpy-weights")
+@click.option("--version", default=None, help="Artifact version (defaults to the latest)")
+@click.option("--name", default="bet_outcome", help="Model name")
+def export_numpy_weights(version, name):
+    """Export a Keras artifact's weights to weights.npz for TensorFlow-free serving."""
+    import json
+    import numpy as np
+    from app.ml.model import build_model
+    from app.ml.numpy_model import export_keras_weights, max_abs_difference
+    from app.ml.registry import model_registry
+
+    version = version or model_registry.latest_version(name)
+    if version is None:
+        raise click.ClickException(f"No artifact found for '{name}'")
+
+    path = model_registry.artifact_path(name, version)
+    with open(os.path.join(path, 'metadata.json')) as metadata_file:
+        metadata = json.load(metadata_file)
+
+    model = build_model(input_dim=metadata.get('input_dim', 10))
+    model.load_weights(os.path.join(path, metadata.get('weights_file', 'model.weights.h5')))
+    network = export_keras_weights(model, os.path.join(path, 'weights.npz'))
+
+    samples = np.random.rand(1024, metadata.get('input_dim', 10)).astype(np.float32)
+    difference = max_abs_difference(model, network, samples)
+    if difference > 1e-5:
+        raise click.ClickException(f"NumPy export differs from Keras by {difference:.2e}")
+
+    metadata['numpy_weights_file'] = 'weights.npz'
+    with open(os.path.join(path, 'metadata.json'), 'w') as metadata_file:
+        json.dump(metadata, metadata_file, indent=2)
+    click.echo(f"Exported {name} {version} to weights.npz (max abs diff {difference:.2e})")
+
+@cli.command("score-predictions")
+@click.option("--database-url", default=None, help="Score predictions in this database instead of the app's")
+@click.option("--horizon-hours", default=72, show_default=True, help="Score events starting within this many hours")
+@click.option("--chunk-size", default=5000, show_default=True, help="Rows per forward pass and UPDATE batch")
+def score_predictions_command(database_url, horizon_hours, chunk_size):
+    """Score active predictions for upcoming events (run from cron/a scheduler)."""
+    from app.services.scoring_service import score_upcoming_predictions
+
+    result = _run_with_session(database_url, lambda session: score_upcoming_predictions(
+        session,
+        horizon_hours=horizon_hours,
+        chunk_size=chunk_size
+    ))
+    click.echo(f"Scored {result['scored']} predictions with model {result['model_version']} "
+               f"in {result['elapsed_seconds']:.2f}s")
+
+@cli.command("evaluate-model")
+@click.option("--database-url", default=None, help="Bets database, e.g. sqlite:///snapshot.db (defaults to the app's)")
+@click.option("--version", default=None, help="Artifact version (defaults to the latest)")
+@click.option("--name", default="bet_outcome", help="Model name")
+@click.option("--model-dir", default=None, help="Artifact root (defaults to MODEL_DIR)")
+@click.option("--since", default=None, type=click.DateTime(), help="Only bets settled on or after this date")
+@click.option("--until", default=None, type=click.DateTime(), help="Only bets settled before this date")
+@click.option("--chunk-size", default=50000, show_default=True, help="Rows fetched per database round trip")
+@click.option("--batch-sizes", default="1,64", show_default=True, help="Comma-separated batch sizes to time")
+@click.option("--iterations", default=200, show_default=True, help="Timed calls per batch size")
+@click.option("--output", default=None, type=click.Path(), help="Also write the JSON report here")
+def evaluate_model_command(database_url, version, name, model_dir, since, until, chunk_size, batch_sizes, iterations, output):
+    """Replay settled bets through a model artifact and report accuracy and latency."""
+    import json
+    from app.ml.evaluation import evaluate_artifact
+
+    report = _run_with_session(database_url, lambda session: evaluate_artifact(
+        session,
+        name=name,
+        version=version,
+        model_dir=model_dir,
+        settled_after=since,
+        settled_before=until,
+        chunk_size=chunk_size,
+        batch_sizes=tuple(int(size) for size in batch_sizes.split(',')),
+        latency_iterations=iterations
+    ))
+
+    text = json.dumps(report, indent=2, default=str)
+    if output:
+        with open(output, 'w') as report_file:
+            report_file.write(text)
+    click.echo(text)
+
+@cli.command("ingest-reddit")
+@click.option("--hours-back", default=24, show_default=True, help="Age limit for subreddits without a watermark")
+@click.option("--page-size", default=100, show_default=True, help="Posts fetched and committed at a time")
+@click.option("--initial-limit", default=500, show_default=True, help="Most posts fetched on a subreddit's first run")
+def ingest_reddit_command(hours_back, page_size, initial_limit):
+    """Fetch Reddit posts newer than each subreddit's watermark into reddit_posts."""
+    from app.services.reddit_scraper import RedditScraper
+
+    result = _run_with_session(None, lambda session: RedditScraper().ingest_latest_posts(
+        session,
+        hours_back=hours_back,
+        page_size=page_size,
+        initial_limit=initial_limit
+    ))
+    for subreddit, count in result['stored'].items():
+        click.echo(f"r/{subreddit}: {count}")
+    click.echo(f"Stored {result['total']} posts")
+
+@cli.command("ingest-reddit-picks")
+@click.option("--subreddit", "subreddits", multiple=True, default=("sportsbook",), show_default=True)
+@click.option("--batch-size", default=500, show_default=True, help="Picks written per INSERT")
+def ingest_reddit_picks_command(subreddits, batch_size):
+    """Extract picks from the comments of daily pick threads into reddit_picks."""
+    from app.services.reddit_scraper import RedditScraper
+
+    result = _run_with_session(None, lambda session: RedditScraper().ingest_daily_thread_picks(
+        session,
+        subreddits=subreddits,
+        batch_size=batch_size
+    ))
+    for thread, count in result['threads'].items():
+        click.echo(f"{thread}: {count}")
+    click.echo(f"Extracted {result['total']} picks")
+
+@cli.command("settle-tipster-picks")
+@click.option("--database-url", default=None, help="Settle picks in this database instead of the app's")
+@click.option("--batch-size", default=1000, show_default=True, help="Picks settled per transaction")
+@click.option("--match-window-hours", default=48, show_default=True, help="How long after a pick its event may start")
+def settle_tipster_picks_command(database_url, batch_size, match_window_hours):
+    """Settle scraped Reddit picks against settled predictions and update tipster_stats."""
+    from app.services.tipster_service import settle_reddit_picks
+
+    result = _run_with_session(database_url, lambda session: settle_reddit_picks(
+        session,
+        batch_size=batch_size,
+        match_window_hours=match_window_hours
+    ))
+    click.echo(f"Settled {result['settled']} picks, {result['unmatched']} unmatched")
+
+@cli.command("update-consensus")
+@click.option("--database-url", default=None, help="Update consensus in this database instead of the app's")
+@click.option("--batch-size", default=1000, show_default=True, help="Source rows folded in per transaction")
+@click.option("--match-window-hours", default=48, show_default=True, help="How long after a pick its event may start")
+@click.option("--retention-days", default=7, show_default=True, help="Prune consensus for events older than this")
+def update_consensus_command(database_url, batch_size, match_window_hours, retention_days):
+    """Fold new Reddit picks and uploaded bets into per-event consensus."""
+    from app.services.consensus_service import update_consensus
+
+    result = _run_with_session(database_url, lambda session: update_consensus(
+        session,
+        batch_size=batch_size,
+        match_window_hours=match_window_hours,
+        retention_days=retention_days
+    ))
+    click.echo(f"Updated consensus for {result['events']} events, pruned {result['pruned']} rows")
+
 if __name__ == '__main__':
     app = create_app()
     app.run(
@@ -56,7 +56,8 @@ def upload_bet_slip():
             'success': True,
             'bet_id': result['bet_id'],
             'bet_data': result['bet_data'],
-            'integrity_score': result['integrity_score']
+            'integrity_score': result['integrity_score'],
+            'ocr_stats': result.get('ocr_stats')
         }), 201
         
     # Handle text upload
@@ -84,6 +85,45 @@ def upload_bet_slip():
     else:
         return jsonify({'error': 'No valid image or text provided'}), 400
 
+@bp.route('/upload/bulk', methods=['POST'])
+@auth_required
+@subscription_required('paid')
+def bulk_upload_bet_slips():
+    """API endpoint to upload many bet slips at once, as images and/or a ZIP archive"""
+    user_id = g.user_id
+    
+    user = User.query.get(user_id)
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    files = [file for file in request.files.getlist('images') if file.filename]
+    
+    archive = request.files.get('archive')
+    if archive and archive.filename:
+        if not archive.filename.lower().endswith('.zip'):
+            return jsonify({'error': 'Archive must be a .zip file'}), 400
+        try:
+            files.extend(bet_upload_service.extract_zip_files(archive))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+    
+    if not files:
+        return jsonify({'error': 'No images or archive provided'}), 400
+    
+    result = bet_upload_service.process_bulk_upload(
+        user_id,
+        files,
+        reddit_username=request.form.get('reddit_username'),
+        subscription_username=request.form.get('subscription_username')
+    )
+    
+    if 'results' not in result:
+        return jsonify({'error': result['error']}), 400
+    
+    # 207 when only some of the slips made it through
+    status_code = 201 if result['summary']['failed'] == 0 else 207
+    return jsonify(result), status_code
+
 @bp.route('/categorize', methods=['GET'])
 @auth_required
 def get_bet_categories():
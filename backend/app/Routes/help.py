@@ -1,35 +1,52 @@
 # File: app/routes/help.py
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from config import Config
 from app.models.faq import FAQ, FAQCategory
 from app.models.support_ticket import SupportTicket
+from app.services.faq_search import get_faq_search
+from app.services.help_center import help_center
+from app.services.faq_views import faq_views, flush_faq_views
 from app import db
 from datetime import datetime
 
 
 help_bp = Blueprint('help', __name__)
 
+def _flush_views():
+    """Write this worker's buffered FAQ views; a failure keeps them for the next flush"""
+    try:
+        flush_faq_views(db.session)
+    except Exception as e:
+        print(f"Error flushing FAQ views: {str(e)}")
+
+def _cached_response(resource, counted=False):
+    """
+    Serve a pre-serialized help-center resource with a strong ETag
+
+    Clients and CDNs may reuse it for HELP_CENTER_MAX_AGE seconds and then
+    revalidate; a matching If-None-Match gets an empty 304. Counted
+    resources (FAQ views) are private and no-cache instead, so every view
+    reaches the app while unchanged bodies still come back as 304s.
+    """
+    response = current_app.response_class(resource.body, mimetype='application/json')
+    response.set_etag(resource.etag)
+    if counted:
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+    else:
+        response.cache_control.public = True
+        response.cache_control.max_age = Config.HELP_CENTER_MAX_AGE
+    return response.make_conditional(request)
+
 @help_bp.route('/api/help/categories', methods=['GET'])
 def get_faq_categories():
     """
     Get all FAQ categories with article counts
     """
     try:
-        categories = []
-        for category in FAQCategory.query.all():
-            count = FAQ.query.filter_by(category_id=category.id).count()
-            categories.append({
-                'id': category.id,
-                'title': category.name,
-                'slug': category.slug,
-                'count': count
-            })
-        
-        return jsonify({
-            'success': True,
-            'categories': categories
-        })
+        return _cached_response(help_center.get(db.session).categories)
     except Exception as e:
         print(f"Error fetching FAQ categories: {str(e)}")
         return jsonify({
@@ -40,21 +57,10 @@ def get_faq_categories():
 @help_bp.route('/api/help/popular-questions', methods=['GET'])
 def get_popular_questions():
     """
-    Get popular/featured FAQ questions
+    Get popular/featured FAQ questions, most viewed first
     """
     try:
-        questions = FAQ.query.filter_by(is_popular=True).limit(5).all()
-        
-        questions_list = [{
-            'id': q.id,
-            'title': q.question,
-            'category_id': q.category_id
-        } for q in questions]
-        
-        return jsonify({
-            'success': True,
-            'questions': questions_list
-        })
+        return _cached_response(help_center.get(db.session).popular)
     except Exception as e:
         print(f"Error fetching popular questions: {str(e)}")
         return jsonify({
@@ -65,9 +71,14 @@ def get_popular_questions():
 @help_bp.route('/api/help/search', methods=['GET'])
 def search_faqs():
     """
-    Search FAQs by query
+    Search FAQs by query, best matches first
+    
+    Query params:
+        q: Search text (at least 3 characters)
+        limit: Most results returned (default 20, max 50)
     """
     query = request.args.get('q', '')
+    limit = max(min(request.args.get('limit', 20, type=int) or 20, 50), 1)
     
     if len(query.strip()) < 3:
         return jsonify({
@@ -76,17 +87,15 @@ def search_faqs():
         }), 400
     
     try:
-        search_results = FAQ.query.filter(
-            (FAQ.question.ilike(f'%{query}%')) | 
-            (FAQ.answer.ilike(f'%{query}%'))
-        ).all()
+        search_results = get_faq_search(db.session).search(db.session, query, limit=limit)
         
         results = [{
-            'id': q.id,
-            'question': q.question,
-            'answer_preview': q.answer[:150] + '...' if len(q.answer) > 150 else q.answer,
-            'category_id': q.category_id,
-            'category_name': FAQCategory.query.get(q.category_id).name if q.category_id else None
+            'id': q['id'],
+            'question': q['question'],
+            'answer_preview': q['snippet'],  # matched terms wrapped in <mark>
+            'category_id': q['category_id'],
+            'category_name': q['category_name'],
+            'score': q['score']
         } for q in search_results]
         
         return jsonify({
@@ -107,27 +116,19 @@ def get_faq(faq_id):
     Get a specific FAQ by ID
     """
     try:
-        faq = FAQ.query.get(faq_id)
+        resource = help_center.get(db.session).faqs.get(faq_id)
         
-        if not faq:
+        if not resource:
             return jsonify({
                 'success': False,
                 'error': 'FAQ not found'
             }), 404
         
-        category = FAQCategory.query.get(faq.category_id) if faq.category_id else None
+        faq_views.record(faq_id)
+        if faq_views.due():
+            _flush_views()
         
-        return jsonify({
-            'success': True,
-            'faq': {
-                'id': faq.id,
-                'question': faq.question,
-                'answer': faq.answer,
-                'category_id': faq.category_id,
-                'category_name': category.name if category else None,
-                'category_slug': category.slug if category else None
-            }
-        })
+        return _cached_response(resource, counted=True)
     except Exception as e:
         print(f"Error fetching FAQ: {str(e)}")
         return jsonify({
@@ -141,36 +142,18 @@ def get_category_faqs(category_slug):
     Get all FAQs in a specific category
     """
     try:
-        category = FAQCategory.query.filter_by(slug=category_slug).first()
+        resource = help_center.get(db.session).by_slug.get(category_slug)
         
-        if not category:
+        if not resource:
             return jsonify({
                 'success': False,
                 'error': 'Category not found'
             }), 404
         
-        faqs = FAQ.query.filter_by(category_id=category.id).all()
-        
-        faqs_list = [{
-            'id': q.id,
-            'question': q.question,
-            'answer_preview': q.answer[:150] + '...' if len(q.answer) > 150 else q.answer
-        } for q in faqs]
-        
-        return jsonify({
-            'success': True,
-            'category': {
-                'id': category.id,
-                'name': category.name,
-                'slug': category.slug,
-                'description': category.description
-            },
-            'faqs': faqs_list,
-            'count': len(faqs_list)
-        })
+        return _cached_response(resource)
     except Exception as e:
         print(f"Error fetching category FAQs: {str(e)}")
         return jsonify({
             'success': False,
             'error': 'Failed to fetch category FAQs'
-        }), 500
\ No newline at end of file
+        }), 500
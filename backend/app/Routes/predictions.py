@@ -1,17 +1,162 @@
-from flask import Blueprint, request, jsonify
+import math
+from datetime import datetime
+from flask import Blueprint, request, jsonify, g
+from config import Config
 from  app.ml.model import get_prediction
+from  app.services.ev_service import score_ev_batch
+from  app.services.hedge_service import recommend_hedges
+from  app.utils.auth_middleware import auth_required
+from  app.models.prediction import Prediction
 from  app import db
 
 predictions_bp = Blueprint('predictions', __name__)
 
+MAX_PAGE_SIZE = 200
+
+# Optional per-bet model inputs; each must be a number when present
+EV_NUMERIC_FIELDS = (
+    'leg_count', 'sentiment_score', 'positive_sentiment', 'negative_sentiment',
+    'consensus_share', 'tipster_win_rate'
+)
+
+def _ev_bet_error(bet):
+    """Coerce one /ev-batch bet's numeric fields in place, returning an error message or None"""
+    if not isinstance(bet, dict) or bet.get('odds') is None:
+        return 'Each bet must be an object with odds'
+    for field in EV_NUMERIC_FIELDS + ('win_probability',):
+        if bet.get(field) is None:
+            bet.pop(field, None)
+            continue
+        if isinstance(bet[field], bool):
+            return f'{field} must be a number'
+        try:
+            bet[field] = float(bet[field])
+        except (TypeError, ValueError):
+            return f'{field} must be a number'
+        if not math.isfinite(bet[field]):
+            return f'{field} must be a finite number'
+    if 'win_probability' in bet and not 0.0 <= bet['win_probability'] <= 1.0:
+        return 'win_probability must be between 0 and 1'
+    return None
+
+@predictions_bp.route('/upcoming', methods=['GET'])
+def get_upcoming_predictions():
+    """
+    Precomputed predictions for upcoming events
+    
+    Served from the columns written by the score-predictions job.
+    Query params: sport, min_ev, sort ('event_date' or 'ev'), limit, offset
+    """
+    try:
+        limit = min(int(request.args.get('limit', 50)), MAX_PAGE_SIZE)
+        offset = max(int(request.args.get('offset', 0)), 0)
+        min_ev = request.args.get('min_ev', type=float)
+    except ValueError:
+        return jsonify({'error': 'limit and offset must be integers'}), 400
+    
+    query = Prediction.query.filter(
+        Prediction.status == 'active',
+        Prediction.event_date >= datetime.utcnow(),
+        Prediction.scored_at.isnot(None)
+    )
+    
+    sport = request.args.get('sport')
+    if sport:
+        query = query.filter(Prediction.sport == sport)
+    if min_ev is not None:
+        query = query.filter(Prediction.expected_value >= min_ev)
+    
+    if request.args.get('sort') == 'ev':
+        query = query.order_by(Prediction.expected_value.desc(), Prediction.id)
+    else:
+        query = query.order_by(Prediction.event_date, Prediction.id)
+    
+    predictions = query.offset(offset).limit(limit).all()
+    return jsonify({
+        'success': True,
+        'predictions': [prediction.to_dict() for prediction in predictions],
+        'limit': limit,
+        'offset': offset
+    }), 200
+
+@predictions_bp.route('/<int:prediction_id>', methods=['GET'])
+def get_prediction_by_id(prediction_id):
+    """Return one precomputed prediction"""
+    prediction = db.session.get(Prediction, prediction_id)
+    if prediction is None:
+        return jsonify({'error': 'Prediction not found'}), 404
+    return jsonify({'success': True, 'prediction': prediction.to_dict()}), 200
+
 @predictions_bp.route('/analyze', methods=['POST'])
 def analyze_bet():
-    pass
+    return jsonify({'error': 'Not implemented'}), 501
 
 @predictions_bp.route('/ev-calculation', methods=['POST'])
 def calculate_ev():
-    pass
+    """Superseded by /ev-batch, which also scores a single bet"""
+    return jsonify({'error': 'Not implemented, use /ev-batch'}), 501
+
+@predictions_bp.route('/ev-batch', methods=['POST'])
+@auth_required
+def calculate_ev_batch():
+    """
+    Score a batch of candidate bets
+    
+    Body: {"bets": [{"id", "odds", "win_probability"?, "opposing_odds"?,
+    "sport"?, "bet_type"?, ...}], "kelly_multiplier"?: 1.0}
+    
+    kelly_multiplier defaults to full Kelly; pass e.g. 0.25 for quarter Kelly.
+    A bet with a non-numeric model input or a win_probability outside
+    [0, 1] is answered with 400 and its index.
+    """
+    data = request.get_json(silent=True) or {}
+    bets = data.get('bets')
+    
+    if not isinstance(bets, list) or not bets:
+        return jsonify({'error': 'bets must be a non-empty list'}), 400
+    if len(bets) > Config.MAX_EV_BATCH:
+        return jsonify({'error': f'At most {Config.MAX_EV_BATCH} bets per request'}), 413
+    
+    for index, bet in enumerate(bets):
+        error = _ev_bet_error(bet)
+        if error:
+            return jsonify({'error': error, 'index': index}), 400
+    
+    try:
+        kelly_multiplier = float(data.get('kelly_multiplier', 1.0))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'kelly_multiplier must be a number'}), 400
+    
+    return jsonify(score_ev_batch(bets, kelly_multiplier)), 200
 
-@predictions_bp.route('/hedge-recommendations', methods=['GET'])
+@predictions_bp.route('/hedge-recommendations', methods=['GET', 'POST'])
+@auth_required
 def get_hedge_recommendations():
-    pass
\ No newline at end of file
+    """
+    Hedge stakes for the current user's pending bets and parlay leg combinations
+    
+    POST body may include current opposing odds: {"current_odds":
+    {"<leg_id>": "+120", "<leg_id>+<leg_id>": "+250", "bet-<bet_id>": "-105"},
+    "partial_fraction": 0.5}. Legs and combinations without a quote are
+    priced from the legs' own odds.
+    """
+    data = (request.get_json(silent=True) or {}) if request.method == 'POST' else {}
+    
+    try:
+        partial_fraction = float(data.get('partial_fraction', request.args.get('partial_fraction', 0.5)))
+        min_profit = data.get('min_profit', request.args.get('min_profit'))
+        min_profit = float(min_profit) if min_profit is not None else None
+    except (TypeError, ValueError):
+        return jsonify({'error': 'partial_fraction and min_profit must be numbers'}), 400
+    
+    current_odds = data.get('current_odds') or {}
+    if not isinstance(current_odds, dict):
+        return jsonify({'error': 'current_odds must be an object'}), 400
+    
+    result = recommend_hedges(
+        g.user_id,
+        current_odds={str(key): value for key, value in current_odds.items()},
+        partial_fraction=partial_fraction,
+        min_profit=min_profit
+    )
+    return jsonify(result), 200
@@ -32,15 +32,17 @@ def create_app():
      supports_credentials=True, 
      allow_headers=["Content-Type", "Authorization", "Access-Control-Allow-Origin"],
      methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-     expose_headers=["Content-Type", "Authorization"])   
+     expose_headers=["Content-Type", "Authorization", "ETag"])   
     migrate = Migrate(app, db)  # ✅ Add Migrate
 
     # ✅ Import models AFTER initializing db to avoid circular imports
     from app.models.user import User
     from app.models.bet import Bet, BetLeg
     from app.models.betting_stats import BettingStats
-    from app.models.Prediction import Prediction
+    from app.models.prediction import Prediction
     from app.models.bankroll import Bankroll
+    from app.models.reddit_post import RedditPostRecord, RedditWatermark, RedditPick, TipsterStats
+    from app.models.consensus import EventConsensus, ConsensusWatermark
 
     # ✅ Register blueprints
     from app.api.upload import upload_bp
@@ -54,6 +56,7 @@ def create_app():
     from app.Routes.profile_routes import profile_bp
     from app.Routes.subscription_routes import subscription_bp
     from app.Routes.bets import bp
+    from app.Routes.predictions import predictions_bp
 
     app.register_blueprint(upload_bp, url_prefix='/api/upload')
     app.register_blueprint(leaderboard_routes)
@@ -62,6 +65,7 @@ def create_app():
     app.register_blueprint(profile_bp, url_prefix='/api/profile')
     app.register_blueprint(subscription_bp, url_prefix='/api/subscription')
     app.register_blueprint(bp, url_prefix='/api/bets')
+    app.register_blueprint(predictions_bp, url_prefix='/api/predictions')
     app.register_blueprint(marketplace_bp)
     app.register_blueprint(help_bp)
     app.register_blueprint(dashboard_bp)
@@ -69,6 +73,15 @@ def create_app():
     # ✅ Register error handlers
     register_error_handlers(app)
 
+    # ✅ Build the help-center snapshot on the first request
+    from app.services.help_center import warm_help_center
+    warm_help_center(app)
+
+    # ✅ Write buffered FAQ views on a timer and when the worker exits
+    from app.services.faq_views import flush_views_at_exit, start_view_flusher
+    start_view_flusher(app)
+    flush_views_at_exit(app)
+
     # ✅ Health check route
     @app.route('/api/health')
     def api_health():
@@ -1,64 +1,56 @@
-import tensorflow as tf
 import numpy as np
-from  app.ml.evaluation import calculate_ev  
+from  app.ml.registry import get_model
+from  app.ml.batching import get_batcher
+from  app.ml.feature_engineering import feature_encoder
 
 class BetPredictionModel:
     def __init__(self):
         """
         Initialize the model
         """
-        self.model = self.load_model()
+        self.model_name = 'bet_outcome'
+    
+    @property
+    def model(self):
+        """
+        Shared network from the model registry, loaded once per process
+        """
+        return self.load_model()
     
     def load_model(self):
         """
-        Load the trained model from file or GCP
+        Load the trained model from the process-wide registry
         """
-        model = tf.keras.Sequential([
-            tf.keras.layers.Dense(64, activation='relu', input_shape=(10,)),
-            tf.keras.layers.Dense(32, activation='relu'),
-            tf.keras.layers.Dense(16, activation='relu'),
-            tf.keras.layers.Dense(2, activation='softmax') 
-        ])
-        
-        model.compile(optimizer='adam',
-                     loss='sparse_categorical_crossentropy',
-                     metrics=['accuracy'])
-        
-        return model
+        return get_model(self.model_name).model
     
     def predict_probability(self, features):
         """
         Make predictions using the trained model
+        
+        Concurrent calls are coalesced into one forward pass by the
+        process-wide micro-batcher.
         """
-        predictions = self.model.predict(np.array([features]))
-        win_probability = predictions[0][1]
+        predictions = get_batcher(self.model_name).predict(features)
+        win_probability = float(predictions[1])
         
         return win_probability
     
-    def get_prediction_confidence(self, features):
+    def predict_with_confidence(self, features):
         """
-        Return confidence score for a prediction
+        Return (win probability, confidence) from a single forward pass
         """
         win_probability = self.predict_probability(features)
+        return win_probability, self.get_prediction_confidence(win_probability)
+    
+    @staticmethod
+    def get_prediction_confidence(win_probability):
+        """
+        Return confidence score for a predicted win probability
+        """
         return max(win_probability, 1 - win_probability)
     
     def prepare_features(self, bet_data):
         """
         Process and normalize features for the model
         """
-        feature_array = np.zeros(10)
-        
-        if 'odds' in bet_data:
-            feature_array[0] = min(bet_data['odds'] / 1000, 1.0)  
-        if 'sport' in bet_data:
-            sport_index = {'basketball': 1, 'soccer': 2, 'baseball': 3}.get(bet_data['sport'], 0)
-            feature_array[1] = sport_index / 3
-        
-        if 'bet_type' in bet_data:
-            bet_type_index = {'moneyline': 1, 'spread': 2, 'over_under': 3, 'prop': 4, 'parlay': 5}.get(bet_data['bet_type'], 0)
-            feature_array[2] = bet_type_index / 5
-            
-        if 'sentiment_score' in bet_data:
-            feature_array[3] = (bet_data['sentiment_score'] + 1) / 2 
-        
-        return feature_array
\ No newline at end of file
+        return feature_encoder.encode_one(bet_data)
@@ -0,0 +1,127 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict
+
+import numpy as np
+
+from config import Config
+
+class MicroBatcher:
+    """
+    Collects concurrent single-row predictions into one forward pass
+
+    Callers submit a feature row and block on a Future. A background
+    thread waits for the first request, keeps collecting for up to
+    max_wait_ms or until max_batch_size rows are queued, runs predict_fn
+    once on the stacked batch and hands each caller its own output row.
+    If the batch fails, its rows are retried one at a time so a single bad
+    row only fails its own caller.
+    """
+
+    def __init__(self, predict_fn: Callable[[np.ndarray], np.ndarray], max_batch_size=64, max_wait_ms=5.0):
+        """
+        Args:
+            predict_fn: Function mapping an (n, d) float32 array to n output rows
+            max_batch_size: Largest batch sent to predict_fn
+            max_wait_ms: Longest time the first request in a batch waits for company
+        """
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='prediction-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, features) -> Future:
+        """
+        Queue one feature row and return a Future for its output row
+
+        Raises:
+            ValueError: features cannot be read as a row of floats
+        """
+        if self._closed:
+            raise RuntimeError('MicroBatcher is closed')
+        future = Future()
+        self._queue.put((np.asarray(features, dtype=np.float32).reshape(-1), future))
+        return future
+
+    def predict(self, features, timeout=None):
+        """Submit one feature row and wait for its output"""
+        return self.submit(features).result(timeout=timeout)
+
+    def close(self):
+        """Stop the worker thread after the queued requests are served"""
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._run_batch(batch)
+            if stop:
+                return
+
+    def _run_batch(self, batch):
+        try:
+            outputs = np.asarray(self.predict_fn(np.stack([row for row, _ in batch])))
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+            else:
+                for item in batch:
+                    self._run_batch([item])
+            return
+
+        for (_, future), output in zip(batch, outputs):
+            future.set_result(output)
+
+_batchers: Dict[str, MicroBatcher] = {}
+_batchers_lock = threading.Lock()
+
+def get_batcher(name='bet_outcome') -> MicroBatcher:
+    """
+    Return the process-wide batcher for a registry model
+
+    The model is resolved on every batch, so a registry reload is picked
+    up without restarting the batcher.
+    """
+    batcher = _batchers.get(name)
+    if batcher is None:
+        with _batchers_lock:
+            batcher = _batchers.get(name)
+            if batcher is None:
+                from app.ml.registry import get_model
+
+                def forward(batch):
+                    return np.asarray(get_model(name).model(batch, training=False))
+
+                batcher = MicroBatcher(
+                    forward,
+                    max_batch_size=Config.PREDICTION_BATCH_SIZE,
+                    max_wait_ms=Config.PREDICTION_BATCH_WAIT_MS
+                )
+                _batchers[name] = batcher
+    return batcher
@@ -0,0 +1,96 @@
+from sqlalchemy import select, func
+
+from app.models.bet import Bet, BetLeg
+
+WIN_STATUSES = ('win', 'won')
+LOSS_STATUSES = ('loss', 'lost')
+
+def settled_bets_query(settled_after=None, settled_before=None):
+    """
+    Select settled bets with their leg count, oldest first
+
+    Args:
+        settled_after (datetime, optional): Inclusive lower bound on settled_at
+        settled_before (datetime, optional): Exclusive upper bound on settled_at
+    """
+    leg_counts = (
+        select(BetLeg.bet_id, func.count(BetLeg.id).label('leg_count'))
+        .group_by(BetLeg.bet_id)
+        .subquery()
+    )
+
+    query = (
+        select(
+            Bet.id,
+            Bet.odds,
+            Bet.amount,
+            Bet.bet_type,
+            Bet.status,
+            Bet.settled_at,
+            Bet.additional_data,
+            func.coalesce(leg_counts.c.leg_count, 0).label('leg_count')
+        )
+        .outerjoin(leg_counts, leg_counts.c.bet_id == Bet.id)
+        .where(Bet.status.in_(WIN_STATUSES + LOSS_STATUSES))
+        .where(Bet.settled_at.isnot(None))
+        .order_by(Bet.settled_at, Bet.id)
+    )
+
+    if settled_after is not None:
+        query = query.where(Bet.settled_at >= settled_after)
+    if settled_before is not None:
+        query = query.where(Bet.settled_at < settled_before)
+    return query
+
+def stream_settled_bets(session, chunk_size=10000, settled_after=None, settled_before=None):
+    """
+    Yield settled bets as lists of dicts, chunk_size rows at a time
+
+    stream_results makes Postgres use a server-side cursor, so only one
+    chunk is held in memory regardless of table size.
+
+    Args:
+        session: SQLAlchemy session (Flask-SQLAlchemy's db.session or a plain Session)
+        chunk_size (int): Rows per chunk
+        settled_after (datetime, optional): Inclusive lower bound on settled_at
+        settled_before (datetime, optional): Exclusive upper bound on settled_at
+
+    Yields:
+        list: Bet dicts with odds, amount, bet_type, sport, sentiment_score, leg_count,
+            consensus_share, tipster_win_rate, settled_at and label
+    """
+    query = settled_bets_query(settled_after, settled_before).execution_options(
+        stream_results=True,
+        yield_per=chunk_size
+    )
+    result = session.execute(query)
+
+    try:
+        for partition in result.partitions(chunk_size):
+            chunk = []
+            for row in partition:
+                additional_data = row.additional_data or {}
+                chunk.append({
+                    'id': row.id,
+                    'odds': row.odds,
+                    'amount': row.amount,
+                    'bet_type': row.bet_type,
+                    'sport': additional_data.get('sport'),
+                    'sentiment_score': additional_data.get('sentiment_score'),
+                    'leg_count': row.leg_count,
+                    'consensus_share': additional_data.get('consensus_share'),
+                    'tipster_win_rate': additional_data.get('tipster_win_rate'),
+                    'settled_at': row.settled_at,
+                    'label': 1 if row.status in WIN_STATUSES else 0
+                })
+            yield chunk
+    finally:
+        result.close()
+
+def settled_range(session):
+    """Return (earliest, latest, count) of settled_at across settled bets"""
+    return session.execute(
+        select(func.min(Bet.settled_at), func.max(Bet.settled_at), func.count(Bet.id))
+        .where(Bet.status.in_(WIN_STATUSES + LOSS_STATUSES))
+        .where(Bet.settled_at.isnot(None))
+    ).one()
@@ -1,10 +1,200 @@
+import time
+
+import numpy as np
+
+from app.ml.odds import american_to_decimal, parse_odds, expected_value
+
+# Upper edges of the EV buckets used for ROI reporting
+EV_BUCKET_EDGES = (-0.10, -0.05, 0.0, 0.05, 0.10, np.inf)
+
 def calculate_ev(odds, win_probability):
-    if odds > 0:
-        potential_profit = odds / 100
-        potential_loss = 1
-    else:
-        potential_profit = 1
-        potential_loss = abs(odds) / 100
-    
-    ev = (win_probability * potential_profit) - ((1 - win_probability) * potential_loss)
-    return ev
+    """
+    Calculate expected value per unit staked from American odds
+
+    Args:
+        odds: American odds, scalar or array
+        win_probability: Model win probability, scalar or array
+
+    Returns:
+        float or np.ndarray: EV per unit staked, 0 where odds are missing
+    """
+    ev = np.nan_to_num(expected_value(win_probability, american_to_decimal(odds)))
+    return float(ev) if ev.ndim == 0 else ev
+
+class EvaluationAccumulator:
+    """
+    Streaming model-quality metrics over settled bets
+
+    update() is called once per chunk; only per-bin sums are kept, so any
+    number of rows can be evaluated in constant memory.
+    """
+
+    def __init__(self, calibration_bins=10, ev_bucket_edges=EV_BUCKET_EDGES):
+        self.calibration_bins = calibration_bins
+        self.ev_bucket_edges = np.asarray(ev_bucket_edges, dtype=np.float64)
+        self.count = 0
+        self.correct = 0
+        self.log_loss_sum = 0.0
+        self.brier_sum = 0.0
+        self.bin_count = np.zeros(calibration_bins, dtype=np.int64)
+        self.bin_predicted = np.zeros(calibration_bins)
+        self.bin_observed = np.zeros(calibration_bins)
+        self.bucket_count = np.zeros(len(ev_bucket_edges), dtype=np.int64)
+        self.bucket_profit = np.zeros(len(ev_bucket_edges))
+
+    def update(self, win_probability, labels, decimal=None):
+        """
+        Add one chunk of predictions
+
+        Args:
+            win_probability: Predicted win probabilities
+            labels: 1 for won bets, 0 for lost
+            decimal: Decimal odds; needed for ROI by EV bucket
+        """
+        win_probability = np.asarray(win_probability, dtype=np.float64)
+        labels = np.asarray(labels, dtype=np.float64)
+        clipped = np.clip(win_probability, 1e-7, 1 - 1e-7)
+
+        self.count += len(labels)
+        self.correct += int(np.sum((win_probability > 0.5) == (labels == 1)))
+        self.log_loss_sum += float(-np.sum(labels * np.log(clipped) + (1 - labels) * np.log(1 - clipped)))
+        self.brier_sum += float(np.sum((win_probability - labels) ** 2))
+
+        bins = np.minimum((win_probability * self.calibration_bins).astype(np.int64), self.calibration_bins - 1)
+        self.bin_count += np.bincount(bins, minlength=self.calibration_bins)
+        self.bin_predicted += np.bincount(bins, weights=win_probability, minlength=self.calibration_bins)
+        self.bin_observed += np.bincount(bins, weights=labels, minlength=self.calibration_bins)
+
+        if decimal is None:
+            return
+        decimal = np.asarray(decimal, dtype=np.float64)
+        priced = ~np.isnan(decimal)
+        ev = expected_value(win_probability[priced], decimal[priced])
+        # Flat one-unit stakes
+        profit = labels[priced] * (decimal[priced] - 1) - (1 - labels[priced])
+        buckets = np.searchsorted(self.ev_bucket_edges, ev, side='right')
+        buckets = np.minimum(buckets, len(self.ev_bucket_edges) - 1)
+        self.bucket_count += np.bincount(buckets, minlength=len(self.ev_bucket_edges))
+        self.bucket_profit += np.bincount(buckets, weights=profit, minlength=len(self.ev_bucket_edges))
+
+    def calibration(self):
+        """Mean predicted vs observed win rate per probability bin"""
+        curve = []
+        for index in range(self.calibration_bins):
+            count = int(self.bin_count[index])
+            curve.append({
+                'bin': [index / self.calibration_bins, (index + 1) / self.calibration_bins],
+                'count': count,
+                'mean_predicted': self.bin_predicted[index] / count if count else None,
+                'observed_win_rate': self.bin_observed[index] / count if count else None
+            })
+        return curve
+
+    def roi_by_ev_bucket(self):
+        """Flat-stake ROI of the bets in each predicted-EV bucket"""
+        buckets = []
+        lower = -np.inf
+        for index, upper in enumerate(self.ev_bucket_edges):
+            count = int(self.bucket_count[index])
+            buckets.append({
+                'ev_range': [None if np.isinf(lower) else float(lower), None if np.isinf(upper) else float(upper)],
+                'bets': count,
+                'roi': self.bucket_profit[index] / count if count else None
+            })
+            lower = upper
+        return buckets
+
+    def results(self):
+        if self.count == 0:
+            return {'rows': 0}
+
+        return {
+            'rows': self.count,
+            'accuracy': self.correct / self.count,
+            'log_loss': self.log_loss_sum / self.count,
+            'brier_score': self.brier_sum / self.count,
+            'calibration': self.calibration(),
+            'roi_by_ev_bucket': self.roi_by_ev_bucket()
+        }
+
+def measure_latency(model, samples, batch_sizes=(1, 64), iterations=200):
+    """
+    Time model calls at each batch size
+
+    Args:
+        model: Network callable as model(x, training=False)
+        samples: (n, input_dim) feature rows to draw batches from
+        batch_sizes (tuple): Batch sizes to time
+        iterations (int): Timed calls per batch size, after one warm-up call
+
+    Returns:
+        dict: p50/p99 milliseconds per call and rows per second, per batch size
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    report = {}
+    for batch_size in batch_sizes:
+        repeats = int(np.ceil(batch_size / len(samples)))
+        batch = np.tile(samples, (repeats, 1))[:batch_size]
+        model(batch, training=False)
+
+        timings = np.empty(iterations)
+        for index in range(iterations):
+            started = time.perf_counter()
+            model(batch, training=False)
+            timings[index] = time.perf_counter() - started
+
+        report[str(batch_size)] = {
+            'p50_ms': float(np.percentile(timings, 50) * 1000),
+            'p99_ms': float(np.percentile(timings, 99) * 1000),
+            'rows_per_second': float(batch_size * iterations / timings.sum())
+        }
+    return report
+
+def evaluate_artifact(session, name='bet_outcome', version=None, model_dir=None,
+                      settled_after=None, settled_before=None, chunk_size=50000,
+                      batch_sizes=(1, 64), latency_iterations=200):
+    """
+    Replay settled bets through a model artifact
+
+    Args:
+        session: SQLAlchemy session on the bets database (Postgres or a SQLite snapshot)
+        name (str): Model name
+        version (str, optional): Artifact version, defaults to the latest
+        model_dir (str, optional): Artifact root, defaults to MODEL_DIR
+        settled_after (datetime, optional): Inclusive lower bound on settled_at
+        settled_before (datetime, optional): Exclusive upper bound on settled_at
+        chunk_size (int): Rows fetched per database round trip
+        batch_sizes (tuple): Batch sizes for the latency benchmark
+        latency_iterations (int): Timed calls per batch size
+
+    Returns:
+        dict: Artifact, quality metrics and latency report
+    """
+    from app.ml.data_preprocessing import stream_settled_bets
+    from app.ml.feature_engineering import encode_bets
+    from app.ml.registry import ModelRegistry
+
+    loaded = ModelRegistry(model_dir).load(name, version)
+    accumulator = EvaluationAccumulator()
+    sample = None
+
+    for chunk in stream_settled_bets(session, chunk_size=chunk_size,
+                                     settled_after=settled_after, settled_before=settled_before):
+        features = encode_bets(chunk)
+        labels = np.array([row['label'] for row in chunk])
+        win_probability = np.asarray(loaded.model(features, training=False))[:, 1]
+        decimal = american_to_decimal(parse_odds([row['odds'] for row in chunk]))
+        accumulator.update(win_probability, labels, decimal)
+        if sample is None:
+            sample = features[:max(batch_sizes)]
+
+    if sample is None:
+        sample = np.zeros((1, loaded.input_dim), dtype=np.float32)
+
+    return {
+        'model': name,
+        'version': loaded.version,
+        'feature_version': loaded.metadata.get('feature_version'),
+        'metrics': accumulator.results(),
+        'latency': measure_latency(loaded.model, sample, batch_sizes, latency_iterations)
+    }
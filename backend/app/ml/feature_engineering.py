@@ -0,0 +1,175 @@
+import math
+
+import numpy as np
+
+from app.ml.odds import parse_american_odds, parse_odds  # noqa: F401 (parse_american_odds re-exported)
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+FEATURE_DIM = 10
+FEATURE_VERSION = 2
+
+# Column order of the encoded matrix
+FEATURE_COLUMNS = (
+    'odds_scaled',          # American odds / 1000, clipped to [-1, 1]
+    'sport',                # vocabulary index / vocabulary size
+    'bet_type',             # vocabulary index / vocabulary size
+    'sentiment',            # compound sentiment mapped from [-1, 1] to [0, 1]
+    'implied_probability',  # from the odds, vig included
+    'leg_count',            # parlay legs / 10, capped at 1
+    'positive_sentiment',
+    'negative_sentiment',
+    'consensus_share',      # share of community picks on this selection
+    'tipster_win_rate',     # weighted win rate of tipsters backing it
+)
+
+SPORTS = ('basketball', 'soccer', 'baseball', 'football', 'hockey')
+BET_TYPES = ('moneyline', 'spread', 'over_under', 'prop', 'parlay')
+
+SOURCE_COLUMNS = (
+    'odds', 'sport', 'bet_type', 'sentiment_score', 'leg_count',
+    'positive_sentiment', 'negative_sentiment', 'consensus_share', 'tipster_win_rate'
+)
+
+def normalize_label(value):
+    """Lowercase a sport/bet type and map 'Over/Under' style names to 'over_under'"""
+    if not value or (isinstance(value, float) and math.isnan(value)):
+        return ''
+    return str(value).strip().lower().replace('/', '_').replace(' ', '_')
+
+def count_legs(bet_data):
+    """
+    Number of legs an extracted slip is stored with
+
+    Mirrors the BetLeg rows BetUploadService.build_bet creates (template legs,
+    or one leg per team on a regex-parsed parlay), which is what training
+    counts, so serving sees the same leg_count for the same slip.
+    """
+    if normalize_label(bet_data.get('bet_type')) != 'parlay':
+        return 0
+    if bet_data.get('legs'):
+        return len(bet_data['legs'])
+    teams = bet_data.get('teams') or []
+    return len(teams) if len(teams) >= 2 else 0
+
+def _object_column(values):
+    """1-D object array, keeping list values (e.g. odds lists) as single cells"""
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column
+
+class FeatureEncoder:
+    """
+    Columnar encoder from bets to the model's float32 feature matrix
+
+    Shared by training (app.ml.train) and serving (model.predict,
+    BetPredictionModel, ai_service). Categorical and odds columns are
+    mapped once per distinct value with precomputed vocabularies, and the
+    remaining work is whole-column NumPy arithmetic.
+    """
+
+    def __init__(self, sports=SPORTS, bet_types=BET_TYPES):
+        self.sport_vocab = {name: index + 1 for index, name in enumerate(sports)}
+        self.bet_type_vocab = {name: index + 1 for index, name in enumerate(bet_types)}
+
+    def encode(self, data):
+        """
+        Encode a batch of bets
+
+        Args:
+            data: List of bet dicts, a pandas DataFrame or a pyarrow Table
+
+        Returns:
+            np.ndarray: (rows, FEATURE_DIM) float32 matrix
+        """
+        columns, count = self._columns(data)
+        matrix = np.zeros((count, FEATURE_DIM), dtype=np.float32)
+        if count == 0:
+            return matrix
+
+        first_index, inverse = self._unique(columns['odds'])
+        odds = parse_odds(columns['odds'][first_index])[inverse]
+        sports = self._map_unique(columns['sport'], lambda value: self.sport_vocab.get(normalize_label(value), 0))
+        bet_types = self._map_unique(columns['bet_type'], lambda value: self.bet_type_vocab.get(normalize_label(value), 0))
+
+        magnitude = np.abs(odds)
+        implied = np.where(
+            odds > 0, 100 / (magnitude + 100),
+            np.where(odds < 0, magnitude / (magnitude + 100), 0.0)
+        )
+
+        matrix[:, 0] = np.clip(odds / 1000, -1.0, 1.0)
+        matrix[:, 1] = sports / len(self.sport_vocab)
+        matrix[:, 2] = bet_types / len(self.bet_type_vocab)
+        matrix[:, 3] = np.nan_to_num((self._float_column(columns['sentiment_score']) + 1) / 2)
+        matrix[:, 4] = implied
+        matrix[:, 5] = np.minimum(np.nan_to_num(self._float_column(columns['leg_count'])), 10) / 10
+        matrix[:, 6] = np.nan_to_num(self._float_column(columns['positive_sentiment']))
+        matrix[:, 7] = np.nan_to_num(self._float_column(columns['negative_sentiment']))
+        matrix[:, 8] = np.nan_to_num(self._float_column(columns['consensus_share']))
+        matrix[:, 9] = np.nan_to_num(self._float_column(columns['tipster_win_rate']))
+        return matrix
+
+    def encode_one(self, record):
+        """Encode a single bet dict to a (FEATURE_DIM,) vector"""
+        return self.encode([record])[0]
+
+    @staticmethod
+    def _columns(data):
+        """Pull the source columns out of dicts, a DataFrame or an Arrow table"""
+        if pd is not None and isinstance(data, pd.DataFrame):
+            count = len(data)
+            return {
+                name: data[name].to_numpy(dtype=object) if name in data.columns else np.full(count, None, dtype=object)
+                for name in SOURCE_COLUMNS
+            }, count
+
+        if pa is not None and isinstance(data, pa.Table):
+            count = data.num_rows
+            return {
+                name: _object_column(data.column(name).to_pylist()) if name in data.column_names else np.full(count, None, dtype=object)
+                for name in SOURCE_COLUMNS
+            }, count
+
+        records = list(data)
+        return {
+            name: _object_column([record.get(name) for record in records])
+            for name in SOURCE_COLUMNS
+        }, len(records)
+
+    @staticmethod
+    def _unique(column):
+        """Index of each distinct value's first row, and each row's distinct value"""
+        keys = np.array([
+            repr(value) if isinstance(value, (list, tuple)) else str(value)
+            for value in column
+        ])
+        unique_keys, first_index, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        return first_index, inverse
+
+    @classmethod
+    def _map_unique(cls, column, mapper):
+        """Apply mapper once per distinct value and broadcast back to the column"""
+        first_index, inverse = cls._unique(column)
+        mapped = np.array([mapper(column[index]) for index in first_index], dtype=np.float64)
+        return mapped[inverse]
+
+    @staticmethod
+    def _float_column(column):
+        """Convert an object column to float64, with None/missing as NaN"""
+        return np.asarray(column, dtype=np.float64)
+
+# Shared encoder instance for training and serving
+feature_encoder = FeatureEncoder()
+
+def encode_bets(records):
+    """Encode a batch of bets with the shared encoder"""
+    return feature_encoder.encode(records)
@@ -1,18 +1,27 @@
-import tensorflow as tf
 import numpy as np
 import os
 from datetime import datetime
+from  app.ml.feature_engineering import feature_encoder, parse_american_odds
+from  app.ml.evaluation import calculate_ev
 
-def load_model():
+# Hidden/output layer sizes and activations of the prediction network
+LAYER_UNITS = (64, 32, 16, 2)
+LAYER_ACTIVATIONS = ('relu', 'relu', 'relu', 'softmax')
+
+def build_model(input_dim=10):
     """
-    Load the trained model from file or GCP
+    Build and compile the (untrained) prediction network
+    
+    TensorFlow is imported here so only training code pays for it;
+    the web tier serves the NumPy export (see app.ml.numpy_model).
     """
-    model = tf.keras.Sequential([
-        tf.keras.layers.Dense(64, activation='relu', input_shape=(10,)),
-        tf.keras.layers.Dense(32, activation='relu'),
-        tf.keras.layers.Dense(16, activation='relu'),
-        tf.keras.layers.Dense(2, activation='softmax')  
-    ])
+    import tensorflow as tf
+    
+    layers = [
+        tf.keras.layers.Dense(units, activation=activation)
+        for units, activation in zip(LAYER_UNITS, LAYER_ACTIVATIONS)
+    ]
+    model = tf.keras.Sequential([tf.keras.Input(shape=(input_dim,))] + layers)
     
     model.compile(optimizer='adam',
                  loss='sparse_categorical_crossentropy',
@@ -20,16 +29,24 @@ def load_model():
     
     return model
 
+def load_model():
+    """
+    Load the trained model from the process-wide registry
+    """
+    from app.ml.registry import get_model
+    return get_model().model
+
 def predict(model, features):
     """
     Make predictions using the trained model
     """
     processed_features = process_features(features)
     
-    predictions = model.predict(np.array([processed_features]))
+    # Direct call avoids predict()'s per-call setup overhead for one row
+    predictions = np.asarray(model(np.array([processed_features], dtype=np.float32), training=False))
     win_probability = predictions[0][1]
     
-    odds = features.get('odds', 0)
+    odds = parse_american_odds(features.get('odds'))
     ev = calculate_ev(odds, win_probability)
     
     return {
@@ -43,36 +60,6 @@ def process_features(features_dict):
     """
     Process and normalize features for the model
     """
-    feature_array = np.zeros(10)
-    
-    if 'odds' in features_dict:
-        feature_array[0] = min(features_dict['odds'] / 1000, 1.0)  
-    
-    if 'sport' in features_dict:
-        sport_index = {'basketball': 1, 'soccer': 2, 'baseball': 3}.get(features_dict['sport'], 0)
-        feature_array[1] = sport_index / 3
-    
-    if 'bet_type' in features_dict:
-        bet_type_index = {'moneyline': 1, 'spread': 2, 'over_under': 3, 'prop': 4, 'parlay': 5}.get(features_dict['bet_type'], 0)
-        feature_array[2] = bet_type_index / 5
-        
-    if 'sentiment_score' in features_dict:
-        feature_array[3] = (features_dict['sentiment_score'] + 1) / 2  
-    
-    return feature_array
-
-def calculate_ev(odds, win_probability):
-    """
-    Calculate Expected Value based on odds and win probability
-    """
-    if odds > 0:
-        potential_profit = odds / 100
-        potential_loss = 1
-    else:
-        potential_profit = 1
-        potential_loss = abs(odds) / 100
-        
-    ev = (win_probability * potential_profit) - ((1 - win_probability) * potential_loss)
-    return ev
+    return feature_encoder.encode_one(features_dict)
 
 get_prediction = predict
\ No newline at end of file
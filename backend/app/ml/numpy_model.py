@@ -0,0 +1,126 @@
+import numpy as np
+
+ACTIVATIONS = {
+    'relu': lambda x: np.maximum(x, 0.0),
+    'linear': lambda x: x,
+    'softmax': None,  # handled separately for numerical stability
+}
+
+def softmax(x):
+    """Row-wise softmax with max subtraction for stability"""
+    shifted = x - x.max(axis=1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+class NumpyMLP:
+    """
+    Dense feed-forward network evaluated with NumPy only
+
+    Used by the web tier so serving never imports TensorFlow. Weights come
+    from a Keras model via export_keras_weights; the forward pass is
+    matmul + bias + activation per layer.
+    """
+
+    def __init__(self, kernels, biases, activations):
+        """
+        Args:
+            kernels (list): (in, out) float32 weight matrices, one per layer
+            biases (list): (out,) float32 bias vectors
+            activations (list): Activation names ('relu', 'softmax', 'linear')
+        """
+        if not len(kernels) == len(biases) == len(activations):
+            raise ValueError('kernels, biases and activations must have the same length')
+        for activation in activations:
+            if activation not in ACTIVATIONS:
+                raise ValueError(f'Unsupported activation: {activation}')
+
+        self.kernels = [np.asarray(kernel, dtype=np.float32) for kernel in kernels]
+        self.biases = [np.asarray(bias, dtype=np.float32) for bias in biases]
+        self.activations = list(activations)
+
+    @property
+    def input_dim(self):
+        return self.kernels[0].shape[0]
+
+    def __call__(self, x, training=False):
+        """Forward pass; signature mirrors a Keras model call"""
+        out = np.asarray(x, dtype=np.float32)
+        if out.ndim == 1:
+            out = out.reshape(1, -1)
+
+        for kernel, bias, activation in zip(self.kernels, self.biases, self.activations):
+            out = out @ kernel + bias
+            out = softmax(out) if activation == 'softmax' else ACTIVATIONS[activation](out)
+        return out
+
+    def predict(self, x, verbose=0):
+        """Keras-compatible alias for the forward pass"""
+        return self(x)
+
+    def save(self, path):
+        """Write the weights to a compressed .npz file"""
+        arrays = {}
+        for index, (kernel, bias) in enumerate(zip(self.kernels, self.biases)):
+            arrays[f'kernel_{index}'] = kernel
+            arrays[f'bias_{index}'] = bias
+        np.savez_compressed(path, activations=np.array(self.activations), **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """Load weights written by save() or export_keras_weights()"""
+        with np.load(path, allow_pickle=False) as data:
+            activations = [str(name) for name in data['activations']]
+            kernels = [data[f'kernel_{index}'] for index in range(len(activations))]
+            biases = [data[f'bias_{index}'] for index in range(len(activations))]
+        return cls(kernels, biases, activations)
+
+    @classmethod
+    def initialize(cls, layer_sizes, activations, seed=None):
+        """
+        Glorot-uniform initialized network, matching a fresh Keras model
+
+        Args:
+            layer_sizes (list): Input dim followed by each layer's units
+            activations (list): One activation name per layer
+        """
+        rng = np.random.default_rng(seed)
+        kernels = []
+        biases = []
+        for fan_in, fan_out in zip(layer_sizes[:-1], layer_sizes[1:]):
+            limit = np.sqrt(6.0 / (fan_in + fan_out))
+            kernels.append(rng.uniform(-limit, limit, size=(fan_in, fan_out)).astype(np.float32))
+            biases.append(np.zeros(fan_out, dtype=np.float32))
+        return cls(kernels, biases, activations)
+
+def export_keras_weights(keras_model, path):
+    """
+    Dump a Keras Sequential of Dense layers to a NumPy .npz
+
+    Args:
+        keras_model: Trained tf.keras model made only of Dense layers
+        path (str): Destination .npz path
+
+    Returns:
+        NumpyMLP: The exported network, for equivalence checks
+    """
+    kernels = []
+    biases = []
+    activations = []
+    for layer in keras_model.layers:
+        weights = layer.get_weights()
+        if not weights:
+            continue
+        if len(weights) != 2:
+            raise ValueError(f'Layer {layer.name} is not a Dense layer with bias')
+        kernels.append(weights[0])
+        biases.append(weights[1])
+        activations.append(layer.get_config().get('activation', 'linear'))
+
+    network = NumpyMLP(kernels, biases, activations)
+    network.save(path)
+    return network
+
+def max_abs_difference(keras_model, network, samples):
+    """Largest absolute output difference between Keras and NumPy on samples"""
+    expected = np.asarray(keras_model(samples, training=False))
+    return float(np.max(np.abs(expected - network(samples))))
@@ -0,0 +1,143 @@
+import math
+
+import numpy as np
+
+def parse_american_odds(value):
+    """
+    Convert one odds value to American odds
+
+    Accepts strings such as '+150', '-110' or decimal '2.50', numbers, and
+    lists of those (the first entry is used, as uploads store every odds
+    string found on the slip). Numbers follow the same rules as unsigned
+    strings, so a stored 1.91 and an uploaded '1.91' are both decimal odds.
+
+    Unsigned values are read as decimal odds below 100 and as American odds
+    from 100 up, so 50 means decimal 50.0 (+4900), not +50; positive American
+    odds under +100 do not exist, and long-shot decimal prices do.
+    """
+    if isinstance(value, (list, tuple)):
+        value = value[0] if value else None
+    if value is None:
+        return 0.0
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        if math.isnan(value):
+            return 0.0
+        decimal = float(value)
+        if decimal < 0:
+            return decimal
+    else:
+        text = str(value).strip()
+        try:
+            if text.startswith(('+', '-')):
+                return float(text)
+            decimal = float(text)
+        except ValueError:
+            return 0.0
+
+    # Bare numbers of 100+ are American odds written without a sign
+    if decimal >= 100:
+        return decimal
+    if decimal <= 1.0:
+        return 0.0
+    return (decimal - 1) * 100 if decimal >= 2.0 else -100 / (decimal - 1)
+
+def parse_odds(values):
+    """
+    Parse a sequence of odds values ('+150', '-110', '2.50', numbers) to American odds
+
+    Args:
+        values: Iterable of odds in any format parse_american_odds accepts
+
+    Returns:
+        np.ndarray: float64 American odds, 0 where a value could not be parsed
+    """
+    return np.array([parse_american_odds(value) for value in values], dtype=np.float64)
+
+def american_to_decimal(american):
+    """
+    Convert American odds to decimal odds
+
+    Zero (unparsed) odds map to NaN.
+    """
+    american = np.asarray(american, dtype=np.float64)
+    magnitude = np.abs(american)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        decimal = np.where(american > 0, 1 + magnitude / 100, 1 + 100 / magnitude)
+    return np.where(american == 0, np.nan, decimal)
+
+def decimal_to_american(decimal):
+    """
+    Convert decimal odds to American odds
+
+    Decimal odds of 1.0 or less have no American equivalent and map to NaN.
+    """
+    decimal = np.asarray(decimal, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        american = np.where(decimal >= 2.0, (decimal - 1) * 100, -100 / (decimal - 1))
+    return np.where(decimal > 1.0, american, np.nan)
+
+def decimal_to_implied(decimal):
+    """Implied probability of decimal odds, vig included"""
+    decimal = np.asarray(decimal, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(decimal > 1.0, 1 / decimal, np.nan)
+
+def american_to_implied(american):
+    """Implied probability of American odds, vig included"""
+    return decimal_to_implied(american_to_decimal(american))
+
+def implied_to_decimal(probability):
+    """Fair decimal odds for a win probability"""
+    probability = np.asarray(probability, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(probability > 0, 1 / probability, np.nan)
+
+def remove_vig(implied):
+    """
+    Normalize implied probabilities so each market sums to 1
+
+    Args:
+        implied: (markets, outcomes) implied probabilities, one row per
+            market with every outcome of that market (e.g. both sides of
+            a moneyline). A 1-D array is treated as a single market.
+
+    Returns:
+        np.ndarray: Fair probabilities, same shape as implied
+    """
+    implied = np.asarray(implied, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return implied / implied.sum(axis=-1, keepdims=True)
+
+def overround(implied):
+    """Bookmaker margin of each market: sum of implied probabilities minus 1"""
+    return np.asarray(implied, dtype=np.float64).sum(axis=-1) - 1
+
+def expected_value(win_probability, decimal):
+    """
+    Expected profit per unit staked
+
+    Args:
+        win_probability: Probability the bet wins
+        decimal: Decimal odds of the bet
+
+    Returns:
+        np.ndarray: p * (decimal - 1) - (1 - p)
+    """
+    win_probability = np.asarray(win_probability, dtype=np.float64)
+    decimal = np.asarray(decimal, dtype=np.float64)
+    return win_probability * (decimal - 1) - (1 - win_probability)
+
+def kelly_fraction(win_probability, decimal, multiplier=1.0):
+    """
+    Kelly stake as a fraction of bankroll, 0 when the bet has no edge
+
+    Args:
+        win_probability: Probability the bet wins
+        decimal: Decimal odds of the bet
+        multiplier (float): Fractional Kelly, e.g. 0.25 for quarter Kelly
+    """
+    win_probability = np.asarray(win_probability, dtype=np.float64)
+    net_odds = np.asarray(decimal, dtype=np.float64) - 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraction = (net_odds * win_probability - (1 - win_probability)) / net_odds
+    return np.nan_to_num(np.clip(fraction, 0.0, 1.0)) * multiplier
@@ -0,0 +1,217 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import numpy as np
+
+from config import Config
+from app.ml.feature_engineering import parse_american_odds
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 3600
+MAX_TTL_SECONDS = 6 * 3600
+
+class CacheBackend:
+    """
+    Interface for prediction cache storage
+
+    Values are JSON-serializable dicts; ttl is in seconds.
+    """
+    name = None
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process LRU cache with per-entry expiry"""
+    name = 'memory'
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or Config.PREDICTION_CACHE_MAX_ENTRIES
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redis cache shared by every worker
+
+    Entries expire with their TTL; LRU eviction comes from the server's
+    maxmemory-policy (allkeys-lru or volatile-lru).
+    """
+    name = 'redis'
+    prefix = 'prediction:'
+
+    def __init__(self, url=None):
+        if redis is None:
+            raise RuntimeError('redis is not installed')
+        self.client = redis.Redis.from_url(url or Config.REDIS_URL)
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefix + key, json.dumps(value), ex=max(int(ttl), 1))
+
+    def clear(self):
+        for key in self.client.scan_iter(match=self.prefix + '*', count=1000):
+            self.client.delete(key)
+
+CACHE_BACKENDS = {
+    MemoryCacheBackend.name: MemoryCacheBackend,
+    RedisCacheBackend.name: RedisCacheBackend,
+}
+
+def feature_key(features, odds, model_version):
+    """
+    Canonical cache key for a prediction
+
+    The encoded feature vector captures everything the model sees (sport,
+    market, odds, sentiment, ...), so identical picks from different users
+    hash to the same key. Odds are added at full precision because EV
+    uses them beyond the capped odds feature, and the model version makes
+    a newly deployed artifact miss every entry of the previous one (the
+    registry picks up a new artifact within MODEL_RECHECK_SECONDS, without
+    a restart).
+    """
+    digest = hashlib.sha1()
+    digest.update(str(model_version).encode())
+    digest.update(np.round(np.asarray(features, dtype=np.float32), 6).tobytes())
+    digest.update(repr(round(parse_american_odds(odds), 2)).encode())
+    return digest.hexdigest()
+
+def ttl_until(event_start, now=None):
+    """
+    Seconds a prediction stays valid
+
+    Until the event starts (capped at MAX_TTL_SECONDS); DEFAULT_TTL_SECONDS
+    when the start time is unknown. Returns 0 once the event has started.
+    """
+    if not event_start:
+        return DEFAULT_TTL_SECONDS
+    if isinstance(event_start, str):
+        try:
+            event_start = datetime.fromisoformat(event_start.replace('Z', '+00:00'))
+        except ValueError:
+            return DEFAULT_TTL_SECONDS
+    if event_start.tzinfo is None:
+        event_start = event_start.replace(tzinfo=timezone.utc)
+
+    now = now or datetime.now(timezone.utc)
+    return max(0, min(int((event_start - now).total_seconds()), MAX_TTL_SECONDS))
+
+class PredictionCache:
+    """
+    Read-through cache in front of the prediction model
+
+    Storage errors are logged and treated as misses so a cache outage
+    never fails a prediction.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key, compute, ttl):
+        """
+        Return the cached value for key, or compute and store it
+
+        Args:
+            key (str): Key from feature_key()
+            compute: Zero-argument function producing the value
+            ttl (int): Seconds to keep the value; 0 skips storing
+
+        Returns:
+            tuple: (value, cache_hit)
+        """
+        try:
+            cached = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Prediction cache read failed: {str(e)}")
+            cached = None
+
+        if cached is not None:
+            self.hits += 1
+            return cached, True
+
+        self.misses += 1
+        value = compute()
+        if ttl > 0:
+            try:
+                self.backend.set(key, value, ttl)
+            except Exception as e:
+                logger.warning(f"Prediction cache write failed: {str(e)}")
+        return value, False
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'backend': self.backend.name,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_prediction_cache():
+    """
+    Return the process-wide prediction cache, or None when disabled
+
+    Config.PREDICTION_CACHE_BACKEND selects 'memory' (default), 'redis' or 'none'.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                name = Config.PREDICTION_CACHE_BACKEND
+                if name == 'none':
+                    return None
+                if name not in CACHE_BACKENDS:
+                    raise ValueError(f'Unknown prediction cache backend: {name}')
+                _cache = PredictionCache(CACHE_BACKENDS[name]())
+    return _cache
@@ -0,0 +1,190 @@
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from config import Config
+from app.ml.feature_engineering import FEATURE_VERSION
+from app.ml.numpy_model import NumpyMLP
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_NAME = 'bet_outcome'
+
+@dataclass
+class LoadedModel:
+    """
+    A model loaded into this process
+
+    Attributes:
+        name (str): Model name (artifact sub-directory)
+        version (str): Artifact version, 'untrained' when no artifact exists
+        model: The network, callable as model(x, training=False)
+        input_dim (int): Number of input features
+        metadata (dict): Contents of the artifact's metadata.json
+        load_seconds (float): Time spent loading and warming up
+    """
+    name: str
+    version: str
+    model: Any
+    input_dim: int
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    load_seconds: float = 0.0
+
+class ModelRegistry:
+    """
+    Process-wide registry of prediction models
+
+    Artifacts live in <MODEL_DIR>/<name>/<version>/ with a metadata.json
+    and the saved weights. Each model is loaded and warmed up once per
+    process, then shared by every caller. The NumPy export (weights.npz)
+    is served by default; Config.MODEL_BACKEND = 'keras' loads the Keras
+    weights. Every recheck_seconds the artifact directory is looked at
+    again, and a newer deployed version replaces the served one without a
+    restart; callers keep the old model while the new one loads.
+    """
+
+    def __init__(self, model_dir=None, recheck_seconds=None):
+        self.model_dir = model_dir or Config.MODEL_DIR
+        self.recheck_seconds = recheck_seconds if recheck_seconds is not None else Config.MODEL_RECHECK_SECONDS
+        self._models: Dict[str, LoadedModel] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name=DEFAULT_MODEL_NAME) -> LoadedModel:
+        """Return the loaded model, loading it on first use and swapping in newer artifacts"""
+        loaded = self._models.get(name)
+        if loaded is None:
+            with self._lock:
+                loaded = self._models.get(name)
+                if loaded is None:
+                    loaded = self._load(name)
+                    self._models[name] = loaded
+                    self._checked_at[name] = time.monotonic()
+        elif self.recheck_seconds and time.monotonic() - self._checked_at.get(name, 0.0) >= self.recheck_seconds:
+            loaded = self._recheck(name)
+        return loaded
+
+    def _recheck(self, name) -> LoadedModel:
+        """Load the latest version if it differs from the served one; one caller checks, the rest keep serving"""
+        if not self._lock.acquire(blocking=False):
+            return self._models[name]
+        try:
+            loaded = self._models[name]
+            if time.monotonic() - self._checked_at.get(name, 0.0) < self.recheck_seconds:
+                return loaded
+            self._checked_at[name] = time.monotonic()
+            latest = self.latest_version(name)
+            if latest is None or latest == loaded.version:
+                return loaded
+            try:
+                loaded = self._load(name, latest)
+            except Exception as e:
+                logger.error(f"Could not load model '{name}' {latest}, still serving {loaded.version}: {str(e)}")
+                return loaded
+            self._models[name] = loaded
+            return loaded
+        finally:
+            self._lock.release()
+
+    def reload(self, name=DEFAULT_MODEL_NAME) -> LoadedModel:
+        """Load the newest artifact again, replacing the cached one"""
+        loaded = self._load(name)
+        with self._lock:
+            self._models[name] = loaded
+            self._checked_at[name] = time.monotonic()
+        return loaded
+
+    def load(self, name=DEFAULT_MODEL_NAME, version=None) -> LoadedModel:
+        """Load a specific (or the newest) artifact without caching it, e.g. for evaluation"""
+        return self._load(name, version)
+
+    def latest_version(self, name=DEFAULT_MODEL_NAME) -> Optional[str]:
+        """
+        Return the version to serve
+
+        Config.BET_MODEL_VERSION pins a version; otherwise the lexically
+        greatest version directory wins (versions are UTC timestamps).
+        """
+        pinned = Config.BET_MODEL_VERSION
+        if pinned:
+            return pinned
+
+        model_path = os.path.join(self.model_dir, name)
+        if not os.path.isdir(model_path):
+            return None
+
+        versions = [
+            entry for entry in os.listdir(model_path)
+            if os.path.isfile(os.path.join(model_path, entry, 'metadata.json'))
+        ]
+        return max(versions) if versions else None
+
+    def artifact_path(self, name, version) -> str:
+        return os.path.join(self.model_dir, name, version)
+
+    def _load(self, name, version=None) -> LoadedModel:
+        started = time.perf_counter()
+        version = version or self.latest_version(name)
+        backend = Config.MODEL_BACKEND
+
+        from app.ml.model import LAYER_UNITS, LAYER_ACTIVATIONS
+
+        if version is None:
+            logger.warning(f"No trained artifact for '{name}' in {self.model_dir}, serving an untrained network")
+            metadata = {'version': 'untrained', 'input_dim': 10}
+            version = 'untrained'
+            if backend == 'keras':
+                from app.ml.model import build_model
+                model = build_model()
+            else:
+                model = NumpyMLP.initialize((10,) + LAYER_UNITS, LAYER_ACTIVATIONS)
+        else:
+            path = self.artifact_path(name, version)
+            if not os.path.isfile(os.path.join(path, 'metadata.json')):
+                pinned = ' (pinned by BET_MODEL_VERSION)' if version == Config.BET_MODEL_VERSION else ''
+                raise ValueError(f"No artifact for model '{name}' version {version}{pinned} in {self.model_dir}")
+            with open(os.path.join(path, 'metadata.json')) as metadata_file:
+                metadata = json.load(metadata_file)
+
+            numpy_weights = os.path.join(path, metadata.get('numpy_weights_file', 'weights.npz'))
+            if backend != 'keras' and os.path.exists(numpy_weights):
+                model = NumpyMLP.load(numpy_weights)
+            else:
+                # Keras is only needed when the artifact has no NumPy export
+                from app.ml.model import build_model
+                model = build_model(input_dim=metadata.get('input_dim', 10))
+                model.load_weights(os.path.join(path, metadata.get('weights_file', 'model.weights.h5')))
+
+        input_dim = metadata.get('input_dim', 10)
+        if version != 'untrained' and metadata.get('feature_version') != FEATURE_VERSION:
+            logger.warning(
+                f"Model '{name}' {version} was trained on feature layout {metadata.get('feature_version')}, "
+                f"serving encodes layout {FEATURE_VERSION}"
+            )
+
+        # The first call builds graph/kernels; pay for it here, not on a request
+        model(np.zeros((1, input_dim), dtype=np.float32), training=False)
+
+        loaded = LoadedModel(
+            name=name,
+            version=version,
+            model=model,
+            input_dim=input_dim,
+            metadata=metadata,
+            load_seconds=time.perf_counter() - started
+        )
+        logger.info(f"Loaded model '{name}' version {version} in {loaded.load_seconds:.2f}s")
+        return loaded
+
+# Shared instance for the process
+model_registry = ModelRegistry()
+
+def get_model(name=DEFAULT_MODEL_NAME) -> LoadedModel:
+    """Return the process-wide loaded model"""
+    return model_registry.get(name)
@@ -0,0 +1,117 @@
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from config import Config
+from app.ml.data_preprocessing import stream_settled_bets, settled_range
+from app.ml.feature_engineering import encode_bets, FEATURE_DIM, FEATURE_VERSION
+from app.ml.registry import DEFAULT_MODEL_NAME
+from app.ml.evaluation import EvaluationAccumulator
+from app.ml.odds import american_to_decimal, parse_odds
+
+logger = logging.getLogger(__name__)
+
+def _chunk_arrays(chunk):
+    features = encode_bets(chunk)
+    labels = np.array([row['label'] for row in chunk], dtype=np.int32)
+    return features, labels
+
+def evaluate_stream(model, session, settled_after, chunk_size):
+    """
+    Streaming holdout metrics: accuracy, log loss, Brier score and calibration
+
+    Only running sums are kept, so memory stays flat however large the
+    holdout window is.
+    """
+    accumulator = EvaluationAccumulator()
+    for chunk in stream_settled_bets(session, chunk_size=chunk_size, settled_after=settled_after):
+        features, labels = _chunk_arrays(chunk)
+        win_probability = np.asarray(model(features, training=False))[:, 1]
+        decimal = american_to_decimal(parse_odds([row['odds'] for row in chunk]))
+        accumulator.update(win_probability, labels, decimal)
+    return accumulator.results()
+
+def train_model(session, model_dir=None, holdout_days=30, epochs=5, batch_size=1024, chunk_size=50000, seed=42):
+    """
+    Train the bet outcome model from settled bets and write a versioned artifact
+
+    Bets settled in the last holdout_days (relative to the newest settled
+    bet) are held out for evaluation; everything earlier is streamed in
+    chunks for training. Each epoch re-streams the training rows, so peak
+    memory is one chunk plus the model.
+
+    Args:
+        session: SQLAlchemy session to read bets from
+        model_dir (str): Artifact root, defaults to MODEL_DIR
+        holdout_days (int): Size of the time-based holdout window
+        epochs (int): Passes over the training rows
+        batch_size (int): Rows per gradient step
+        chunk_size (int): Rows fetched from the database at a time
+        seed (int): Seed for shuffling and initialization
+
+    Returns:
+        dict: Artifact path, version and holdout metrics
+    """
+    from app.ml.model import build_model
+    from app.ml.numpy_model import export_keras_weights
+    import tensorflow as tf
+
+    earliest, latest, total = settled_range(session)
+    if not total:
+        raise ValueError('No settled bets to train on')
+
+    cutoff = latest - timedelta(days=holdout_days)
+    if cutoff <= earliest:
+        raise ValueError(f'Holdout window of {holdout_days} days leaves no training data')
+
+    tf.keras.utils.set_random_seed(seed)
+    rng = np.random.default_rng(seed)
+    model = build_model(input_dim=FEATURE_DIM)
+
+    train_rows = 0
+    for epoch in range(epochs):
+        train_rows = 0
+        losses = []
+        for chunk in stream_settled_bets(session, chunk_size=chunk_size, settled_before=cutoff):
+            features, labels = _chunk_arrays(chunk)
+            # Shuffle within the chunk; chunks arrive in time order
+            order = rng.permutation(len(labels))
+            features, labels = features[order], labels[order]
+            for start in range(0, len(labels), batch_size):
+                loss = model.train_on_batch(features[start:start + batch_size], labels[start:start + batch_size])
+                losses.append(loss[0] if isinstance(loss, (list, tuple)) else loss)
+            train_rows += len(labels)
+        logger.info(f"Epoch {epoch + 1}/{epochs}: {train_rows} rows, mean loss {np.mean(losses) if losses else float('nan'):.4f}")
+
+    holdout = evaluate_stream(model, session, cutoff, chunk_size)
+
+    version = datetime.utcnow().strftime('%Y%m%dT%H%M%S')
+    model_dir = model_dir or Config.MODEL_DIR
+    path = os.path.join(model_dir, DEFAULT_MODEL_NAME, version)
+    os.makedirs(path, exist_ok=True)
+
+    model.save_weights(os.path.join(path, 'model.weights.h5'))
+    export_keras_weights(model, os.path.join(path, 'weights.npz'))
+
+    metadata = {
+        'version': version,
+        'input_dim': FEATURE_DIM,
+        'feature_version': FEATURE_VERSION,
+        'weights_file': 'model.weights.h5',
+        'numpy_weights_file': 'weights.npz',
+        'trained_at': datetime.utcnow().isoformat(),
+        'train_rows': train_rows,
+        'holdout_cutoff': cutoff.isoformat(),
+        'holdout_days': holdout_days,
+        'epochs': epochs,
+        'batch_size': batch_size,
+        'holdout_metrics': holdout
+    }
+    with open(os.path.join(path, 'metadata.json'), 'w') as metadata_file:
+        json.dump(metadata, metadata_file, indent=2)
+
+    logger.info(f"Wrote artifact {path}: {holdout}")
+    return {'path': path, 'version': version, 'holdout_metrics': holdout}
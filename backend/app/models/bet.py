@@ -13,6 +13,7 @@ from sqlalchemy import (
 import enum
 from sqlalchemy.orm import relationship
 from app import db
+from app.utils.teams import resolve_team_id
 from sqlalchemy.exc import SQLAlchemyError
 
 # Enum for bet status
@@ -70,6 +71,7 @@ class BetLeg(db.Model):
     id = Column(Integer, primary_key=True)
     bet_id = Column(Integer, ForeignKey('bets.id'), nullable=False)
     team_name = Column(String(255))
+    team_id = Column(String(32))  # canonical id from app.utils.teams
     opponent_name = Column(String(255))
     sport_type = Column(String(50))
     bet_type = Column(String(50))
@@ -153,6 +155,7 @@ def create_bet(
             for leg_data in legs:
                 bet_leg = BetLeg(
                     team_name=leg_data.get('team_name'),
+                    team_id=leg_data.get('team_id') or resolve_team_id(leg_data.get('team_name'), leg_data.get('sport_type')),
                     opponent_name=leg_data.get('opponent_name'),
                     sport_type=leg_data.get('sport_type'),
                     bet_type=leg_data.get('bet_type'),
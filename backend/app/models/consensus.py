@@ -0,0 +1,66 @@
+from  app import db
+from datetime import datetime
+
+class EventConsensus(db.Model):
+    """
+    Community picks on one selection of one event, from Reddit and uploads
+
+    Keyed by normalized (event, selection) so a prediction's consensus is a
+    primary-key read. event_picks repeats the event's total on every row
+    so pick_share needs no second query.
+    """
+    __tablename__ = 'event_consensus'
+    __table_args__ = (
+        db.Index('ix_event_consensus_event_date', 'event_date'),
+    )
+
+    event_key = db.Column(db.String(255), primary_key=True)
+    selection_key = db.Column(db.String(255), primary_key=True)
+    sport = db.Column(db.String(50))
+    event_date = db.Column(db.DateTime)
+    picks = db.Column(db.Integer, nullable=False, default=0)
+    reddit_picks = db.Column(db.Integer, nullable=False, default=0)
+    upload_picks = db.Column(db.Integer, nullable=False, default=0)
+    stake_total = db.Column(db.Float, nullable=False, default=0.0)
+    # Stake-weighted sentiment: sum(weight * sentiment) / sum(weight) over picks with a sentiment
+    sentiment_sum = db.Column(db.Float, nullable=False, default=0.0)
+    sentiment_weight = db.Column(db.Float, nullable=False, default=0.0)
+    event_picks = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    @property
+    def pick_share(self):
+        return self.picks / self.event_picks if self.event_picks else None
+
+    @property
+    def sentiment(self):
+        return self.sentiment_sum / self.sentiment_weight if self.sentiment_weight else None
+
+    def to_dict(self):
+        """Convert model to dictionary."""
+        return {
+            'event_key': self.event_key,
+            'selection_key': self.selection_key,
+            'sport': self.sport,
+            'event_date': self.event_date.isoformat() if self.event_date else None,
+            'picks': self.picks,
+            'reddit_picks': self.reddit_picks,
+            'upload_picks': self.upload_picks,
+            'stake_total': self.stake_total,
+            'sentiment': self.sentiment,
+            'pick_share': self.pick_share
+        }
+
+    def __repr__(self):
+        return f'<EventConsensus {self.event_key} {self.selection_key} {self.picks}/{self.event_picks}>'
+
+class ConsensusWatermark(db.Model):
+    """Last source row folded into event_consensus, per source"""
+    __tablename__ = 'consensus_watermarks'
+
+    source = db.Column(db.String(20), primary_key=True)  # reddit_picks or bets
+    last_id = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ConsensusWatermark {self.source} {self.last_id}>'
@@ -1,6 +1,20 @@
 
 from  app import db
 from datetime import datetime
+from sqlalchemy import func, literal_column
+
+SEARCH_LANGUAGE = 'english'
+
+def search_language():
+    """Text search configuration as an inline regconfig literal (index expressions cannot take parameters)"""
+    return literal_column(f"'{SEARCH_LANGUAGE}'::regconfig")
+
+def search_document(question, answer):
+    """Postgres tsvector of an FAQ, questions weighted above answers"""
+    language, empty = search_language(), literal_column("''")
+    return func.setweight(func.to_tsvector(language, func.coalesce(question, empty)), literal_column("'A'")).op('||')(
+        func.setweight(func.to_tsvector(language, func.coalesce(answer, empty)), literal_column("'B'"))
+    )
 
 class FAQCategory(db.Model):
     """FAQ Category model"""
@@ -31,10 +45,20 @@ class FAQ(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # Full-text search; the query builds the same expression so @@ is a GIN lookup
+        db.Index('ix_faqs_search_document', search_document(question, answer), postgresql_using='gin')
+        .ddl_if(dialect='postgresql'),
+    )
+    
     def __repr__(self):
         return f'<FAQ {self.question[:30]}...>'
         
     def increment_view_count(self):
-        """Increment the view count of this FAQ"""
-        self.view_count += 1
-        db.session.commit()
\ No newline at end of file
+        """Count a view of this FAQ; buffered and written in batches by services.faq_views"""
+        from  app.services.faq_views import faq_views
+        faq_views.record(self.id)
+
+def faq_document():
+    """Search document expression matching the ix_faqs_search_document index"""
+    return search_document(FAQ.__table__.c.question, FAQ.__table__.c.answer)
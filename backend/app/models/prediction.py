@@ -1,12 +1,18 @@
 
 # models/prediction.py
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from  app import db
 
 class Prediction(db.Model):
     __tablename__ = 'predictions'
+    __table_args__ = (
+        # Served reads: upcoming active predictions, optionally by sport, ordered by start
+        Index('ix_predictions_status_event_date', 'status', 'event_date'),
+        Index('ix_predictions_sport_status_event_date', 'sport', 'status', 'event_date'),
+        Index('ix_predictions_status_expected_value', 'status', 'expected_value'),
+    )
     
     id = Column(Integer, primary_key=True)
     event_name = Column(String(255), nullable=False)
@@ -23,8 +29,34 @@ class Prediction(db.Model):
     is_featured = Column(Boolean, default=False)
     is_clutch_pick = Column(Boolean, default=False)
     
+    # Written by the score-predictions job
+    win_probability = Column(Float)
+    expected_value = Column(Float)
+    model_version = Column(String(50))
+    scored_at = Column(DateTime)
+    
     # Relationships
     bets = relationship("Bet", back_populates="prediction")
     
     def __repr__(self):
-        return f"<Prediction(id={self.id}, event='{self.event_name}', selection='{self.selection}')>"
\ No newline at end of file
+        return f"<Prediction(id={self.id}, event='{self.event_name}', selection='{self.selection}')>"
+    
+    def to_dict(self):
+        """Convert model to dictionary."""
+        return {
+            'id': self.id,
+            'event_name': self.event_name,
+            'event_date': self.event_date.isoformat() if self.event_date else None,
+            'sport': self.sport,
+            'market_type': self.market_type,
+            'selection': self.selection,
+            'odds': self.odds,
+            'win_probability': self.win_probability,
+            'expected_value': self.expected_value,
+            'confidence': self.confidence,
+            'model_version': self.model_version,
+            'scored_at': self.scored_at.isoformat() if self.scored_at else None,
+            'status': self.status,
+            'is_featured': self.is_featured,
+            'is_clutch_pick': self.is_clutch_pick
+        }
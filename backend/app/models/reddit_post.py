@@ -0,0 +1,122 @@
+from  app import db
+from datetime import datetime
+
+class RedditPostRecord(db.Model):
+    """Reddit post ingested by the scraper, upserted by reddit id"""
+    __tablename__ = 'reddit_posts'
+    __table_args__ = (
+        db.Index('ix_reddit_posts_subreddit_created_utc', 'subreddit', 'created_utc'),
+    )
+
+    id = db.Column(db.String(16), primary_key=True)  # base36 reddit id
+    subreddit = db.Column(db.String(50), nullable=False)
+    title = db.Column(db.Text, nullable=False)
+    text = db.Column(db.Text)
+    url = db.Column(db.String(512))
+    author = db.Column(db.String(50))
+    created_utc = db.Column(db.Float, nullable=False)
+    score = db.Column(db.Integer, default=0)
+    num_comments = db.Column(db.Integer, default=0)
+    sport = db.Column(db.String(50))
+    sentiment_score = db.Column(db.Float)
+    bet_info = db.Column(db.JSON)
+    fetched_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<RedditPostRecord {self.id} r/{self.subreddit}>'
+
+class RedditWatermark(db.Model):
+    """Newest post seen per subreddit; the next run only fetches posts after it"""
+    __tablename__ = 'reddit_watermarks'
+
+    subreddit = db.Column(db.String(50), primary_key=True)
+    last_fullname = db.Column(db.String(20), nullable=False)  # t3_<id>
+    last_created_utc = db.Column(db.Float, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<RedditWatermark r/{self.subreddit} {self.last_fullname}>'
+
+class RedditPick(db.Model):
+    """Pick extracted from a Reddit comment, deduplicated by pick_hash"""
+    __tablename__ = 'reddit_picks'
+    __table_args__ = (
+        db.Index('ix_reddit_picks_submission_id', 'submission_id'),
+        db.Index('ix_reddit_picks_created_utc', 'created_utc'),
+        db.Index('ix_reddit_picks_outcome_id', 'outcome', 'id'),
+        db.Index('ix_reddit_picks_team_id', 'team_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    # sha1 of author, thread, team, bet type and line; one row per distinct pick
+    pick_hash = db.Column(db.String(40), nullable=False, unique=True)
+    comment_id = db.Column(db.String(16), nullable=False)
+    submission_id = db.Column(db.String(16), nullable=False)
+    subreddit = db.Column(db.String(50), nullable=False)
+    author = db.Column(db.String(50))
+    team = db.Column(db.String(255))
+    team_id = db.Column(db.String(32))  # canonical id from app.utils.teams
+    bet_type = db.Column(db.String(50))
+    odds = db.Column(db.Float)
+    stake = db.Column(db.Float)
+    sentiment_score = db.Column(db.Float)
+    comment_score = db.Column(db.Integer, default=0)
+    created_utc = db.Column(db.Float, nullable=False)
+    fetched_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Set by the tipster settlement job: win, loss, push, unmatched or ungraded (spread/total picks)
+    outcome = db.Column(db.String(20))
+    prediction_id = db.Column(db.Integer)
+    settled_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<RedditPick {self.bet_type} {self.team} {self.odds}>'
+
+class TipsterStats(db.Model):
+    """Running track record of a Reddit author, keyed by author for O(1) lookups"""
+    __tablename__ = 'tipster_stats'
+
+    # Win rate is shrunk toward 50% by this many pseudo-picks
+    PRIOR_PICKS = 20
+
+    author = db.Column(db.String(50), primary_key=True)
+    wins = db.Column(db.Integer, nullable=False, default=0)
+    losses = db.Column(db.Integer, nullable=False, default=0)
+    pushes = db.Column(db.Integer, nullable=False, default=0)
+    units_profit = db.Column(db.Float, nullable=False, default=0.0)  # flat one-unit stakes
+    last_settled_utc = db.Column(db.Float)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    @property
+    def sample_size(self):
+        return self.wins + self.losses + self.pushes
+
+    @property
+    def win_rate(self):
+        decided = self.wins + self.losses
+        return self.wins / decided if decided else None
+
+    @property
+    def roi(self):
+        return self.units_profit / self.sample_size if self.sample_size else None
+
+    @property
+    def weighted_win_rate(self):
+        """Win rate shrunk toward 0.5, so small samples carry little weight"""
+        return (self.wins + 0.5 * self.PRIOR_PICKS) / (self.wins + self.losses + self.PRIOR_PICKS)
+
+    def to_dict(self):
+        """Convert model to dictionary."""
+        return {
+            'author': self.author,
+            'wins': self.wins,
+            'losses': self.losses,
+            'pushes': self.pushes,
+            'sample_size': self.sample_size,
+            'win_rate': self.win_rate,
+            'roi': self.roi,
+            'weighted_win_rate': self.weighted_win_rate
+        }
+
+    def __repr__(self):
+        return f'<TipsterStats {self.author} {self.wins}-{self.losses}>'
@@ -0,0 +1,84 @@
+# File: app/scripts/benchmark_batching.py
+"""
+Throughput vs latency of micro-batched inference.
+
+Runs the same number of concurrent single-row requests through direct
+per-row forward passes and through MicroBatcher at several batch
+sizes / wait windows.
+
+Usage (from backend/):
+    python -m app.scripts.benchmark_batching --clients 32 --requests 2000
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+
+import numpy as np
+
+from app.ml.batching import MicroBatcher
+from app.ml.registry import get_model
+
+def run_clients(predict_one, clients, requests, input_dim):
+    """Fire requests from concurrent client threads; return latencies and wall time"""
+    latencies = []
+    lock = threading.Lock()
+    per_client = requests // clients
+    row = np.random.rand(input_dim).astype(np.float32)
+    
+    def client():
+        local = []
+        for _ in range(per_client):
+            started = time.perf_counter()
+            predict_one(row)
+            local.append((time.perf_counter() - started) * 1000)
+        with lock:
+            latencies.extend(local)
+    
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, time.perf_counter() - started
+
+def summarize(label, latencies, elapsed):
+    latencies.sort()
+    return {
+        'mode': label,
+        'requests': len(latencies),
+        'rows_per_second': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(statistics.median(latencies), 2),
+        'p99_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], 2)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark micro-batched inference')
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[8, 32, 128])
+    parser.add_argument('--wait-ms', type=float, nargs='+', default=[1, 5, 20])
+    args = parser.parse_args()
+    
+    loaded = get_model()
+    model = loaded.model
+    
+    def forward(batch):
+        return np.asarray(model(batch, training=False))
+    
+    latencies, elapsed = run_clients(
+        lambda row: forward(row.reshape(1, -1)), args.clients, args.requests, loaded.input_dim
+    )
+    print(json.dumps(summarize('direct', latencies, elapsed)))
+    
+    for batch_size in args.batch_sizes:
+        for wait_ms in args.wait_ms:
+            batcher = MicroBatcher(forward, max_batch_size=batch_size, max_wait_ms=wait_ms)
+            latencies, elapsed = run_clients(batcher.predict, args.clients, args.requests, loaded.input_dim)
+            batcher.close()
+            print(json.dumps(summarize(f'batched(b={batch_size},wait={wait_ms}ms)', latencies, elapsed)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+# File: app/scripts/benchmark_extraction.py
+"""
+Reddit post extraction: regex cost and process-pool throughput.
+
+Patterns
+  Times the old spread/moneyline patterns against BET_PATTERNS on
+  pathological text (long runs of words with no line after them, where
+  the old ([A-Za-z\\s]+)\\s* prefix is quadratic) and on large normal posts.
+
+Stage
+  Pushes generated posts through ExtractionStage inline (workers=0) and
+  with worker processes, reporting posts/second.
+
+Usage (from backend/):
+    python -m app.scripts.benchmark_extraction --posts 5000 --workers 4
+"""
+import argparse
+import json
+import random
+import re
+import time
+
+from app.services.reddit_scraper import BET_PATTERNS, ExtractionStage, RedditScraper
+
+LEGACY_PATTERNS = {
+    'spread': re.compile(r'([A-Za-z\s]+)\s*([-+]\d+\.?\d*)\s*(?:points?)?'),
+    'moneyline': re.compile(r'([A-Za-z\s]+)\s+ML\s*([-+]\d+)'),
+}
+
+PICKS = ('Lakers -5.5', 'Celtics ML -150', 'over 220.5', 'Yankees +1.5', 'Chiefs ML +120', 'under 47')
+
+def pathological_texts(sizes):
+    """Texts with long word runs and no line to end a match"""
+    for size in sizes:
+        yield f'words-{size}', ('lock of the day ' * size)[:size]
+        yield f'ml-bait-{size}', ('Lakers ML ' * size)[:size]
+
+def large_post(rng, paragraphs=40):
+    """Write-up sized post: prose with a pick every few sentences"""
+    sentences = []
+    for _ in range(paragraphs * 5):
+        sentences.append(' '.join(rng.choice(('the', 'line', 'value', 'sharp', 'money', 'home', 'team', 'public'))
+                                  for _ in range(rng.randint(8, 20))))
+        if rng.random() < 0.3:
+            sentences.append(rng.choice(PICKS))
+    return '. '.join(sentences)
+
+def time_patterns(patterns, text, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for pattern in patterns.values():
+            for _ in pattern.finditer(text):
+                pass
+    return (time.perf_counter() - started) / repeat
+
+def bench_patterns(sizes, posts, rng):
+    rows = []
+    for name, text in pathological_texts(sizes):
+        rows.append({
+            'text': name,
+            'legacy_ms': round(time_patterns(LEGACY_PATTERNS, text, 1) * 1000, 2),
+            'linear_ms': round(time_patterns({key: BET_PATTERNS[key] for key in LEGACY_PATTERNS}, text, 5) * 1000, 2)
+        })
+    text = '\n\n'.join(large_post(rng) for _ in range(posts))
+    rows.append({
+        'text': f'large-posts-{len(text)}',
+        'legacy_ms': round(time_patterns(LEGACY_PATTERNS, text, 1) * 1000, 2),
+        'linear_ms': round(time_patterns({key: BET_PATTERNS[key] for key in LEGACY_PATTERNS}, text, 1) * 1000, 2)
+    })
+    return rows
+
+def bench_stage(count, workers, rng):
+    subreddits_by_sport = RedditScraper(reddit=object()).subreddits_by_sport
+    fields = [
+        {
+            'id': str(index), 'title': rng.choice(PICKS), 'text': large_post(rng, paragraphs=4),
+            'url': '', 'subreddit': 'sportsbook', 'author': 'bench', 'created_utc': time.time(),
+            'score': 1, 'num_comments': 0
+        }
+        for index in range(count)
+    ]
+    rows = []
+    for worker_count in sorted({0, workers}):
+        started = time.perf_counter()
+        with ExtractionStage(subreddits_by_sport, workers=worker_count) as stage:
+            for row in fields:
+                stage.put(row)
+        elapsed = time.perf_counter() - started
+        rows.append({
+            'workers': worker_count, 'posts': len(stage.results), 'seconds': round(elapsed, 2),
+            'posts_per_second': round(len(stage.results) / elapsed, 1)
+        })
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Reddit bet extraction')
+    parser.add_argument('--sizes', default='2000,8000,16000', help='Pathological text lengths (legacy is quadratic)')
+    parser.add_argument('--large-posts', type=int, default=20, help='Large posts concatenated for the pattern run')
+    parser.add_argument('--posts', type=int, default=5000, help='Posts pushed through the extraction stage')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for row in bench_patterns([int(size) for size in args.sizes.split(',')], args.large_posts, rng):
+        print(json.dumps({'bench': 'patterns', **row}))
+    for row in bench_stage(args.posts, args.workers, rng):
+        print(json.dumps({'bench': 'stage', **row}))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# File: app/scripts/benchmark_features.py
+"""
+Rows/sec of the shared FeatureEncoder.
+
+Compares the columnar encoder on lists of dicts (and a DataFrame when
+pandas is installed) with a per-row loop equivalent to the old
+process_features implementation.
+
+Usage (from backend/):
+    python -m app.scripts.benchmark_features --rows 200000
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from app.ml.feature_engineering import FeatureEncoder, FEATURE_DIM
+
+SPORTS = ['Basketball', 'Soccer', 'Baseball', 'Football', 'Hockey', 'Unknown']
+BET_TYPES = ['Moneyline', 'Spread', 'Over/Under', 'Prop', 'Parlay', 'Unknown']
+
+def synthetic_bets(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    odds = rng.choice([-250, -150, -110, 100, 120, 150, 300, 550], size=rows)
+    return [
+        {
+            'odds': int(odds[i]),
+            'sport': SPORTS[i % len(SPORTS)],
+            'bet_type': BET_TYPES[(i * 7) % len(BET_TYPES)],
+            'sentiment_score': float(rng.uniform(-1, 1)),
+            'leg_count': int(rng.integers(0, 6))
+        }
+        for i in range(rows)
+    ]
+
+def per_row(records):
+    """Row-at-a-time encoding in the style of the old process_features"""
+    sport_index = {'basketball': 1, 'soccer': 2, 'baseball': 3}
+    bet_type_index = {'moneyline': 1, 'spread': 2, 'over_under': 3, 'prop': 4, 'parlay': 5}
+    out = []
+    for record in records:
+        feature_array = np.zeros(FEATURE_DIM)
+        feature_array[0] = min(record['odds'] / 1000, 1.0)
+        feature_array[1] = sport_index.get(record['sport'].lower(), 0) / 3
+        feature_array[2] = bet_type_index.get(record['bet_type'].lower(), 0) / 5
+        feature_array[3] = (record['sentiment_score'] + 1) / 2
+        out.append(feature_array)
+    return np.array(out)
+
+def timed(label, func, data, rows):
+    started = time.perf_counter()
+    func(data)
+    elapsed = time.perf_counter() - started
+    return {'encoder': label, 'rows': rows, 'rows_per_second': round(rows / elapsed)}
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark feature encoding throughput')
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+    
+    records = synthetic_bets(args.rows)
+    encoder = FeatureEncoder()
+    
+    print(json.dumps(timed('per_row', per_row, records, args.rows)))
+    print(json.dumps(timed('columnar_dicts', encoder.encode, records, args.rows)))
+    
+    try:
+        import pandas as pd
+    except ImportError:
+        return
+    print(json.dumps(timed('columnar_dataframe', encoder.encode, pd.DataFrame(records), args.rows)))
+
+if __name__ == '__main__':
+    main()
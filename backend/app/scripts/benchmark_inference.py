@@ -0,0 +1,68 @@
+# File: app/scripts/benchmark_inference.py
+"""
+Per-prediction latency and process RSS for the bet outcome model.
+
+--mode legacy rebuilds the network on every call (the old load_model()
+behaviour); --mode registry uses the shared, warmed-up model.
+
+Usage (from backend/):
+    python -m app.scripts.benchmark_inference --mode legacy --calls 50
+    python -m app.scripts.benchmark_inference --mode registry --calls 500
+"""
+import argparse
+import json
+import resource
+import statistics
+import time
+
+SAMPLE_BET = {'odds': -110, 'sport': 'basketball', 'bet_type': 'spread', 'sentiment_score': 0.2}
+
+def current_rss_mb():
+    """Resident set size of this process, from /proc when available"""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark bet outcome inference')
+    parser.add_argument('--mode', choices=['legacy', 'registry'], default='registry')
+    parser.add_argument('--calls', type=int, default=200)
+    args = parser.parse_args()
+    
+    rss_start = current_rss_mb()
+    import_started = time.perf_counter()
+    from app.ml.model import build_model, predict
+    from app.ml.registry import get_model
+    import_seconds = time.perf_counter() - import_started
+    
+    if args.mode == 'legacy':
+        get_model_for_call = build_model
+    else:
+        get_model()
+        get_model_for_call = lambda: get_model().model
+    
+    latencies = []
+    for _ in range(args.calls):
+        started = time.perf_counter()
+        predict(get_model_for_call(), SAMPLE_BET)
+        latencies.append((time.perf_counter() - started) * 1000)
+    
+    latencies.sort()
+    print(json.dumps({
+        'mode': args.mode,
+        'calls': args.calls,
+        'import_seconds': round(import_seconds, 2),
+        'p50_ms': round(statistics.median(latencies), 2),
+        'p99_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], 2),
+        'rss_start_mb': round(rss_start, 1),
+        'rss_end_mb': round(current_rss_mb(), 1),
+        'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }))
+
+if __name__ == '__main__':
+    main()
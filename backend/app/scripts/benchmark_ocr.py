@@ -0,0 +1,107 @@
+# File: app/scripts/benchmark_ocr.py
+"""
+Benchmark OCR backends for latency and accuracy on a fixture set of slips.
+
+Slip screenshots hold account details, so no fixture set ships with the
+repo; point the benchmark at a local directory where each fixture is an
+image plus a JSON file with the same stem holding the expected
+extraction, e.g. slips/draftkings_parlay.png and slips/draftkings_parlay.json:
+
+    {"text": "...", "teams": ["Lakers", "Celtics"], "odds": ["-110"], "amount": "$25.00"}
+
+Usage (from backend/):
+    python -m app.scripts.benchmark_ocr path/to/slips --backends vision tesseract
+"""
+import argparse
+import difflib
+import glob
+import json
+import os
+import statistics
+import time
+
+from app.services.ocr_service import get_ocr_backend, preprocess_image, extract_bet_info
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+def load_fixtures(fixture_dir):
+    """Load (name, image bytes, expected dict) for every image with a JSON sidecar"""
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(fixture_dir, '*'))):
+        stem, extension = os.path.splitext(path)
+        if extension.lower() not in IMAGE_EXTENSIONS or not os.path.exists(stem + '.json'):
+            continue
+        with open(path, 'rb') as image_file, open(stem + '.json') as expected_file:
+            fixtures.append((os.path.basename(stem), image_file.read(), json.load(expected_file)))
+    return fixtures
+
+def field_accuracy(expected, actual):
+    """Share of expected fields (teams, odds, amount) that were extracted exactly"""
+    checked = 0
+    correct = 0
+    for field in ('teams', 'odds', 'amount'):
+        if field not in expected:
+            continue
+        checked += 1
+        if field == 'amount':
+            correct += int(expected[field] == actual.get(field))
+        else:
+            correct += int(set(expected[field]) <= set(actual.get(field) or []))
+    return correct / checked if checked else None
+
+def benchmark_backend(name, fixtures, preprocess=True, repeat=1):
+    """Run one backend over every fixture and summarize latency and accuracy"""
+    backend = get_ocr_backend(name)
+    latencies = []
+    text_scores = []
+    field_scores = []
+    
+    for fixture_name, content, expected in fixtures:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            image = preprocess_image(content) if preprocess else content
+            output = backend.detect_text(image)
+            latencies.append((time.perf_counter() - started) * 1000)
+        
+        actual = extract_bet_info(output)
+        if 'text' in expected:
+            text_scores.append(difflib.SequenceMatcher(None, expected['text'], actual.get('text', '')).ratio())
+        score = field_accuracy(expected, actual)
+        if score is not None:
+            field_scores.append(score)
+    
+    latencies.sort()
+    return {
+        'backend': name,
+        'fixtures': len(fixtures),
+        'p50_ms': round(statistics.median(latencies), 1),
+        'p95_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 1),
+        'mean_ms': round(statistics.mean(latencies), 1),
+        'text_similarity': round(statistics.mean(text_scores), 3) if text_scores else None,
+        'field_accuracy': round(statistics.mean(field_scores), 3) if field_scores else None
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark OCR backends on slip fixtures')
+    parser.add_argument('fixtures', help='Directory of slip images + JSON expectations')
+    parser.add_argument('--backends', nargs='+', default=['vision', 'tesseract'])
+    parser.add_argument('--repeat', type=int, default=1, help='OCR runs per fixture for latency')
+    parser.add_argument('--no-preprocess', action='store_true', help='Send the original image bytes')
+    args = parser.parse_args()
+    
+    if not os.path.isdir(args.fixtures):
+        parser.error(f'Fixture directory {args.fixtures} does not exist')
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        parser.error(f'No fixtures found in {args.fixtures}: expected images (.png, .jpg, .jpeg) with .json sidecars')
+    
+    for name in args.backends:
+        try:
+            result = benchmark_backend(name, fixtures, preprocess=not args.no_preprocess, repeat=args.repeat)
+        except RuntimeError as e:
+            print(f"{name}: skipped ({e})")
+            continue
+        print(json.dumps(result))
+
+if __name__ == '__main__':
+    main()
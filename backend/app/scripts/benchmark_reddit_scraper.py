@@ -0,0 +1,184 @@
+# File: app/scripts/benchmark_reddit_scraper.py
+"""
+Reddit scraping throughput against a local mock server.
+
+The mock serves /r/<sub>/new.json and /r/<sub>/hot.json listings with
+per-request latency and Reddit-style rate-limit headers, answering 429
+once the window's quota is spent. It compares:
+
+  threaded   ThreadPoolExecutor(5) + requests, hot and new read in full
+             then filtered (the old scrape_latest_posts pattern)
+  asyncio    AsyncRedditScraper: token bucket, streamed listings
+
+Usage (from backend/):
+    python -m app.scripts.benchmark_reddit_scraper --posts 600 --latency-ms 50
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import aiohttp
+from aiohttp import web
+import requests
+
+from app.services.reddit_async import AsyncRedditClient, AsyncRedditScraper, TokenBucket
+from app.services.reddit_scraper import RedditScraper
+
+# Typed app key on aiohttp 3.9+; the pinned 3.8 only has string keys
+MOCK_STATE = web.AppKey('state', dict) if hasattr(web, 'AppKey') else 'state'
+
+def create_mock_app(subreddits, posts_per_subreddit=600, latency_ms=50, quota=300, window_seconds=10, now=None):
+    """
+    aiohttp application imitating Reddit listings
+
+    Posts are one minute apart, newest first, and every title carries a
+    moneyline pick so extraction does real work.
+    """
+    now = now or time.time()
+    listings = {
+        name: [
+            {
+                'id': f'{name}{index}',
+                'name': f't3_{name}{index}',
+                'title': f'Lakers ML -{110 + index % 50} pick {index}',
+                'selftext': '',
+                'url': f'https://reddit.com/{name}/{index}',
+                'author': 'mock',
+                'created_utc': now - index * 60,
+                'score': index % 100,
+                'num_comments': index % 20
+            }
+            for index in range(posts_per_subreddit)
+        ]
+        for name in subreddits
+    }
+    state = {'window_start': time.monotonic(), 'used': 0, 'requests': 0, 'throttled': 0}
+
+    async def listing(request):
+        await asyncio.sleep(latency_ms / 1000)
+        state['requests'] += 1
+
+        elapsed = time.monotonic() - state['window_start']
+        if elapsed >= window_seconds:
+            state['window_start'] = time.monotonic()
+            state['used'] = 0
+            elapsed = 0
+        reset = max(window_seconds - elapsed, 0)
+        if state['used'] >= quota:
+            state['throttled'] += 1
+            return web.json_response({'error': 429}, status=429, headers={
+                'Retry-After': f'{reset:.0f}',
+                'X-Ratelimit-Remaining': '0',
+                'X-Ratelimit-Reset': f'{reset:.0f}'
+            })
+        state['used'] += 1
+
+        posts = listings.get(request.match_info['subreddit'], [])
+        limit = int(request.query.get('limit', 25))
+        start = 0
+        after = request.query.get('after')
+        if after:
+            start = next((i + 1 for i, post in enumerate(posts) if post['name'] == after), len(posts))
+        page = posts[start:start + limit]
+        return web.json_response(
+            {'data': {
+                'children': [{'kind': 't3', 'data': post} for post in page],
+                'after': page[-1]['name'] if start + limit < len(posts) and page else None
+            }},
+            headers={
+                'X-Ratelimit-Used': str(state['used']),
+                'X-Ratelimit-Remaining': str(quota - state['used']),
+                'X-Ratelimit-Reset': f'{reset:.0f}'
+            }
+        )
+
+    app = web.Application()
+    app.router.add_get('/r/{subreddit}/{sort}.json', listing)
+    app[MOCK_STATE] = state
+    return app
+
+def run_threaded(base_url, subreddits, hours_back, limit):
+    """Old pattern: 5 threads, hot + new fully listed, then filtered"""
+    threshold = time.time() - hours_back * 3600
+
+    def fetch_all(name, sort):
+        posts, after = [], None
+        while len(posts) < limit:
+            params = {'limit': 100}
+            if after:
+                params['after'] = after
+            response = requests.get(f'{base_url}/r/{name}/{sort}.json', params=params)
+            if response.status_code == 429:
+                time.sleep(float(response.headers.get('Retry-After', 1)))
+                continue
+            data = response.json()['data']
+            posts.extend(child['data'] for child in data['children'])
+            after = data['after']
+            if not after:
+                break
+        return posts
+
+    def scrape(name):
+        posts = fetch_all(name, 'hot') + fetch_all(name, 'new')
+        return [post for post in {post['id']: post for post in posts}.values() if post['created_utc'] >= threshold]
+
+    kept = 0
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        for future in as_completed([executor.submit(scrape, name) for name in subreddits]):
+            kept += len(future.result())
+    return kept
+
+async def run_async(base_url, hours_back, limit, concurrency):
+    async with aiohttp.ClientSession() as session:
+        client = AsyncRedditClient(session, base_url=base_url, bucket=TokenBucket(rate=50, capacity=50))
+        scraper = AsyncRedditScraper(client, concurrency=concurrency)
+        posts = await scraper.scrape(hours_back=hours_back, limit=limit)
+        return len(posts), client.requests, client.throttled
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Reddit scraping against a mock server')
+    parser.add_argument('--posts', type=int, default=600, help='Posts per subreddit on the mock')
+    parser.add_argument('--hours-back', type=float, default=4)
+    parser.add_argument('--limit', type=int, default=500, help='Most posts read per subreddit')
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--quota', type=int, default=300, help='Requests allowed per window')
+    parser.add_argument('--window', type=float, default=10, help='Rate-limit window in seconds')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    subreddits = RedditScraper(reddit=object()).subreddits
+    app = create_mock_app(subreddits, args.posts, args.latency_ms, args.quota, args.window)
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(app)
+    loop.run_until_complete(runner.setup())
+    loop.run_until_complete(web.TCPSite(runner, '127.0.0.1', args.port).start())
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{args.port}'
+    state = app[MOCK_STATE]
+
+    started = time.perf_counter()
+    requests_before = state['requests']
+    kept = run_threaded(base_url, subreddits, args.hours_back, args.limit)
+    elapsed = time.perf_counter() - started
+    print(json.dumps({
+        'scraper': 'threaded', 'posts_in_window': kept, 'requests': state['requests'] - requests_before,
+        'seconds': round(elapsed, 2), 'posts_per_second': round(kept / elapsed, 1)
+    }))
+
+    time.sleep(args.window)  # start the async run with a fresh quota
+    started = time.perf_counter()
+    kept, sent, throttled = asyncio.run(run_async(base_url, args.hours_back, args.limit, args.concurrency))
+    elapsed = time.perf_counter() - started
+    print(json.dumps({
+        'scraper': 'asyncio', 'posts_with_bets': kept, 'requests': sent, 'throttled': throttled,
+        'seconds': round(elapsed, 2), 'posts_per_second': round(kept / elapsed, 1)
+    }))
+
+    loop.call_soon_threadsafe(loop.stop)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# File: app/scripts/benchmark_slip_templates.py
+"""
+Accuracy and throughput of template parsing vs the generic regex extractors.
+
+Fixtures are JSON files holding a recorded OCR result and the expected
+extraction (see tests/fixtures/slip_layouts/).
+
+Usage (from backend/):
+    python -m app.scripts.benchmark_slip_templates --iterations 2000
+"""
+import argparse
+import glob
+import json
+import os
+import time
+
+from app.services.ocr_service import OCRService
+from app.services.slip_templates import parse_slip
+
+DEFAULT_FIXTURE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'tests', 'fixtures', 'slip_layouts')
+
+def load_fixtures(fixture_dir):
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(fixture_dir, '*.json'))):
+        with open(path) as fixture_file:
+            fixtures.append((os.path.basename(path), json.load(fixture_file)))
+    return fixtures
+
+def regex_parse(text, words):
+    """The pre-template extraction, for comparison"""
+    return {
+        'odds': OCRService.extract_odds(text),
+        'amount': OCRService.extract_amount(text),
+        'legs': []
+    }
+
+def score(expected, actual):
+    """Fraction of expected fields (odds, amount, payout, legs) extracted exactly"""
+    checks = [
+        actual.get('odds') == expected['odds'],
+        actual.get('amount') == expected['amount'],
+        actual.get('payout') == expected.get('payout'),
+        [(leg['selection'], leg['odds']) for leg in actual.get('legs') or []]
+        == [(leg['selection'], leg['odds']) for leg in expected['legs']]
+    ]
+    return sum(checks) / len(checks)
+
+def run(parser, fixtures, iterations):
+    accuracy = sum(
+        score(fixture['expected'], parser(fixture['ocr']['text'], fixture['ocr']['words']) or {})
+        for _, fixture in fixtures
+    ) / len(fixtures)
+    
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for _, fixture in fixtures:
+            parser(fixture['ocr']['text'], fixture['ocr']['words'])
+    elapsed = time.perf_counter() - started
+    
+    return {
+        'accuracy': round(accuracy, 3),
+        'slips_per_second': round(iterations * len(fixtures) / elapsed, 1)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark sportsbook slip templates')
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURE_DIR)
+    parser.add_argument('--iterations', type=int, default=1000)
+    args = parser.parse_args()
+    
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        parser.error(f'No fixtures found in {args.fixtures}')
+    
+    print(json.dumps({'parser': 'template', 'fixtures': len(fixtures), **run(parse_slip, fixtures, args.iterations)}))
+    print(json.dumps({'parser': 'regex', 'fixtures': len(fixtures), **run(regex_parse, fixtures, args.iterations)}))
+
+if __name__ == '__main__':
+    main()
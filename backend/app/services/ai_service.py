@@ -2,8 +2,13 @@
 # services/ai_service.py (AI model predictions)
 
 import numpy as np
+from  app import db
 from  app.ml.BetPredictionModel import BetPredictionModel
-from  app.ml.evaluation import calculate_ev  
+from  app.ml.odds import american_to_decimal, expected_value
+from  app.ml.feature_engineering import count_legs, parse_american_odds
+from  app.ml.prediction_cache import get_prediction_cache, feature_key, ttl_until
+from  app.ml.registry import get_model
+from  app.services.consensus_service import upload_consensus
 
 bet_model = BetPredictionModel()
 
@@ -11,14 +16,31 @@ def predict_bet(bet_data):
     """
     Generate predictions for a bet using the AI model
     Calculate EV and provide recommendations
+    
+    Results are cached by feature hash and model version until the event
+    starts, so the same pick uploaded by many users is predicted once.
     """
     features = prepare_features(bet_data)
+    odds = bet_data['odds'][0] if bet_data.get('odds') else None
+    
+    cache = get_prediction_cache()
+    if cache is None:
+        return _predict_bet(bet_data, features, odds)
     
-    win_probability = bet_model.predict_probability(features)
+    key = feature_key(features, odds, get_model(bet_model.model_name).version)
+    result, _ = cache.get_or_compute(
+        key,
+        lambda: _predict_bet(bet_data, features, odds),
+        ttl_until(bet_data.get('event_date'))
+    )
+    return result
+
+def _predict_bet(bet_data, features, odds):
+    win_probability, confidence = bet_model.predict_with_confidence(features)
     
-    ev_value = calculate_ev(
-        win_probability, 
-        convert_odds_to_decimal(bet_data['odds'][0]) if bet_data['odds'] else 2.0
+    ev_value = expected_value(
+        win_probability,
+        convert_odds_to_decimal(odds) if odds else 2.0
     )
     
     recommendation = "Strong Bet" if ev_value > 0.15 else \
@@ -32,59 +54,33 @@ def predict_bet(bet_data):
         'ev_value': float(ev_value),
         'recommendation': recommendation,
         'hedging': hedging_recommendation,
-        'confidence': float(bet_model.get_prediction_confidence(features))
+        'confidence': float(confidence)
     }
 
-def prepare_features(bet_data):
+def prepare_features(bet_data, session=None):
     """
     Transform bet data into features for the prediction model
-    """
-    
-    features = {
-        'sport': one_hot_encode_sport(bet_data['sport']),
-        'bet_type': one_hot_encode_bet_type(bet_data['bet_type']),
-        'odds_value': normalize_odds(bet_data['odds'][0]) if bet_data['odds'] else 0.0,
-    }
-    
-    return np.array([
-        *features['sport'],
-        *features['bet_type'],
-        features['odds_value']
-    ]).reshape(1, -1)  
-
-def one_hot_encode_sport(sport):
-    """Convert sport to one-hot encoding"""
-    sports = ['Basketball', 'Soccer', 'Baseball', 'Football', 'Hockey', 'Unknown']
-    return [1 if s == sport else 0 for s in sports]
 
-def one_hot_encode_bet_type(bet_type):
-    """Convert bet type to one-hot encoding"""
-    bet_types = ['Parlay', 'Over/Under', 'Spread', 'Moneyline', 'Prop', 'Unknown']
-    return [1 if bt == bet_type else 0 for bt in bet_types]
-
-def normalize_odds(odds_str):
-    """Normalize odds to a standard format"""
-    try:
-        if odds_str.startswith('+'):
-            return float(odds_str) / 100.0
-        elif odds_str.startswith('-'):
-            return -100.0 / float(odds_str)
-        else:
-            return float(odds_str) - 1.0
-    except (ValueError, TypeError):
-        return 0.0
+    consensus_share (and sentiment_score, when the slip has none) come from
+    the crowd on the slip's selection, matched the way update_consensus
+    matches the saved bet, so serving sees what training reads back.
+    """
+    crowd = upload_consensus(session or db.session, bet_data)
+    sentiment_score = bet_data.get('sentiment_score')
+    return bet_model.prepare_features({
+        'odds': bet_data.get('odds'),
+        'sport': bet_data.get('sport'),
+        'bet_type': bet_data.get('bet_type'),
+        'sentiment_score': sentiment_score if sentiment_score is not None else crowd.get('sentiment_score'),
+        'leg_count': count_legs(bet_data),
+        'consensus_share': crowd.get('consensus_share'),
+        'tipster_win_rate': bet_data.get('tipster_win_rate'),
+    })
 
 def convert_odds_to_decimal(odds_str):
     """Convert any odds format to decimal odds"""
-    try:
-        if odds_str.startswith('+'):
-            return 1.0 + (float(odds_str) / 100.0)
-        elif odds_str.startswith('-'):
-            return 1.0 + (100.0 / abs(float(odds_str)))
-        else:
-            return float(odds_str)
-    except (ValueError, TypeError):
-        return 2.0  
+    decimal = float(american_to_decimal(parse_american_odds(odds_str)))
+    return 2.0 if np.isnan(decimal) else decimal
 
 def check_hedging_opportunity(win_probability, bet_data):
     """Check if there's a good hedging opportunity for this bet"""
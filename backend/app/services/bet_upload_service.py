@@ -1,18 +1,48 @@
 from datetime import datetime
+import io
 import os
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.datastructures import FileStorage
 from werkzeug.utils import secure_filename
+from sqlalchemy import inspect, insert
 from app import db
 from app.models.bet import Bet, BetLeg
+from app.services.consensus_service import slip_selection
 from app.services.ocr_service import process_image
-from app.services.nlp_service import process_text
-from app.services.storage_service import upload_to_cloud_storage, delete_from_cloud_storage
+from app.services.nlp_service import process_text, process_texts
+from app.services.storage_service import upload_stream_to_cloud_storage, delete_from_cloud_storage
+from app.services.tipster_service import get_tipster_stats
+from app.utils.slip_scoring import calculate_integrity_score
+from app.utils.storage import UploadBuffer
+from app.utils.teams import resolve_team_id, resolve_team_ids
 import uuid
 
+def _insert_values(obj):
+    """Column values of an unsaved model for a bulk INSERT; unset columns with defaults are left to them"""
+    values = {}
+    for attribute in inspect(type(obj)).column_attrs:
+        column = attribute.columns[0]
+        value = getattr(obj, attribute.key)
+        if column.primary_key or (value is None and column.default is not None):
+            continue
+        values[attribute.key] = value
+    return values
+
 class BetUploadService:
     """Service for handling betting slip uploads and processing"""
     
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'pdf'}
-    TEMP_FOLDER = 'temp_uploads'
+    
+    # Uploads stay in memory up to this size, then spill to a private temp file
+    SPOOL_MAX_MEMORY_BYTES = 2 * 1024 * 1024
+    
+    # Bulk upload limits
+    MAX_BULK_FILES = 200
+    MAX_FILE_BYTES = 10 * 1024 * 1024
+    MAX_ZIP_UNCOMPRESSED_BYTES = 500 * 1024 * 1024
+    OCR_MAX_WORKERS = 8
     
     @staticmethod
     def allowed_file(filename):
@@ -46,45 +76,23 @@ class BetUploadService:
             'bet_id': None
         }
         
+        # Attach the Reddit author's settled-pick track record, if one exists
+        tipster = get_tipster_stats(db.session, reddit_username) if reddit_username else None
+        if reddit_username:
+            result['tipster'] = tipster.to_dict() if tipster else {'author': reddit_username, 'verified': False}
+        
         # Process image upload
         if file:
-            # Create a unique temp filename
-            temp_filename = None
             try:
-                # Save file temporarily
-                original_filename = secure_filename(file.filename)
-                temp_filename = f"{str(uuid.uuid4())}_{original_filename}"
-                temp_file_path = os.path.join(BetUploadService.TEMP_FOLDER, temp_filename)
-                
-                # Create temp folder if it doesn't exist
-                os.makedirs(BetUploadService.TEMP_FOLDER, exist_ok=True)
-                file.save(temp_file_path)
-                
-                # Upload to cloud storage
-                cloud_path = upload_to_cloud_storage(temp_file_path, f"bet_slips/{temp_filename}")
-                
-                # Process image with OCR
-                ocr_result = process_image(temp_file_path)
+                cloud_path, ocr_result = BetUploadService._ocr_uploaded_file(file)
                 if not ocr_result['success']:
                     return {'success': False, 'error': 'Failed to process image'}
                 
-                # Extract bet details from OCR result
-                bet_data = {
-                    'teams': ocr_result.get('teams', []),
-                    'odds': ocr_result.get('odds', []),
-                    'amount': ocr_result.get('amount'),
-                    'bet_type': ocr_result.get('bet_type', 'Unknown'),
-                    'sport': 'Unknown',  # We'll determine this with NLP
-                    'original_text': ocr_result.get('text', '')
-                }
-                
                 # Run the extracted text through NLP for better categorization
-                nlp_result = process_text(bet_data['original_text'])
-                
-                # Merge OCR and NLP results, prioritizing OCR for direct extractions
-                bet_data['sport'] = nlp_result['sport']
-                if not bet_data['bet_type'] or bet_data['bet_type'] == 'Unknown':
-                    bet_data['bet_type'] = nlp_result['bet_type']
+                nlp_result = process_text(ocr_result.get('text', ''))
+                bet_data = BetUploadService._merge_ocr_and_nlp(ocr_result, nlp_result)
+                if tipster:
+                    bet_data['tipster_win_rate'] = tipster.weighted_win_rate
                 
                 # Calculate integrity score
                 integrity_score = calculate_integrity_score(bet_data)
@@ -102,15 +110,10 @@ class BetUploadService:
                 
                 result['bet_id'] = bet.id
                 result['bet_data'] = bet_data
-                
-                # Clean up temp file
-                if os.path.exists(temp_file_path):
-                    os.remove(temp_file_path)
+                if 'ocr_stats' in ocr_result:
+                    result['ocr_stats'] = ocr_result['ocr_stats']
                     
             except Exception as e:
-                # Clean up on error
-                if temp_filename and os.path.exists(os.path.join(BetUploadService.TEMP_FOLDER, temp_filename)):
-                    os.remove(os.path.join(BetUploadService.TEMP_FOLDER, temp_filename))
                 return {'success': False, 'error': str(e)}
                 
         # Process text upload
@@ -128,6 +131,8 @@ class BetUploadService:
                     'sport': nlp_result.get('sport', 'Unknown'),
                     'original_text': text
                 }
+                if tipster:
+                    bet_data['tipster_win_rate'] = tipster.weighted_win_rate
                 
                 # Calculate integrity score
                 integrity_score = calculate_integrity_score(bet_data)
@@ -151,6 +156,285 @@ class BetUploadService:
         
         return result
     
+    @staticmethod
+    def _ocr_uploaded_file(file):
+        """
+        Store an uploaded slip in cloud storage and run OCR on it
+        
+        Args:
+            file: Uploaded image file
+            
+        Returns:
+            tuple: (cloud storage path, OCR result dictionary)
+        """
+        original_filename = secure_filename(file.filename)
+        blob_name = f"bet_slips/{uuid.uuid4().hex}_{original_filename}"
+        
+        # Read the request stream once; storage and OCR share the buffer
+        with UploadBuffer(
+            file,
+            max_memory_bytes=BetUploadService.SPOOL_MAX_MEMORY_BYTES,
+            max_bytes=BetUploadService.MAX_FILE_BYTES
+        ) as buffer:
+            cloud_path = upload_stream_to_cloud_storage(buffer.open(), blob_name, buffer.content_type)
+            ocr_result = process_image(buffer)
+        
+        return cloud_path, ocr_result
+    
+    @staticmethod
+    def _merge_ocr_and_nlp(ocr_result, nlp_result):
+        """Merge OCR and NLP results, prioritizing OCR for direct extractions"""
+        bet_data = {
+            'teams': ocr_result.get('teams', []),
+            'odds': ocr_result.get('odds', []),
+            'amount': ocr_result.get('amount'),
+            'bet_type': ocr_result.get('bet_type', 'Unknown'),
+            'sport': nlp_result['sport'],
+            'original_text': ocr_result.get('text', '')
+        }
+        
+        if not bet_data['bet_type'] or bet_data['bet_type'] == 'Unknown':
+            bet_data['bet_type'] = nlp_result['bet_type']
+        
+        # Structured fields from a recognized sportsbook template
+        for key in ('sportsbook', 'legs', 'payout'):
+            if ocr_result.get(key):
+                bet_data[key] = ocr_result[key]
+        
+        return bet_data
+    
+    @staticmethod
+    def validate_upload_file(file):
+        """
+        Check an uploaded file against the allowed types and size limit
+        
+        Args:
+            file: Uploaded file
+            
+        Returns:
+            str: Error message, or None if the file is acceptable
+        """
+        if not file or not file.filename:
+            return 'No file selected'
+        
+        if not BetUploadService.allowed_file(file.filename):
+            return f"Invalid file type. Allowed types: {', '.join(sorted(BetUploadService.ALLOWED_EXTENSIONS))}"
+        
+        file.stream.seek(0, 2)
+        file_size = file.stream.tell()
+        file.stream.seek(0)
+        
+        if file_size == 0:
+            return 'File is empty'
+        if file_size > BetUploadService.MAX_FILE_BYTES:
+            return 'File too large. Maximum size is 10MB'
+        
+        return None
+    
+    @staticmethod
+    def extract_zip_files(archive):
+        """
+        Expand a ZIP upload into in-memory files
+        
+        Args:
+            archive: Uploaded ZIP file
+            
+        Returns:
+            list: FileStorage objects for each slip in the archive
+            
+        Raises:
+            ValueError: If the archive is invalid or exceeds the bulk limits
+        """
+        try:
+            zip_file = zipfile.ZipFile(archive.stream)
+        except zipfile.BadZipFile:
+            raise ValueError('Invalid ZIP archive')
+        
+        entries = [
+            info for info in zip_file.infolist()
+            if not info.is_dir()
+            and not info.filename.startswith('__MACOSX/')
+            and not os.path.basename(info.filename).startswith('.')
+        ]
+        
+        if len(entries) > BetUploadService.MAX_BULK_FILES:
+            raise ValueError(f'Too many files in archive. Maximum is {BetUploadService.MAX_BULK_FILES}')
+        
+        # Check declared sizes before decompressing anything
+        if sum(info.file_size for info in entries) > BetUploadService.MAX_ZIP_UNCOMPRESSED_BYTES:
+            raise ValueError('Archive is too large when uncompressed')
+        
+        files = []
+        for info in entries:
+            files.append(FileStorage(
+                stream=io.BytesIO(zip_file.read(info)),
+                filename=os.path.basename(info.filename)
+            ))
+        
+        return files
+    
+    @staticmethod
+    def process_bulk_upload(user_id, files, reddit_username=None, subscription_username=None):
+        """
+        Process many bet slip images in one request
+        
+        Files are validated up front, OCR runs concurrently on a bounded
+        thread pool, NLP runs as one batch and all bets and legs are
+        written by insert_bets in a single transaction.
+        
+        Args:
+            user_id: ID of the user uploading the bets
+            files: List of uploaded image files
+            reddit_username: Associated Reddit username (optional)
+            subscription_username: Associated subscription username (optional)
+            
+        Returns:
+            dict: Per-file results and throughput summary
+        """
+        if not files:
+            return {'success': False, 'error': 'No files provided'}
+        
+        if len(files) > BetUploadService.MAX_BULK_FILES:
+            return {'success': False, 'error': f'Too many files. Maximum is {BetUploadService.MAX_BULK_FILES}'}
+        
+        started = time.perf_counter()
+        
+        # One track-record lookup for the whole batch
+        tipster = get_tipster_stats(db.session, reddit_username) if reddit_username else None
+        
+        results = [
+            {'filename': file.filename, 'success': False, 'bet_id': None}
+            for file in files
+        ]
+        
+        # Validate everything before doing any network work
+        valid_indexes = []
+        for index, file in enumerate(files):
+            error = BetUploadService.validate_upload_file(file)
+            if error:
+                results[index]['error'] = error
+            else:
+                valid_indexes.append(index)
+        
+        # Fan out storage upload and OCR
+        ocr_outputs = {}
+        if valid_indexes:
+            max_workers = min(BetUploadService.OCR_MAX_WORKERS, len(valid_indexes))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                future_to_index = {
+                    executor.submit(BetUploadService._ocr_uploaded_file, files[index]): index
+                    for index in valid_indexes
+                }
+                for future, index in future_to_index.items():
+                    try:
+                        cloud_path, ocr_result = future.result()
+                    except Exception as e:
+                        results[index]['error'] = str(e)
+                        continue
+                    
+                    if not ocr_result['success']:
+                        results[index]['error'] = ocr_result.get('message', 'Failed to process image')
+                        continue
+                    
+                    ocr_outputs[index] = (cloud_path, ocr_result)
+                    if 'ocr_stats' in ocr_result:
+                        results[index]['ocr_stats'] = ocr_result['ocr_stats']
+        
+        # Batch NLP over all recognized texts
+        ocr_indexes = sorted(ocr_outputs)
+        nlp_results = process_texts([ocr_outputs[index][1].get('text', '') for index in ocr_indexes])
+        
+        pending = []
+        for index, nlp_result in zip(ocr_indexes, nlp_results):
+            cloud_path, ocr_result = ocr_outputs[index]
+            try:
+                bet_data = BetUploadService._merge_ocr_and_nlp(ocr_result, nlp_result)
+                if tipster:
+                    bet_data['tipster_win_rate'] = tipster.weighted_win_rate
+                integrity_score = calculate_integrity_score(bet_data)
+                bet = BetUploadService.build_bet(
+                    user_id,
+                    bet_data,
+                    cloud_path,
+                    reddit_username,
+                    subscription_username,
+                    integrity_score
+                )
+            except Exception as e:
+                results[index]['error'] = str(e)
+                continue
+            
+            results[index]['bet_data'] = bet_data
+            results[index]['integrity_score'] = integrity_score
+            pending.append((index, bet))
+        
+        # One transaction for every bet and leg
+        bet_ids = []
+        if pending:
+            try:
+                bet_ids = BetUploadService.insert_bets(db.session, [bet for _, bet in pending])
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                for index, _ in pending:
+                    results[index]['error'] = f"Error saving bet: {str(e)}"
+                pending = []
+        
+        for (index, _), bet_id in zip(pending, bet_ids):
+            results[index]['success'] = True
+            results[index]['bet_id'] = bet_id
+        
+        elapsed = time.perf_counter() - started
+        succeeded = len(pending)
+        ocr_stats = [r['ocr_stats'] for r in results if r.get('ocr_stats')]
+        
+        response = {
+            'success': succeeded > 0,
+            'results': results,
+            'summary': {
+                'total': len(files),
+                'succeeded': succeeded,
+                'failed': len(files) - succeeded,
+                'elapsed_seconds': round(elapsed, 3),
+                'files_per_second': round(len(files) / elapsed, 2) if elapsed > 0 else None,
+                'ocr_escalations': sum(1 for stats in ocr_stats if stats['escalated']),
+                'ocr_cost_usd': round(sum(stats['cost_usd'] for stats in ocr_stats), 6)
+            }
+        }
+        if reddit_username:
+            response['tipster'] = tipster.to_dict() if tipster else {'author': reddit_username, 'verified': False}
+        
+        return response
+    
+    @staticmethod
+    def insert_bets(session, bets):
+        """
+        Insert built bets, then all their legs, as two bulk INSERTs
+        
+        Unlike session.add_all, no per-object unit-of-work flush runs: bet ids
+        come back from one INSERT ... RETURNING in parameter order and every
+        leg of every bet goes into the second statement.
+        
+        Args:
+            session: SQLAlchemy session
+            bets: Unsaved bets from build_bet
+            
+        Returns:
+            list: New bet ids, in the order of bets
+        """
+        bet_ids = session.scalars(
+            insert(Bet).returning(Bet.id, sort_by_parameter_order=True),
+            [_insert_values(bet) for bet in bets]
+        ).all()
+        leg_rows = [
+            dict(_insert_values(leg), bet_id=bet_id)
+            for bet, bet_id in zip(bets, bet_ids)
+            for leg in bet.legs
+        ]
+        if leg_rows:
+            session.execute(insert(BetLeg), leg_rows)
+        return bet_ids
+    
     @staticmethod
     def save_bet(user_id, bet_data, slip_image_path=None, reddit_username=None, subscription_username=None, integrity_score=0):
         """
@@ -167,6 +451,39 @@ class BetUploadService:
         Returns:
             Bet: Created bet object
         """
+        bet = BetUploadService.build_bet(
+            user_id,
+            bet_data,
+            slip_image_path,
+            reddit_username,
+            subscription_username,
+            integrity_score
+        )
+        
+        try:
+            db.session.add(bet)
+            db.session.commit()
+            return bet
+        except Exception as e:
+            db.session.rollback()
+            raise ValueError(f"Error saving bet: {str(e)}")
+    
+    @staticmethod
+    def build_bet(user_id, bet_data, slip_image_path=None, reddit_username=None, subscription_username=None, integrity_score=0):
+        """
+        Build an unsaved bet (and its legs) from extracted bet details
+        
+        Args:
+            user_id: User ID
+            bet_data: Dictionary of bet details
+            slip_image_path: Path to bet slip image in cloud storage
+            reddit_username: Associated Reddit username
+            subscription_username: Associated subscription username
+            integrity_score: Calculated integrity score
+            
+        Returns:
+            Bet: Unsaved bet object
+        """
         # Calculate potential payout
         odds = float(bet_data['odds'][0]) if bet_data['odds'] else 0
         amount = float(bet_data['amount'].replace('$', '').replace('€', '').replace('£', '')) if bet_data['amount'] else 0
@@ -181,8 +498,11 @@ class BetUploadService:
         win_probability = 0.5  # Default value
         expected_value = (win_probability * potential_payout) - ((1 - win_probability) * amount)
         
-        # Get or create selection text from teams
-        selection = ', '.join(bet_data['teams']) if bet_data['teams'] else None
+        # Get or create selection text from template legs or teams
+        selection = slip_selection(bet_data)
+        
+        # Canonical ids let leaderboards and consensus group "LAL"/"Lakers"/"LA Lakers"
+        team_ids = resolve_team_ids(bet_data['teams'], bet_data['sport'])
         
         # Create main bet record
         bet = Bet(
@@ -198,17 +518,36 @@ class BetUploadService:
             slip_image_path=slip_image_path,
             upload_date=datetime.utcnow(),
             status='pending',
-            metadata={
+            additional_data={
                 'reddit_username': reddit_username,
                 'subscription_username': subscription_username,
                 'integrity_score': integrity_score,
                 'sport': bet_data['sport'],
+                'team_ids': team_ids,
+                'sportsbook': bet_data.get('sportsbook'),
+                'payout': bet_data.get('payout'),
+                'tipster_win_rate': bet_data.get('tipster_win_rate'),
                 'original_text': bet_data['original_text']
             }
         )
         
+        # Template-parsed slips carry their legs explicitly
+        if bet_data['bet_type'] == 'Parlay' and bet_data.get('legs'):
+            bet.legs = [
+                BetLeg(
+                    team_name=leg['selection'],
+                    team_id=resolve_team_id(leg['selection'], bet_data['sport']),
+                    opponent_name=next((team for team in leg.get('teams', []) if team != leg['selection']), None),
+                    sport_type=bet_data['sport'],
+                    bet_type=leg.get('market') or bet_data['bet_type'],
+                    odds=float(leg['odds']),
+                    status='pending'
+                )
+                for leg in bet_data['legs']
+            ]
+        
         # Create bet legs if it's a parlay or multi-bet
-        if bet_data['bet_type'] == 'Parlay' and len(bet_data['teams']) >= 2:
+        elif bet_data['bet_type'] == 'Parlay' and len(bet_data['teams']) >= 2:
             bet_legs = []
             
             # Create a leg for each team
@@ -218,6 +557,7 @@ class BetUploadService:
                 
                 bet_leg = BetLeg(
                     team_name=team,
+                    team_id=team_ids[i],
                     opponent_name=bet_data['teams'][i+1] if i+1 < len(bet_data['teams']) else None,
                     sport_type=bet_data['sport'],
                     bet_type=bet_data['bet_type'],
@@ -228,41 +568,4 @@ class BetUploadService:
             
             bet.legs = bet_legs
         
-        try:
-            db.session.add(bet)
-            db.session.commit()
-            return bet
-        except Exception as e:
-            db.session.rollback()
-            raise ValueError(f"Error saving bet: {str(e)}")
-
-def calculate_integrity_score(bet_data):
-    """
-    Calculate an integrity score based on completeness and validity of bet data
-    
-    Args:
-        bet_data: Dictionary of bet details
-        
-    Returns:
-        int: Integrity score (0-100)
-    """
-    score = 0
-    
-    # Check for presence of key data points
-    if bet_data.get('teams') and len(bet_data['teams']) > 0:
-        score += 30  # 30 points for having team names
-    
-    if bet_data.get('odds') and len(bet_data['odds']) > 0:
-        score += 30  # 30 points for having odds
-    
-    if bet_data.get('amount'):
-        score += 20  # 20 points for having bet amount
-    
-    if bet_data.get('bet_type') and bet_data['bet_type'] != 'Unknown':
-        score += 10  # 10 points for having bet type
-    
-    if bet_data.get('sport') and bet_data['sport'] != 'Unknown':
-        score += 10  # 10 points for having sport
-    
-    # Cap at 100
-    return min(score, 100)
\ No newline at end of file
+        return bet
@@ -0,0 +1,457 @@
+# services/consensus_service.py (community consensus per event and selection)
+
+import bisect
+import logging
+import re
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, select, tuple_, update
+from sqlalchemy.orm import aliased
+
+from  app.models.bet import Bet
+from  app.models.consensus import EventConsensus, ConsensusWatermark
+from  app.models.prediction import Prediction
+from  app.models.reddit_post import RedditPick
+from  app.utils.teams import resolve_team_id, resolve_team_ids
+from  app.utils.upsert import dialect_insert
+
+logger = logging.getLogger(__name__)
+
+MATCH_WINDOW_HOURS = 48  # how long after a pick its event may start
+
+EVENT_SEPARATOR = re.compile(r'\s+(?:vs\.?|v\.?|@|at)\s+', re.IGNORECASE)
+NON_ALPHANUMERIC = re.compile(r'[^a-z0-9]+')
+
+def normalize_selection(name, sport=None):
+    """
+    Canonical team id for a selection, falling back to its lowercased,
+    punctuation-free text for selections that are not teams
+    """
+    return resolve_team_id(name, sport) or NON_ALPHANUMERIC.sub(' ', (name or '').lower()).strip()
+
+def normalize_event_key(event_name, event_date=None, sport=None):
+    """
+    Order-independent event key: sorted canonical teams plus the event day
+
+    'Lakers vs Celtics' and 'BOS @ LAL' on the same day share a key.
+    """
+    teams = sorted(normalize_selection(team, sport) for team in EVENT_SEPARATOR.split(event_name or ''))
+    key = '|'.join(team for team in teams if team)
+    if event_date is not None:
+        key = f'{key}|{event_date.date().isoformat()}'
+    return key
+
+# Normalized market_type / bet_type spellings for each market picks are graded in
+MARKET_ALIASES = {
+    'moneyline': ('moneyline', 'money line', 'ml', 'h2h', 'winner', 'match winner', 'straight'),
+    'spread': ('spread', 'point spread', 'ats', 'handicap', 'run line', 'puck line'),
+    'over_under': ('over under', 'over', 'under', 'o u', 'total', 'totals'),
+}
+_MARKETS = {alias: market for market, aliases in MARKET_ALIASES.items() for alias in aliases}
+
+def normalize_market(market_type):
+    """
+    Canonical market ('moneyline', 'spread', 'over_under') of a bet type or
+    prediction market_type, or None for anything else (props, futures)
+
+    A missing market_type is a straight win/loss prediction, i.e. moneyline.
+    """
+    if not market_type:
+        return 'moneyline'
+    return _MARKETS.get(NON_ALPHANUMERIC.sub(' ', market_type.lower()).strip())
+
+def selection_key(team_id, text, sport=None):
+    """Matching key of a pick or bet: its stored canonical team id, else its normalized text"""
+    return team_id or normalize_selection(text, sport)
+
+def predictions_by_selection(session, keys, earliest, latest, outcomes=None, by_market=False):
+    """
+    Predictions with events in [earliest, latest] on the given selection keys
+
+    Prediction selections are stored as free text ('Lakers', 'LA Lakers',
+    'Los Angeles Lakers'), so rows are read by event window and keyed
+    in Python with normalize_selection; picks and bets key by their
+    stored team ids. The resolver caches each distinct selection.
+
+    Args:
+        session: SQLAlchemy session
+        keys (set): Canonical team ids or normalized selection texts
+        earliest, latest (datetime): Event start window
+        outcomes (tuple, optional): Only predictions with these outcomes
+        by_market (bool): Key by (normalize_market(market_type), selection key)
+            instead, so picks only meet predictions in their own market
+
+    Returns:
+        dict: selection key -> (event dates, rows), both sorted by event date, for bisecting
+    """
+    query = (
+        select(Prediction.id, Prediction.event_name, Prediction.event_date, Prediction.sport,
+               Prediction.market_type, Prediction.selection, Prediction.outcome)
+        .where(Prediction.selection.isnot(None))
+        .where(Prediction.event_date >= earliest)
+        .where(Prediction.event_date <= latest)
+        .order_by(Prediction.event_date)
+    )
+    if outcomes is not None:
+        query = query.where(Prediction.outcome.in_(outcomes))
+
+    by_selection = defaultdict(lambda: ([], []))
+    for row in session.execute(query):
+        key = normalize_selection(row.selection, row.sport)
+        if by_market:
+            key = (normalize_market(row.market_type), key)
+        if key in keys:
+            dates, rows = by_selection[key]
+            dates.append(row.event_date)
+            rows.append(row)
+    return by_selection
+
+def first_event_after(by_selection, key, at, window):
+    """First prediction on a selection key whose event starts within window after at, or None"""
+    dates, rows = by_selection.get(key, ([], []))
+    index = bisect.bisect_left(dates, at)
+    if index < len(dates) and dates[index] <= at + window:
+        return rows[index]
+    return None
+
+def _new_totals():
+    return {
+        'picks': 0, 'reddit_picks': 0, 'upload_picks': 0, 'stake_total': 0.0,
+        'sentiment_sum': 0.0, 'sentiment_weight': 0.0, 'sport': None, 'event_date': None
+    }
+
+def _add_pick(increments, prediction, source, stake, sentiment):
+    """Add one pick to its (event, selection) totals and return that key"""
+    key = (normalize_event_key(prediction.event_name, prediction.event_date, prediction.sport),
+           normalize_selection(prediction.selection, prediction.sport))
+    totals = increments[key]
+    weight = stake if stake and stake > 0 else 1.0
+    totals['picks'] += 1
+    totals[f'{source}_picks'] += 1
+    totals['stake_total'] += stake or 0.0
+    if sentiment is not None:
+        totals['sentiment_sum'] += weight * sentiment
+        totals['sentiment_weight'] += weight
+    totals['sport'] = prediction.sport
+    totals['event_date'] = prediction.event_date
+    return key
+
+def _reddit_increments(session, last_id, batch_size, window):
+    picks = session.execute(
+        select(RedditPick.id, RedditPick.team, RedditPick.team_id, RedditPick.stake, RedditPick.sentiment_score,
+               RedditPick.created_utc)
+        .where(RedditPick.id > last_id)
+        .where(RedditPick.bet_type != 'over_under')
+        .order_by(RedditPick.id)
+        .limit(batch_size)
+    ).all()
+    increments = defaultdict(_new_totals)
+    if not picks:
+        return last_id, increments, {}
+
+    posted = [datetime.utcfromtimestamp(pick.created_utc) for pick in picks]
+    keys = [selection_key(pick.team_id, pick.team) for pick in picks]
+    by_selection = predictions_by_selection(session, set(keys), min(posted), max(posted) + window)
+    for key, pick, posted_at in zip(keys, picks, posted):
+        prediction = first_event_after(by_selection, key, posted_at, window)
+        if prediction is not None:
+            _add_pick(increments, prediction, 'reddit', pick.stake, pick.sentiment_score)
+    return picks[-1].id, increments, {}
+
+def slip_selection(bet_data):
+    """Selection text an extracted slip is saved with: its template legs' selections, else its teams"""
+    if bet_data.get('legs'):
+        return ', '.join(leg['selection'] for leg in bet_data['legs'])
+    return ', '.join(bet_data['teams']) if bet_data.get('teams') else None
+
+def _single_selection(selection, bet_type):
+    """Parlays back several selections at once; only single-selection bets count toward consensus"""
+    return bool(selection) and ',' not in selection and (bet_type or '').lower() != 'parlay'
+
+def _bet_selection_key(selection, additional_data):
+    """A single-selection upload's canonical team id from additional_data, else its normalized selection"""
+    additional = additional_data or {}
+    team_ids = additional.get('team_ids') or []
+    return selection_key(team_ids[0] if len(team_ids) == 1 else None, selection, additional.get('sport'))
+
+def _upload_increments(session, last_id, batch_size, window):
+    bets = session.execute(
+        select(Bet.id, Bet.prediction_id, Bet.selection, Bet.bet_type, Bet.amount, Bet.created_at, Bet.additional_data)
+        .where(Bet.id > last_id)
+        .order_by(Bet.id)
+        .limit(batch_size)
+    ).all()
+    increments = defaultdict(_new_totals)
+    if not bets:
+        return last_id, increments, {}
+
+    linked_ids = {bet.prediction_id for bet in bets if bet.prediction_id}
+    linked = {
+        row.id: row for row in session.execute(
+            select(Prediction.id, Prediction.event_name, Prediction.event_date, Prediction.sport, Prediction.selection)
+            .where(Prediction.id.in_(linked_ids))
+        )
+    } if linked_ids else {}
+
+    unlinked = [bet for bet in bets if not bet.prediction_id and _single_selection(bet.selection, bet.bet_type)]
+    keys = {bet.id: _bet_selection_key(bet.selection, bet.additional_data) for bet in unlinked}
+    by_selection = predictions_by_selection(
+        session,
+        set(keys.values()),
+        min(bet.created_at for bet in unlinked),
+        max(bet.created_at for bet in unlinked) + window
+    ) if unlinked else {}
+
+    matched = {}
+    for bet in bets:
+        if bet.prediction_id:
+            prediction = linked.get(bet.prediction_id)
+        elif bet.id in keys:
+            prediction = first_event_after(by_selection, keys[bet.id], bet.created_at, window)
+        else:
+            prediction = None
+        if prediction is not None:
+            sentiment = (bet.additional_data or {}).get('sentiment_score')
+            matched[bet.id] = _add_pick(increments, prediction, 'upload', bet.amount, sentiment)
+    return bets[-1].id, increments, matched
+
+def _record_bet_shares(session, matched):
+    """
+    Store each matched upload's consensus features in its additional_data
+
+    Event consensus is pruned after the event, so the crowd a bet joined is
+    snapshotted here for training (consensus_share, and sentiment_score when
+    the bet has none), without the bet's own pick: serving looks the same
+    features up with upload_consensus before the bet is counted. Rows are
+    re-read under a row lock and only these keys merged in, one UPDATE per
+    bet, so concurrent edits to other keys are kept.
+
+    Args:
+        session: SQLAlchemy session
+        matched (dict): Bet id -> (event_key, selection_key) its pick was added to
+    """
+    totals = consensus_totals(session, set(matched.values()))
+    matched = {bet_id: key for bet_id, key in matched.items() if key in totals}
+    if not matched:
+        return
+
+    current = dict(session.execute(
+        select(Bet.id, Bet.additional_data).where(Bet.id.in_(list(matched))).with_for_update()
+    ).all())
+    for bet_id, key in matched.items():
+        additional_data = dict(current.get(bet_id) or {})
+        features = consensus_features(totals[key], own_pick=True)
+        if additional_data.get('sentiment_score') is not None:
+            features.pop('sentiment_score', None)
+        session.execute(
+            update(Bet).where(Bet.id == bet_id).values(additional_data={**additional_data, **features})
+        )
+
+CONSENSUS_SOURCES = {
+    'reddit_picks': _reddit_increments,
+    'bets': _upload_increments
+}
+
+def update_consensus(session, batch_size=1000, match_window_hours=MATCH_WINDOW_HOURS, retention_days=7):
+    """
+    Fold new Reddit picks and uploaded bets into event_consensus
+
+    Each source is read after its watermark, batch_size rows at a time.
+    A pick counts toward the first prediction on the same canonical team
+    (or normalized selection, for non-team picks) whose event starts within match_window_hours after it was made (uploads
+    linked to a prediction use that one). Per-(event, selection)
+    increments are upserted, the touched events' totals refreshed and the
+    watermark moved in one transaction per batch, so re-runs only read
+    new rows. Matched uploads keep their consensus features in
+    additional_data for training. Rows for events older than retention_days are pruned.
+
+    Args:
+        session: SQLAlchemy session
+        batch_size (int): Source rows per transaction
+        match_window_hours (int): How long after a pick its event may start
+        retention_days (int): Keep consensus for events this recent
+
+    Returns:
+        dict: Batches read per source, events touched and rows pruned
+    """
+    window = timedelta(hours=match_window_hours)
+    batches = {}
+    events = set()
+
+    for source, load in CONSENSUS_SOURCES.items():
+        watermark = session.get(ConsensusWatermark, source)
+        if watermark is None:
+            watermark = ConsensusWatermark(source=source, last_id=0)
+            session.add(watermark)
+        batches[source] = 0
+
+        while True:
+            last_id, increments, matched = load(session, watermark.last_id, batch_size, window)
+            if last_id == watermark.last_id:
+                break
+            batches[source] += 1
+            if increments:
+                _increment_consensus(session, increments)
+                touched = {event_key for event_key, _ in increments}
+                _refresh_event_totals(session, touched)
+                events |= touched
+            if matched:
+                _record_bet_shares(session, matched)
+            watermark.last_id = last_id
+            session.commit()
+
+    pruned = session.execute(
+        delete(EventConsensus).where(EventConsensus.event_date < datetime.utcnow() - timedelta(days=retention_days))
+    ).rowcount
+    session.commit()
+
+    logger.info(f"Consensus updated for {len(events)} events, {pruned} stale rows pruned")
+    return {'success': True, 'batches': batches, 'events': len(events), 'pruned': pruned}
+
+def _increment_consensus(session, increments):
+    insert = dialect_insert(session)
+    now = datetime.utcnow()
+    rows = [
+        {'event_key': event_key, 'selection_key': selection_key, 'event_picks': 0, 'updated_at': now, **totals}
+        for (event_key, selection_key), totals in increments.items()
+    ]
+    statement = insert(EventConsensus).values(rows)
+    table = EventConsensus.__table__.c
+    summed = ('picks', 'reddit_picks', 'upload_picks', 'stake_total', 'sentiment_sum', 'sentiment_weight')
+    session.execute(statement.on_conflict_do_update(
+        index_elements=[EventConsensus.event_key, EventConsensus.selection_key],
+        set_={
+            **{column: table[column] + statement.excluded[column] for column in summed},
+            'updated_at': statement.excluded.updated_at
+        }
+    ))
+
+def _refresh_event_totals(session, event_keys):
+    """Copy each touched event's total picks onto all of its selection rows"""
+    other = aliased(EventConsensus)
+    total = (
+        select(func.sum(other.picks))
+        .where(other.event_key == EventConsensus.event_key)
+        .scalar_subquery()
+    )
+    session.execute(
+        update(EventConsensus)
+        .where(EventConsensus.event_key.in_(event_keys))
+        .values(event_picks=total)
+        .execution_options(synchronize_session=False)
+    )
+
+def get_consensus(session, event_name, event_date, selection, sport=None):
+    """Consensus row for one event selection by primary key, or None"""
+    return session.get(EventConsensus, (
+        normalize_event_key(event_name, event_date, sport),
+        normalize_selection(selection, sport)
+    ))
+
+def pick_shares(session, keys):
+    """Pick share per (event_key, selection_key) in one query, missing when the event has no picks"""
+    return {
+        (event_key, selection_key): picks / event_picks
+        for event_key, selection_key, picks, event_picks in session.execute(
+            select(EventConsensus.event_key, EventConsensus.selection_key, EventConsensus.picks, EventConsensus.event_picks)
+            .where(tuple_(EventConsensus.event_key, EventConsensus.selection_key).in_(list(keys)))
+            .where(EventConsensus.event_picks > 0)
+        )
+    }
+
+def consensus_totals(session, keys):
+    """
+    Consensus counts per (event_key, selection_key) in one query
+
+    Returns:
+        dict: Key -> (picks, event_picks, sentiment_sum, sentiment_weight)
+    """
+    if not keys:
+        return {}
+    return {
+        (row.event_key, row.selection_key): (row.picks, row.event_picks, row.sentiment_sum, row.sentiment_weight)
+        for row in session.execute(
+            select(EventConsensus.event_key, EventConsensus.selection_key, EventConsensus.picks,
+                   EventConsensus.event_picks, EventConsensus.sentiment_sum, EventConsensus.sentiment_weight)
+            .where(tuple_(EventConsensus.event_key, EventConsensus.selection_key).in_(list(keys)))
+        )
+    }
+
+def consensus_features(totals, own_pick=False):
+    """
+    consensus_share and sentiment_score features of one consensus row
+
+    Args:
+        totals (tuple): (picks, event_picks, sentiment_sum, sentiment_weight) from consensus_totals
+        own_pick (bool): The bet being featurized is counted in the row; take its pick
+            off the selection and the event so it sees only the rest of the crowd
+
+    Returns:
+        dict: The features the row supports (none when nobody else picked the event)
+    """
+    picks, event_picks, sentiment_sum, sentiment_weight = totals
+    if own_pick:
+        picks, event_picks = picks - 1, event_picks - 1
+    features = {}
+    if event_picks > 0:
+        features['consensus_share'] = picks / event_picks
+    if sentiment_weight:
+        features['sentiment_score'] = sentiment_sum / sentiment_weight
+    return features
+
+def upload_consensus(session, bet_data, at=None, match_window_hours=MATCH_WINDOW_HOURS):
+    """
+    Consensus features for an extracted slip before it is saved
+
+    The slip is matched to an event the way update_consensus will match
+    the saved bet (its selection's first prediction starting within the
+    window), so serving encodes what training later reads back.
+
+    Args:
+        session: SQLAlchemy session
+        bet_data (dict): Extracted slip (teams or legs, bet_type, sport)
+        at (datetime, optional): Upload time, defaults to now
+
+    Returns:
+        dict: consensus_share and sentiment_score where the crowd has them
+    """
+    selection = slip_selection(bet_data)
+    if not _single_selection(selection, bet_data.get('bet_type')):
+        return {}
+
+    sport = bet_data.get('sport')
+    key = _bet_selection_key(selection, {'team_ids': resolve_team_ids(bet_data.get('teams') or [], sport),
+                                         'sport': sport})
+    at = at or datetime.utcnow()
+    window = timedelta(hours=match_window_hours)
+    prediction = first_event_after(predictions_by_selection(session, {key}, at, at + window), key, at, window)
+    if prediction is None:
+        return {}
+
+    consensus_key = (normalize_event_key(prediction.event_name, prediction.event_date, prediction.sport),
+                     normalize_selection(prediction.selection, prediction.sport))
+    totals = consensus_totals(session, {consensus_key})
+    return consensus_features(totals[consensus_key]) if consensus_key in totals else {}
+
+def consensus_shares(session, rows):
+    """
+    Pick share for a chunk of prediction rows in one query
+
+    Args:
+        rows (list): Dicts with id, event_name, event_date, selection and (optionally) sport
+
+    Returns:
+        dict: Prediction id -> pick share (missing when nobody picked the event)
+    """
+    keys = {
+        row['id']: (
+            normalize_event_key(row['event_name'], row['event_date'], row.get('sport')),
+            normalize_selection(row['selection'], row.get('sport'))
+        )
+        for row in rows
+    }
+    if not keys:
+        return {}
+    found = pick_shares(session, set(keys.values()))
+    return {prediction_id: found[key] for prediction_id, key in keys.items() if key in found}
@@ -0,0 +1,74 @@
+# services/ev_service.py (batch expected value scoring)
+
+import numpy as np
+from  app.ml.registry import get_model
+from  app.ml.feature_engineering import encode_bets
+from  app.ml.odds import (
+    parse_odds, american_to_decimal, decimal_to_implied, remove_vig,
+    expected_value, kelly_fraction
+)
+
+def score_ev_batch(candidates, kelly_multiplier=1.0):
+    """
+    Score many candidate bets in one vectorized pass
+
+    Each candidate needs 'odds'. 'win_probability' is used when given;
+    the rest are scored by the model in a single forward pass over their
+    encoded features. When 'opposing_odds' is given the vig-free market
+    probability and the model's edge over it are included.
+
+    Args:
+        candidates (list): Candidate bet dicts
+        kelly_multiplier (float): Fractional Kelly applied to the stake
+
+    Returns:
+        dict: Per-candidate results and the model version used
+    """
+    count = len(candidates)
+    decimal = american_to_decimal(parse_odds([candidate.get('odds') for candidate in candidates]))
+    implied = decimal_to_implied(decimal)
+
+    win_probability = np.array([
+        candidate.get('win_probability', np.nan) for candidate in candidates
+    ], dtype=np.float64)
+
+    model_version = None
+    missing = np.flatnonzero(np.isnan(win_probability))
+    if missing.size:
+        loaded = get_model()
+        model_version = loaded.version
+        features = encode_bets([candidates[index] for index in missing])
+        win_probability[missing] = np.asarray(loaded.model(features, training=False))[:, 1]
+
+    opposing_implied = decimal_to_implied(american_to_decimal(parse_odds([
+        candidate.get('opposing_odds') for candidate in candidates
+    ])))
+    market_probability = remove_vig(np.column_stack([implied, opposing_implied]))[:, 0]
+
+    columns = {
+        'decimal_odds': decimal,
+        'implied_probability': implied,
+        'market_probability': market_probability,
+        'win_probability': win_probability,
+        'edge': win_probability - market_probability,
+        'expected_value': expected_value(win_probability, decimal),
+        'kelly_fraction': kelly_fraction(win_probability, decimal, kelly_multiplier)
+    }
+    # NaN (unparsed odds, no opposing line) is returned as null
+    columns = {
+        name: np.where(np.isnan(values), None, np.round(values, 6)).tolist()
+        for name, values in columns.items()
+    }
+
+    results = []
+    for index in range(count):
+        result = {name: values[index] for name, values in columns.items()}
+        result['id'] = candidates[index].get('id', index)
+        results.append(result)
+
+    return {
+        'success': True,
+        'results': results,
+        'count': count,
+        'model_version': model_version
+    }
@@ -0,0 +1,256 @@
+# services/faq_search.py (ranked full-text search over help-center FAQs)
+
+import html
+import math
+import re
+import threading
+from collections import Counter, defaultdict, namedtuple
+
+from sqlalchemy import func, select
+
+from config import Config
+from  app.models.faq import FAQ, FAQCategory, faq_document, search_language
+
+SNIPPET_WORDS = 30
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_STOP = '</mark>'
+
+class FAQSearchBackend:
+    """Interface for FAQ search backends"""
+    name = None
+
+    def search(self, session, query, limit=20):
+        """
+        Ranked FAQs for a free-text query
+
+        Args:
+            session: SQLAlchemy session
+            query (str): User query
+            limit (int): Most results returned
+
+        Returns:
+            list: Dicts with id, question, snippet (matches wrapped in
+                <mark>), category_id, category_name and score, best first
+        """
+        raise NotImplementedError
+
+class PostgresFAQSearch(FAQSearchBackend):
+    """tsvector + GIN search: match, rank, headline and category in one query"""
+    name = 'postgres'
+
+    def statement(self, query, limit=20):
+        ts_query = func.websearch_to_tsquery(search_language(), query)
+        document = faq_document()
+        rank = func.ts_rank_cd(document, ts_query).label('score')
+        return (
+            select(
+                FAQ.id,
+                FAQ.question,
+                FAQ.category_id,
+                FAQCategory.name.label('category_name'),
+                func.ts_headline(
+                    search_language(), FAQ.answer, ts_query,
+                    f'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, '
+                    f'MaxWords={SNIPPET_WORDS}, MinWords=10, MaxFragments=1'
+                ).label('snippet'),
+                rank
+            )
+            .outerjoin(FAQCategory, FAQCategory.id == FAQ.category_id)
+            .where(document.op('@@')(ts_query))
+            .order_by(rank.desc(), FAQ.id)
+            .limit(limit)
+        )
+
+    def search(self, session, query, limit=20):
+        results = [dict(row._mapping) for row in session.execute(self.statement(query, limit))]
+        for result in results:
+            result['snippet'] = escape_highlighted(result['snippet'])
+        return results
+
+def escape_highlighted(snippet):
+    """HTML-escape a ts_headline snippet, keeping only its highlight tags live"""
+    return (
+        html.escape(snippet or '')
+        .replace(html.escape(HIGHLIGHT_START), HIGHLIGHT_START)
+        .replace(html.escape(HIGHLIGHT_STOP), HIGHLIGHT_STOP)
+    )
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+STOPWORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'do', 'does', 'for', 'from', 'how', 'i', 'if',
+    'in', 'is', 'it', 'my', 'of', 'on', 'or', 'the', 'this', 'to', 'what', 'when', 'where', 'with', 'you', 'your'
+})
+
+def stem(token):
+    """
+    Light suffix stripping so 'bets'/'betting' meet 'bet'
+
+    A trailing 'e' is dropped after stripping, and from unsuffixed words,
+    so 'rule'/'rules', 'message'/'messages' and 'change'/'changed' agree.
+    """
+    for suffix in ('ing', 'ies', 'es', 's', 'ed'):
+        if suffix == 's' and token.endswith('ss'):
+            continue  # 'access', not 'acces'
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            token = token[:-len(suffix)]
+            if suffix == 'ies':
+                token += 'y'
+            elif suffix in ('ing', 'ed') and len(token) > 3 and token[-1] == token[-2]:
+                token = token[:-1]  # betting -> bett -> bet
+            break
+    if token.endswith('e') and len(token) > 3:
+        token = token[:-1]
+    return token
+
+def tokenize(text):
+    return [stem(token) for token in TOKEN_PATTERN.findall((text or '').lower()) if token not in STOPWORDS]
+
+# One built inverted index; replaced whole so searches never see half of a rebuild
+SearchIndex = namedtuple('SearchIndex', ['postings', 'documents', 'lengths', 'average_length'])
+
+EMPTY_INDEX = SearchIndex(postings={}, documents={}, lengths={}, average_length=0.0)
+
+class MemoryFAQSearch(FAQSearchBackend):
+    """
+    In-process BM25 over an inverted index, for SQLite and tests
+
+    The index is built from one joined query and rebuilt only when the
+    FAQ row count or the latest FAQ/category update changes. Question terms
+    count QUESTION_WEIGHT times, mirroring the A/B weights in Postgres.
+    A rebuild swaps in a new SearchIndex with one assignment, and each
+    search reads self.index once, so it scores against a single build.
+    """
+    name = 'memory'
+    K1 = 1.2
+    B = 0.75
+    QUESTION_WEIGHT = 3
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._signature = None
+        self.index = EMPTY_INDEX
+
+    def _current_signature(self, session):
+        return tuple(session.execute(select(
+            select(func.count(FAQ.id)).scalar_subquery(),
+            select(func.max(FAQ.updated_at)).scalar_subquery(),
+            select(func.max(FAQCategory.updated_at)).scalar_subquery()
+        )).one())
+
+    def build(self, session):
+        """(Re)build the inverted index from the FAQ table and swap it in"""
+        rows = session.execute(
+            select(FAQ.id, FAQ.question, FAQ.answer, FAQ.category_id, FAQCategory.name.label('category_name'))
+            .outerjoin(FAQCategory, FAQCategory.id == FAQ.category_id)
+        ).all()
+
+        postings = defaultdict(dict)
+        documents, lengths = {}, {}
+        for row in rows:
+            counts = Counter(tokenize(row.answer))
+            for token in tokenize(row.question):
+                counts[token] += self.QUESTION_WEIGHT
+            for token, count in counts.items():
+                postings[token][row.id] = count
+            lengths[row.id] = sum(counts.values())
+            documents[row.id] = row
+
+        self.index = SearchIndex(
+            postings=dict(postings),
+            documents=documents,
+            lengths=lengths,
+            average_length=sum(lengths.values()) / len(lengths) if lengths else 0.0
+        )
+        return self.index
+
+    def _ensure_current(self, session):
+        signature = self._current_signature(session)
+        if signature != self._signature:
+            with self._lock:
+                if signature != self._signature:
+                    self.build(session)
+                    self._signature = signature
+
+    def scores(self, terms, index=None):
+        """BM25 score per document id for the query terms"""
+        index = index or self.index
+        total = len(index.documents)
+        scores = defaultdict(float)
+        for term in set(terms):
+            postings = index.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings.items():
+                norm = self.K1 * (1 - self.B + self.B * index.lengths[doc_id] / (index.average_length or 1))
+                scores[doc_id] += idf * frequency * (self.K1 + 1) / (frequency + norm)
+        return scores
+
+    @staticmethod
+    def snippet(text, terms, words=SNIPPET_WORDS):
+        """Window of the answer with the most query terms, HTML-escaped, matches wrapped in <mark>"""
+        tokens = (text or '').split()
+        if not tokens:
+            return ''
+        hits = [1 if set(tokenize(token)) & terms else 0 for token in tokens]
+        best_start, best_hits, window = 0, -1, sum(hits[:words])
+        for start in range(max(len(tokens) - words + 1, 1)):
+            if start:
+                window += (hits[start + words - 1] if start + words - 1 < len(hits) else 0) - hits[start - 1]
+            if window > best_hits:
+                best_start, best_hits = start, window
+        chosen = [
+            f'{HIGHLIGHT_START}{html.escape(token)}{HIGHLIGHT_STOP}' if hit else html.escape(token)
+            for token, hit in zip(tokens[best_start:best_start + words], hits[best_start:best_start + words])
+        ]
+        return ('... ' if best_start else '') + ' '.join(chosen) + (' ...' if best_start + words < len(tokens) else '')
+
+    def search(self, session, query, limit=20):
+        self._ensure_current(session)
+        index = self.index
+        terms = tokenize(query)
+        ranked = sorted(self.scores(terms, index).items(), key=lambda item: (-item[1], item[0]))[:limit]
+        term_set = set(terms)
+        return [
+            {
+                'id': doc_id,
+                'question': index.documents[doc_id].question,
+                'category_id': index.documents[doc_id].category_id,
+                'category_name': index.documents[doc_id].category_name,
+                'snippet': self.snippet(index.documents[doc_id].answer, term_set),
+                'score': score
+            }
+            for doc_id, score in ranked
+        ]
+
+FAQ_SEARCH_BACKENDS = {
+    PostgresFAQSearch.name: PostgresFAQSearch,
+    MemoryFAQSearch.name: MemoryFAQSearch,
+}
+
+_search_instances = {}
+_search_lock = threading.Lock()
+
+def get_faq_search(session, name=None):
+    """
+    Return the shared FAQ search backend for this process
+
+    Args:
+        session: SQLAlchemy session, used to pick a backend for 'auto'
+        name: Backend name, defaults to Config.FAQ_SEARCH_BACKEND ('auto': postgres
+            on PostgreSQL, memory otherwise)
+
+    Returns:
+        FAQSearchBackend: Backend instance, created on first use
+    """
+    name = name or Config.FAQ_SEARCH_BACKEND
+    if name == 'auto':
+        name = PostgresFAQSearch.name if session.get_bind().dialect.name == 'postgresql' else MemoryFAQSearch.name
+    if name not in FAQ_SEARCH_BACKENDS:
+        raise ValueError(f'Unknown FAQ search backend: {name}')
+
+    if name not in _search_instances:
+        with _search_lock:
+            if name not in _search_instances:
+                _search_instances[name] = FAQ_SEARCH_BACKENDS[name]()
+    return _search_instances[name]
@@ -0,0 +1,238 @@
+# services/faq_views.py (buffered FAQ view counting and popularity)
+
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from sqlalchemy import Integer, bindparam, column, func, select, update, values
+
+from config import Config
+from  app.models.faq import FAQ
+
+logger = logging.getLogger(__name__)
+
+FLUSH_CHUNK = 1000  # ids per UPDATE, keeps the VALUES list well under bind limits
+
+class FAQViewBuffer:
+    """
+    Per-process FAQ view counts waiting to be written
+
+    Views are added under a lock and never touch the database; the buffer
+    reports itself due once flush_seconds have passed or max_pending views
+    are waiting, and drain() hands the counts to exactly one flusher.
+    """
+
+    def __init__(self, flush_seconds=None, max_pending=None):
+        self.flush_seconds = flush_seconds if flush_seconds is not None else Config.FAQ_VIEW_FLUSH_SECONDS
+        self.max_pending = max_pending if max_pending is not None else Config.FAQ_VIEW_FLUSH_MAX_PENDING
+        self._lock = threading.Lock()
+        self._views = Counter()
+        self._pending = 0
+        self._flushed_at = time.monotonic()
+
+    def record(self, faq_id, count=1):
+        """Count views of one FAQ"""
+        with self._lock:
+            self._views[faq_id] += count
+            self._pending += count
+
+    def due(self):
+        return self._pending > 0 and (
+            self._pending >= self.max_pending or time.monotonic() - self._flushed_at >= self.flush_seconds
+        )
+
+    def drain(self):
+        """Take all buffered counts, leaving the buffer empty"""
+        with self._lock:
+            views, self._views = self._views, Counter()
+            self._pending = 0
+            self._flushed_at = time.monotonic()
+        return views
+
+    def restore(self, views):
+        """Put back counts whose flush failed so they are retried"""
+        with self._lock:
+            self._views.update(views)
+            self._pending += sum(views.values())
+
+faq_views = FAQViewBuffer()
+
+# The process buffer gets one flusher thread and one exit hook, bound to the
+# first app that starts them; later create_app() calls (CLI, tests) reuse them
+_flusher_lock = threading.Lock()
+_process_flusher = None
+_exit_hook_registered = False
+
+def values_update(rows):
+    """UPDATE faqs ... FROM (VALUES (id, views), ...) AS v(id, views) for one chunk of (id, views) rows"""
+    table = FAQ.__table__
+    increments = values(column('id', Integer), column('views', Integer), name='v').data(rows)
+    return (
+        update(table)
+        .where(table.c.id == increments.c.id)
+        .values(view_count=func.coalesce(table.c.view_count, 0) + increments.c.views,
+                updated_at=table.c.updated_at)
+    )
+
+def add_view_counts(session, views):
+    """
+    Add view counts to faqs in one UPDATE per chunk of ids
+
+    PostgreSQL joins against an inline VALUES list
+    (UPDATE faqs SET view_count = faqs.view_count + v.views FROM (VALUES ...) AS v(id, views));
+    other databases run the same increment as one executemany. updated_at
+    is left alone so view traffic does not look like a content change.
+
+    Args:
+        session: SQLAlchemy session
+        views (dict): FAQ id -> views to add
+    """
+    table = FAQ.__table__
+    rows = [(faq_id, count) for faq_id, count in views.items() if count]
+    for start in range(0, len(rows), FLUSH_CHUNK):
+        chunk = rows[start:start + FLUSH_CHUNK]
+        if session.get_bind().dialect.name == 'postgresql':
+            session.execute(values_update(chunk))
+        else:
+            session.execute(
+                update(table)
+                .where(table.c.id == bindparam('faq_id'))
+                .values(view_count=func.coalesce(table.c.view_count, 0) + bindparam('views'),
+                        updated_at=table.c.updated_at),
+                [{'faq_id': faq_id, 'views': count} for faq_id, count in chunk]
+            )
+
+def refresh_popular(session, top_n=None):
+    """
+    Mark the top_n most viewed FAQs popular and clear the flag elsewhere
+
+    Only rows whose flag changes are written, so a stable ranking costs two
+    no-op UPDATEs and leaves updated_at (and the help-center snapshot) alone.
+
+    Returns:
+        list: Ids of the popular FAQs, most viewed first
+    """
+    top_n = top_n if top_n is not None else Config.FAQ_POPULAR_COUNT
+    table = FAQ.__table__
+    top_ids = list(session.execute(
+        select(table.c.id)
+        .where(table.c.view_count > 0)
+        .order_by(table.c.view_count.desc(), table.c.id)
+        .limit(top_n)
+    ).scalars())
+
+    session.execute(
+        update(table)
+        .where(table.c.id.in_(top_ids))
+        .where(table.c.is_popular.isnot(True))
+        .values(is_popular=True)
+    )
+    session.execute(
+        update(table)
+        .where(table.c.id.notin_(top_ids))
+        .where(table.c.is_popular.is_(True))
+        .values(is_popular=False)
+    )
+    return top_ids
+
+def flush_faq_views(session, buffer=None):
+    """
+    Write buffered views and recompute popularity in one transaction
+
+    Args:
+        session: SQLAlchemy session
+        buffer (FAQViewBuffer): Buffer to drain, defaults to this process's
+
+    Returns:
+        dict: FAQs updated, views written and popular FAQ ids
+    """
+    buffer = buffer if buffer is not None else faq_views
+    views = buffer.drain()
+    if not views:
+        return {'success': True, 'faqs': 0, 'views': 0, 'popular': None}
+
+    try:
+        add_view_counts(session, views)
+        popular = refresh_popular(session)
+        session.commit()
+    except Exception:
+        session.rollback()
+        buffer.restore(views)
+        raise
+
+    # Popular order follows view counts; other workers see it via the snapshot signature
+    from  app.services.help_center import help_center
+    help_center.invalidate()
+
+    logger.info(f"Flushed {sum(views.values())} views for {len(views)} FAQs")
+    return {'success': True, 'faqs': len(views), 'views': sum(views.values()), 'popular': popular}
+
+def _flush_in_app(app, buffer=None):
+    from  app import db
+    with app.app_context():
+        try:
+            flush_faq_views(db.session, buffer)
+        except Exception as e:
+            logger.warning(f"Could not flush FAQ views: {str(e)}")
+        finally:
+            db.session.remove()
+
+def start_view_flusher(app, buffer=None, interval=None):
+    """
+    Flush buffered views on a daemon thread every interval seconds
+
+    Requests only flush when a view arrives, so without this a worker that
+    goes quiet would hold its counts until it exits. The process buffer is
+    flushed by a single thread writing through the first app passed in;
+    further calls return that thread's stop event instead of starting
+    another that would race it for the same counts.
+
+    Args:
+        app: Flask app whose database receives the views
+        buffer (FAQViewBuffer): Buffer to drain, defaults to this process's
+        interval (float): Seconds between checks, defaults to the buffer's flush_seconds
+
+    Returns:
+        threading.Event: Set it to stop the thread
+    """
+    global _process_flusher
+
+    if buffer is not None:
+        return _start_flusher(app, buffer, interval)
+
+    with _flusher_lock:
+        if _process_flusher is None:
+            _process_flusher = _start_flusher(app, faq_views, interval)
+        return _process_flusher
+
+def _start_flusher(app, buffer, interval):
+    interval = interval if interval is not None else buffer.flush_seconds
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            if buffer.due():
+                _flush_in_app(app, buffer)
+
+    threading.Thread(target=run, name='faq-view-flusher', daemon=True).start()
+    return stop
+
+def flush_views_at_exit(app):
+    """
+    Write whatever views this process still holds when it shuts down
+
+    Registered once per process, through the first app passed in.
+
+    Returns:
+        bool: True if this call registered the hook
+    """
+    global _exit_hook_registered
+
+    with _flusher_lock:
+        if _exit_hook_registered:
+            return False
+        atexit.register(_flush_in_app, app)
+        _exit_hook_registered = True
+        return True
@@ -0,0 +1,279 @@
+# services/hedge_service.py (hedge stakes for pending bets)
+
+import itertools
+from collections import defaultdict
+
+import numpy as np
+from sqlalchemy.orm import selectinload
+
+from  app.models.bet import Bet
+from  app.ml.odds import parse_odds, american_to_decimal, american_to_implied, decimal_to_american
+
+WON_LEG_STATUSES = ('win', 'won')
+PENDING_LEG_STATUSES = ('pending',)
+
+# Parlays with more pending legs than this only get single-leg and all-remaining hedges
+MAX_COMBINATION_LEGS = 6
+
+# Margin assumed when estimating the other side's price from a leg's own odds
+DEFAULT_VIG = 0.045
+
+def estimate_opposing_decimal(american, vig=DEFAULT_VIG):
+    """
+    Estimate decimal odds of the opposite outcome from one side's American odds
+
+    The opposing implied probability is 1 - p + vig, i.e. the market is
+    assumed to carry the same margin on both sides.
+    """
+    implied = american_to_implied(american)
+    opposing = np.clip(1 - implied + vig, 0.01, 0.99)
+    return 1 / opposing
+
+def hedge_stakes(stake, total_return, hedge_decimal, partial_fraction=0.5):
+    """
+    Hedge stakes and outcomes for arrays of open positions
+
+    All arguments broadcast; each element is one (bet, pending leg) pair.
+
+    Args:
+        stake: Amount staked on the original bet
+        total_return: What the original bet returns if it wins (stake included)
+        hedge_decimal: Decimal odds available on the opposite outcome
+        partial_fraction (float): Share of the full hedge used for the partial hedge
+
+    Returns:
+        dict: Arrays for the full (equal-profit), break-even and partial hedges.
+            break_even_stake is NaN where breaking even on a loss would leave
+            the original win unprofitable.
+    """
+    stake = np.asarray(stake, dtype=np.float64)
+    total_return = np.asarray(total_return, dtype=np.float64)
+    hedge_decimal = np.asarray(hedge_decimal, dtype=np.float64)
+
+    # Full hedge: same profit whichever side wins
+    full_stake = total_return / hedge_decimal
+    full_profit = total_return - stake - full_stake
+
+    # Break-even: the hedge returns the original stake if the original loses
+    break_even_stake = stake / (hedge_decimal - 1)
+    break_even_profit = total_return - stake - break_even_stake
+    viable = break_even_profit >= 0
+    break_even_stake = np.where(viable, break_even_stake, np.nan)
+    break_even_profit = np.where(viable, break_even_profit, np.nan)
+
+    partial_stake = full_stake * partial_fraction
+    return {
+        'full_stake': full_stake,
+        'full_profit': full_profit,
+        'break_even_stake': break_even_stake,
+        'break_even_profit_if_original_wins': break_even_profit,
+        'partial_stake': partial_stake,
+        'partial_profit_if_original_wins': total_return - stake - partial_stake,
+        'partial_profit_if_hedge_wins': partial_stake * (hedge_decimal - 1) - stake
+    }
+
+def combination_decimal(leg_decimal, members):
+    """
+    Decimal odds for hedging a combination of legs, i.e. backing "at least
+    one of these legs loses" (laying the combination)
+
+    Each leg's win probability is taken from its hedge price
+    (1 - 1 / hedge decimal) and legs are treated as independent.
+
+    Args:
+        leg_decimal: Hedge decimal odds per leg row
+        members: (combinations, width) leg row indexes, padded with -1
+
+    Returns:
+        np.ndarray: Hedge decimal odds per combination
+    """
+    leg_decimal = np.asarray(leg_decimal, dtype=np.float64)
+    # Index -1 (padding) reads the appended 1.0 and leaves the product alone
+    win = np.append(1 - 1 / leg_decimal, 1.0)
+    all_win = np.prod(win[np.asarray(members, dtype=np.int64)], axis=1)
+    with np.errstate(divide='ignore'):
+        return 1 / (1 - all_win)
+
+def _open_positions(bets):
+    """
+    Flatten pending bets into one row per (bet, pending leg)
+
+    Single bets without legs count as one pending leg priced at the
+    bet's own odds. Bets without a positive stake and a return above it
+    have nothing to hedge and are skipped.
+    """
+    rows = []
+    for bet in bets:
+        legs = list(bet.legs)
+        stake = bet.amount or 0.0
+        total_return = stake + (bet.potential_payout or 0.0)
+        if stake <= 0 or total_return <= stake:
+            continue
+
+        if not legs:
+            rows.append({
+                'bet_id': bet.id, 'leg_id': None, 'odds': bet.odds,
+                'selection': bet.selection, 'hedge_against': None,
+                'stake': stake, 'total_return': total_return, 'remaining_legs': 1
+            })
+            continue
+
+        if any(leg.status not in WON_LEG_STATUSES + PENDING_LEG_STATUSES for leg in legs):
+            continue  # A leg already lost; nothing left to hedge
+
+        pending = [leg for leg in legs if leg.status in PENDING_LEG_STATUSES]
+        for leg in pending:
+            rows.append({
+                'bet_id': bet.id, 'leg_id': leg.id, 'odds': leg.odds,
+                'selection': leg.team_name, 'hedge_against': leg.opponent_name,
+                'stake': stake, 'total_return': total_return, 'remaining_legs': len(pending)
+            })
+    return rows
+
+def _leg_combinations(rows, max_legs=MAX_COMBINATION_LEGS):
+    """
+    Row indexes of every multi-leg combination of each parlay's pending legs
+
+    Parlays with more than max_legs pending legs only get the combination
+    of all of them, which keeps the row count linear in open bets.
+    """
+    by_bet = defaultdict(list)
+    for index, row in enumerate(rows):
+        if row['leg_id'] is not None:
+            by_bet[row['bet_id']].append(index)
+
+    combinations = []
+    for indexes in by_bet.values():
+        sizes = range(2, len(indexes) + 1) if len(indexes) <= max_legs else [len(indexes)]
+        for size in sizes:
+            combinations.extend(itertools.combinations(indexes, size))
+    return combinations
+
+def _position_key(leg_ids, bet_id):
+    """current_odds key: '<leg_id>', '<leg_id>+<leg_id>...' for combinations, 'bet-<id>' for singles"""
+    if not leg_ids:
+        return f'bet-{bet_id}'
+    return '+'.join(str(leg_id) for leg_id in sorted(leg_ids))
+
+def recommend_hedges(user_id, current_odds=None, partial_fraction=0.5, min_profit=None):
+    """
+    Hedge options for every pending leg, and every combination of pending
+    parlay legs, of a user's open bets
+
+    Args:
+        user_id (int): Owner of the bets
+        current_odds (dict, optional): Current odds on the opposite outcome,
+            keyed by leg id, '<leg_id>+<leg_id>' for a leg combination, or
+            'bet-<id>' for single bets. Missing prices are estimated from
+            the legs' own odds.
+        partial_fraction (float): Share of the full hedge for the partial option
+        min_profit (float, optional): Only return rows whose full hedge locks
+            in at least this profit
+
+    Returns:
+        dict: Hedge rows, best guaranteed profit first
+    """
+    current_odds = current_odds or {}
+    bets = (
+        Bet.query
+        .options(selectinload(Bet.legs))
+        .filter(Bet.user_id == user_id, Bet.status == 'pending')
+        .all()
+    )
+    rows = _open_positions(bets)
+    if not rows:
+        return {'success': True, 'hedges': []}
+
+    # Price each leg; legs with neither a usable quote nor parseable odds drop out
+    keys = [_position_key([row['leg_id']] if row['leg_id'] is not None else [], row['bet_id']) for row in rows]
+    quoted = american_to_decimal(parse_odds([current_odds.get(key) for key in keys]))
+    estimated = estimate_opposing_decimal(parse_odds([row['odds'] for row in rows]))
+    leg_decimal = np.where(np.isnan(quoted), estimated, quoted)
+    priced = np.isfinite(leg_decimal) & (leg_decimal > 1)
+
+    positions = [
+        dict(row, leg_ids=[row['leg_id']] if row['leg_id'] is not None else [])
+        for row in rows
+    ]
+    hedge_decimal = [leg_decimal]
+    is_quoted = [~np.isnan(quoted)]
+    valid = [priced]
+
+    combinations = [members for members in _leg_combinations(rows) if priced[list(members)].all()]
+    if combinations:
+        width = max(len(members) for members in combinations)
+        padded = np.full((len(combinations), width), -1, dtype=np.int64)
+        for index, members in enumerate(combinations):
+            padded[index, :len(members)] = members
+        combo_keys = [_position_key([rows[i]['leg_id'] for i in members], None) for members in combinations]
+        combo_quoted = american_to_decimal(parse_odds([current_odds.get(key) for key in combo_keys]))
+        combo_decimal = np.where(np.isnan(combo_quoted), combination_decimal(leg_decimal, padded), combo_quoted)
+
+        for members in combinations:
+            first = rows[members[0]]
+            positions.append({
+                'bet_id': first['bet_id'], 'leg_id': None,
+                'leg_ids': [rows[i]['leg_id'] for i in members],
+                'selection': ' + '.join(str(rows[i]['selection']) for i in members),
+                'hedge_against': None,
+                'stake': first['stake'], 'total_return': first['total_return'],
+                'remaining_legs': first['remaining_legs']
+            })
+        hedge_decimal.append(combo_decimal)
+        is_quoted.append(~np.isnan(combo_quoted))
+        valid.append(np.isfinite(combo_decimal) & (combo_decimal > 1))
+
+    hedge_decimal = np.concatenate(hedge_decimal)
+    is_quoted = np.concatenate(is_quoted)
+    keep = np.flatnonzero(np.concatenate(valid))
+    if not len(keep):
+        return {'success': True, 'hedges': []}
+    positions = [positions[index] for index in keep]
+    hedge_decimal = hedge_decimal[keep]
+    is_quoted = is_quoted[keep]
+
+    stakes = hedge_stakes(
+        [position['stake'] for position in positions],
+        [position['total_return'] for position in positions],
+        hedge_decimal,
+        partial_fraction
+    )
+    columns = {
+        name: np.where(np.isnan(values), None, np.round(values, 2)).tolist()
+        for name, values in stakes.items()
+    }
+    hedge_american = np.round(decimal_to_american(hedge_decimal)).tolist()
+
+    hedges = []
+    for index, position in enumerate(positions):
+        full_profit = columns['full_profit'][index]
+        if min_profit is not None and full_profit < min_profit:
+            continue
+        hedges.append({
+            'bet_id': position['bet_id'],
+            'leg_id': position['leg_id'],
+            'leg_ids': position['leg_ids'],
+            'selection': position['selection'],
+            'hedge_against': position['hedge_against'],
+            'remaining_legs': position['remaining_legs'],
+            # The hedge only locks in a result when it covers every leg still open
+            'guaranteed': max(len(position['leg_ids']), 1) == position['remaining_legs'],
+            'hedge_odds': hedge_american[index],
+            'odds_estimated': not bool(is_quoted[index]),
+            'full_hedge': {
+                'stake': columns['full_stake'][index],
+                'profit': full_profit
+            },
+            'break_even_hedge': {
+                'stake': columns['break_even_stake'][index],
+                'profit_if_original_wins': columns['break_even_profit_if_original_wins'][index]
+            },
+            'partial_hedge': {
+                'stake': columns['partial_stake'][index],
+                'profit_if_original_wins': columns['partial_profit_if_original_wins'][index],
+                'profit_if_hedge_wins': columns['partial_profit_if_hedge_wins'][index]
+            }
+        })
+
+    hedges.sort(key=lambda hedge: hedge['full_hedge']['profit'], reverse=True)
+    return {'success': True, 'hedges': hedges}
@@ -0,0 +1,216 @@
+# services/help_center.py (in-memory read model for the public help center)
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import namedtuple
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from config import Config
+from  app.models.faq import FAQ, FAQCategory
+
+logger = logging.getLogger(__name__)
+
+POPULAR_LIMIT = 5
+PREVIEW_LENGTH = 150
+
+# Serialized JSON body and its strong ETag, ready to send
+Resource = namedtuple('Resource', ['body', 'etag'])
+
+def make_resource(payload):
+    """Serialize a payload once and tag it with a hash of the exact bytes served"""
+    body = json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8')
+    return Resource(body=body, etag=hashlib.sha256(body).hexdigest()[:32])
+
+def _preview(answer):
+    return answer[:PREVIEW_LENGTH] + '...' if len(answer) > PREVIEW_LENGTH else answer
+
+class HelpCenterSnapshot:
+    """
+    Every public help-center response, pre-serialized
+
+    Built from three queries: categories, FAQs, and per-category counts
+    from one GROUP BY.
+    """
+
+    def __init__(self, categories, popular, faqs, by_slug):
+        self.categories = categories
+        self.popular = popular
+        self.faqs = faqs
+        self.by_slug = by_slug
+
+    @classmethod
+    def build(cls, session):
+        categories = session.execute(
+            select(FAQCategory.id, FAQCategory.name, FAQCategory.slug, FAQCategory.description)
+            .order_by(FAQCategory.id)
+        ).all()
+        counts = dict(session.execute(
+            select(FAQ.category_id, func.count(FAQ.id))
+            .where(FAQ.category_id.isnot(None))
+            .group_by(FAQ.category_id)
+        ).all())
+        faqs = session.execute(
+            select(FAQ.id, FAQ.question, FAQ.answer, FAQ.category_id, FAQ.is_popular, FAQ.view_count)
+            .order_by(FAQ.id)
+        ).all()
+
+        by_id = {category.id: category for category in categories}
+        in_category = {category.id: [] for category in categories}
+        for faq in faqs:
+            if faq.category_id in in_category:
+                in_category[faq.category_id].append(faq)
+
+        popular = sorted((faq for faq in faqs if faq.is_popular), key=lambda faq: (-(faq.view_count or 0), faq.id))
+
+        return cls(
+            categories=make_resource({
+                'success': True,
+                'categories': [
+                    {'id': category.id, 'title': category.name, 'slug': category.slug,
+                     'count': counts.get(category.id, 0)}
+                    for category in categories
+                ]
+            }),
+            popular=make_resource({
+                'success': True,
+                'questions': [
+                    {'id': faq.id, 'title': faq.question, 'category_id': faq.category_id}
+                    for faq in popular[:POPULAR_LIMIT]
+                ]
+            }),
+            faqs={
+                faq.id: make_resource({
+                    'success': True,
+                    'faq': {
+                        'id': faq.id,
+                        'question': faq.question,
+                        'answer': faq.answer,
+                        'category_id': faq.category_id,
+                        'category_name': by_id[faq.category_id].name if faq.category_id in by_id else None,
+                        'category_slug': by_id[faq.category_id].slug if faq.category_id in by_id else None
+                    }
+                })
+                for faq in faqs
+            },
+            by_slug={
+                category.slug: make_resource({
+                    'success': True,
+                    'category': {
+                        'id': category.id,
+                        'name': category.name,
+                        'slug': category.slug,
+                        'description': category.description
+                    },
+                    'faqs': [
+                        {'id': faq.id, 'question': faq.question, 'answer_preview': _preview(faq.answer)}
+                        for faq in in_category[category.id]
+                    ],
+                    'count': len(in_category[category.id])
+                })
+                for category in categories
+            }
+        )
+
+class HelpCenterCache:
+    """
+    Per-process help-center snapshot
+
+    Commits that touch FAQ or FAQCategory rows through the ORM, and this
+    worker's view flushes, drop the snapshot at once. Changes made by other
+    workers are picked up by comparing a cheap signature (row counts and
+    latest updated_at of both tables, plus total views so flushed counts
+    reorder "popular") at most every recheck_seconds.
+    """
+
+    def __init__(self, recheck_seconds=None):
+        self.recheck_seconds = recheck_seconds if recheck_seconds is not None else Config.HELP_CENTER_RECHECK_SECONDS
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._signature = None
+        self._checked_at = 0.0
+
+    @staticmethod
+    def signature(session):
+        return tuple(session.execute(select(
+            select(func.count(FAQ.id)).scalar_subquery(),
+            select(func.max(FAQ.updated_at)).scalar_subquery(),
+            select(func.sum(FAQ.view_count)).scalar_subquery(),
+            select(func.count(FAQCategory.id)).scalar_subquery(),
+            select(func.max(FAQCategory.updated_at)).scalar_subquery()
+        )).one())
+
+    def invalidate(self):
+        """Drop the snapshot so the next read rebuilds it"""
+        with self._lock:
+            self._snapshot = None
+
+    def get(self, session):
+        """
+        Current snapshot, rebuilt when missing or the tables changed
+
+        Args:
+            session: SQLAlchemy session
+
+        Returns:
+            HelpCenterSnapshot: Pre-serialized help-center responses
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked_at < self.recheck_seconds:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() - self._checked_at < self.recheck_seconds:
+                return self._snapshot
+            signature = self.signature(session)
+            if self._snapshot is None or signature != self._signature:
+                self._snapshot = HelpCenterSnapshot.build(session)
+                self._signature = signature
+                logger.info(f"Help center snapshot built: {len(self._snapshot.faqs)} FAQs")
+            self._checked_at = time.monotonic()
+            return self._snapshot
+
+help_center = HelpCenterCache()
+
+def warm_help_center(app):
+    """
+    Build the snapshot on the app's first request
+
+    Deferred to a request so CLI commands and test apps, which never serve
+    the help center, do not query for it; a missing table just leaves it to
+    the first help-center request.
+    """
+    warmed = threading.Event()
+
+    @app.before_request
+    def _warm_help_center():
+        if warmed.is_set():
+            return
+        warmed.set()
+        from  app import db
+        try:
+            help_center.get(db.session)
+        except Exception as e:
+            db.session.rollback()
+            logger.info(f"Help center snapshot deferred: {str(e)}")
+
+HELP_CENTER_MODELS = (FAQ, FAQCategory)
+
+@event.listens_for(Session, 'after_flush')
+def _track_help_center_changes(session, flush_context):
+    if any(isinstance(instance, HELP_CENTER_MODELS)
+           for instance in (*session.new, *session.dirty, *session.deleted)):
+        session.info['help_center_changed'] = True
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_on_commit(session):
+    if session.info.pop('help_center_changed', False):
+        help_center.invalidate()
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_on_rollback(session):
+    session.info.pop('help_center_changed', None)
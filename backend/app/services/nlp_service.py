@@ -2,14 +2,35 @@ import re
 import spacy
 from collections import defaultdict
 
+from app.utils.slip_scoring import calculate_confidence
+
 nlp = spacy.load("en_core_web_md")
 
 def process_text(text):
     """
     Process text input to extract betting information using NLP
     """
-    doc = nlp(text)
+    return _extract_bet_data(nlp(text), text)
+
+def process_texts(texts, batch_size=32):
+    """
+    Process many texts in one spaCy pipe pass
     
+    Args:
+        texts: List of texts to process
+        batch_size: Number of texts spaCy tokenizes and tags per batch
+        
+    Returns:
+        list: One bet data dictionary per input text, in input order
+    """
+    texts = [text or '' for text in texts]
+    return [
+        _extract_bet_data(doc, text)
+        for doc, text in zip(nlp.pipe(texts, batch_size=batch_size), texts)
+    ]
+
+def _extract_bet_data(doc, text):
+    """Build the bet data dictionary from a parsed spaCy document"""
     bet_data = {
         'original_text': text,
         'teams': [],
@@ -104,19 +125,3 @@ def extract_amount_from_text(text):
             return match.group(0)
     
     return None
-
-def calculate_confidence(bet_data):
-    """Calculate a confidence score for the extraction"""
-    score = 0
-    total_fields = 4  
-    
-    if bet_data['teams']:
-        score += 1
-    if bet_data['odds']:
-        score += 1
-    if bet_data['bet_type'] != 'Unknown':
-        score += 1
-    if bet_data['sport'] != 'Unknown':
-        score += 1
-    
-    return (score / total_fields) * 100
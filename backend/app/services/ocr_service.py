@@ -1,6 +1,29 @@
-from google.cloud import vision
 import io
+import logging
 import re
+import threading
+import time
+
+try:
+    from google.cloud import vision
+except ImportError:  # Offline installs only ship the local engine
+    vision = None
+
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
+try:
+    from PIL import Image, ImageChops, ImageOps
+except ImportError:
+    Image = None
+
+from config import Config
+from app.services.slip_templates import parse_slip
+from app.utils.slip_scoring import calculate_confidence, calculate_integrity_score
+
+logger = logging.getLogger(__name__)
 
 class OCRService:
     """Service for processing betting slip images using OCR"""
@@ -68,31 +91,210 @@ class OCRService:
         
         return 'Unknown'
 
-def process_image(image_url):
+class OCRBackend:
     """
-    Process an image using Google Cloud Vision OCR
-    Extract text and betting information
+    Interface for OCR engines
+    
+    detect_text returns a dict with the full text and word-level boxes:
+    {'text': str, 'words': [{'text': str, 'box': (x0, y0, x1, y1)}, ...]}
+    """
+    name = 'base'
+    supports_uri = False
+    
+    def detect_text(self, content):
+        """Run OCR over raw image bytes"""
+        raise NotImplementedError
+    
+    def detect_text_uri(self, uri):
+        """Run OCR over an image the engine can fetch itself (e.g. gs://)"""
+        raise NotImplementedError(f'{self.name} backend cannot read {uri}')
+
+class VisionOCRBackend(OCRBackend):
+    """
+    Google Cloud Vision backend
+    
+    The ImageAnnotatorClient is created once per process and shared across
+    threads; its gRPC channel multiplexes concurrent requests, so callers
+    reuse one pooled connection instead of opening a new one per slip.
     """
-    client = vision.ImageAnnotatorClient()
+    name = 'vision'
+    supports_uri = True
+    
+    def __init__(self):
+        if vision is None:
+            raise RuntimeError('google-cloud-vision is not installed')
+        self._client = None
+        self._lock = threading.Lock()
+    
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = vision.ImageAnnotatorClient()
+        return self._client
     
-    if image_url.startswith('gs://'):
+    def detect_text(self, content):
+        return self._annotate(vision.Image(content=content))
+    
+    def detect_text_uri(self, uri):
         image = vision.Image()
-        image.source.image_uri = image_url
-    else:
-        with io.open(image_url, 'rb') as image_file:
-            content = image_file.read()
-        image = vision.Image(content=content)
+        image.source.image_uri = uri
+        return self._annotate(image)
+    
+    def _annotate(self, image):
+        response = self.client.text_detection(image=image)
+        if response.error.message:
+            raise RuntimeError(f'Vision API error: {response.error.message}')
+        
+        texts = response.text_annotations
+        if not texts:
+            return {'text': '', 'words': []}
+        
+        # The first annotation is the full text, the rest are single words
+        words = []
+        for annotation in texts[1:]:
+            xs = [vertex.x for vertex in annotation.bounding_poly.vertices]
+            ys = [vertex.y for vertex in annotation.bounding_poly.vertices]
+            words.append({
+                'text': annotation.description,
+                'box': (min(xs), min(ys), max(xs), max(ys))
+            })
+        
+        return {'text': texts[0].description, 'words': words}
+
+class TesseractOCRBackend(OCRBackend):
+    """Local Tesseract backend for tests and offline use"""
+    name = 'tesseract'
     
-    response = client.text_detection(image=image)
-    texts = response.text_annotations
+    def __init__(self, lang='eng', config='--psm 6'):
+        if pytesseract is None or Image is None:
+            raise RuntimeError('pytesseract and Pillow are required for the tesseract backend')
+        self.lang = lang
+        self.config = config
     
-    if not texts:
-        return {'success': False, 'text': '', 'message': 'No text detected in image'}
+    def detect_text(self, content):
+        image = Image.open(io.BytesIO(content))
+        data = pytesseract.image_to_data(
+            image,
+            lang=self.lang,
+            config=self.config,
+            output_type=pytesseract.Output.DICT
+        )
+        
+        words = []
+        lines = {}
+        for i, word in enumerate(data['text']):
+            word = word.strip()
+            if not word:
+                continue
+            
+            left, top = data['left'][i], data['top'][i]
+            words.append({
+                'text': word,
+                'box': (left, top, left + data['width'][i], top + data['height'][i])
+            })
+            line_key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            lines.setdefault(line_key, []).append(word)
+        
+        text = '\n'.join(' '.join(line) for _, line in sorted(lines.items()))
+        return {'text': text, 'words': words}
+
+OCR_BACKENDS = {
+    VisionOCRBackend.name: VisionOCRBackend,
+    TesseractOCRBackend.name: TesseractOCRBackend,
+}
+
+_backend_instances = {}
+_backend_lock = threading.Lock()
+
+def get_ocr_backend(name=None):
+    """
+    Return the shared OCR backend instance for this process
+    
+    Args:
+        name: Backend name, defaults to Config.OCR_BACKEND
+        
+    Returns:
+        OCRBackend: Backend instance, created on first use
+    """
+    name = name or Config.OCR_BACKEND
+    if name not in OCR_BACKENDS:
+        raise ValueError(f'Unknown OCR backend: {name}')
+    
+    if name not in _backend_instances:
+        with _backend_lock:
+            if name not in _backend_instances:
+                _backend_instances[name] = OCR_BACKENDS[name]()
+    return _backend_instances[name]
+
+def preprocess_image(content, max_dimension=1600, grayscale=True, crop=True):
+    """
+    Shrink an image before OCR
+    
+    Downscales so the longest side is at most max_dimension, converts to
+    grayscale and crops uniform borders around the slip. Returns the
+    original bytes untouched when Pillow is unavailable or the image
+    cannot be decoded.
+    
+    Args:
+        content: Raw image bytes
+        max_dimension: Longest side in pixels after resizing
+        grayscale: Convert to single-channel grayscale
+        crop: Trim borders that match the corner background colour
+        
+    Returns:
+        bytes: PNG-encoded processed image (or the input bytes)
+    """
+    if Image is None:
+        return content
+    
+    try:
+        image = Image.open(io.BytesIO(content))
+        image = ImageOps.exif_transpose(image)
+    except Exception:
+        return content
+    
+    if grayscale:
+        image = image.convert('L')
+    elif image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
     
-    full_text = texts[0].description
+    if crop:
+        background = Image.new(image.mode, image.size, image.getpixel((0, 0)))
+        diff = ImageChops.difference(image, background).convert('L')
+        # Ignore faint noise (JPEG artifacts) when looking for content
+        bbox = diff.point(lambda value: 255 if value > 24 else 0).getbbox()
+        if bbox:
+            image = image.crop(bbox)
+    
+    if max(image.size) > max_dimension:
+        image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+    
+    output = io.BytesIO()
+    image.save(output, format='PNG', optimize=False)
+    return output.getvalue()
+
+def _read_image_content(image_url):
+    """Load raw bytes from bytes, a buffer with getvalue() or a local path"""
+    if isinstance(image_url, (bytes, bytearray)):
+        return bytes(image_url)
+    if hasattr(image_url, 'getvalue'):
+        return image_url.getvalue()
+    with io.open(image_url, 'rb') as image_file:
+        return image_file.read()
+
+def extract_bet_info(ocr_output):
+    """
+    Build the bet info dictionary from an OCR backend result
+    """
+    full_text = ocr_output.get('text', '')
+    if not full_text:
+        return {'success': False, 'text': '', 'message': 'No text detected in image'}
     
     bet_info = {
         'text': full_text,
+        'words': ocr_output.get('words', []),
         'success': True
     }
     
@@ -101,4 +303,190 @@ def process_image(image_url):
     bet_info['amount'] = OCRService.extract_amount(full_text)
     bet_info['bet_type'] = OCRService.identify_bet_type(full_text)
     
-    return bet_info
\ No newline at end of file
+    # Known sportsbook layouts are parsed from the word boxes in one pass
+    template_result = parse_slip(full_text, bet_info['words'])
+    if template_result:
+        bet_info['sportsbook'] = template_result['sportsbook']
+        bet_info['legs'] = template_result['legs']
+        bet_info['payout'] = template_result['payout']
+        bet_info['teams'] = template_result['teams'] or bet_info['teams']
+        bet_info['odds'] = template_result['odds']
+        bet_info['amount'] = template_result['amount'] or bet_info['amount']
+        bet_info['bet_type'] = template_result['bet_type'] or bet_info['bet_type']
+    
+    return bet_info
+
+class OCRCascadeStats:
+    """Process-wide counters for the local-first OCR cascade"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.escalations = 0
+            self.cloud_errors = 0
+            self.cost_usd = 0.0
+            self.latency_ms = 0.0
+    
+    def record(self, stats):
+        with self._lock:
+            self.requests += 1
+            self.escalations += int(stats['escalated'])
+            self.cloud_errors += int(stats['cloud_error'] is not None)
+            self.cost_usd += stats['cost_usd']
+            self.latency_ms += stats['latency_ms']['total']
+    
+    def snapshot(self):
+        """Return totals plus escalation rate and mean latency"""
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'escalations': self.escalations,
+                'escalation_rate': self.escalations / self.requests if self.requests else 0.0,
+                'cloud_errors': self.cloud_errors,
+                'cost_usd': round(self.cost_usd, 6),
+                'mean_latency_ms': self.latency_ms / self.requests if self.requests else 0.0
+            }
+
+cascade_stats = OCRCascadeStats()
+
+# OCR text never yields a sport, so the most a slip can score on the fields
+# OCR does extract; cascade thresholds are fractions of these
+OCR_MAX_INTEGRITY = 90  # calculate_integrity_score without its 10 sport points
+OCR_MAX_CONFIDENCE = 75  # calculate_confidence with 3 of its 4 fields
+
+def _resolve_backend(backend):
+    return backend if isinstance(backend, OCRBackend) else get_ocr_backend(backend)
+
+def process_image_cascade(content, local_backend='tesseract', cloud_backend='vision', threshold=None,
+                          min_confidence=None, cloud_cost=None):
+    """
+    Run the local OCR engine first and escalate to the cloud only when needed
+    
+    The local result goes through the same extract_* regexes as the cloud
+    result and is scored with calculate_integrity_score and
+    calculate_confidence. Both thresholds are scaled to the fields OCR can
+    fill (OCR_MAX_INTEGRITY, OCR_MAX_CONFIDENCE), so 100 means every one of
+    them. Slips below either threshold (or failing locally) are sent to the
+    cloud backend. If the cloud call fails the
+    local result is kept and the error is recorded in the stats.
+    
+    Args:
+        content: Pre-processed image bytes
+        local_backend: Name or instance of the cheap local engine
+        cloud_backend: Name or instance of the cloud engine used for escalation
+        threshold: Minimum integrity score (0-100) to accept the local
+            result, defaults to Config.OCR_CASCADE_THRESHOLD
+        min_confidence: Minimum extraction confidence (0-100), defaults to
+            Config.OCR_CASCADE_MIN_CONFIDENCE
+        cloud_cost: USD per cloud request, defaults to Config.OCR_CLOUD_COST_PER_IMAGE
+        
+    Returns:
+        dict: Bet info as returned by process_image, plus 'ocr_stats'
+    """
+    threshold = Config.OCR_CASCADE_THRESHOLD if threshold is None else threshold
+    min_confidence = Config.OCR_CASCADE_MIN_CONFIDENCE if min_confidence is None else min_confidence
+    cloud_cost = Config.OCR_CLOUD_COST_PER_IMAGE if cloud_cost is None else cloud_cost
+    threshold = threshold * OCR_MAX_INTEGRITY / 100
+    min_confidence = min_confidence * OCR_MAX_CONFIDENCE / 100
+    local_backend = _resolve_backend(local_backend)
+    
+    stats = {
+        'engine': local_backend.name,
+        'escalated': False,
+        'local_score': None,
+        'local_confidence': None,
+        'score': None,
+        'threshold': threshold,
+        'min_confidence': min_confidence,
+        'cloud_error': None,
+        'cost_usd': 0.0,
+        'latency_ms': {'local': None, 'cloud': None, 'total': 0.0}
+    }
+    
+    bet_info = None
+    started = time.perf_counter()
+    try:
+        bet_info = extract_bet_info(local_backend.detect_text(content))
+        if bet_info['success']:
+            stats['local_score'] = calculate_integrity_score(bet_info)
+            stats['local_confidence'] = calculate_confidence(bet_info)
+    except Exception as e:
+        logger.warning(f"Local OCR ({local_backend.name}) failed, escalating: {str(e)}")
+    stats['latency_ms']['local'] = (time.perf_counter() - started) * 1000
+    stats['score'] = stats['local_score']
+    
+    confident = (
+        stats['local_score'] is not None
+        and stats['local_score'] >= threshold
+        and stats['local_confidence'] >= min_confidence
+    )
+    if not confident:
+        stats['escalated'] = True
+        cloud_started = time.perf_counter()
+        try:
+            cloud = _resolve_backend(cloud_backend)
+            cloud_info = extract_bet_info(cloud.detect_text(content))
+        except Exception as e:
+            # Quota, network or credentials: fall back to whatever the local pass found
+            logger.warning(f"Cloud OCR failed, keeping the local result: {str(e)}")
+            stats['cloud_error'] = str(e)
+            cloud_info = None
+        stats['latency_ms']['cloud'] = (time.perf_counter() - cloud_started) * 1000
+        
+        if cloud_info is not None:
+            stats['cost_usd'] = cloud_cost
+            # Keep the local result if the cloud did no better
+            cloud_score = calculate_integrity_score(cloud_info) if cloud_info['success'] else None
+            if bet_info is None or not bet_info['success'] or (cloud_score or 0) >= (stats['local_score'] or 0):
+                bet_info = cloud_info
+                stats['engine'] = cloud.name
+                stats['score'] = cloud_score
+    
+    if bet_info is None:
+        bet_info = {'success': False, 'text': '', 'message': 'OCR failed on both engines'}
+    
+    stats['latency_ms']['total'] = (time.perf_counter() - started) * 1000
+    cascade_stats.record(stats)
+    logger.info(
+        f"OCR cascade: engine={stats['engine']} escalated={stats['escalated']} "
+        f"local_score={stats['local_score']} cloud_error={stats['cloud_error'] is not None} "
+        f"latency_ms={stats['latency_ms']['total']:.1f} cost_usd={stats['cost_usd']}"
+    )
+    
+    bet_info['ocr_stats'] = stats
+    return bet_info
+
+def process_image(image_url, backend=None, preprocess=True):
+    """
+    Process an image with the configured OCR backend
+    Extract text and betting information
+    
+    Args:
+        image_url: gs:// URI, local file path, raw image bytes or a
+            buffer with getvalue() (e.g. UploadBuffer)
+        backend: OCRBackend instance or name (defaults to Config.OCR_BACKEND);
+            'cascade' runs the local engine first, see process_image_cascade
+        preprocess: Downscale/grayscale/crop before OCR
+    """
+    if not isinstance(backend, OCRBackend):
+        backend = backend or Config.OCR_BACKEND
+        if backend != 'cascade':
+            backend = get_ocr_backend(backend)
+    
+    if isinstance(image_url, str) and image_url.startswith('gs://'):
+        if backend == 'cascade':
+            backend = get_ocr_backend(VisionOCRBackend.name)
+        return extract_bet_info(backend.detect_text_uri(image_url))
+    
+    content = _read_image_content(image_url)
+    if preprocess:
+        content = preprocess_image(content)
+    
+    if backend == 'cascade':
+        return process_image_cascade(content)
+    
+    return extract_bet_info(backend.detect_text(content))
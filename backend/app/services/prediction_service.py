@@ -1,4 +1,5 @@
-from  app.ml.model import load_model, predict
+from  app.ml.model import predict
+from  app.ml.registry import get_model
 from  app.services.sentiment_analysis import analyze_sentiment
 import numpy as np
 
@@ -6,7 +7,7 @@ def predict_outcome(bet_data, reddit_data=None):
     """
     Generate predictions for a bet based on the AI model
     """
-    model = load_model()
+    model = get_model().model
     
     features = prepare_features(bet_data, reddit_data)
     
@@ -35,7 +36,6 @@ def prepare_features(bet_data, reddit_data=None):
         features['positive_sentiment'] = sentiment_scores['pos']
         features['negative_sentiment'] = sentiment_scores['neg']
     
-    
     return features
 
 def generate_hedging_recommendation(prediction):
@@ -0,0 +1,294 @@
+# services/reddit_async.py (asyncio Reddit scraper)
+
+import asyncio
+import heapq
+import logging
+import os
+import time
+from typing import AsyncIterator, Dict, List
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from  app.services.reddit_scraper import (
+    EXTRACT_BATCH_SIZE, REDDIT_PAGE_SIZE, SUBREDDITS_BY_SPORT, RedditPost, _build_reddit_posts, post_fields,
+    subreddit_names
+)
+
+logger = logging.getLogger(__name__)
+
+REDDIT_OAUTH_URL = 'https://oauth.reddit.com'
+REDDIT_TOKEN_URL = 'https://www.reddit.com/api/v1/access_token'
+
+# Smoothed posts/hour per subreddit, kept across scrape_latest_posts_async calls
+subreddit_velocity: Dict[str, float] = {}
+
+class TokenBucket:
+    """
+    Async token bucket kept in step with Reddit's rate-limit headers
+
+    Starts at rate tokens/second; every response resets the bucket to the
+    server's X-Ratelimit-Remaining and spreads those requests evenly over
+    the X-Ratelimit-Reset window, so bursts never outrun the quota.
+    """
+
+    def __init__(self, rate=1.0, capacity=10):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def update_from_headers(self, headers):
+        """Apply X-Ratelimit-Remaining / X-Ratelimit-Reset from a response"""
+        try:
+            remaining = float(headers['X-Ratelimit-Remaining'])
+            reset = max(float(headers['X-Ratelimit-Reset']), 1.0)
+        except (KeyError, TypeError, ValueError):
+            return
+
+        if remaining < 1:
+            # Quota spent: wait for the window to reset at the current rate
+            self.pause(reset)
+            return
+
+        self._refill()
+        # Requests already counted against tokens are in flight; never go above remaining
+        self.tokens = min(self.tokens, remaining)
+        self.rate = remaining / reset
+
+    def pause(self, seconds):
+        """Block new requests for seconds (429 Retry-After)"""
+        self._refill()
+        self.tokens = -seconds * self.rate
+
+class ListingPost:
+    """Attribute view of a listing child, matching the PRAW Submission fields the scraper reads"""
+
+    def __init__(self, data):
+        self.id = data['id']
+        self.fullname = data.get('name') or f"t3_{data['id']}"
+        self.title = data.get('title', '')
+        self.selftext = data.get('selftext', '')
+        self.url = data.get('url')
+        self.author = data.get('author')
+        self.created_utc = float(data.get('created_utc', 0))
+        self.score = data.get('score', 0)
+        self.num_comments = data.get('num_comments', 0)
+
+class AsyncRedditClient:
+    """
+    Minimal Reddit listing client over aiohttp
+
+    Args:
+        session: aiohttp.ClientSession
+        base_url (str): API root; a local mock server in benchmarks and tests
+        token (str, optional): OAuth bearer token
+        bucket (TokenBucket, optional): Shared rate limiter
+    """
+
+    def __init__(self, session, base_url=REDDIT_OAUTH_URL, token=None, bucket=None, user_agent=None):
+        self.session = session
+        self.base_url = base_url.rstrip('/')
+        self.bucket = bucket or TokenBucket()
+        self.headers = {'User-Agent': user_agent or os.environ.get('REDDIT_USER_AGENT', 'Clutch-It Scraper v1.0')}
+        if token:
+            self.headers['Authorization'] = f'bearer {token}'
+        self.requests = 0
+        self.throttled = 0
+
+    @staticmethod
+    async def fetch_token(session, client_id=None, client_secret=None):
+        """Application-only OAuth token (client credentials grant)"""
+        auth = aiohttp.BasicAuth(
+            client_id or os.environ.get('REDDIT_CLIENT_ID'),
+            client_secret or os.environ.get('REDDIT_CLIENT_SECRET')
+        )
+        async with session.post(REDDIT_TOKEN_URL, auth=auth, data={'grant_type': 'client_credentials'}) as response:
+            response.raise_for_status()
+            return (await response.json())['access_token']
+
+    async def _get(self, path, params, retries=3):
+        for attempt in range(retries + 1):
+            await self.bucket.acquire()
+            self.requests += 1
+            async with self.session.get(f'{self.base_url}{path}', params=params, headers=self.headers) as response:
+                self.bucket.update_from_headers(response.headers)
+                if response.status == 429 and attempt < retries:
+                    self.throttled += 1
+                    self.bucket.pause(float(response.headers.get('Retry-After', 2 ** attempt)))
+                    continue
+                response.raise_for_status()
+                return await response.json()
+
+    async def listing(self, subreddit, sort='new', limit=None, page_size=REDDIT_PAGE_SIZE) -> AsyncIterator[ListingPost]:
+        """
+        Stream a subreddit listing post by post
+
+        Pages are requested only as the caller consumes them, so breaking
+        out of the loop stops fetching.
+        """
+        after = None
+        yielded = 0
+        while limit is None or yielded < limit:
+            params = {'limit': page_size, 'raw_json': 1}
+            if after:
+                params['after'] = after
+            payload = await self._get(f'/r/{subreddit}/{sort}.json', params)
+            children = payload.get('data', {}).get('children', [])
+            for child in children:
+                yield ListingPost(child['data'])
+                yielded += 1
+                if limit is not None and yielded >= limit:
+                    return
+            after = payload.get('data', {}).get('after')
+            if not after or not children:
+                return
+
+class AsyncRedditScraper:
+    """
+    Scrapes every configured subreddit concurrently under one rate limit
+
+    Subreddits are scheduled by post velocity (posts/hour seen on the
+    previous run, smoothed), busiest first, so when the quota is tight the
+    high-volume subreddits are never the ones left waiting. Listings are
+    streamed newest first and abandoned at the first post older than the
+    time threshold or the subreddit's stop_at fullname.
+    """
+
+    def __init__(self, client, subreddits_by_sport=None, concurrency=8, smoothing=0.5, velocity=None,
+                 executor=None):
+        """
+        Args:
+            client (AsyncRedditClient): Listing client
+            subreddits_by_sport (dict, optional): Sport -> subreddits, defaults to SUBREDDITS_BY_SPORT
+            concurrency (int): Subreddits fetched at once
+            smoothing (float): Weight of the newest velocity sample
+            velocity (dict, optional): Velocities from earlier runs, updated in place
+            executor (Executor, optional): Runs bet extraction off the event loop;
+                the loop's default thread pool when omitted
+        """
+        self.client = client
+        self.subreddits_by_sport = subreddits_by_sport or SUBREDDITS_BY_SPORT
+        self.concurrency = concurrency
+        self.smoothing = smoothing
+        self.velocity: Dict[str, float] = velocity if velocity is not None else {}
+        self.executor = executor
+
+    @property
+    def subreddits(self) -> List[str]:
+        """Every configured subreddit once, in configuration order"""
+        return subreddit_names(self.subreddits_by_sport)
+
+    def schedule(self, subreddits) -> List[str]:
+        """Subreddits ordered by smoothed velocity, unseen ones first"""
+        queue = [(-self.velocity.get(name, float('inf')), index, name) for index, name in enumerate(subreddits)]
+        heapq.heapify(queue)
+        return [heapq.heappop(queue)[2] for _ in range(len(queue))]
+
+    async def scrape(self, hours_back=24, limit=REDDIT_PAGE_SIZE * 5, stop_at=None, bets_only=True) -> List[RedditPost]:
+        """
+        Scrape recent posts from every subreddit
+
+        Args:
+            hours_back (int): Ignore posts older than this
+            limit (int): Most posts read per subreddit
+            stop_at (dict, optional): Subreddit -> fullname already stored (e.g. a watermark)
+            bets_only (bool): Keep only posts with extracted bets
+
+        Returns:
+            list: RedditPost results
+        """
+        stop_at = stop_at or {}
+        threshold = time.time() - hours_back * 3600
+        queue = asyncio.Queue()
+        for name in self.schedule(self.subreddits):
+            queue.put_nowait(name)
+
+        results: List[RedditPost] = []
+
+        async def worker():
+            while True:
+                try:
+                    name = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    posts = await self._scrape_subreddit(name, threshold, limit, stop_at.get(name), bets_only)
+                    results.extend(posts)
+                except Exception as e:
+                    logger.error(f"Error scraping r/{name}: {str(e)}")
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        return results
+
+    async def _scrape_subreddit(self, name, threshold, limit, stop_fullname, bets_only):
+        loop = asyncio.get_running_loop()
+        extracting = []
+        batch = []
+        seen = 0
+        oldest = None
+        async for post in self.client.listing(name, 'new', limit=limit):
+            if post.created_utc < threshold or post.fullname == stop_fullname:
+                break
+            seen += 1
+            oldest = post.created_utc
+            batch.append(post_fields(post, name))
+            if len(batch) >= EXTRACT_BATCH_SIZE:
+                # Regex and NLP work would block every in-flight fetch if run on the loop
+                extracting.append(loop.run_in_executor(self.executor, _build_reddit_posts, batch, self.subreddits_by_sport))
+                batch = []
+        if batch:
+            extracting.append(loop.run_in_executor(self.executor, _build_reddit_posts, batch, self.subreddits_by_sport))
+
+        self._update_velocity(name, seen, oldest if seen >= limit else threshold)
+        extracted = await asyncio.gather(*extracting)
+        return [post for posts in extracted for post in posts if post.bet_info or not bets_only]
+
+    def _update_velocity(self, name, seen, since):
+        """Smoothed posts/hour; since is the start of the window that was fully read"""
+        hours = max((time.time() - since) / 3600, 1 / 60)
+        sample = seen / hours
+        previous = self.velocity.get(name)
+        self.velocity[name] = sample if previous is None else (
+            self.smoothing * sample + (1 - self.smoothing) * previous
+        )
+
+async def scrape_latest_posts_async(hours_back=24, limit=REDDIT_PAGE_SIZE * 5, concurrency=8, base_url=None) -> List[RedditPost]:
+    """
+    Asyncio scrape with an application OAuth token
+
+    Each call opens its own HTTP session, but subreddit velocities carry
+    over in subreddit_velocity so later runs schedule the busiest first.
+
+    Args:
+        hours_back (int): Ignore posts older than this
+        limit (int): Most posts read per subreddit
+        concurrency (int): Subreddits fetched at once
+        base_url (str, optional): API root override (mock servers)
+    """
+    if aiohttp is None:
+        raise RuntimeError('aiohttp is not installed')
+
+    async with aiohttp.ClientSession() as session:
+        token = None if base_url else await AsyncRedditClient.fetch_token(session)
+        client = AsyncRedditClient(session, base_url=base_url or REDDIT_OAUTH_URL, token=token)
+        scraper = AsyncRedditScraper(client, concurrency=concurrency, velocity=subreddit_velocity)
+        return await scraper.scrape(hours_back, limit)
@@ -1,12 +1,51 @@
-import praw
+import hashlib
 import os
+import time
 from datetime import datetime, timedelta
 import re
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator
 import logging
-from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor
+import queue
+import threading
+from collections import deque
+from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from functools import lru_cache
+from itertools import chain
+
+from config import Config
+from app.utils.teams import resolve_team_id
+from app.utils.upsert import dialect_insert
+
+try:
+    import praw
+except ImportError:
+    praw = None
+
+REDDIT_PAGE_SIZE = 100  # Reddit's maximum listing page
+
+DAILY_THREAD_PATTERN = re.compile(r'\b(?:daily|pick(?:s|\s+of\s+the\s+day)?|potd)\b.*\bthread\b', re.IGNORECASE)
+
+# A team name: one to four words on one line, starting at a word boundary.
+# The old ([A-Za-z\s]+)\s* prefix let every position of a long run of
+# words retry the whole run (quadratic on long posts); here a match can
+# only start at a word and cover at most four of them, so each search is
+# linear in the text length.
+_TEAM = r'\b([A-Za-z]+(?:[ \t]+[A-Za-z]+){0,3})'
+
+BET_PATTERNS = {
+    'spread': re.compile(_TEAM + r'[ \t]{0,3}([-+]\d{1,4}(?:\.\d{1,2})?)(?:[ \t]{0,3}points?)?'),
+    'moneyline': re.compile(_TEAM + r'[ \t]+ML[ \t]{0,3}([-+]\d{1,4})'),
+    'over_under': re.compile(r'\b(?:over|under)\s{1,3}(\d{1,4}(?:\.\d{1,2})?)', re.IGNORECASE),
+    'parlay': re.compile(r'parlay', re.IGNORECASE),
+    'stake': re.compile(r'\$(\d+(?:\.\d{2})?)', re.IGNORECASE)
+}
+
+POSITIVE_WORDS = frozenset({'confident', 'lock', 'guaranteed', 'sure', 'value'})
+NEGATIVE_WORDS = frozenset({'risky', 'uncertain', 'avoid', 'sketchy'})
+
+# Posts per task sent to an extraction process
+EXTRACT_BATCH_SIZE = 64
 
 @dataclass
 class BetInfo:
@@ -15,6 +54,7 @@ class BetInfo:
     bet_type: str  
     stake: Optional[float] = None
     confidence: Optional[float] = None
+    team_id: Optional[str] = None  # canonical id from app.utils.teams
 
 @dataclass
 class RedditPost:
@@ -31,28 +71,234 @@ class RedditPost:
     sport: str
     sentiment_score: Optional[float] = None
 
+def extract_bet_info(title: str, text: str) -> List[BetInfo]:
+    """Spread, moneyline and total picks in a post, with the post's stake if any"""
+    combined_text = f"{title} {text}"
+    bet_info_list = []
+    
+    for match in BET_PATTERNS['spread'].finditer(combined_text):
+        team, spread = match.groups()
+        bet_info_list.append(BetInfo(
+            team=team.strip(),
+            odds=float(spread),
+            bet_type='spread'
+        ))
+    
+    for match in BET_PATTERNS['moneyline'].finditer(combined_text):
+        team, odds = match.groups()
+        bet_info_list.append(BetInfo(
+            team=team.strip(),
+            odds=float(odds),
+            bet_type='moneyline'
+        ))
+    
+    for match in BET_PATTERNS['over_under'].finditer(combined_text):
+        total = match.group(1)
+        bet_info_list.append(BetInfo(
+            team='',  
+            odds=float(total),
+            bet_type='over_under'
+        ))
+    
+    stake_match = BET_PATTERNS['stake'].search(combined_text)
+    if stake_match and bet_info_list:
+        stake = float(stake_match.group(1))
+        for bet_info in bet_info_list:
+            bet_info.stake = stake
+    
+    return bet_info_list
+
+def analyze_sentiment(title: str, text: str) -> float:
+    """Basic sentiment analysis for betting posts"""
+    words = set(f"{title} {text}".lower().split())
+    
+    positive_count = len(words & POSITIVE_WORDS)
+    negative_count = len(words & NEGATIVE_WORDS)
+    
+    if positive_count + negative_count == 0:
+        return 0.0
+        
+    return (positive_count - negative_count) / (positive_count + negative_count)
+
+def extract_sport(title: str, text: str, subreddit_name: str, subreddits_by_sport: Dict[str, List[str]]) -> str:
+    """Sport of a post from its subreddit, falling back to keyword matches"""
+    for sport, subreddits in subreddits_by_sport.items():
+        if sport != 'general' and subreddit_name in subreddits:
+            return sport
+    
+    combined_text = f"{title} {text}".lower()
+    for sport, keywords in sport_keywords().items():
+        if any(keyword in combined_text for keyword in keywords):
+            return sport
+    return 'unknown'
+
+SUBREDDITS_BY_SPORT = {
+    'basketball': ['nba', 'ncaabb', 'basketballbetting'],
+    'soccer': ['soccer', 'footballbetting', 'soccerbetting'],
+    'baseball': ['mlb', 'baseballbetting'],
+    'football': ['nfl', 'cfb', 'footballbetting'],
+    'general': ['sportsbook', 'sportsbetting', 'sportsbookextra']
+}
+
+def subreddit_names(subreddits_by_sport: Dict[str, List[str]]) -> List[str]:
+    """Every configured subreddit once, in configuration order"""
+    return list(dict.fromkeys(
+        subreddit for sport_subs in subreddits_by_sport.values() for subreddit in sport_subs
+    ))
+
+@lru_cache(maxsize=1)
+def sport_keywords() -> Dict[str, List[str]]:
+    """Cached keywords for sport detection"""
+    return {
+        'basketball': ['nba', 'basketball', 'ncaa', 'march madness'] + RedditScraper._get_nba_teams(),
+        'soccer': ['soccer', 'football', 'premier league', 'epl', 'uefa'] + RedditScraper._get_soccer_teams(),
+        'baseball': ['mlb', 'baseball', 'innings'] + RedditScraper._get_mlb_teams(),
+        'football': ['nfl', 'touchdown', 'quarterback'] + RedditScraper._get_nfl_teams()
+    }
+
+def post_fields(post, subreddit_name: str) -> Dict:
+    """Plain, picklable fields of a PRAW submission (or ListingPost)"""
+    return {
+        'id': post.id,
+        'title': post.title,
+        'text': post.selftext,
+        'url': post.url,
+        'subreddit': subreddit_name,
+        'author': str(post.author) if post.author is not None else None,  # None: deleted account
+        'created_utc': post.created_utc,
+        'score': post.score,
+        'num_comments': post.num_comments
+    }
+
+def build_reddit_post(fields: Dict, subreddits_by_sport: Dict[str, List[str]]) -> RedditPost:
+    """RedditPost with extracted bets, sport and sentiment from post_fields()"""
+    title, text = fields['title'], fields['text']
+    sport = extract_sport(title, text, fields['subreddit'], subreddits_by_sport)
+    bet_info = extract_bet_info(title, text)
+    for bet in bet_info:
+        bet.team_id = resolve_team_id(bet.team, sport)
+    return RedditPost(
+        **fields,
+        bet_info=bet_info,
+        sport=sport,
+        sentiment_score=analyze_sentiment(title, text)
+    )
+
+def _build_reddit_posts(batch: List[Dict], subreddits_by_sport: Dict[str, List[str]]) -> List[RedditPost]:
+    """Process-pool task: extract one batch of posts"""
+    return [build_reddit_post(fields, subreddits_by_sport) for fields in batch]
+
+class ExtractionStage:
+    """
+    Process-pool stage that turns fetched posts into RedditPosts
+    
+    I/O threads put() post fields on a queue and go back to the network; a
+    feeder thread drains the queue in batches and submits them to worker
+    processes, so regex and sentiment work never holds the fetching
+    threads' GIL. With workers=0 extraction runs inline on the feeder.
+    
+    Usage:
+        with ExtractionStage(subreddits_by_sport) as stage:
+            ... stage.put(post_fields(post, name)) from any thread ...
+        posts = stage.results
+    """
+    
+    _DONE = object()
+    
+    def __init__(self, subreddits_by_sport: Dict[str, List[str]], workers: Optional[int] = None,
+                 batch_size: int = EXTRACT_BATCH_SIZE, max_queued: int = 10000):
+        """
+        Args:
+            subreddits_by_sport (dict): Sport -> subreddits, for sport detection
+            workers (int, optional): Extraction processes; defaults to
+                Config.REDDIT_EXTRACT_WORKERS, then one per spare CPU (up to 4),
+                leaving a core for the I/O threads. 0 runs inline.
+            batch_size (int): Posts per process task
+            max_queued (int): Queue bound; put() blocks when extraction falls behind
+        """
+        if workers is None:
+            workers = (
+                int(Config.REDDIT_EXTRACT_WORKERS) if Config.REDDIT_EXTRACT_WORKERS is not None
+                else min(4, (os.cpu_count() or 1) - 1)
+            )
+        self.subreddits_by_sport = subreddits_by_sport
+        self.workers = workers
+        self.batch_size = batch_size
+        self.queue = queue.Queue(maxsize=max_queued)
+        self.results: List[RedditPost] = []
+        self._futures = []
+        self._executor = None
+        self._feeder = None
+    
+    def __enter__(self):
+        if self.workers > 0:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            # Start the workers now, before the caller's I/O threads exist
+            self._executor.submit(_build_reddit_posts, [], self.subreddits_by_sport).result()
+        self._feeder = threading.Thread(target=self._feed, daemon=True)
+        self._feeder.start()
+        return self
+    
+    def put(self, fields: Dict):
+        """Queue one post for extraction"""
+        self.queue.put(fields)
+    
+    def _feed(self):
+        done = False
+        while not done:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is self._DONE:
+                batch.pop()
+                done = True
+            if not batch:
+                continue
+            if self._executor is None:
+                self.results.extend(_build_reddit_posts(batch, self.subreddits_by_sport))
+            else:
+                self._futures.append(self._executor.submit(_build_reddit_posts, batch, self.subreddits_by_sport))
+    
+    def __exit__(self, exc_type, exc, traceback):
+        self.queue.put(self._DONE)
+        self._feeder.join()
+        try:
+            for future in self._futures:
+                self.results.extend(future.result())
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+        return False
+
 class RedditScraper:
-    def __init__(self):
+    def __init__(self, reddit=None):
+        """
+        Args:
+            reddit: PRAW-compatible client; a praw.Reddit is created from
+                the REDDIT_* environment variables when omitted
+        """
         self.logger = logging.getLogger(__name__)
         self._setup_logging()
         
-        try:
-            self.reddit = praw.Reddit(
-                client_id=os.environ.get('REDDIT_CLIENT_ID'),
-                client_secret=os.environ.get('REDDIT_CLIENT_SECRET'),
-                user_agent=os.environ.get('REDDIT_USER_AGENT', 'Clutch-It Scraper v1.0')
-            )
-        except Exception as e:
-            self.logger.error(f"Failed to initialize Reddit client: {str(e)}")
-            raise
+        if reddit is not None:
+            self.reddit = reddit
+        else:
+            if praw is None:
+                raise RuntimeError('praw is not installed')
+            try:
+                self.reddit = praw.Reddit(
+                    client_id=os.environ.get('REDDIT_CLIENT_ID'),
+                    client_secret=os.environ.get('REDDIT_CLIENT_SECRET'),
+                    user_agent=os.environ.get('REDDIT_USER_AGENT', 'Clutch-It Scraper v1.0')
+                )
+            except Exception as e:
+                self.logger.error(f"Failed to initialize Reddit client: {str(e)}")
+                raise
         
-        self.subreddits_by_sport = {
-            'basketball': ['nba', 'ncaabb', 'basketballbetting'],
-            'soccer': ['soccer', 'footballbetting', 'soccerbetting'],
-            'baseball': ['mlb', 'baseballbetting'],
-            'football': ['nfl', 'cfb', 'footballbetting'],
-            'general': ['sportsbook', 'sportsbetting', 'sportsbookextra']
-        }
+        self.subreddits_by_sport = {sport: list(subreddits) for sport, subreddits in SUBREDDITS_BY_SPORT.items()}
         
         self._compile_patterns()
 
@@ -64,57 +310,57 @@ class RedditScraper:
         )
 
     def _compile_patterns(self):
-        """Pre-compile regex patterns for better performance"""
-        self.bet_patterns = {
-            'spread': re.compile(r'([A-Za-z\s]+)\s*([-+]\d+\.?\d*)\s*(?:points?)?'),
-            'moneyline': re.compile(r'([A-Za-z\s]+)\s+ML\s*([-+]\d+)'),
-            'over_under': re.compile(r'(?:over|under)\s+(\d+\.?\d*)', re.IGNORECASE),
-            'parlay': re.compile(r'parlay', re.IGNORECASE),
-            'stake': re.compile(r'\$(\d+(?:\.\d{2})?)', re.IGNORECASE)
-        }
+        """Pre-compiled, linear-time bet patterns (module-level so worker processes share them)"""
+        self.bet_patterns = BET_PATTERNS
 
-    @lru_cache(maxsize=100)
     def _get_sport_keywords(self) -> Dict[str, List[str]]:
         """Cached keywords for sport detection"""
-        return {
-            'basketball': ['nba', 'basketball', 'ncaa', 'march madness'] + self._get_nba_teams(),
-            'soccer': ['soccer', 'football', 'premier league', 'epl', 'uefa'] + self._get_soccer_teams(),
-            'baseball': ['mlb', 'baseball', 'innings'] + self._get_mlb_teams(),
-            'football': ['nfl', 'touchdown', 'quarterback'] + self._get_nfl_teams()
-        }
+        return sport_keywords()
 
-    def scrape_latest_posts(self, hours_back: int = 24, limit: int = 100) -> List[RedditPost]:
-        """Scrape recent betting posts with enhanced error handling and parallel processing"""
-        all_posts = []
+    def scrape_latest_posts(self, hours_back: int = 24, limit: int = 100,
+                            workers: Optional[int] = None) -> List[RedditPost]:
+        """
+        Scrape recent betting posts from every subreddit
+        
+        Five I/O threads fetch listings and hand raw posts to an
+        ExtractionStage, whose worker processes extract bets, sport and
+        sentiment while the threads keep fetching.
+        
+        Args:
+            hours_back (int): Ignore posts older than this
+            limit (int): Posts read from each of hot and new per subreddit
+            workers (int, optional): Extraction processes (see ExtractionStage)
+        
+        Returns:
+            list: RedditPosts with at least one extracted bet
+        """
         current_time = datetime.utcnow()
         time_threshold = current_time - timedelta(hours=hours_back)
         
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            future_to_subreddit = {
-                executor.submit(self._scrape_subreddit, subreddit, time_threshold, limit): subreddit
-                for sport_subs in self.subreddits_by_sport.values()
-                for subreddit in sport_subs
-            }
-            
-            for future in futures.as_completed(future_to_subreddit):
-                subreddit = future_to_subreddit[future]
-                try:
-                    posts = future.result()
-                    all_posts.extend(posts)
-                    self.logger.info(f"Successfully scraped {len(posts)} posts from r/{subreddit}")
-                except Exception as e:
-                    self.logger.error(f"Error scraping r/{subreddit}: {str(e)}")
+        with ExtractionStage(self.subreddits_by_sport, workers=workers) as stage:
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                future_to_subreddit = {
+                    executor.submit(self._scrape_subreddit, subreddit, time_threshold, limit, stage.put): subreddit
+                    for subreddit in self.subreddits
+                }
+                
+                for future in as_completed(future_to_subreddit):
+                    subreddit = future_to_subreddit[future]
+                    try:
+                        self.logger.info(f"Fetched {future.result()} posts from r/{subreddit}")
+                    except Exception as e:
+                        self.logger.error(f"Error scraping r/{subreddit}: {str(e)}")
 
-        return all_posts
+        return [post for post in stage.results if post.bet_info]
 
-    def _scrape_subreddit(self, subreddit_name: str, time_threshold: datetime, limit: int) -> List[RedditPost]:
-        """Scrape a single subreddit with enhanced error handling"""
-        posts = []
+    def _scrape_subreddit(self, subreddit_name: str, time_threshold: datetime, limit: int, emit) -> int:
+        """Fetch a subreddit's recent posts and emit their fields for extraction"""
+        count = 0
         try:
             subreddit = self.reddit.subreddit(subreddit_name)
             
             seen_posts = set()
-            for post in list(subreddit.hot(limit=limit)) + list(subreddit.new(limit=limit)):
+            for post in chain(subreddit.hot(limit=limit), subreddit.new(limit=limit)):
                 if post.id in seen_posts:
                     continue
                     
@@ -124,84 +370,269 @@ class RedditScraper:
                 if post_time < time_threshold:
                     continue
                 
-                bet_info = self._extract_bet_info(post.title, post.selftext)
-                if bet_info:
-                    sport = self._extract_sport(post.title, post.selftext, subreddit_name)
-                    sentiment_score = self._analyze_sentiment(post.title, post.selftext)
-                    
-                    posts.append(RedditPost(
-                        id=post.id,
-                        title=post.title,
-                        text=post.selftext,
-                        url=post.url,
-                        subreddit=subreddit_name,
-                        author=str(post.author),
-                        created_utc=post.created_utc,
-                        score=post.score,
-                        num_comments=post.num_comments,
-                        bet_info=bet_info,
-                        sport=sport,
-                        sentiment_score=sentiment_score
-                    ))
+                emit(post_fields(post, subreddit_name))
+                count += 1
                     
         except Exception as e:
             self.logger.error(f"Error in _scrape_subreddit for {subreddit_name}: {str(e)}")
             raise
             
-        return posts
+        return count
+
+    def _to_reddit_post(self, post, subreddit_name: str) -> RedditPost:
+        """Build a RedditPost with extracted bets, sport and sentiment"""
+        return build_reddit_post(post_fields(post, subreddit_name), self.subreddits_by_sport)
+
+    @property
+    def subreddits(self) -> List[str]:
+        """Every configured subreddit once, in configuration order"""
+        return subreddit_names(self.subreddits_by_sport)
+
+    def ingest_latest_posts(self, session, hours_back: int = 24, page_size: int = REDDIT_PAGE_SIZE,
+                            initial_limit: int = 500) -> Dict:
+        """
+        Fetch only posts newer than each subreddit's watermark and upsert them
+
+        Args:
+            session: SQLAlchemy session
+            hours_back (int): Age limit for a subreddit's first run (no watermark yet)
+            page_size (int): Posts fetched, upserted and committed at a time
+            initial_limit (int): Most posts fetched on a subreddit's first run
+
+        Returns:
+            dict: Posts stored per subreddit and the total
+        """
+        stored = {}
+        for subreddit_name in self.subreddits:
+            try:
+                stored[subreddit_name] = self.ingest_subreddit(
+                    session, subreddit_name, hours_back, page_size, initial_limit
+                )
+            except Exception as e:
+                session.rollback()
+                self.logger.error(f"Error ingesting r/{subreddit_name}: {str(e)}")
+                stored[subreddit_name] = 0
+        
+        return {'success': True, 'stored': stored, 'total': sum(stored.values())}
+
+    def ingest_subreddit(self, session, subreddit_name: str, hours_back: int = 24,
+                         page_size: int = REDDIT_PAGE_SIZE, initial_limit: int = 500) -> int:
+        """
+        Ingest one subreddit, committing posts and watermark page by page
+
+        With a watermark, pages are requested with before=<last fullname>,
+        oldest first, and the watermark moves to each page's newest post in
+        the same transaction as its posts. Only one page is held in memory.
+        """
+        from app.models.reddit_post import RedditWatermark
+        
+        subreddit = self.reddit.subreddit(subreddit_name)
+        watermark = session.get(RedditWatermark, subreddit_name)
+        count = 0
+        
+        if watermark is None:
+            threshold = time.time() - hours_back * 3600
+            newest = None
+            page = []
+            for post in subreddit.new(limit=initial_limit):
+                if newest is None:
+                    newest = post
+                if post.created_utc < threshold:
+                    break
+                page.append(post)
+                if len(page) == page_size:
+                    count += self._store_page(session, subreddit_name, page)
+                    page = []
+            count += self._store_page(session, subreddit_name, page)
+            if newest is not None:
+                self._set_watermark(session, subreddit_name, newest)
+                session.commit()
+            return count
+        
+        for page in self._pages_after(subreddit, watermark, page_size):
+            count += self._store_page(session, subreddit_name, page, commit=False)
+            self._set_watermark(session, subreddit_name, max(page, key=lambda post: post.created_utc))
+            session.commit()
+        return count
+
+    def _pages_after(self, subreddit, watermark, page_size: int) -> Iterator[List]:
+        """
+        Yield pages of posts newer than the watermark, oldest page first
+        
+        If the watermark post was deleted Reddit returns nothing for
+        before= it. An empty first page is only treated that way when the
+        newest post is newer than the watermark; the listing is then walked
+        back until created_utc reaches the watermark's.
+        """
+        cursor = watermark.last_fullname
+        first = True
+        while True:
+            page = list(subreddit.new(limit=page_size, params={'before': cursor}))
+            if not page and first:
+                # Nothing newer is the usual idle case; only a newer post means the watermark is gone
+                newest = next(iter(subreddit.new(limit=1)), None)
+                if newest is not None and newest.created_utc > watermark.last_created_utc:
+                    yield from self._pages_since(subreddit, watermark.last_created_utc, page_size)
+                return
+            if not page:
+                return
+            first = False
+            yield page
+            cursor = max(page, key=lambda post: post.created_utc).fullname
+
+    @staticmethod
+    def _pages_since(subreddit, created_utc: float, page_size: int) -> Iterator[List]:
+        """Pages of posts newer than created_utc, oldest page first, read newest first from the listing"""
+        newer = []
+        for post in subreddit.new(limit=None):
+            if post.created_utc <= created_utc:
+                break
+            newer.append(post)
+        newer.reverse()
+        for start in range(0, len(newer), page_size):
+            yield newer[start:start + page_size]
+
+    def _store_page(self, session, subreddit_name: str, page: List, commit: bool = True) -> int:
+        if not page:
+            return 0
+        rows = []
+        for post in page:
+            row = asdict(self._to_reddit_post(post, subreddit_name))
+            row['fetched_at'] = datetime.utcnow()
+            rows.append(row)
+        upsert_reddit_posts(session, rows)
+        if commit:
+            session.commit()
+        return len(rows)
+
+    @staticmethod
+    def _set_watermark(session, subreddit_name: str, post):
+        from app.models.reddit_post import RedditWatermark
+        
+        watermark = session.get(RedditWatermark, subreddit_name)
+        if watermark is None:
+            watermark = RedditWatermark(subreddit=subreddit_name)
+            session.add(watermark)
+        watermark.last_fullname = post.fullname
+        watermark.last_created_utc = post.created_utc
+
+    def find_daily_threads(self, subreddit_name: str, limit: int = 25) -> List:
+        """Stickied or pick-thread-titled posts among the subreddit's hot posts"""
+        return [
+            post for post in self.reddit.subreddit(subreddit_name).hot(limit=limit)
+            if getattr(post, 'stickied', False) or DAILY_THREAD_PATTERN.search(post.title)
+        ]
+
+    @staticmethod
+    def iter_comments(submission) -> Iterator:
+        """
+        Yield every comment of a submission, expanding "load more" stubs lazily
+        
+        Unlike replace_more(limit=None), which loads the whole forest
+        before returning, each MoreComments stub is fetched only when the
+        walk reaches it and dropped once expanded, so memory holds the
+        pending stubs plus one fetched batch.
+        """
+        pending = deque(submission.comments)
+        seen = set()
+        while pending:
+            item = pending.popleft()
+            if not hasattr(item, 'body'):
+                # MoreComments: fetch the next batch of children
+                pending.extend(item.comments())
+                continue
+            if item.id in seen:
+                continue
+            seen.add(item.id)
+            yield item
+            pending.extend(item.replies)
+
+    def ingest_thread_picks(self, session, submission, subreddit_name: str, batch_size: int = 500) -> int:
+        """
+        Extract picks from every comment of a thread and write them in batches
+        
+        Picks are deduplicated by (author, thread, team, bet type, line)
+        within the run and by the unique pick_hash in the database, so
+        re-running on a growing thread only adds new picks. Comments from
+        deleted accounts are skipped, since their picks cannot be credited.
+        
+        Returns:
+            int: Picks extracted (before database-level deduplication)
+        """
+        batch = []
+        hashes = set()
+        extracted = 0
+        for comment in self.iter_comments(submission):
+            if comment.author is None:
+                continue
+            author = str(comment.author)
+            bets = self._extract_bet_info(comment.body, '')
+            sentiment = analyze_sentiment(comment.body, '') if bets else None
+            sport = self._extract_sport(comment.body, '', subreddit_name) if bets else None
+            for bet in bets:
+                pick_hash = hashlib.sha1(
+                    f"{author}|{submission.id}|{bet.team.lower()}|{bet.bet_type}|{bet.odds}".encode()
+                ).hexdigest()
+                if pick_hash in hashes:
+                    continue
+                hashes.add(pick_hash)
+                batch.append({
+                    'pick_hash': pick_hash,
+                    'comment_id': comment.id,
+                    'submission_id': submission.id,
+                    'subreddit': subreddit_name,
+                    'author': author,
+                    'team': bet.team,
+                    'team_id': resolve_team_id(bet.team, sport),
+                    'bet_type': bet.bet_type,
+                    'odds': bet.odds,
+                    'stake': bet.stake,
+                    'sentiment_score': sentiment,
+                    'comment_score': comment.score,
+                    'created_utc': comment.created_utc,
+                    'fetched_at': datetime.utcnow()
+                })
+            if len(batch) >= batch_size:
+                extracted += len(batch)
+                insert_reddit_picks(session, batch)
+                session.commit()
+                batch = []
+        
+        if batch:
+            extracted += len(batch)
+            insert_reddit_picks(session, batch)
+            session.commit()
+        return extracted
+
+    def ingest_daily_thread_picks(self, session, subreddits=('sportsbook',), batch_size: int = 500) -> Dict:
+        """
+        Ingest picks from the daily pick threads of each subreddit
+        
+        Returns:
+            dict: Picks extracted per thread and the total
+        """
+        threads = {}
+        for subreddit_name in subreddits:
+            for submission in self.find_daily_threads(subreddit_name):
+                try:
+                    threads[submission.id] = self.ingest_thread_picks(session, submission, subreddit_name, batch_size)
+                except Exception as e:
+                    session.rollback()
+                    self.logger.error(f"Error ingesting picks from thread {submission.id}: {str(e)}")
+        
+        return {'success': True, 'threads': threads, 'total': sum(threads.values())}
 
     def _extract_bet_info(self, title: str, text: str) -> List[BetInfo]:
         """Enhanced bet information extraction with structured output"""
-        combined_text = f"{title} {text}"
-        bet_info_list = []
-        
-        for match in self.bet_patterns['spread'].finditer(combined_text):
-            team, spread = match.groups()
-            bet_info_list.append(BetInfo(
-                team=team.strip(),
-                odds=float(spread),
-                bet_type='spread'
-            ))
-        
-        for match in self.bet_patterns['moneyline'].finditer(combined_text):
-            team, odds = match.groups()
-            bet_info_list.append(BetInfo(
-                team=team.strip(),
-                odds=float(odds),
-                bet_type='moneyline'
-            ))
-        
-        for match in self.bet_patterns['over_under'].finditer(combined_text):
-            total = match.group(1)
-            bet_info_list.append(BetInfo(
-                team='',  
-                odds=float(total),
-                bet_type='over_under'
-            ))
-        
-        stake_match = self.bet_patterns['stake'].search(combined_text)
-        if stake_match and bet_info_list:
-            stake = float(stake_match.group(1))
-            for bet_info in bet_info_list:
-                bet_info.stake = stake
-        
-        return bet_info_list
+        return extract_bet_info(title, text)
 
     def _analyze_sentiment(self, title: str, text: str) -> float:
         """Basic sentiment analysis for betting posts"""
-        positive_words = {'confident', 'lock', 'guaranteed', 'sure', 'value'}
-        negative_words = {'risky', 'uncertain', 'avoid', 'sketchy'}
-        
-        combined_text = f"{title} {text}".lower()
-        words = set(combined_text.split())
-        
-        positive_count = len(words.intersection(positive_words))
-        negative_count = len(words.intersection(negative_words))
-        
-        if positive_count + negative_count == 0:
-            return 0.0
-            
-        return (positive_count - negative_count) / (positive_count + negative_count)
+        return analyze_sentiment(title, text)
+
+    def _extract_sport(self, title: str, text: str, subreddit_name: str) -> str:
+        """Sport of a post from its subreddit, falling back to keyword matches"""
+        return extract_sport(title, text, subreddit_name, self.subreddits_by_sport)
 
     @staticmethod
     def _get_nba_teams() -> List[str]:
@@ -210,5 +641,45 @@ class RedditScraper:
     @staticmethod
     def _get_soccer_teams() -> List[str]:
         """Return list of major soccer team names"""
-        return ['manchester united', 'liverpool', 'barcelona', 'real madrid'] 
+        return ['manchester united', 'liverpool', 'barcelona', 'real madrid']
+
+    @staticmethod
+    def _get_mlb_teams() -> List[str]:
+        """Return list of MLB team names"""
+        return ['yankees', 'dodgers', 'red sox', 'cubs', 'astros']
+
+    @staticmethod
+    def _get_nfl_teams() -> List[str]:
+        """Return list of NFL team names"""
+        return ['chiefs', 'eagles', 'cowboys', 'patriots', '49ers']
+
+def upsert_reddit_posts(session, rows: List[Dict]):
+    """
+    Insert posts, updating score, comment count and edited text of ones already stored
+
+    Uses INSERT ... ON CONFLICT (Postgres and SQLite).
+    """
+    from app.models.reddit_post import RedditPostRecord
+    
+    insert = dialect_insert(session)
+    statement = insert(RedditPostRecord).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=[RedditPostRecord.id],
+        set_={
+            'title': statement.excluded.title,
+            'text': statement.excluded.text,
+            'score': statement.excluded.score,
+            'num_comments': statement.excluded.num_comments,
+            'bet_info': statement.excluded.bet_info,
+            'sentiment_score': statement.excluded.sentiment_score,
+            'updated_at': datetime.utcnow()
+        }
+    )
+    session.execute(statement)
 
+def insert_reddit_picks(session, rows: List[Dict]):
+    """Insert picks, skipping ones whose pick_hash is already stored"""
+    from app.models.reddit_post import RedditPick
+    
+    insert = dialect_insert(session)
+    session.execute(insert(RedditPick).values(rows).on_conflict_do_nothing(index_elements=[RedditPick.pick_hash]))
@@ -0,0 +1,109 @@
+# services/scoring_service.py (precomputed predictions for upcoming events)
+
+import logging
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import select, update
+
+from  app.models.prediction import Prediction
+from  app.ml.registry import get_model
+from  app.ml.feature_engineering import encode_bets
+from  app.ml.odds import parse_odds, american_to_decimal, expected_value
+from  app.services.consensus_service import consensus_shares
+
+logger = logging.getLogger(__name__)
+
+def upcoming_predictions_query(now, horizon_hours):
+    """Active predictions whose event starts within horizon_hours of now"""
+    return (
+        select(
+            Prediction.id,
+            Prediction.event_name,
+            Prediction.event_date,
+            Prediction.sport,
+            Prediction.market_type,
+            Prediction.selection,
+            Prediction.odds
+        )
+        .where(Prediction.status == 'active')
+        .where(Prediction.event_date >= now)
+        .where(Prediction.event_date < now + timedelta(hours=horizon_hours))
+        .order_by(Prediction.id)
+    )
+
+def score_rows(rows, model, shares=None):
+    """
+    Score a chunk of prediction rows in one forward pass
+
+    Args:
+        rows (list): Dicts with id, sport, market_type and odds
+        model: Network callable as model(x, training=False)
+        shares (dict, optional): Prediction id -> community pick share
+
+    Returns:
+        list: Update parameter dicts (id, win_probability, expected_value, confidence)
+    """
+    shares = shares or {}
+    features = encode_bets([
+        {'sport': row['sport'], 'bet_type': row['market_type'], 'odds': row['odds'],
+         'consensus_share': shares.get(row['id'])}
+        for row in rows
+    ])
+    win_probability = np.asarray(model(features, training=False))[:, 1].astype(np.float64)
+    decimal = american_to_decimal(parse_odds([row['odds'] for row in rows]))
+    ev = np.nan_to_num(expected_value(win_probability, decimal))
+    confidence = np.maximum(win_probability, 1 - win_probability)
+
+    return [
+        {'id': row['id'], 'win_probability': p, 'expected_value': e, 'confidence': c}
+        for row, p, e, c in zip(rows, win_probability.tolist(), ev.tolist(), confidence.tolist())
+    ]
+
+def score_upcoming_predictions(session, horizon_hours=72, chunk_size=5000):
+    """
+    Score every active prediction for upcoming events and store the results
+
+    Intended to run on a schedule (see the score-predictions command) so
+    /api/predictions/* only reads stored columns. Rows are read in primary
+    key order chunk_size at a time; each chunk is scored in one forward
+    pass, written back with one executemany UPDATE and committed before
+    the next chunk is read, so memory stays flat and an interrupted run
+    keeps the chunks it finished.
+
+    Args:
+        session: SQLAlchemy session
+        horizon_hours (int): How far ahead to score events
+        chunk_size (int): Rows per forward pass and UPDATE batch
+
+    Returns:
+        dict: Rows scored, model version and elapsed time
+    """
+    started = datetime.utcnow()
+    loaded = get_model()
+    query = upcoming_predictions_query(started, horizon_hours)
+
+    scored = 0
+    last_id = 0
+    while True:
+        # Keyset pages rather than one streamed cursor, which a commit would close
+        rows = [row._asdict() for row in session.execute(query.where(Prediction.id > last_id).limit(chunk_size))]
+        if not rows:
+            break
+        updates = score_rows(rows, loaded.model, consensus_shares(session, rows))
+        for params in updates:
+            params['model_version'] = loaded.version
+            params['scored_at'] = started
+        session.execute(update(Prediction), updates)
+        session.commit()
+        scored += len(updates)
+        last_id = rows[-1]['id']
+
+    elapsed = (datetime.utcnow() - started).total_seconds()
+    logger.info(f"Scored {scored} predictions with model {loaded.version} in {elapsed:.2f}s")
+    return {
+        'success': True,
+        'scored': scored,
+        'model_version': loaded.version,
+        'elapsed_seconds': elapsed
+    }
@@ -0,0 +1,277 @@
+# services/slip_templates.py (Sportsbook-specific slip parsing)
+import re
+import statistics
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+AMERICAN_ODDS_PATTERN = re.compile(r'^(?:[+-]\d{3,5}|EVEN|EV)$', re.IGNORECASE)
+MONEY_PATTERN = re.compile(r'^[$€£]\d{1,3}(?:,?\d{3})*(?:\.\d{2})?$')
+LEG_COUNT_PATTERN = re.compile(r'\b\d+\s*(?:pick|leg|team)\b', re.IGNORECASE)
+
+@dataclass
+class SlipLine:
+    """A row of OCR words that share the same vertical band"""
+    words: List[dict]
+    center_y: float
+
+    @property
+    def text(self) -> str:
+        return ' '.join(word['text'] for word in self.words)
+
+@dataclass
+class SlipTemplate:
+    """
+    Layout description for one sportsbook's bet slip
+
+    Attributes:
+        name (str): Sportsbook name reported in results
+        keywords (list): Lowercase strings whose presence identifies the book
+        stake_labels (list): Labels printed next to (or above) the stake
+        payout_labels (list): Labels for the payout, in order of preference
+        odds_column (tuple): Relative x range (0-1) where leg odds are printed
+        body_region (tuple): Relative y range (0-1) that holds the legs
+        event_separators (tuple): Separators between teams on the event line
+    """
+    name: str
+    keywords: List[str]
+    stake_labels: List[str] = field(default_factory=lambda: ['wager', 'stake', 'risk'])
+    payout_labels: List[str] = field(default_factory=lambda: ['to pay', 'total payout', 'payout', 'to win'])
+    odds_column: Tuple[float, float] = (0.6, 1.0)
+    body_region: Tuple[float, float] = (0.0, 1.0)
+    event_separators: Tuple[str, ...] = (' @ ', ' vs. ', ' vs ', ' v ', ' at ')
+
+    def matches(self, text_lower: str) -> bool:
+        """Check whether OCR text belongs to this sportsbook"""
+        return any(keyword in text_lower for keyword in self.keywords)
+
+    def parse(self, words: List[dict]) -> Optional[Dict]:
+        """
+        Extract legs, odds, stake and payout from word boxes in one pass
+
+        Args:
+            words (list): OCR words as {'text': str, 'box': (x0, y0, x1, y1)}
+
+        Returns:
+            dict: Parsed slip, or None if no legs were found
+        """
+        if not words:
+            return None
+
+        lines = group_lines(words)
+        left = min(word['box'][0] for word in words)
+        right = max(word['box'][2] for word in words)
+        top = min(word['box'][1] for word in words)
+        bottom = max(word['box'][3] for word in words)
+        width = max(right - left, 1)
+        height = max(bottom - top, 1)
+
+        odds_x0 = left + self.odds_column[0] * width
+        odds_x1 = left + self.odds_column[1] * width
+        body_y0 = top + self.body_region[0] * height
+        body_y1 = top + self.body_region[1] * height
+
+        label_lines = set()
+        amount, stake_line = self._value_for_labels(lines, self.stake_labels)
+        payout, payout_line = self._value_for_labels(lines, self.payout_labels)
+        label_lines.update(index for index in (stake_line, payout_line) if index is not None)
+
+        legs = []
+        total_odds = None
+        for index, line in enumerate(lines):
+            if index in label_lines or not body_y0 <= line.center_y <= body_y1:
+                continue
+
+            odds_word = None
+            for word in line.words:
+                center_x = (word['box'][0] + word['box'][2]) / 2
+                if odds_x0 <= center_x <= odds_x1 and AMERICAN_ODDS_PATTERN.match(word['text']):
+                    odds_word = word
+
+            if odds_word is None:
+                # Market and event lines describe the leg above them
+                if legs and index == legs[-1]['_line'] + 1 + len(legs[-1]['_detail_lines']):
+                    legs[-1]['_detail_lines'].append(line.text)
+                continue
+
+            odds = _normalize_american_odds(odds_word['text'])
+            selection = ' '.join(
+                word['text'] for word in line.words
+                if word['box'][2] <= odds_word['box'][0]
+            ).strip()
+
+            # "3 Pick Parlay +596" is the combined price, not a leg
+            if 'parlay' in line.text.lower() or LEG_COUNT_PATTERN.search(selection):
+                total_odds = odds
+                continue
+
+            if selection:
+                legs.append({'selection': selection, 'odds': odds, '_line': index, '_detail_lines': []})
+
+        if not legs:
+            return None
+
+        parsed_legs = []
+        for leg in legs:
+            parsed_leg = {'selection': leg['selection'], 'odds': leg['odds'], 'market': None, 'event': None, 'teams': []}
+            for detail in leg['_detail_lines']:
+                teams = self._split_event(detail)
+                if teams and parsed_leg['event'] is None:
+                    parsed_leg['event'] = detail
+                    parsed_leg['teams'] = teams
+                elif parsed_leg['market'] is None and not MONEY_PATTERN.match(detail):
+                    parsed_leg['market'] = detail
+            parsed_legs.append(parsed_leg)
+
+        is_parlay = len(parsed_legs) > 1 or total_odds is not None
+        teams = []
+        for leg in parsed_legs:
+            for team in leg['teams'] or [leg['selection']]:
+                if team not in teams:
+                    teams.append(team)
+
+        return {
+            'sportsbook': self.name,
+            'legs': parsed_legs,
+            'odds': [total_odds] if total_odds else [leg['odds'] for leg in parsed_legs],
+            'teams': teams,
+            'amount': amount,
+            'payout': payout,
+            'bet_type': 'Parlay' if is_parlay else None
+        }
+
+    def _split_event(self, text: str) -> List[str]:
+        """Split an event line like 'LA Lakers @ BOS Celtics' into teams"""
+        padded = f' {text} '
+        for separator in self.event_separators:
+            if separator in padded.lower():
+                start = padded.lower().index(separator)
+                home = padded[:start].strip()
+                away = padded[start + len(separator):].strip()
+                if home and away:
+                    return [home, away]
+        return []
+
+    @staticmethod
+    def _value_for_labels(lines: List[SlipLine], labels: List[str]) -> Tuple[Optional[str], Optional[int]]:
+        """
+        Find the money value printed after a label on the same line, or on
+        the line directly below it
+
+        Returns:
+            tuple: (value, index of the label line)
+        """
+        for label in labels:
+            label_tokens = label.split()
+            for index, line in enumerate(lines):
+                tokens = [word['text'].lower().rstrip(':') for word in line.words]
+                for start in range(len(tokens) - len(label_tokens) + 1):
+                    if tokens[start:start + len(label_tokens)] != label_tokens:
+                        continue
+
+                    for word in line.words[start + len(label_tokens):]:
+                        if MONEY_PATTERN.match(word['text']):
+                            return word['text'], index
+                        # Stop at the next label on a shared line
+                        if not word['text'].startswith(('$', '€', '£')) and word['text'][:1].isalpha():
+                            break
+
+                    if index + 1 < len(lines):
+                        label_x = line.words[start]['box'][0]
+                        candidates = [word for word in lines[index + 1].words if MONEY_PATTERN.match(word['text'])]
+                        if candidates:
+                            nearest = min(candidates, key=lambda word: abs(word['box'][0] - label_x))
+                            return nearest['text'], index
+        return None, None
+
+def group_lines(words: List[dict]) -> List[SlipLine]:
+    """
+    Cluster OCR words into lines by vertical centre
+
+    Words whose centres are within half the median word height of a line's
+    centre join that line; each line is then ordered left to right.
+    """
+    heights = [word['box'][3] - word['box'][1] for word in words]
+    tolerance = max(statistics.median(heights) / 2, 1)
+
+    lines: List[SlipLine] = []
+    for word in sorted(words, key=lambda w: ((w['box'][1] + w['box'][3]) / 2, w['box'][0])):
+        center_y = (word['box'][1] + word['box'][3]) / 2
+        if lines and abs(center_y - lines[-1].center_y) <= tolerance:
+            line = lines[-1]
+            line.words.append(word)
+            line.center_y += (center_y - line.center_y) / len(line.words)
+        else:
+            lines.append(SlipLine(words=[word], center_y=center_y))
+
+    for line in lines:
+        line.words.sort(key=lambda w: w['box'][0])
+    return lines
+
+def _normalize_american_odds(text: str) -> str:
+    """Map 'EVEN'/'EV' to +100 and keep explicit signs"""
+    if text.upper() in ('EVEN', 'EV'):
+        return '+100'
+    return text
+
+SLIP_TEMPLATES = [
+    SlipTemplate(
+        name='DraftKings',
+        keywords=['draftkings', 'draft kings'],
+        stake_labels=['wager'],
+        payout_labels=['to pay', 'payout']
+    ),
+    SlipTemplate(
+        name='FanDuel',
+        keywords=['fanduel', 'fan duel'],
+        stake_labels=['wager'],
+        payout_labels=['total payout', 'to win']
+    ),
+    SlipTemplate(
+        name='BetMGM',
+        keywords=['betmgm', 'bet mgm'],
+        stake_labels=['stake', 'wager'],
+        payout_labels=['potential payout', 'potential winnings']
+    ),
+    SlipTemplate(
+        name='Caesars',
+        keywords=['caesars sportsbook', 'caesars'],
+        stake_labels=['wager', 'risk'],
+        payout_labels=['to win', 'payout']
+    ),
+    SlipTemplate(
+        name='BetRivers',
+        keywords=['betrivers', 'bet rivers'],
+        stake_labels=['stake', 'wager'],
+        payout_labels=['potential payout', 'payout']
+    ),
+    SlipTemplate(
+        name='PointsBet',
+        keywords=['pointsbet'],
+        stake_labels=['stake', 'risk'],
+        payout_labels=['payout', 'to win']
+    ),
+]
+
+def detect_template(text: str) -> Optional[SlipTemplate]:
+    """Return the template for the sportsbook named in the OCR text"""
+    text_lower = text.lower()
+    for template in SLIP_TEMPLATES:
+        if template.matches(text_lower):
+            return template
+    return None
+
+def parse_slip(text: str, words: List[dict]) -> Optional[Dict]:
+    """
+    Parse a slip with its sportsbook template when one is recognized
+
+    Args:
+        text (str): Full OCR text
+        words (list): Word boxes from the OCR backend
+
+    Returns:
+        dict: Template parse result, or None to fall back to the regex extractors
+    """
+    template = detect_template(text)
+    if template is None or not words:
+        return None
+    return template.parse(words)
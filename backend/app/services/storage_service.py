@@ -29,6 +29,26 @@ class StorageService:
         
         return f"gs://{self.bucket_name}/{destination_blob_name}"
         
+    def upload_stream_to_cloud_storage(self, file_obj, destination_blob_name, content_type=None):
+        """
+        Upload an open file object to Google Cloud Storage
+        
+        Args:
+            file_obj: Readable binary file object (rewound before upload)
+            destination_blob_name: Destination path in bucket
+            content_type: MIME type of the content (optional)
+            
+        Returns:
+            str: Public URL of the uploaded file
+        """
+        bucket = self.client.bucket(self.bucket_name)
+        blob = bucket.blob(destination_blob_name)
+        
+        # Upload straight from the buffer, no local file needed
+        blob.upload_from_file(file_obj, rewind=True, content_type=content_type)
+        
+        return f"gs://{self.bucket_name}/{destination_blob_name}"
+        
     def delete_from_cloud_storage(self, blob_name):
         """
         Delete a file from Google Cloud Storage
@@ -112,6 +132,7 @@ storage_service = StorageService()
 
 # Export individual functions for convenience
 upload_to_cloud_storage = storage_service.upload_to_cloud_storage
+upload_stream_to_cloud_storage = storage_service.upload_stream_to_cloud_storage
 delete_from_cloud_storage = storage_service.delete_from_cloud_storage
 get_signed_url = storage_service.get_signed_url
 schedule_deletion = storage_service.schedule_deletion
\ No newline at end of file
@@ -0,0 +1,146 @@
+# services/tipster_service.py (Reddit tipster track records)
+
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, update
+
+from  app.models.reddit_post import RedditPick, TipsterStats
+from  app.ml.odds import american_to_decimal
+from  app.services.consensus_service import (
+    predictions_by_selection, first_event_after, selection_key, normalize_market
+)
+from  app.utils.upsert import dialect_insert
+
+logger = logging.getLogger(__name__)
+
+SETTLED_OUTCOMES = ('win', 'loss', 'push')
+# Spread and total picks carry the line, not the price; assume the standard -110
+DEFAULT_LINE_DECIMAL = 1 + 100 / 110
+
+def pick_profit(outcome, bet_type, odds):
+    """Units won or lost on a flat one-unit pick"""
+    if outcome == 'push':
+        return 0.0
+    if outcome == 'loss':
+        return -1.0
+    decimal = DEFAULT_LINE_DECIMAL
+    if bet_type == 'moneyline' and odds:
+        decimal = float(american_to_decimal(odds))
+    return decimal - 1
+
+def settle_reddit_picks(session, batch_size=1000, match_window_hours=48):
+    """
+    Settle scraped picks against settled predictions and update tipster stats
+
+    A moneyline pick settles with the first settled moneyline Prediction
+    on the same canonical team (or normalized selection) whose event
+    starts within match_window_hours after the pick was posted. Picks with
+    no match once the window has passed are marked 'unmatched'. Spread,
+    total and other picks are marked 'ungraded': a prediction's outcome
+    is for its own line and no final margin is stored, so "Lakers -3.5"
+    and "Lakers +7" cannot be told apart. Each pick is settled exactly
+    once, and its author's totals are incremented in the same
+    transaction, so tipster_stats is maintained incrementally without
+    rescanning history. Picks without an author (deleted accounts) are
+    settled but credited to no one.
+
+    Args:
+        session: SQLAlchemy session
+        batch_size (int): Unsettled picks processed per transaction
+        match_window_hours (int): How long after a pick its event may start
+
+    Returns:
+        dict: Picks settled, marked unmatched and left ungraded
+    """
+    window = timedelta(hours=match_window_hours)
+    expired_before = time.time() - window.total_seconds()
+    settled = unmatched = ungraded = 0
+    last_id = 0
+
+    while True:
+        picks = session.execute(
+            select(RedditPick.id, RedditPick.author, RedditPick.team, RedditPick.team_id, RedditPick.bet_type,
+                   RedditPick.odds, RedditPick.created_utc)
+            .where(RedditPick.outcome.is_(None))
+            .where(RedditPick.id > last_id)
+            .order_by(RedditPick.id)
+            .limit(batch_size)
+        ).all()
+        if not picks:
+            break
+        last_id = picks[-1].id
+
+        updates = []
+        now = datetime.utcnow()
+        gradable = []
+        for pick in picks:
+            if normalize_market(pick.bet_type) == 'moneyline':
+                gradable.append(pick)
+            else:
+                updates.append({'id': pick.id, 'outcome': 'ungraded', 'prediction_id': None, 'settled_at': now})
+                ungraded += 1
+
+        posted = [datetime.utcfromtimestamp(pick.created_utc) for pick in gradable]
+        # Moneyline picks are graded only against moneyline predictions
+        keys = [('moneyline', selection_key(pick.team_id, pick.team)) for pick in gradable]
+        by_selection = predictions_by_selection(
+            session,
+            set(keys),
+            min(posted),
+            max(posted) + window,
+            outcomes=SETTLED_OUTCOMES,
+            by_market=True
+        ) if gradable else {}
+
+        increments = defaultdict(lambda: {'wins': 0, 'losses': 0, 'pushes': 0, 'units_profit': 0.0, 'last_settled_utc': 0.0})
+        for key, pick, posted_at in zip(keys, gradable, posted):
+            prediction = first_event_after(by_selection, key, posted_at, window)
+            if prediction is not None:
+                outcome = prediction.outcome
+                updates.append({'id': pick.id, 'outcome': outcome, 'prediction_id': prediction.id, 'settled_at': now})
+                if pick.author is not None:
+                    totals = increments[pick.author]
+                    totals[{'win': 'wins', 'loss': 'losses', 'push': 'pushes'}[outcome]] += 1
+                    totals['units_profit'] += pick_profit(outcome, pick.bet_type, pick.odds)
+                    totals['last_settled_utc'] = max(totals['last_settled_utc'], pick.created_utc)
+                settled += 1
+            elif pick.created_utc < expired_before:
+                updates.append({'id': pick.id, 'outcome': 'unmatched', 'prediction_id': None, 'settled_at': now})
+                unmatched += 1
+
+        if updates:
+            session.execute(update(RedditPick), updates)
+        if increments:
+            _increment_tipster_stats(session, increments)
+        session.commit()
+
+    logger.info(f"Settled {settled} Reddit picks, {unmatched} unmatched, {ungraded} ungraded")
+    return {'success': True, 'settled': settled, 'unmatched': unmatched, 'ungraded': ungraded}
+
+def _increment_tipster_stats(session, increments):
+    insert = dialect_insert(session)
+    rows = [{'author': author, 'updated_at': datetime.utcnow(), **totals} for author, totals in increments.items()]
+    statement = insert(TipsterStats).values(rows)
+    table = TipsterStats.__table__.c
+    session.execute(statement.on_conflict_do_update(
+        index_elements=[TipsterStats.author],
+        set_={
+            'wins': table.wins + statement.excluded.wins,
+            'losses': table.losses + statement.excluded.losses,
+            'pushes': table.pushes + statement.excluded.pushes,
+            'units_profit': table.units_profit + statement.excluded.units_profit,
+            'last_settled_utc': func.max(func.coalesce(table.last_settled_utc, 0), statement.excluded.last_settled_utc)
+            if session.get_bind().dialect.name == 'sqlite'
+            else func.greatest(func.coalesce(table.last_settled_utc, 0), statement.excluded.last_settled_utc),
+            'updated_at': statement.excluded.updated_at
+        }
+    ))
+
+def get_tipster_stats(session, author):
+    """Track record of one Reddit author by primary key, or None when unknown"""
+    if not author:
+        return None
+    return session.get(TipsterStats, author)
@@ -0,0 +1,53 @@
+"""
+Quality scores for extracted bet slip data
+
+Shared by OCR (to decide whether a local result needs cloud OCR), NLP and
+the upload service, without any of them importing each other.
+"""
+
+def calculate_integrity_score(bet_data):
+    """
+    Calculate an integrity score based on completeness and validity of bet data
+    
+    Args:
+        bet_data: Dictionary of bet details
+        
+    Returns:
+        int: Integrity score (0-100)
+    """
+    score = 0
+    
+    # Check for presence of key data points
+    if bet_data.get('teams') and len(bet_data['teams']) > 0:
+        score += 30  # 30 points for having team names
+    
+    if bet_data.get('odds') and len(bet_data['odds']) > 0:
+        score += 30  # 30 points for having odds
+    
+    if bet_data.get('amount'):
+        score += 20  # 20 points for having bet amount
+    
+    if bet_data.get('bet_type') and bet_data['bet_type'] != 'Unknown':
+        score += 10  # 10 points for having bet type
+    
+    if bet_data.get('sport') and bet_data['sport'] != 'Unknown':
+        score += 10  # 10 points for having sport
+    
+    # Cap at 100
+    return min(score, 100)
+
+def calculate_confidence(bet_data):
+    """Calculate a confidence score for the extraction (missing fields count as unknown)"""
+    score = 0
+    total_fields = 4  
+    
+    if bet_data.get('teams'):
+        score += 1
+    if bet_data.get('odds'):
+        score += 1
+    if bet_data.get('bet_type', 'Unknown') != 'Unknown':
+        score += 1
+    if bet_data.get('sport', 'Unknown') != 'Unknown':
+        score += 1
+    
+    return (score / total_fields) * 100
@@ -0,0 +1,76 @@
+import tempfile
+
+class UploadBuffer:
+    """
+    Single-read buffer for an uploaded file
+    
+    The request stream is copied once into a SpooledTemporaryFile, which
+    stays in memory up to max_memory_bytes and only then rolls over to an
+    anonymous, process-private temp file. The same buffer is then handed
+    to cloud storage and OCR, so nothing is written to a shared folder.
+    """
+    
+    CHUNK_SIZE = 64 * 1024
+    
+    def __init__(self, file, max_memory_bytes=2 * 1024 * 1024, max_bytes=None):
+        """
+        Args:
+            file: Uploaded file (werkzeug FileStorage or any object with .stream/.read)
+            max_memory_bytes: Size above which the buffer spills to disk
+            max_bytes: Hard size limit, ValueError is raised above it (optional)
+        """
+        self.filename = getattr(file, 'filename', None)
+        self.content_type = getattr(file, 'mimetype', None) or getattr(file, 'content_type', None)
+        self.size = 0
+        self._buffer = tempfile.SpooledTemporaryFile(max_size=max_memory_bytes)
+        self._bytes = None
+        
+        stream = getattr(file, 'stream', file)
+        try:
+            stream.seek(0)
+        except (AttributeError, OSError):
+            pass
+        
+        try:
+            while True:
+                chunk = stream.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                self.size += len(chunk)
+                if max_bytes is not None and self.size > max_bytes:
+                    raise ValueError(f'File too large. Maximum size is {max_bytes // (1024 * 1024)}MB')
+                self._buffer.write(chunk)
+        except Exception:
+            self._buffer.close()
+            raise
+        
+        self._buffer.seek(0)
+    
+    @property
+    def spilled_to_disk(self):
+        """True if the buffer rolled over from memory to a temp file"""
+        return bool(getattr(self._buffer, '_rolled', False))
+    
+    def open(self):
+        """Return the underlying file object rewound to the start"""
+        self._buffer.seek(0)
+        return self._buffer
+    
+    def getvalue(self):
+        """Return the buffered content as bytes, reading it at most once"""
+        if self._bytes is None:
+            self._bytes = self.open().read()
+            self._buffer.seek(0)
+        return self._bytes
+    
+    def close(self):
+        """Release the buffer (and its temp file if it spilled)"""
+        self._bytes = None
+        self._buffer.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
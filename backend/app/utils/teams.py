@@ -0,0 +1,358 @@
+"""
+Canonical team dictionary and resolver
+
+Team mentions arrive as raw strings from OCR ("LAL"), spaCy ORG entities
+("LA Lakers") and the Reddit pick patterns ("Take the Lakers"). Every
+ingestion path resolves them to a canonical id such as 'nba:lal' so
+aggregation and leaderboards can group them.
+
+Resolution order, cheapest first:
+  1. exact alias (full name, nickname, city, abbreviation, slang)
+  2. the longest run of words inside the mention that is an alias
+  3. trigram similarity against every alias of four or more characters
+
+Mentions matching teams in several leagues (Giants, Kings, "Boston") are
+ambiguous unless a sport or league hint narrows them to one team.
+"""
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+# league: (sport, rows); each row is abbreviation|city|nickname|extra aliases
+LEAGUES = {
+    'nba': ('basketball', """
+        ATL|Atlanta|Hawks|
+        BOS|Boston|Celtics|cs
+        BKN|Brooklyn|Nets|brk
+        CHA|Charlotte|Hornets|cho
+        CHI|Chicago|Bulls|
+        CLE|Cleveland|Cavaliers|cavs
+        DAL|Dallas|Mavericks|mavs
+        DEN|Denver|Nuggets|
+        DET|Detroit|Pistons|
+        GSW|Golden State|Warriors|gs,dubs
+        HOU|Houston|Rockets|
+        IND|Indiana|Pacers|
+        LAC|Los Angeles|Clippers|la clippers,clips
+        LAL|Los Angeles|Lakers|la lakers
+        MEM|Memphis|Grizzlies|grizz
+        MIA|Miami|Heat|
+        MIL|Milwaukee|Bucks|
+        MIN|Minnesota|Timberwolves|wolves,t wolves,twolves
+        NOP|New Orleans|Pelicans|pels
+        NYK|New York|Knicks|ny knicks
+        OKC|Oklahoma City|Thunder|
+        ORL|Orlando|Magic|
+        PHI|Philadelphia|76ers|sixers,philly
+        PHX|Phoenix|Suns|pho
+        POR|Portland|Trail Blazers|blazers
+        SAC|Sacramento|Kings|
+        SAS|San Antonio|Spurs|
+        TOR|Toronto|Raptors|raps
+        UTA|Utah|Jazz|
+        WAS|Washington|Wizards|wsh
+    """),
+    'nfl': ('football', """
+        ARI|Arizona|Cardinals|
+        ATL|Atlanta|Falcons|
+        BAL|Baltimore|Ravens|
+        BUF|Buffalo|Bills|
+        CAR|Carolina|Panthers|
+        CHI|Chicago|Bears|
+        CIN|Cincinnati|Bengals|
+        CLE|Cleveland|Browns|
+        DAL|Dallas|Cowboys|
+        DEN|Denver|Broncos|
+        DET|Detroit|Lions|
+        GB|Green Bay|Packers|gnb
+        HOU|Houston|Texans|
+        IND|Indianapolis|Colts|
+        JAX|Jacksonville|Jaguars|jags
+        KC|Kansas City|Chiefs|kan
+        LV|Las Vegas|Raiders|lvr
+        LAC|Los Angeles|Chargers|la chargers
+        LAR|Los Angeles|Rams|la rams
+        MIA|Miami|Dolphins|fins
+        MIN|Minnesota|Vikings|vikes
+        NE|New England|Patriots|pats,nwe
+        NO|New Orleans|Saints|nor
+        NYG|New York|Giants|ny giants
+        NYJ|New York|Jets|ny jets
+        PHI|Philadelphia|Eagles|
+        PIT|Pittsburgh|Steelers|
+        SF|San Francisco|49ers|niners,sfo
+        SEA|Seattle|Seahawks|hawks
+        TB|Tampa Bay|Buccaneers|bucs,tam
+        TEN|Tennessee|Titans|
+        WAS|Washington|Commanders|wsh
+    """),
+    'mlb': ('baseball', """
+        ARI|Arizona|Diamondbacks|dbacks,d backs
+        ATL|Atlanta|Braves|
+        BAL|Baltimore|Orioles|os
+        BOS|Boston|Red Sox|sox
+        CHC|Chicago|Cubs|
+        CWS|Chicago|White Sox|chw
+        CIN|Cincinnati|Reds|
+        CLE|Cleveland|Guardians|guards
+        COL|Colorado|Rockies|
+        DET|Detroit|Tigers|
+        HOU|Houston|Astros|stros
+        KC|Kansas City|Royals|kcr
+        LAA|Los Angeles|Angels|la angels,anaheim angels
+        LAD|Los Angeles|Dodgers|la dodgers
+        MIA|Miami|Marlins|
+        MIL|Milwaukee|Brewers|brew crew
+        MIN|Minnesota|Twins|
+        NYM|New York|Mets|ny mets
+        NYY|New York|Yankees|yanks,ny yankees
+        OAK|Oakland|Athletics|a s,athletics
+        PHI|Philadelphia|Phillies|phils
+        PIT|Pittsburgh|Pirates|bucs
+        SD|San Diego|Padres|sdp
+        SF|San Francisco|Giants|sfg
+        SEA|Seattle|Mariners|ms
+        STL|St Louis|Cardinals|cards,saint louis
+        TB|Tampa Bay|Rays|tbr
+        TEX|Texas|Rangers|
+        TOR|Toronto|Blue Jays|jays
+        WSH|Washington|Nationals|nats
+    """),
+    'nhl': ('hockey', """
+        ANA|Anaheim|Ducks|
+        BOS|Boston|Bruins|
+        BUF|Buffalo|Sabres|
+        CGY|Calgary|Flames|
+        CAR|Carolina|Hurricanes|canes
+        CHI|Chicago|Blackhawks|hawks
+        COL|Colorado|Avalanche|avs
+        CBJ|Columbus|Blue Jackets|jackets
+        DAL|Dallas|Stars|
+        DET|Detroit|Red Wings|wings
+        EDM|Edmonton|Oilers|
+        FLA|Florida|Panthers|
+        LAK|Los Angeles|Kings|la kings
+        MIN|Minnesota|Wild|
+        MTL|Montreal|Canadiens|habs
+        NSH|Nashville|Predators|preds
+        NJD|New Jersey|Devils|
+        NYI|New York|Islanders|isles
+        NYR|New York|Rangers|ny rangers
+        OTT|Ottawa|Senators|sens
+        PHI|Philadelphia|Flyers|
+        PIT|Pittsburgh|Penguins|pens
+        SJS|San Jose|Sharks|
+        SEA|Seattle|Kraken|
+        STL|St Louis|Blues|
+        TBL|Tampa Bay|Lightning|bolts
+        TOR|Toronto|Maple Leafs|leafs
+        UTA|Utah|Mammoth|utah hockey club
+        VAN|Vancouver|Canucks|nucks
+        VGK|Vegas|Golden Knights|knights
+        WSH|Washington|Capitals|caps
+        WPG|Winnipeg|Jets|
+    """),
+    # Soccer clubs carry their full name in the nickname column
+    'soccer': ('soccer', """
+        ARS||Arsenal|gunners
+        AVL||Aston Villa|villa
+        BOU||Bournemouth|afc bournemouth
+        BRE||Brentford|
+        BHA||Brighton|brighton and hove albion
+        BUR||Burnley|
+        CHE||Chelsea|
+        CRY||Crystal Palace|palace
+        EVE||Everton|
+        FUL||Fulham|
+        LEE||Leeds United|leeds
+        LIV||Liverpool|
+        MCI||Manchester City|man city
+        MUN||Manchester United|man united,man utd
+        NEW||Newcastle United|newcastle
+        NFO||Nottingham Forest|forest
+        SUN||Sunderland|
+        TOT||Tottenham Hotspur|tottenham,spurs
+        WHU||West Ham United|west ham
+        WOL||Wolverhampton Wanderers|wolves
+        RMA||Real Madrid|madrid
+        FCB||Barcelona|barca,fc barcelona
+        ATM||Atletico Madrid|atleti
+        BAY||Bayern Munich|bayern
+        PSG||Paris Saint Germain|paris sg
+        INT||Inter Milan|inter
+        MIL||AC Milan|milan
+        JUV||Juventus|juve
+    """),
+}
+
+# Words dropped from mentions before lookup ("Lakers ML", "the Chiefs")
+NOISE_WORDS = frozenset({'the', 'ml', 'moneyline', 'pk', 'pick', 'fc', 'take', 'and', 'on', 'to', 'win'})
+
+# Abbreviations this short only count when they are the whole mention
+MAX_ABBREVIATION_LENGTH = 3
+
+FUZZY_THRESHOLD = 0.6
+
+_NON_ALPHANUMERIC = re.compile(r'[^a-z0-9]+')
+
+def normalize_mention(text):
+    """Lowercase, replace punctuation with spaces and drop noise words"""
+    words = _NON_ALPHANUMERIC.sub(' ', (text or '').lower()).split()
+    return ' '.join(word for word in words if word not in NOISE_WORDS)
+
+def trigrams(text):
+    padded = f'  {text} '
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+@dataclass(frozen=True)
+class Team:
+    id: str
+    league: str
+    sport: str
+    name: str
+    abbreviation: str
+    aliases: frozenset  # normalized
+
+@dataclass(frozen=True)
+class TeamMatch:
+    team: Team
+    score: float  # 1.0 for alias matches, trigram similarity for fuzzy ones
+    method: str   # exact, partial or fuzzy
+
+def load_teams() -> List[Team]:
+    """Parse LEAGUES into Team records"""
+    teams = []
+    for league, (sport, table) in LEAGUES.items():
+        for line in table.strip().splitlines():
+            abbreviation, city, nickname, extra = line.strip().split('|')
+            name = f'{city} {nickname}'.strip()
+            aliases = {normalize_mention(alias) for alias in [name, city, nickname, abbreviation] + extra.split(',')}
+            aliases.discard('')
+            teams.append(Team(f'{league}:{abbreviation.lower()}', league, sport, name, abbreviation, frozenset(aliases)))
+    return teams
+
+class TeamResolver:
+    """
+    Alias index plus trigram index over the canonical team dictionary
+
+    Lookups are dictionary hits except for fuzzy matching, which scores
+    only the aliases sharing a trigram with the mention. Results are
+    cached per (mention, hint).
+    """
+
+    def __init__(self, teams: Optional[List[Team]] = None, fuzzy_threshold: float = FUZZY_THRESHOLD):
+        """
+        Args:
+            teams (list, optional): Team records; defaults to load_teams()
+            fuzzy_threshold (float): Minimum Dice similarity of trigrams for a fuzzy match
+        """
+        self.teams = {team.id: team for team in (teams or load_teams())}
+        self.fuzzy_threshold = fuzzy_threshold
+        # alias -> team ids; abbreviations are kept apart so they only match whole mentions
+        self.aliases: Dict[str, set] = defaultdict(set)
+        self.abbreviations: Dict[str, set] = defaultdict(set)
+        for team in self.teams.values():
+            for alias in team.aliases:
+                index = self.abbreviations if len(alias) <= MAX_ABBREVIATION_LENGTH else self.aliases
+                index[alias].add(team.id)
+
+        self._alias_list = [alias for alias in self.aliases if len(alias) >= 4]
+        self._alias_trigrams = [trigrams(alias) for alias in self._alias_list]
+        self._trigram_index: Dict[str, List[int]] = defaultdict(list)
+        for position, grams in enumerate(self._alias_trigrams):
+            for gram in grams:
+                self._trigram_index[gram].append(position)
+        self.resolve = lru_cache(maxsize=65536)(self._resolve)
+
+    def _pick(self, team_ids, hint):
+        """The one team among team_ids, after narrowing by sport/league hint"""
+        if hint and len(team_ids) > 1:
+            # A hint only narrows; one that matches nothing (e.g. 'ncaab') is ignored
+            team_ids = {team_id for team_id in team_ids
+                        if hint in (self.teams[team_id].sport, self.teams[team_id].league)} or team_ids
+        if len(team_ids) == 1:
+            return self.teams[next(iter(team_ids))]
+        return None
+
+    def _resolve(self, mention: str, hint: Optional[str] = None) -> Optional[TeamMatch]:
+        """
+        Canonical team for one mention, or None when unknown or ambiguous
+
+        Args:
+            mention (str): Raw team text
+            hint (str, optional): Sport ('basketball') or league ('nba'), lowercase
+        """
+        text = normalize_mention(mention)
+        if not text:
+            return None
+
+        exact = self.aliases.get(text) or self.abbreviations.get(text)
+        if exact:
+            team = self._pick(exact, hint)
+            return TeamMatch(team, 1.0, 'exact') if team else None
+
+        words = text.split()
+        for size in range(len(words) - 1, 0, -1):
+            found = set()
+            for start in range(len(words) - size + 1):
+                team_ids = self.aliases.get(' '.join(words[start:start + size]))
+                if team_ids:
+                    team = self._pick(team_ids, hint)
+                    found.add(team.id if team else None)
+            if found:
+                # Several teams in one mention ("Lakers vs Celtics") resolve to none
+                return TeamMatch(self.teams[found.pop()], 1.0, 'partial') if len(found) == 1 and None not in found else None
+
+        return self._fuzzy(text, hint)
+
+    def _fuzzy(self, text, hint):
+        grams = trigrams(text)
+        shared = defaultdict(int)
+        for gram in grams:
+            for position in self._trigram_index.get(gram, ()):
+                shared[position] += 1
+        if not shared:
+            return None
+
+        best_score, best_ids = 0.0, set()
+        for position, count in shared.items():
+            score = 2 * count / (len(grams) + len(self._alias_trigrams[position]))
+            if score > best_score:
+                best_score, best_ids = score, set(self.aliases[self._alias_list[position]])
+            elif score == best_score:
+                best_ids |= self.aliases[self._alias_list[position]]
+        if best_score < self.fuzzy_threshold:
+            return None
+        team = self._pick(best_ids, hint)
+        return TeamMatch(team, best_score, 'fuzzy') if team else None
+
+    def resolve_id(self, mention: str, hint: Optional[str] = None) -> Optional[str]:
+        """Canonical team id for one mention, or None"""
+        match = self.resolve(mention, hint)
+        return match.team.id if match else None
+
+    def resolve_many(self, mentions: Iterable[str], hint: Optional[str] = None) -> List[Optional[str]]:
+        """Canonical team ids for many mentions, in input order (duplicates resolved once)"""
+        mentions = list(mentions)
+        resolved = {mention: self.resolve_id(mention, hint) for mention in set(mentions)}
+        return [resolved[mention] for mention in mentions]
+
+def sport_hint(sport):
+    """Resolver hint from a sport label ('Basketball', 'unknown', None)"""
+    sport = (sport or '').strip().lower()
+    return None if sport in ('', 'unknown') else sport
+
+@lru_cache(maxsize=1)
+def get_team_resolver() -> TeamResolver:
+    """Process-wide resolver, built on first use"""
+    return TeamResolver()
+
+def resolve_team_id(mention, sport=None):
+    """Canonical team id for one mention, or None"""
+    return get_team_resolver().resolve_id(mention, sport_hint(sport))
+
+def resolve_team_ids(mentions, sport=None):
+    """Canonical team ids for many mentions, in input order"""
+    return get_team_resolver().resolve_many(mentions, sport_hint(sport))
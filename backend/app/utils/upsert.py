@@ -0,0 +1,11 @@
+def dialect_insert(session):
+    """
+    insert() construct with ON CONFLICT support for the session's database
+
+    Postgres and SQLite share the on_conflict_do_update/do_nothing API.
+    """
+    if session.get_bind().dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
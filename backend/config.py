@@ -14,6 +14,11 @@ class Config:
     GCP_PROJECT_ID = os.environ.get('GCP_PROJECT_ID', 'clutch-app-project')
     GCP_BUCKET_NAME = os.environ.get('GCP_BUCKET_NAME', 'clutch-app-uploads')
     GCP_TEMP_FOLDER = 'temp_uploads/'
+    
+    OCR_BACKEND = os.environ.get('OCR_BACKEND', 'vision')  # vision, tesseract or cascade
+    OCR_CASCADE_THRESHOLD = float(os.environ.get('OCR_CASCADE_THRESHOLD', 80))
+    OCR_CASCADE_MIN_CONFIDENCE = float(os.environ.get('OCR_CASCADE_MIN_CONFIDENCE', 50))  # calculate_confidence, 0-100
+    OCR_CLOUD_COST_PER_IMAGE = float(os.environ.get('OCR_CLOUD_COST_PER_IMAGE', 0.0015))
 
     FIREBASE_CONFIG = os.environ.get('FIREBASE_CONFIG')
     FIREBASE_API_KEY = os.environ.get('FIREBASE_API_KEY', '')
@@ -27,6 +32,24 @@ class Config:
     REDDIT_CLIENT_ID = os.environ.get('REDDIT_CLIENT_ID')
     REDDIT_CLIENT_SECRET = os.environ.get('REDDIT_CLIENT_SECRET')
     REDDIT_USER_AGENT = os.environ.get('REDDIT_USER_AGENT')
+    REDDIT_EXTRACT_WORKERS = os.environ.get('REDDIT_EXTRACT_WORKERS')  # extraction processes, 0 = inline
+    
+    MODEL_DIR = os.environ.get('MODEL_DIR', 'models')
+    MODEL_BACKEND = os.environ.get('MODEL_BACKEND', 'numpy')  # numpy (serving) or keras
+    BET_MODEL_VERSION = os.environ.get('BET_MODEL_VERSION')  # pin a version, defaults to latest
+    MODEL_RECHECK_SECONDS = float(os.environ.get('MODEL_RECHECK_SECONDS', 60))  # look for a newer artifact, 0 = never
+    PREDICTION_BATCH_SIZE = int(os.environ.get('PREDICTION_BATCH_SIZE', 64))
+    PREDICTION_BATCH_WAIT_MS = float(os.environ.get('PREDICTION_BATCH_WAIT_MS', 5))
+    MAX_EV_BATCH = int(os.environ.get('MAX_EV_BATCH', 10000))
+    PREDICTION_CACHE_BACKEND = os.environ.get('PREDICTION_CACHE_BACKEND', 'memory')  # memory, redis or none
+    PREDICTION_CACHE_MAX_ENTRIES = int(os.environ.get('PREDICTION_CACHE_MAX_ENTRIES', 10000))
+    REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+    FAQ_SEARCH_BACKEND = os.environ.get('FAQ_SEARCH_BACKEND', 'auto')  # auto, postgres or memory
+    HELP_CENTER_MAX_AGE = int(os.environ.get('HELP_CENTER_MAX_AGE', 60))  # Cache-Control max-age for help pages
+    HELP_CENTER_RECHECK_SECONDS = float(os.environ.get('HELP_CENTER_RECHECK_SECONDS', 30))
+    FAQ_VIEW_FLUSH_SECONDS = float(os.environ.get('FAQ_VIEW_FLUSH_SECONDS', 30))  # buffered views written at least this often
+    FAQ_VIEW_FLUSH_MAX_PENDING = int(os.environ.get('FAQ_VIEW_FLUSH_MAX_PENDING', 1000))
+    FAQ_POPULAR_COUNT = int(os.environ.get('FAQ_POPULAR_COUNT', 5))  # most viewed FAQs marked is_popular
     
     BASIC_UPLOADS_LIMIT = 10
     PREMIUM_UPLOADS_LIMIT = float('inf')  
@@ -0,0 +1,79 @@
+"""
+In-memory stand-in for the parts of PRAW the Reddit scraper uses
+
+Listings follow Reddit's semantics: newest first, and before=<fullname>
+returns the posts immediately newer than that post.
+"""
+
+class FakeComment:
+    def __init__(self, id, body, created_utc, author='tester', score=1, replies=None):
+        self.id = id
+        self.body = body
+        self.created_utc = created_utc
+        self.author = author
+        self.score = score
+        self.replies = replies or []
+
+class FakeMoreComments:
+    """'Load more comments' stub; load() builds the batch only when expanded"""
+    expanded = 0
+
+    def __init__(self, load):
+        self._load = load
+
+    def comments(self):
+        FakeMoreComments.expanded += 1
+        return self._load()
+
+class FakeSubmission:
+    def __init__(self, id, title, created_utc, selftext='', score=1, num_comments=0, author='tester',
+                 stickied=False, comments=None):
+        self.id = id
+        self.fullname = f't3_{id}'
+        self.title = title
+        self.selftext = selftext
+        self.url = f'https://reddit.com/comments/{id}'
+        self.author = author
+        self.created_utc = created_utc
+        self.score = score
+        self.num_comments = num_comments
+        self.stickied = stickied
+        self.comments = comments or []
+
+class FakeSubreddit:
+    def __init__(self, name, reddit):
+        self.display_name = name
+        self.posts = []
+        self._reddit = reddit
+
+    def add(self, post):
+        self.posts.append(post)
+        self.posts.sort(key=lambda item: item.created_utc, reverse=True)
+
+    def new(self, limit=100, params=None):
+        self._reddit.requests.append((self.display_name, 'new', dict(params or {})))
+        posts = self.posts
+        before = (params or {}).get('before')
+        if before:
+            index = next((i for i, post in enumerate(posts) if post.fullname == before), None)
+            if index is None:
+                return iter([])
+            newer = posts[:index]
+            posts = newer[-limit:] if limit else newer
+        elif limit:
+            posts = posts[:limit]
+        return iter(list(posts))
+
+    def hot(self, limit=100):
+        self._reddit.requests.append((self.display_name, 'hot', {}))
+        return iter(sorted(self.posts, key=lambda post: post.score, reverse=True)[:limit])
+
+class FakeReddit:
+    def __init__(self):
+        self.subreddits = {}
+        self.requests = []
+
+    def subreddit(self, name):
+        if name not in self.subreddits:
+            self.subreddits[name] = FakeSubreddit(name, self)
+        return self.subreddits[name]
@@ -0,0 +1,112 @@
+import threading
+import time
+import unittest
+import numpy as np
+from app.ml.batching import MicroBatcher
+
+class RecordingModel:
+    """predict_fn that doubles its input and records each batch size, failing on error or a rejected value"""
+
+    def __init__(self, error=None, reject=None):
+        self.error = error
+        self.reject = reject
+        self.batch_sizes = []
+        self._lock = threading.Lock()
+
+    def __call__(self, batch):
+        with self._lock:
+            self.batch_sizes.append(len(batch))
+        if self.error:
+            raise self.error
+        if self.reject is not None and (batch == self.reject).any():
+            raise ValueError(f'cannot score {self.reject}')
+        return batch * 2
+
+class MicroBatcherTestCase(unittest.TestCase):
+    """Tests for coalescing single-row predictions into batches."""
+
+    def make_batcher(self, model, **kwargs):
+        batcher = MicroBatcher(model, **kwargs)
+        self.addCleanup(batcher.close)
+        return batcher
+
+    def test_concurrent_rows_share_one_forward_pass(self):
+        """Test rows queued within the wait are stacked and each caller gets its own row."""
+        model = RecordingModel()
+        batcher = self.make_batcher(model, max_batch_size=4, max_wait_ms=1000)
+
+        futures = [batcher.submit([index, index + 0.5]) for index in range(4)]
+
+        for index, future in enumerate(futures):
+            np.testing.assert_array_equal(future.result(timeout=5), [2 * index, 2 * index + 1])
+        self.assertEqual(model.batch_sizes, [4])
+
+    def test_batches_are_capped_at_max_size(self):
+        """Test a burst larger than max_batch_size is split."""
+        model = RecordingModel()
+        batcher = self.make_batcher(model, max_batch_size=3, max_wait_ms=200)
+
+        futures = [batcher.submit([index]) for index in range(7)]
+
+        self.assertEqual([future.result(timeout=5)[0] for future in futures], [2 * index for index in range(7)])
+        self.assertTrue(all(size <= 3 for size in model.batch_sizes))
+        self.assertEqual(sum(model.batch_sizes), 7)
+
+    def test_lone_request_runs_after_max_wait(self):
+        """Test a single row is not held past max_wait_ms waiting for company."""
+        model = RecordingModel()
+        batcher = self.make_batcher(model, max_batch_size=64, max_wait_ms=20)
+
+        started = time.monotonic()
+        result = batcher.predict([1.0], timeout=5)
+        elapsed = time.monotonic() - started
+
+        np.testing.assert_array_equal(result, [2.0])
+        self.assertEqual(model.batch_sizes, [1])
+        self.assertGreaterEqual(elapsed, 0.015)
+        self.assertLess(elapsed, 2)
+
+    def test_failed_batch_raises_in_every_failing_caller(self):
+        """Test a predict_fn that fails every row reaches each waiting future, and later batches still run."""
+        model = RecordingModel(error=ValueError('bad batch'))
+        batcher = self.make_batcher(model, max_batch_size=3, max_wait_ms=1000)
+
+        futures = [batcher.submit([index]) for index in range(3)]
+        for future in futures:
+            with self.assertRaisesRegex(ValueError, 'bad batch'):
+                future.result(timeout=5)
+
+        model.error = None
+        np.testing.assert_array_equal(batcher.predict([4.0], timeout=5), [8.0])
+
+    def test_bad_row_only_fails_its_own_caller(self):
+        """Test a batch broken by one row is retried row by row."""
+        model = RecordingModel(reject=-1.0)
+        batcher = self.make_batcher(model, max_batch_size=3, max_wait_ms=1000)
+
+        good, bad, other = batcher.submit([1.0, 2.0]), batcher.submit([-1.0, 2.0]), batcher.submit([3.0, 4.0])
+
+        np.testing.assert_array_equal(good.result(timeout=5), [2.0, 4.0])
+        np.testing.assert_array_equal(other.result(timeout=5), [6.0, 8.0])
+        with self.assertRaisesRegex(ValueError, 'cannot score'):
+            bad.result(timeout=5)
+        self.assertEqual(model.batch_sizes, [3, 1, 1, 1])
+
+    def test_unreadable_row_is_rejected_on_submit(self):
+        batcher = self.make_batcher(RecordingModel())
+        with self.assertRaises(ValueError):
+            batcher.submit(['two'])
+
+    def test_close_serves_queued_requests(self):
+        """Test close waits for queued rows and then refuses new ones."""
+        batcher = MicroBatcher(RecordingModel(), max_batch_size=64, max_wait_ms=1000)
+        future = batcher.submit([3.0])
+
+        batcher.close()
+
+        np.testing.assert_array_equal(future.result(timeout=0), [6.0])
+        with self.assertRaises(RuntimeError):
+            batcher.submit([1.0])
+
+if __name__ == '__main__':
+    unittest.main()
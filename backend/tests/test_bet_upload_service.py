@@ -0,0 +1,182 @@
+import io
+import sys
+import types
+import unittest
+import zipfile
+from unittest import mock
+from flask import Flask
+from werkzeug.datastructures import FileStorage
+from app import db
+from app.models import user, subscription, betting_stats, bankroll, marketplace, prediction  # noqa: F401
+from app.models.bet import Bet, BetLeg
+from app.models.reddit_post import TipsterStats
+
+def stub_missing_modules():
+    """
+    Stand in for spaCy and google-cloud-storage where they are not installed
+
+    The upload service imports both (a spaCy model and a GCS client are
+    built at import), but these tests fake OCR, NLP and storage, so the
+    suite runs either way.
+    """
+    try:
+        import spacy  # noqa: F401
+    except ImportError:
+        sys.modules['spacy'] = types.SimpleNamespace(load=mock.Mock())
+    try:
+        from google.cloud import storage  # noqa: F401
+    except ImportError:
+        storage = types.SimpleNamespace(Client=mock.Mock())
+        cloud = sys.modules.setdefault('google.cloud', types.ModuleType('google.cloud'))
+        cloud.storage = sys.modules['google.cloud.storage'] = storage
+        sys.modules.setdefault('google', types.ModuleType('google')).cloud = cloud
+
+stub_missing_modules()
+from app.services.bet_upload_service import BetUploadService  # noqa: E402
+
+SLIP_TEXT = 'Lakers vs Celtics\nMoneyline -110\nStake $25'
+
+def slip_file(name='slip.png', content=b'\x89PNG fake image bytes'):
+    return FileStorage(stream=io.BytesIO(content), filename=name)
+
+def fake_ocr(file):
+    """Storage path and OCR result for an uploaded slip, without GCS or an OCR engine"""
+    if file.filename.startswith('blurry'):
+        return f'gs://test/{file.filename}', {'success': False, 'message': 'No text found'}
+    return f'gs://test/{file.filename}', {
+        'success': True, 'text': SLIP_TEXT, 'teams': ['Lakers', 'Celtics'], 'odds': ['-110'],
+        'amount': '$25', 'bet_type': 'Moneyline'
+    }
+
+def zip_upload(entries):
+    """A ZIP upload holding name -> bytes entries (a trailing '/' name is a directory)"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for name, content in entries.items():
+            archive.writestr(name, content)
+    buffer.seek(0)
+    return FileStorage(stream=buffer, filename='slips.zip')
+
+def fake_nlp(texts):
+    return [{'sport': 'basketball', 'bet_type': 'Moneyline'} for _ in texts]
+
+class BulkUploadTestCase(unittest.TestCase):
+    """Tests for bulk bet-slip uploads with OCR and NLP faked out."""
+
+    def setUp(self):
+        """Bind the app database to in-memory SQLite."""
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        db.init_app(self.app)
+        self.context = self.app.app_context()
+        self.context.push()
+        db.create_all()
+        patches = [
+            mock.patch.object(BetUploadService, '_ocr_uploaded_file', side_effect=fake_ocr),
+            mock.patch('app.services.bet_upload_service.process_texts', side_effect=fake_nlp),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.context.pop()
+
+    def test_bulk_upload_saves_each_readable_slip(self):
+        """Test readable slips are saved in one transaction and failures reported per file."""
+        files = [slip_file('a.png'), slip_file('blurry.png'), slip_file('notes.txt'), slip_file('b.jpg')]
+
+        result = BetUploadService.process_bulk_upload(1, files)
+
+        self.assertTrue(result['success'])
+        self.assertEqual((result['summary']['succeeded'], result['summary']['failed']), (2, 2))
+        self.assertEqual([r['success'] for r in result['results']], [True, False, False, True])
+        self.assertEqual(result['results'][1]['error'], 'No text found')
+        self.assertIn('Invalid file type', result['results'][2]['error'])
+        self.assertEqual(db.session.query(Bet).count(), 2)
+
+    def test_bulk_upload_inserts_parlay_legs(self):
+        """Test bulk-inserted bets get their ids back in file order, with every leg attached."""
+        legs = [{'selection': team, 'teams': ['Lakers', 'Celtics'], 'odds': '-110'} for team in ('Lakers', 'Celtics')]
+        def parlay_nlp(texts):
+            return [{'sport': 'basketball', 'bet_type': 'Parlay'} for _ in texts]
+
+        with mock.patch('app.services.bet_upload_service.process_texts', side_effect=parlay_nlp), \
+                mock.patch.object(BetUploadService, '_merge_ocr_and_nlp',
+                                  side_effect=lambda ocr, nlp: {**ocr, **nlp, 'legs': legs, 'original_text': ocr['text']}):
+            result = BetUploadService.process_bulk_upload(1, [slip_file('a.png'), slip_file('b.png')])
+
+        bet_ids = [r['bet_id'] for r in result['results']]
+        self.assertEqual(bet_ids, sorted(bet_ids))
+        for bet_id in bet_ids:
+            bet = db.session.get(Bet, bet_id)
+            self.assertEqual((bet.status, bet.profit), ('pending', 0.0))
+            self.assertEqual([leg.team_name for leg in bet.legs], ['Lakers', 'Celtics'])
+        self.assertEqual(db.session.query(BetLeg).count(), 4)
+
+    def test_bulk_upload_attaches_tipster_record(self):
+        """Test a known Reddit author's win rate reaches every saved bet."""
+        db.session.add(TipsterStats(author='sharp', wins=12, losses=8, units_profit=3.0))
+        db.session.commit()
+
+        result = BetUploadService.process_bulk_upload(1, [slip_file('a.png'), slip_file('b.png')],
+                                                      reddit_username='sharp')
+
+        self.assertEqual(result['summary']['succeeded'], 2)
+        self.assertEqual(result['tipster']['author'], 'sharp')
+        for bet in db.session.query(Bet):
+            self.assertIsNotNone(bet.additional_data['tipster_win_rate'])
+
+    def test_bulk_upload_rejects_too_many_files(self):
+        """Test the file-count limit is enforced before any OCR."""
+        files = [slip_file(f'{index}.png') for index in range(BetUploadService.MAX_BULK_FILES + 1)]
+        self.assertFalse(BetUploadService.process_bulk_upload(1, files)['success'])
+        BetUploadService._ocr_uploaded_file.assert_not_called()
+
+    def test_bulk_upload_runs_nlp_once(self):
+        """Test every readable slip's text goes through NLP in a single batch."""
+        from app.services import bet_upload_service
+
+        BetUploadService.process_bulk_upload(1, [slip_file(f'{index}.png') for index in range(3)])
+
+        bet_upload_service.process_texts.assert_called_once_with([SLIP_TEXT] * 3)
+
+class ZipExtractionTestCase(unittest.TestCase):
+    """Tests for expanding ZIP uploads into slip files."""
+
+    def test_flattens_nested_paths_and_skips_metadata(self):
+        """Test nested slips keep their base names and directories, dotfiles and __MACOSX are dropped."""
+        archive = zip_upload({
+            'slips/': b'', 'slips/week1/a.png': b'a', 'b.jpg': b'b',
+            '__MACOSX/slips/._a.png': b'x', 'slips/.DS_Store': b'x',
+        })
+
+        files = BetUploadService.extract_zip_files(archive)
+
+        self.assertEqual([(file.filename, file.read()) for file in files], [('a.png', b'a'), ('b.jpg', b'b')])
+
+    def test_rejects_too_many_entries(self):
+        """Test the bulk file limit applies to archive entries."""
+        archive = zip_upload({f'{index}.png': b'x' for index in range(3)})
+        with mock.patch.object(BetUploadService, 'MAX_BULK_FILES', 2):
+            with self.assertRaisesRegex(ValueError, 'Too many files'):
+                BetUploadService.extract_zip_files(archive)
+
+    def test_rejects_oversized_archive_before_reading(self):
+        """Test declared uncompressed sizes are checked before anything is decompressed."""
+        archive = zip_upload({'a.png': b'0' * 600, 'b.png': b'0' * 600})
+        with mock.patch.object(BetUploadService, 'MAX_ZIP_UNCOMPRESSED_BYTES', 1000), \
+                mock.patch.object(zipfile.ZipFile, 'read') as read:
+            with self.assertRaisesRegex(ValueError, 'too large'):
+                BetUploadService.extract_zip_files(archive)
+        read.assert_not_called()
+
+    def test_rejects_invalid_archive(self):
+        """Test a non-ZIP upload raises ValueError."""
+        with self.assertRaisesRegex(ValueError, 'Invalid ZIP'):
+            BetUploadService.extract_zip_files(slip_file('slips.zip', b'not a zip'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+import numpy as np
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import Session
+from app.models import user, subscription, betting_stats, bankroll, marketplace  # noqa: F401
+from app.models.bet import Bet, BetLeg
+from app.ml.data_preprocessing import stream_settled_bets
+from app.ml.feature_engineering import encode_bets
+from app.models.consensus import EventConsensus, ConsensusWatermark
+from app.models.prediction import Prediction
+from app.models.reddit_post import RedditPick
+from app.services import consensus_service
+from app.services.ai_service import prepare_features
+from app.services.consensus_service import (
+    update_consensus, get_consensus, consensus_shares, normalize_event_key, slip_selection
+)
+from app.utils.teams import resolve_team_ids
+
+class ConsensusServiceTestCase(unittest.TestCase):
+    """Tests for incremental per-event consensus from Reddit picks and uploads."""
+
+    def setUp(self):
+        """Create in-memory tables with one upcoming Lakers/Celtics event."""
+        self.engine = create_engine('sqlite://')
+        for model in (RedditPick, Bet, BetLeg, Prediction, EventConsensus, ConsensusWatermark):
+            model.__table__.create(self.engine)
+        self.session = Session(self.engine)
+        self.now = datetime.utcnow()
+        self.event_date = self.now + timedelta(hours=6)
+        for selection in ('Lakers', 'Celtics'):
+            self.session.add(Prediction(
+                event_name='Lakers vs Celtics', event_date=self.event_date, sport='basketball',
+                selection=selection, status='active'
+            ))
+        self.session.commit()
+        self.picks = 0
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def add_pick(self, team, stake=None, sentiment=None, team_id=None):
+        self.picks += 1
+        self.session.add(RedditPick(
+            pick_hash=f'h{self.picks}', comment_id=f'c{self.picks}', submission_id='s1', subreddit='sportsbook',
+            author=f'user{self.picks}', team=team, team_id=team_id, bet_type='moneyline', odds=-110, stake=stake,
+            sentiment_score=sentiment, created_utc=self.now.timestamp() - 3600
+        ))
+
+    def test_event_key_ignores_order_and_separator(self):
+        """Test both team orders and separators map to one event."""
+        date = datetime(2024, 5, 1, 19)
+        self.assertEqual(normalize_event_key('Lakers vs Celtics', date), normalize_event_key('celtics @ LAKERS', date))
+
+    def test_consensus_accumulates_incrementally(self):
+        """Test picks and uploads fold into shares and stake-weighted sentiment across runs."""
+        self.add_pick('Lakers', stake=30, sentiment=1.0)
+        self.add_pick('lakers', stake=10, sentiment=-1.0)
+        self.add_pick('Celtics')
+        self.add_pick('Knicks')  # no prediction to attach to
+        self.session.commit()
+
+        update_consensus(self.session, batch_size=2)
+        lakers = get_consensus(self.session, 'Lakers vs Celtics', self.event_date, 'Lakers')
+        self.assertEqual((lakers.picks, lakers.event_picks), (2, 3))
+        self.assertAlmostEqual(lakers.sentiment, 0.5)
+
+        self.session.add(Bet(user_id=1, amount=50, odds=120, selection='Celtics', bet_type='Moneyline',
+                             created_at=self.now - timedelta(minutes=5)))
+        self.session.commit()
+        update_consensus(self.session)
+        self.session.expire_all()
+
+        celtics = get_consensus(self.session, 'Lakers vs Celtics', self.event_date, 'Celtics')
+        self.assertEqual((celtics.reddit_picks, celtics.upload_picks, celtics.event_picks), (1, 1, 4))
+        self.assertEqual(get_consensus(self.session, 'Lakers vs Celtics', self.event_date, 'Lakers').pick_share, 0.5)
+
+        self.assertEqual(update_consensus(self.session)['events'], 0)
+
+    def test_aliases_count_toward_one_selection(self):
+        """Test 'LAL', 'LA Lakers', 'Lakers' and a tagged upload all count for the Lakers prediction."""
+        self.add_pick('LAL', team_id='nba:lal')
+        self.add_pick('LA Lakers')
+        self.add_pick('Lakers')
+        self.session.add(Bet(user_id=1, amount=20, odds=-150, selection='Los Angeles Lakers', bet_type='Moneyline',
+                             created_at=self.now - timedelta(minutes=5),
+                             additional_data={'team_ids': ['nba:lal'], 'sport': 'basketball'}))
+        self.session.commit()
+
+        update_consensus(self.session)
+
+        lakers = get_consensus(self.session, 'Lakers vs Celtics', self.event_date, 'LAL')
+        self.assertEqual((lakers.reddit_picks, lakers.upload_picks), (3, 1))
+
+    def test_matched_uploads_keep_their_share(self):
+        """Test a matched upload stores the share of the rest of the crowd and others are left alone."""
+        for _ in range(2):
+            self.add_pick('Lakers')
+        self.add_pick('Celtics')
+        self.session.add_all([
+            Bet(user_id=1, amount=20, odds=-150, selection='Lakers', bet_type='Moneyline',
+                created_at=self.now - timedelta(minutes=5), additional_data={'sport': 'basketball'}),
+            Bet(user_id=1, amount=20, odds=-150, selection='Knicks', bet_type='Moneyline',
+                created_at=self.now - timedelta(minutes=5)),
+        ])
+        self.session.commit()
+
+        update_consensus(self.session)
+        self.session.expire_all()
+
+        lakers, knicks = self.session.query(Bet).order_by(Bet.id)
+        self.assertEqual(lakers.additional_data, {'sport': 'basketball', 'consensus_share': 2 / 3})
+        self.assertIsNone(knicks.additional_data)
+
+    def test_share_snapshot_keeps_concurrent_edits(self):
+        """Test the snapshot merges into the current additional_data, not the copy read with the batch."""
+        self.add_pick('Lakers')
+        self.session.add(Bet(user_id=1, amount=20, odds=-150, selection='Lakers', bet_type='Moneyline',
+                             created_at=self.now - timedelta(minutes=5), additional_data={'sport': 'basketball'}))
+        self.session.commit()
+        load = consensus_service._upload_increments
+
+        def load_then_edit(session, *args):
+            last_id, increments, matched = load(session, *args)
+            if matched:  # another writer edits the bet after the batch was read
+                session.execute(update(Bet).values(additional_data={'sport': 'basketball', 'note': 'edited'}))
+            return last_id, increments, matched
+
+        with mock.patch.dict(consensus_service.CONSENSUS_SOURCES, {'bets': load_then_edit}):
+            update_consensus(self.session)
+        self.session.expire_all()
+
+        self.assertEqual(self.session.query(Bet).one().additional_data,
+                         {'sport': 'basketball', 'note': 'edited', 'consensus_share': 1.0})
+
+    def test_serving_and_training_encode_an_upload_alike(self):
+        """Test a slip predicted at upload and the same bet read back for training get one feature vector."""
+        self.add_pick('Lakers', stake=30, sentiment=0.6)
+        self.add_pick('LA Lakers', stake=10, sentiment=-0.2)
+        self.add_pick('Celtics')
+        self.session.commit()
+        update_consensus(self.session)
+        bet_data = {'teams': ['Lakers'], 'bet_type': 'Moneyline', 'sport': 'basketball', 'odds': ['-150']}
+
+        served = prepare_features(bet_data, session=self.session)
+
+        bet = Bet(user_id=1, amount=20, odds=-150, selection=slip_selection(bet_data), bet_type='Moneyline',
+                  created_at=self.now, additional_data={
+                      'sport': 'basketball', 'team_ids': resolve_team_ids(bet_data['teams'], 'basketball')})
+        self.session.add(bet)
+        self.session.commit()
+        update_consensus(self.session)
+        bet.status, bet.settled_at = 'won', self.event_date + timedelta(hours=3)
+        self.session.commit()
+
+        trained = encode_bets(next(stream_settled_bets(self.session)))[0]
+        np.testing.assert_array_equal(trained, served)
+        self.assertAlmostEqual(float(served[8]), 2 / 3, places=6)
+        self.assertAlmostEqual(float(served[3]), (0.4 + 1) / 2, places=6)
+
+    def test_consensus_shares_for_prediction_rows(self):
+        """Test a chunk of predictions gets its shares in one lookup."""
+        for _ in range(3):
+            self.add_pick('Lakers')
+        self.add_pick('Celtics')
+        self.session.commit()
+        update_consensus(self.session)
+
+        rows = [
+            {'id': prediction.id, 'event_name': prediction.event_name, 'event_date': prediction.event_date,
+             'selection': prediction.selection}
+            for prediction in self.session.query(Prediction).order_by(Prediction.id)
+        ]
+        self.assertEqual(list(consensus_shares(self.session, rows).values()), [0.75, 0.25])
+
+if __name__ == '__main__':
+    unittest.main()
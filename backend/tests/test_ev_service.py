@@ -0,0 +1,102 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+import jwt
+import numpy as np
+from flask import Flask
+from config import Config
+from app.Routes.predictions import predictions_bp
+from app.services.ev_service import score_ev_batch
+
+def fake_model(win_probability):
+    """Registry entry whose model gives every row the same win probability"""
+    def model(features, training=False):
+        return np.column_stack([1 - np.full(len(features), win_probability), np.full(len(features), win_probability)])
+    return SimpleNamespace(version='test-1', model=model)
+
+class EVServiceTestCase(unittest.TestCase):
+    """Tests for batch EV scoring and the /ev-batch endpoint."""
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.register_blueprint(predictions_bp, url_prefix='/api/predictions')
+        self.client = self.app.test_client()
+        token = jwt.encode({'user_id': 1}, Config.JWT_SECRET_KEY, algorithm='HS256')
+        self.headers = {'Authorization': f'Bearer {token}'}
+
+    def test_model_fills_only_missing_probabilities(self):
+        """Test one forward pass scores the candidates without a win probability."""
+        with mock.patch('app.services.ev_service.get_model', return_value=fake_model(0.6)) as get_model:
+            result = score_ev_batch([
+                {'id': 1, 'odds': '+100'},
+                {'id': 2, 'odds': '+100', 'win_probability': 0.4},
+                {'id': 3, 'odds': 'n/a'},
+            ])
+
+        get_model.assert_called_once()
+        self.assertEqual(result['model_version'], 'test-1')
+        first, second, unparsed = result['results']
+        self.assertAlmostEqual(first['expected_value'], 0.2)
+        self.assertAlmostEqual(first['kelly_fraction'], 0.2)
+        self.assertEqual(second['kelly_fraction'], 0.0)
+        self.assertIsNone(unparsed['expected_value'])
+
+    def test_given_probabilities_skip_the_model(self):
+        """Test a fully specified batch never loads the model."""
+        with mock.patch('app.services.ev_service.get_model') as get_model:
+            result = score_ev_batch([{'odds': -110, 'win_probability': 0.5}])
+        get_model.assert_not_called()
+        self.assertIsNone(result['model_version'])
+
+    def test_endpoint_requires_authentication(self):
+        """Test anonymous callers cannot drive model scoring."""
+        response = self.client.post('/api/predictions/ev-batch', json={'bets': [{'odds': -110}]})
+        self.assertEqual(response.status_code, 401)
+
+    def test_endpoint_scores_and_validates(self):
+        """Test the default multiplier is full Kelly and oversized batches are refused."""
+        body = {'bets': [{'id': 'a', 'odds': '+100', 'win_probability': 0.6}]}
+        response = self.client.post('/api/predictions/ev-batch', json=body, headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertAlmostEqual(response.get_json()['results'][0]['kelly_fraction'], 0.2)
+
+        with mock.patch.object(Config, 'MAX_EV_BATCH', 1):
+            response = self.client.post('/api/predictions/ev-batch', json={'bets': [{'odds': 100}] * 2},
+                                        headers=self.headers)
+        self.assertEqual(response.status_code, 413)
+
+        response = self.client.post('/api/predictions/ev-batch', json={'bets': [{'id': 1}]}, headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+    def test_endpoint_rejects_bad_model_inputs(self):
+        """Test non-numeric features and out-of-range probabilities get 400 with the bet's index."""
+        cases = [
+            ({'odds': '+150', 'leg_count': 'two'}, 'leg_count must be a number'),
+            ({'odds': '+150', 'consensus_share': [0.4]}, 'consensus_share must be a number'),
+            ({'odds': '+150', 'tipster_win_rate': 'NaN'}, 'tipster_win_rate must be a finite number'),
+            ({'odds': '+150', 'win_probability': 1.7}, 'win_probability must be between 0 and 1'),
+            ({'odds': '+150', 'sentiment_score': True}, 'sentiment_score must be a number'),
+        ]
+        for bad, message in cases:
+            body = {'bets': [{'odds': -110, 'win_probability': 0.5}, bad]}
+            with mock.patch('app.services.ev_service.get_model') as get_model:
+                response = self.client.post('/api/predictions/ev-batch', json=body, headers=self.headers)
+            self.assertEqual(response.status_code, 400, bad)
+            self.assertEqual(response.get_json(), {'error': message, 'index': 1})
+            get_model.assert_not_called()
+
+    def test_numeric_strings_are_accepted(self):
+        """Test numeric strings are coerced before encoding."""
+        body = {'bets': [{'odds': '+150', 'leg_count': '2', 'sentiment_score': '0.3'}]}
+        with mock.patch('app.services.ev_service.get_model', return_value=fake_model(0.5)):
+            response = self.client.post('/api/predictions/ev-batch', json=body, headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertAlmostEqual(response.get_json()['results'][0]['expected_value'], 0.25)
+
+    def test_stub_routes_answer_not_implemented(self):
+        """Test the unimplemented routes return 501 instead of crashing."""
+        for path in ('/api/predictions/analyze', '/api/predictions/ev-calculation'):
+            self.assertEqual(self.client.post(path, json={}).status_code, 501)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import numpy as np
+from app.ml.evaluation import EvaluationAccumulator, measure_latency
+from app.ml.numpy_model import NumpyMLP
+from app.ml.model import LAYER_UNITS, LAYER_ACTIVATIONS
+
+class EvaluationTestCase(unittest.TestCase):
+    """Tests for the model evaluation harness."""
+    
+    def test_metrics_match_whole_array_computation(self):
+        """Test chunked accumulation matches metrics computed in one pass."""
+        rng = np.random.default_rng(3)
+        probability = rng.random(1000)
+        labels = (rng.random(1000) < probability).astype(int)
+        decimal = rng.uniform(1.5, 3.0, 1000)
+        
+        accumulator = EvaluationAccumulator()
+        for start in range(0, 1000, 128):
+            accumulator.update(probability[start:start + 128], labels[start:start + 128], decimal[start:start + 128])
+        results = accumulator.results()
+        
+        clipped = np.clip(probability, 1e-7, 1 - 1e-7)
+        self.assertEqual(results['rows'], 1000)
+        self.assertAlmostEqual(results['brier_score'], np.mean((probability - labels) ** 2))
+        self.assertAlmostEqual(results['log_loss'], -np.mean(labels * np.log(clipped) + (1 - labels) * np.log(1 - clipped)))
+        self.assertEqual(sum(b['count'] for b in results['calibration']), 1000)
+        self.assertEqual(sum(b['bets'] for b in results['roi_by_ev_bucket']), 1000)
+    
+    def test_roi_by_ev_bucket(self):
+        """Test flat-stake ROI lands in the bucket of the predicted EV."""
+        accumulator = EvaluationAccumulator()
+        # EV = 0.6 * 1 - 0.4 = 0.2 -> top bucket; one win and one loss at evens
+        accumulator.update([0.6, 0.6], [1, 0], [2.0, 2.0])
+        top = accumulator.roi_by_ev_bucket()[-1]
+        
+        self.assertEqual(top['bets'], 2)
+        self.assertAlmostEqual(top['roi'], 0.0)
+        self.assertEqual(top['ev_range'], [0.1, None])
+    
+    def test_measure_latency(self):
+        """Test latency is reported per batch size."""
+        network = NumpyMLP.initialize((10,) + LAYER_UNITS, LAYER_ACTIVATIONS, seed=1)
+        report = measure_latency(network, np.zeros((4, 10)), batch_sizes=(1, 16), iterations=5)
+        
+        self.assertEqual(set(report), {'1', '16'})
+        self.assertGreater(report['16']['rows_per_second'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
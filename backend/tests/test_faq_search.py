@@ -0,0 +1,121 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex
+from config import Config
+from app.models.faq import FAQ, FAQCategory
+from app.services.faq_search import (
+    MemoryFAQSearch, PostgresFAQSearch, escape_highlighted, get_faq_search, stem
+)
+
+class FAQSearchTestCase(unittest.TestCase):
+    """Tests for ranked FAQ search backends."""
+
+    def setUp(self):
+        """Create in-memory FAQ tables with a few articles."""
+        self.engine = create_engine('sqlite://')
+        FAQCategory.__table__.create(self.engine)
+        FAQ.__table__.create(self.engine)
+        self.session = Session(self.engine)
+        betting = FAQCategory(name='Betting', slug='betting')
+        account = FAQCategory(name='Account', slug='account')
+        self.session.add_all([betting, account])
+        self.session.flush()
+        self.session.add_all([
+            FAQ(question='How are parlay payouts calculated?', category_id=betting.id,
+                answer='Each leg multiplies the decimal odds. A parlay pays only when every leg wins.'),
+            FAQ(question='How do I reset my password?', category_id=account.id,
+                answer='Use the forgot password link on the sign-in page.'),
+            FAQ(question='What is expected value?', category_id=betting.id,
+                answer='Expected value compares your win probability with the odds. A parlay of positive '
+                       'legs can still carry negative expected value.'),
+            FAQ(question='Can I delete my account?', answer='Contact support to close your account.'),
+        ])
+        self.session.commit()
+        self.search = MemoryFAQSearch()
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def test_ranks_question_matches_first(self):
+        """Test a term in the question outranks the same term in an answer."""
+        results = self.search.search(self.session, 'parlay')
+
+        self.assertEqual([result['question'] for result in results][:2], [
+            'How are parlay payouts calculated?', 'What is expected value?'
+        ])
+        self.assertGreater(results[0]['score'], results[1]['score'])
+        self.assertEqual(results[0]['category_name'], 'Betting')
+
+    def test_snippets_highlight_stemmed_matches(self):
+        """Test 'passwords' matches 'password' and the snippet marks it."""
+        results = self.search.search(self.session, 'passwords')
+
+        self.assertEqual(len(results), 1)
+        self.assertIn('<mark>password</mark>', results[0]['snippet'])
+        self.assertEqual(stem('betting'), 'bet')
+
+    def test_stem_agrees_across_forms(self):
+        """Test singular, plural and past forms of a word share a stem."""
+        for forms in (('rule', 'rules'), ('message', 'messages'), ('change', 'changes', 'changed', 'changing'),
+                      ('bet', 'bets', 'betting'), ('access', 'accesses'), ('fee', 'fees'), ('policy', 'policies')):
+            self.assertEqual({stem(form) for form in forms}, {stem(forms[0])}, forms)
+
+    def test_index_rebuilds_after_changes(self):
+        """Test new and renamed rows are searchable without a restart."""
+        self.assertEqual(self.search.search(self.session, 'withdrawal'), [])
+        self.session.add(FAQ(question='How long does a withdrawal take?', answer='Usually two business days.',
+                             updated_at=datetime.utcnow() + timedelta(seconds=1)))
+        self.session.commit()
+
+        results = self.search.search(self.session, 'withdrawal')
+        self.assertEqual(len(results), 1)
+        self.assertIsNone(results[0]['category_name'])
+
+    def test_rebuild_swaps_in_a_whole_index(self):
+        """Test a rebuild replaces the index in one assignment and leaves the old build intact."""
+        self.search.search(self.session, 'parlay')
+        old = self.search.index
+        self.session.add(FAQ(question='Parlay limits?', answer='Up to twelve legs.',
+                             updated_at=datetime.utcnow() + timedelta(seconds=1)))
+        self.session.commit()
+
+        self.assertEqual(len(self.search.search(self.session, 'parlay')), 3)
+        self.assertIsNot(self.search.index, old)
+        self.assertEqual(set(old.lengths), set(old.documents))
+        self.assertEqual(len(self.search.scores(['parlay'], old)), 2)
+
+    def test_snippets_escape_answer_markup(self):
+        """Test markup in an answer reaches the client as text, with only the highlight tags live."""
+        self.session.add(FAQ(question='Deposits', answer='<script>alert(1)</script> deposit <b>limits</b>',
+                             updated_at=datetime.utcnow() + timedelta(seconds=1)))
+        self.session.commit()
+
+        snippet = self.search.search(self.session, 'limits')[0]['snippet']
+
+        self.assertEqual(snippet, '&lt;script&gt;alert(1)&lt;/script&gt; deposit <mark>&lt;b&gt;limits&lt;/b&gt;</mark>')
+        self.assertEqual(escape_highlighted('<i>a</i> <mark>odds</mark>'), '&lt;i&gt;a&lt;/i&gt; <mark>odds</mark>')
+
+    def test_postgres_backend_uses_the_gin_expression(self):
+        """Test the query's @@ operand is the indexed expression, in one statement."""
+        dialect = postgresql.dialect()
+        index = next(index for index in FAQ.__table__.indexes if index.name == 'ix_faqs_search_document')
+        expression = str(CreateIndex(index).compile(dialect=dialect)).split('USING gin ')[1][1:-1]
+        statement = str(PostgresFAQSearch().statement('parlay odds').compile(dialect=dialect)).replace('faqs.', '')
+
+        self.assertIn(f'WHERE {expression} @@ websearch_to_tsquery', statement)
+        self.assertIn('LEFT OUTER JOIN faq_categories', statement)
+        self.assertIn('ts_headline', statement)
+
+    def test_auto_backend_follows_dialect(self):
+        """Test SQLite sessions get the in-process index."""
+        self.assertIsInstance(get_faq_search(self.session), MemoryFAQSearch)
+        with mock.patch.object(Config, 'FAQ_SEARCH_BACKEND', 'postgres'):
+            self.assertIsInstance(get_faq_search(self.session), PostgresFAQSearch)
+
+if __name__ == '__main__':
+    unittest.main()
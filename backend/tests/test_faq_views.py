@@ -0,0 +1,84 @@
+import unittest
+from datetime import datetime
+from unittest import mock
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from config import Config
+from app.models.faq import FAQ, FAQCategory
+from app.services.faq_views import FAQViewBuffer, flush_faq_views, values_update
+
+class FAQViewsTestCase(unittest.TestCase):
+    """Tests for buffered FAQ view counting."""
+
+    def setUp(self):
+        """Create in-memory FAQ tables with a curated popular FAQ."""
+        self.engine = create_engine('sqlite://')
+        FAQCategory.__table__.create(self.engine)
+        FAQ.__table__.create(self.engine)
+        self.session = Session(self.engine)
+        self.updated = datetime(2024, 1, 1)
+        self.session.add_all([
+            FAQ(question=f'Question {index}', answer='Answer', view_count=0,
+                is_popular=index == 0, updated_at=self.updated)
+            for index in range(4)
+        ])
+        self.session.commit()
+        self.buffer = FAQViewBuffer(flush_seconds=3600, max_pending=5)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def test_buffer_is_due_after_max_pending(self):
+        """Test views accumulate in memory until the pending limit."""
+        for _ in range(4):
+            self.buffer.record(2)
+        self.assertFalse(self.buffer.due())
+        self.buffer.record(3)
+        self.assertTrue(self.buffer.due())
+        self.assertEqual(self.buffer.drain(), {2: 4, 3: 1})
+        self.assertFalse(self.buffer.due())
+
+    def test_flush_adds_views_and_recomputes_popularity(self):
+        """Test one flush adds counts, keeps updated_at for counts-only rows and re-ranks."""
+        self.buffer.record(2, 3)
+        self.buffer.record(3)
+        self.assertEqual(flush_faq_views(self.session, self.buffer)['popular'][:2], [2, 3])
+
+        self.buffer.record(2)
+        flush_faq_views(self.session, self.buffer)
+        self.session.expire_all()
+        faqs = {faq.id: faq for faq in self.session.query(FAQ)}
+        self.assertEqual(faqs[2].view_count, 4)
+        self.assertTrue(faqs[2].is_popular and faqs[3].is_popular)
+        self.assertFalse(faqs[1].is_popular)
+        self.assertEqual(faqs[4].updated_at, self.updated)
+
+    def test_defaults_come_from_config(self):
+        """Test buffer limits and the popular count follow Config."""
+        with mock.patch.object(Config, 'FAQ_VIEW_FLUSH_SECONDS', 7), \
+                mock.patch.object(Config, 'FAQ_VIEW_FLUSH_MAX_PENDING', 2), \
+                mock.patch.object(Config, 'FAQ_POPULAR_COUNT', 1):
+            buffer = FAQViewBuffer()
+            buffer.record(3, 2)
+            self.assertEqual((buffer.flush_seconds, buffer.max_pending, buffer.due()), (7, 2, True))
+            self.assertEqual(flush_faq_views(self.session, buffer)['popular'], [3])
+
+    def test_failed_flush_keeps_views(self):
+        """Test views survive a flush that fails."""
+        self.buffer.record(2, 2)
+        FAQ.__table__.drop(self.engine)
+        with self.assertRaises(Exception):
+            flush_faq_views(self.session, self.buffer)
+        self.assertEqual(self.buffer.drain(), {2: 2})
+
+    def test_postgres_update_joins_values_list(self):
+        """Test the PostgreSQL flush is one UPDATE ... FROM (VALUES ...)."""
+        sql = str(values_update([(1, 3), (2, 1)]).compile(dialect=postgresql.dialect()))
+        self.assertIn('FROM (VALUES', sql)
+        self.assertIn('AS v (id, views)', sql)
+        self.assertIn('view_count=(coalesce(faqs.view_count', sql)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import numpy as np
+from app.ml.feature_engineering import FeatureEncoder, FEATURE_DIM, count_legs, parse_american_odds
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+class FeatureEncoderTestCase(unittest.TestCase):
+    """Tests for the shared feature encoder."""
+    
+    def setUp(self):
+        """Create the encoder and sample bets."""
+        self.encoder = FeatureEncoder()
+        self.bets = [
+            {'odds': -110, 'sport': 'Basketball', 'bet_type': 'Over/Under', 'sentiment_score': 0.5},
+            {'odds': ['+150', '-110'], 'sport': 'hockey', 'bet_type': 'Parlay', 'leg_count': 3},
+            {},
+        ]
+    
+    def test_layout(self):
+        """Test each column is encoded into its documented slot."""
+        matrix = self.encoder.encode(self.bets)
+        
+        self.assertEqual(matrix.shape, (3, FEATURE_DIM))
+        self.assertEqual(matrix.dtype, np.float32)
+        self.assertAlmostEqual(matrix[0, 0], -0.11, places=5)
+        self.assertAlmostEqual(matrix[0, 1], 1 / 5, places=5)
+        self.assertAlmostEqual(matrix[0, 2], 3 / 5, places=5)
+        self.assertAlmostEqual(matrix[0, 3], 0.75, places=5)
+        self.assertAlmostEqual(matrix[0, 4], 110 / 210, places=5)
+        self.assertAlmostEqual(matrix[1, 0], 0.15, places=5)
+        self.assertAlmostEqual(matrix[1, 5], 0.3, places=5)
+        np.testing.assert_array_equal(matrix[2], np.zeros(FEATURE_DIM))
+    
+    def test_encode_one_matches_batch(self):
+        """Test single-row serving matches batch encoding used in training."""
+        matrix = self.encoder.encode(self.bets)
+        for index, bet in enumerate(self.bets):
+            np.testing.assert_array_equal(self.encoder.encode_one(bet), matrix[index])
+    
+    @unittest.skipIf(pd is None, 'pandas is not installed')
+    def test_dataframe_matches_dicts(self):
+        """Test DataFrame input encodes the same as dicts."""
+        bets = [bet for bet in self.bets if not isinstance(bet.get('odds'), list)]
+        np.testing.assert_array_equal(
+            self.encoder.encode(pd.DataFrame(bets)),
+            self.encoder.encode(bets)
+        )
+    
+    def test_parse_american_odds(self):
+        """Test odds parsing from the formats found on uploads."""
+        self.assertEqual(parse_american_odds('+120'), 120)
+        self.assertEqual(parse_american_odds('-110'), -110)
+        self.assertEqual(parse_american_odds('2.50'), 150)
+        self.assertEqual(parse_american_odds('1.50'), -200)
+        self.assertEqual(parse_american_odds(['-150', '+200']), -150)
+        self.assertEqual(parse_american_odds(None), 0)
+        self.assertEqual(parse_american_odds('n/a'), 0)
+        self.assertEqual(parse_american_odds(2.5), 150)
+        self.assertEqual(parse_american_odds(150), 150)
+        self.assertEqual(parse_american_odds(50), 4900)  # unsigned below 100 is decimal odds
+    
+    def test_stored_and_uploaded_odds_encode_alike(self):
+        """Test a stored float and an uploaded string for the same price give the same row."""
+        stored, uploaded = self.encoder.encode([{'odds': 1.91}, {'odds': ['1.91']}])
+        np.testing.assert_array_equal(stored, uploaded)
+        self.assertAlmostEqual(stored[4], 1 / 1.91, places=5)
+    
+    def test_long_odds_are_clipped(self):
+        """Test heavy favourites and long shots stay within [-1, 1]."""
+        matrix = self.encoder.encode([{'odds': -5000}, {'odds': '+2500'}])
+        np.testing.assert_array_equal(matrix[:, 0], [-1.0, 1.0])
+    
+    def test_count_legs_matches_stored_legs(self):
+        """Test regex-parsed parlays count one leg per team, as build_bet stores them."""
+        self.assertEqual(count_legs({'bet_type': 'Parlay', 'teams': ['Lakers', 'Celtics', 'Heat']}), 3)
+        self.assertEqual(count_legs({'bet_type': 'Parlay', 'legs': [{}, {}], 'teams': ['Lakers']}), 2)
+        self.assertEqual(count_legs({'bet_type': 'Moneyline', 'teams': ['Lakers', 'Celtics']}), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import json
+import unittest
+from types import SimpleNamespace
+import numpy as np
+from flask import Flask
+from app import db
+from app.models import user, subscription, betting_stats, bankroll, marketplace, prediction  # noqa: F401
+from app.models.bet import Bet, BetLeg
+from app.services.hedge_service import (
+    hedge_stakes, estimate_opposing_decimal, combination_decimal, recommend_hedges, _open_positions
+)
+
+class HedgeServiceTestCase(unittest.TestCase):
+    """Tests for the hedge engine."""
+    
+    def test_full_hedge_locks_equal_profit(self):
+        """Test the full hedge pays the same whichever side wins."""
+        # $10 parlay returning $100, hedge available at 2.0
+        stakes = hedge_stakes(10.0, 100.0, 2.0)
+        
+        self.assertAlmostEqual(stakes['full_stake'], 50.0)
+        self.assertAlmostEqual(stakes['full_profit'], 40.0)
+        hedge_side_profit = stakes['full_stake'] * (2.0 - 1) - 10.0
+        self.assertAlmostEqual(hedge_side_profit, stakes['full_profit'])
+    
+    def test_break_even_and_partial(self):
+        """Test break-even returns the stake and partial scales the full hedge."""
+        stakes = hedge_stakes([10.0, 10.0], [100.0, 12.0], [2.5, 1.2], partial_fraction=0.5)
+        
+        self.assertAlmostEqual(stakes['break_even_stake'][0], 10.0 / 1.5)
+        self.assertAlmostEqual(stakes['break_even_profit_if_original_wins'][0], 90.0 - 10.0 / 1.5)
+        self.assertAlmostEqual(stakes['partial_stake'][0], 20.0)
+        self.assertAlmostEqual(stakes['partial_profit_if_hedge_wins'][0], 20.0)
+        # Breaking even at 1.2 costs 50, more than the 2 the original can win
+        self.assertTrue(np.isnan(stakes['break_even_stake'][1]))
+    
+    def test_estimate_opposing_decimal(self):
+        """Test a -110/-110 market is recovered from one side."""
+        np.testing.assert_allclose(estimate_opposing_decimal(-110), 1 + 100 / 110, rtol=1e-2)
+    
+    def test_open_positions(self):
+        """Test pending legs are flattened and lost parlays skipped."""
+        leg = lambda id, status: SimpleNamespace(id=id, status=status, odds=-110, team_name='A', opponent_name='B')
+        bets = [
+            SimpleNamespace(id=1, amount=10.0, potential_payout=90.0, odds=800, selection=None,
+                            legs=[leg(1, 'won'), leg(2, 'pending'), leg(3, 'pending')]),
+            SimpleNamespace(id=2, amount=10.0, potential_payout=90.0, odds=800, selection=None,
+                            legs=[leg(4, 'lost'), leg(5, 'pending')]),
+            SimpleNamespace(id=3, amount=5.0, potential_payout=5.0, odds=100, selection='C', legs=[]),
+        ]
+        rows = _open_positions(bets)
+        
+        self.assertEqual([(row['bet_id'], row['leg_id']) for row in rows], [(1, 2), (1, 3), (3, None)])
+        self.assertEqual(rows[0]['remaining_legs'], 2)
+        self.assertEqual(rows[0]['total_return'], 100.0)
+
+    def test_combination_decimal(self):
+        """Test laying two legs that each win half the time pays 4/3."""
+        np.testing.assert_allclose(combination_decimal([2.0, 2.0, 3.0], [[0, 1], [0, -1]]), [4 / 3, 2.0])
+
+class RecommendHedgesTestCase(unittest.TestCase):
+    """Tests for hedge recommendations over stored bets."""
+
+    def setUp(self):
+        """Bind the app database to in-memory SQLite."""
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        db.init_app(self.app)
+        self.context = self.app.app_context()
+        self.context.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.context.pop()
+
+    def add_parlay(self, odds):
+        bet = Bet(user_id=1, amount=10.0, potential_payout=90.0, odds=600, bet_type='Parlay', status='pending')
+        bet.legs = [BetLeg(team_name=f'Team {index}', odds=leg_odds, status='pending')
+                    for index, leg_odds in enumerate(odds)]
+        db.session.add(bet)
+        db.session.commit()
+        return bet
+
+    def test_every_pending_leg_combination(self):
+        """Test three pending legs give three singles, three pairs and one guaranteed triple."""
+        bet = self.add_parlay([-110, 120, -150])
+
+        hedges = recommend_hedges(1)['hedges']
+
+        self.assertEqual(sorted(len(hedge['leg_ids']) for hedge in hedges), [1, 1, 1, 2, 2, 2, 3])
+        guaranteed = [hedge for hedge in hedges if hedge['guaranteed']]
+        self.assertEqual([sorted(hedge['leg_ids']) for hedge in guaranteed], [[leg.id for leg in bet.legs]])
+        profits = [hedge['full_hedge']['profit'] for hedge in hedges]
+        self.assertEqual(profits, sorted(profits, reverse=True))
+
+    def test_unpriced_bets_are_skipped(self):
+        """Test odds of 0 (not found by OCR) neither crash the sort nor leak NaN."""
+        db.session.add(Bet(user_id=1, amount=10.0, potential_payout=0.0, odds=0, status='pending'))
+        self.add_parlay([0, -110])
+
+        result = recommend_hedges(1)
+
+        self.assertEqual([hedge['leg_ids'] for hedge in result['hedges']], [[2]])
+        json.dumps(result, allow_nan=False)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import json
+import unittest
+from unittest import mock
+from flask import Flask
+from sqlalchemy import create_engine
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from config import Config
+from app.models.faq import FAQ, FAQCategory
+from app.Routes.help import _cached_response
+from app.services.faq_views import FAQViewBuffer, flush_faq_views
+from app.services.help_center import HelpCenterCache, warm_help_center
+
+class HelpCenterTestCase(unittest.TestCase):
+    """Tests for the cached help-center read model."""
+
+    def setUp(self):
+        """Create in-memory FAQ tables with two categories."""
+        self.engine = create_engine('sqlite://')
+        FAQCategory.__table__.create(self.engine)
+        FAQ.__table__.create(self.engine)
+        self.session = Session(self.engine)
+        self.betting = FAQCategory(name='Betting', slug='betting')
+        self.account = FAQCategory(name='Account', slug='account')
+        self.session.add_all([self.betting, self.account])
+        self.session.flush()
+        self.session.add_all([
+            FAQ(question='What is a parlay?', answer='x' * 200, category_id=self.betting.id,
+                is_popular=True, view_count=5),
+            FAQ(question='What is a push?', answer='Your stake is returned.', category_id=self.betting.id,
+                is_popular=True, view_count=9),
+            FAQ(question='How do I reset my password?', answer='Use the forgot password link.',
+                category_id=self.account.id),
+        ])
+        self.session.commit()
+        self.cache = HelpCenterCache(recheck_seconds=3600)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def payload(self, resource):
+        return json.loads(resource.body)
+
+    def test_snapshot_matches_route_payloads(self):
+        """Test counts, popular order, FAQ detail and category previews."""
+        snapshot = self.cache.get(self.session)
+
+        self.assertEqual([(c['slug'], c['count']) for c in self.payload(snapshot.categories)['categories']],
+                         [('betting', 2), ('account', 1)])
+        self.assertEqual([q['title'] for q in self.payload(snapshot.popular)['questions']],
+                         ['What is a push?', 'What is a parlay?'])
+        faq = self.payload(snapshot.faqs[3])['faq']
+        self.assertEqual((faq['category_name'], faq['category_slug']), ('Account', 'account'))
+        category = self.payload(snapshot.by_slug['betting'])
+        self.assertEqual(category['count'], 2)
+        self.assertEqual(len(category['faqs'][0]['answer_preview']), 153)
+
+    def test_commit_rebuilds_snapshot(self):
+        """Test an ORM change to an FAQ replaces the snapshot and its ETags."""
+        with mock.patch('app.services.help_center.help_center', self.cache):
+            before = self.cache.get(self.session)
+            self.assertIs(self.cache.get(self.session), before)
+
+            self.session.get(FAQ, 3).category_id = self.betting.id
+            self.session.commit()
+            after = self.cache.get(self.session)
+
+        self.assertIsNot(after, before)
+        self.assertNotEqual(after.categories.etag, before.categories.etag)
+        self.assertEqual(self.payload(after.by_slug['betting'])['count'], 3)
+
+    def test_matching_etag_gets_not_modified(self):
+        """Test If-None-Match with the current ETag returns 304."""
+        resource = self.cache.get(self.session).categories
+        app = Flask(__name__)
+
+        with app.test_request_context(headers={'If-None-Match': f'"{resource.etag}"'}):
+            response = _cached_response(resource)
+        self.assertEqual(response.status_code, 304)
+
+        with app.test_request_context(headers={'If-None-Match': '"stale"'}):
+            response = _cached_response(resource)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['ETag'], f'"{resource.etag}"')
+        self.assertIn('max-age=60', response.headers['Cache-Control'])
+
+        with mock.patch.object(Config, 'HELP_CENTER_MAX_AGE', 5), app.test_request_context():
+            self.assertEqual(_cached_response(resource).cache_control.max_age, 5)
+
+    def test_view_flush_reorders_popular(self):
+        """Test this worker's flush drops the snapshot so popular follows the new view counts."""
+        buffer = FAQViewBuffer(flush_seconds=3600, max_pending=100)
+        buffer.record(1, count=10)
+        with mock.patch('app.services.help_center.help_center', self.cache):
+            self.cache.get(self.session)
+            flush_faq_views(self.session, buffer)
+            popular = self.cache.get(self.session).popular
+
+        self.assertEqual([q['title'] for q in self.payload(popular)['questions']][:2],
+                         ['What is a parlay?', 'What is a push?'])
+
+    def test_signature_tracks_other_workers_view_flushes(self):
+        """Test view counts written elsewhere, with updated_at untouched, change the signature."""
+        before = HelpCenterCache.signature(self.session)
+        self.session.execute(update(FAQ).where(FAQ.id == 1).values(view_count=FAQ.view_count + 10))
+        self.session.commit()
+
+        self.assertNotEqual(HelpCenterCache.signature(self.session), before)
+
+    def test_warming_waits_for_the_first_request(self):
+        """Test creating an app does not query; the first request warms the snapshot once."""
+        app = Flask(__name__)
+        with mock.patch('app.services.help_center.help_center') as cache:
+            warm_help_center(app)
+            cache.get.assert_not_called()
+
+            with mock.patch('app.db') as db:
+                client = app.test_client()
+                client.get('/')
+                client.get('/')
+
+        cache.get.assert_called_once_with(db.session)
+
+if __name__ == '__main__':
+    unittest.main()
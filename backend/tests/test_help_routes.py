@@ -0,0 +1,100 @@
+import time
+import unittest
+from unittest import mock
+from flask import Flask
+from app import db
+from app.models import user, subscription, betting_stats, bankroll, marketplace, bet, prediction  # noqa: F401
+from app.models.faq import FAQ, FAQCategory
+from app.Routes.help import help_bp
+from app.services import faq_views
+from app.services.faq_views import FAQViewBuffer, flush_views_at_exit, start_view_flusher
+from app.services.help_center import help_center
+
+class HelpRoutesTestCase(unittest.TestCase):
+    """Tests for the help-center endpoints on in-memory SQLite."""
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        db.init_app(self.app)
+        self.app.register_blueprint(help_bp)
+        self.client = self.app.test_client()
+        self.context = self.app.app_context()
+        self.context.push()
+        db.create_all()
+        betting = FAQCategory(name='Betting', slug='betting')
+        db.session.add(betting)
+        db.session.flush()
+        db.session.add_all([
+            FAQ(question=f'How do parlay rules work, part {index}?', answer='Every leg must win.',
+                category_id=betting.id)
+            for index in range(3)
+        ])
+        db.session.commit()
+        help_center.invalidate()
+
+    def tearDown(self):
+        help_center.invalidate()
+        db.session.remove()
+        db.drop_all()
+        self.context.pop()
+
+    def test_search_limit_is_bounded(self):
+        """Test a negative or zero limit returns at least one result rather than failing."""
+        for limit, expected in (('-5', 1), ('2', 2), ('0', 3), ('500', 3)):
+            response = self.client.get(f'/api/help/search?q=parlay+rule&limit={limit}')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json()['count'], expected, limit)
+
+    def test_faq_detail_revalidates_every_view(self):
+        """Test FAQ detail is private no-cache so each view, including a 304, is counted."""
+        buffer = FAQViewBuffer(flush_seconds=3600, max_pending=100)
+        with mock.patch('app.Routes.help.faq_views', buffer):
+            response = self.client.get('/api/help/faq/1')
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.cache_control.private and response.cache_control.no_cache)
+            self.assertIsNone(response.cache_control.max_age)
+
+            revalidated = self.client.get('/api/help/faq/1', headers={'If-None-Match': response.headers['ETag']})
+            self.assertEqual(revalidated.status_code, 304)
+
+        self.assertEqual(buffer.drain(), {1: 2})
+
+    def test_listings_stay_publicly_cacheable(self):
+        """Test uncounted resources keep public max-age caching."""
+        response = self.client.get('/api/help/categories')
+        self.assertTrue(response.cache_control.public)
+        self.assertEqual(response.cache_control.max_age, 60)
+
+    def test_flusher_writes_views_of_a_quiet_worker(self):
+        """Test the timer thread flushes due views without another request."""
+        buffer = FAQViewBuffer(flush_seconds=0, max_pending=100)
+        buffer.record(2, count=3)
+
+        stop = start_view_flusher(self.app, buffer, interval=0.01)
+        self.addCleanup(stop.set)
+        deadline = time.monotonic() + 5
+        while buffer.due() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        stop.set()
+
+        db.session.expire_all()
+        self.assertEqual(db.session.get(FAQ, 2).view_count, 3)
+
+    def test_process_flusher_and_exit_hook_start_once(self):
+        """Test repeated create_app() calls share one flusher and one exit hook, bound to the first app."""
+        other_app = Flask(__name__)
+        with mock.patch.object(faq_views, '_process_flusher', None), \
+                mock.patch.object(faq_views, '_exit_hook_registered', False), \
+                mock.patch.object(faq_views, '_start_flusher', return_value=mock.Mock()) as start, \
+                mock.patch.object(faq_views.atexit, 'register') as register:
+            first = start_view_flusher(self.app)
+            self.assertIs(start_view_flusher(other_app), first)
+            self.assertTrue(flush_views_at_exit(self.app))
+            self.assertFalse(flush_views_at_exit(other_app))
+
+        start.assert_called_once_with(self.app, faq_views.faq_views, None)
+        register.assert_called_once_with(faq_views._flush_in_app, self.app)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+try:
+    from app.services import nlp_service
+except (ImportError, OSError):  # spaCy or its en_core_web_md model is missing
+    nlp_service = None
+
+SLIPS = ['Lakers vs Celtics moneyline -110 $25', None, 'NFL parlay Chiefs +150 Patriots -120 $10']
+TEAMS = ('Lakers', 'Celtics', 'Chiefs', 'Patriots')
+
+class FakePipeline:
+    """Stand-in for the spaCy model that tags known team names as ORG and records pipe() calls"""
+
+    def __init__(self):
+        self.pipe_calls = []
+
+    def __call__(self, text):
+        return SimpleNamespace(ents=[
+            SimpleNamespace(label_='ORG', text=word) for word in text.split() if word in TEAMS
+        ])
+
+    def pipe(self, texts, batch_size=32):
+        texts = list(texts)
+        self.pipe_calls.append((len(texts), batch_size))
+        return (self(text) for text in texts)
+
+@unittest.skipIf(nlp_service is None, 'spaCy and en_core_web_md are not installed')
+class ProcessTextsTestCase(unittest.TestCase):
+    """Tests for batched slip text extraction."""
+
+    def setUp(self):
+        self.pipeline = FakePipeline()
+        patch = mock.patch.object(nlp_service, 'nlp', self.pipeline)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_matches_single_text_processing_in_order(self):
+        """Test one pipe pass gives the same results as processing each text alone."""
+        batched = nlp_service.process_texts(SLIPS, batch_size=8)
+
+        self.assertEqual(self.pipeline.pipe_calls, [(3, 8)])
+        self.assertEqual(batched, [nlp_service.process_text(text or '') for text in SLIPS])
+        self.assertEqual(batched[0]['teams'], ['Lakers', 'Celtics'])
+        self.assertEqual((batched[2]['bet_type'], batched[2]['sport'], batched[2]['amount']),
+                         ('Parlay', 'Football', '$10'))
+
+    def test_missing_text_gives_empty_result(self):
+        """Test a slip with no OCR text still gets a result in its slot."""
+        result = nlp_service.process_texts([None])[0]
+        self.assertEqual((result['original_text'], result['teams'], result['odds']), ('', [], []))
+
+if __name__ == '__main__':
+    unittest.main()
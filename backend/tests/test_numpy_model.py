@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from app.ml.numpy_model import NumpyMLP, softmax, export_keras_weights, max_abs_difference
+from app.ml.model import LAYER_UNITS, LAYER_ACTIVATIONS
+
+try:
+    import tensorflow as tf
+except ImportError:
+    tf = None
+
+class NumpyModelTestCase(unittest.TestCase):
+    """Tests for the NumPy inference path."""
+    
+    def setUp(self):
+        """Create a small random network."""
+        self.network = NumpyMLP.initialize((10,) + LAYER_UNITS, LAYER_ACTIVATIONS, seed=7)
+        self.samples = np.random.default_rng(0).random((64, 10), dtype=np.float32)
+    
+    def test_forward_pass(self):
+        """Test the forward pass matches a hand-written matmul/ReLU/softmax."""
+        expected = self.samples
+        for kernel, bias, activation in zip(self.network.kernels, self.network.biases, self.network.activations):
+            expected = expected @ kernel + bias
+            expected = softmax(expected) if activation == 'softmax' else np.maximum(expected, 0)
+        
+        output = self.network(self.samples)
+        
+        self.assertEqual(output.shape, (64, 2))
+        np.testing.assert_allclose(output, expected, rtol=1e-6)
+        np.testing.assert_allclose(output.sum(axis=1), np.ones(64), rtol=1e-5)
+    
+    def test_single_row(self):
+        """Test a 1-D feature row is treated as a batch of one."""
+        self.assertEqual(self.network(self.samples[0]).shape, (1, 2))
+    
+    def test_softmax_is_stable(self):
+        """Test softmax does not overflow on large logits."""
+        output = softmax(np.array([[1000.0, 0.0], [-1000.0, 1000.0]]))
+        
+        self.assertFalse(np.isnan(output).any())
+        np.testing.assert_allclose(output, [[1.0, 0.0], [0.0, 1.0]], atol=1e-6)
+    
+    def test_save_and_load(self):
+        """Test weights round-trip through .npz."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'weights.npz')
+            self.network.save(path)
+            loaded = NumpyMLP.load(path)
+        
+        np.testing.assert_array_equal(loaded(self.samples), self.network(self.samples))
+    
+    @unittest.skipIf(tf is None, 'TensorFlow is not installed')
+    def test_matches_keras(self):
+        """Test the exported network is numerically equivalent to Keras."""
+        from app.ml.model import build_model
+        model = build_model()
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            network = export_keras_weights(model, os.path.join(tmp_dir, 'weights.npz'))
+        
+        self.assertLess(max_abs_difference(model, network, self.samples), 1e-5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+import io
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from config import Config
+from app.services import ocr_service
+from app.services.ocr_service import (
+    OCRBackend, TesseractOCRBackend, VisionOCRBackend, get_ocr_backend, preprocess_image, process_image
+)
+
+SLIP_TEXT = 'Lakers vs Celtics\nMoneyline -110\nStake $25'
+
+class FakeBackend(OCRBackend):
+    name = 'fake'
+    supports_uri = True
+
+    def __init__(self):
+        self.calls = []
+
+    def detect_text(self, content):
+        self.calls.append(('bytes', content))
+        return {'text': SLIP_TEXT, 'words': []}
+
+    def detect_text_uri(self, uri):
+        self.calls.append(('uri', uri))
+        return {'text': SLIP_TEXT, 'words': []}
+
+def vision_annotation(text, box=None):
+    x0, y0, x1, y1 = box or (0, 0, 0, 0)
+    vertices = [SimpleNamespace(x=x, y=y) for x, y in ((x0, y0), (x1, y0), (x1, y1), (x0, y1))]
+    return SimpleNamespace(description=text, bounding_poly=SimpleNamespace(vertices=vertices))
+
+class BackendSelectionTestCase(unittest.TestCase):
+    """Tests for choosing and sharing OCR backends."""
+
+    def setUp(self):
+        patches = [
+            mock.patch.dict(ocr_service.OCR_BACKENDS, {FakeBackend.name: FakeBackend}),
+            mock.patch.dict(ocr_service._backend_instances, clear=True),
+            mock.patch.object(Config, 'OCR_BACKEND', FakeBackend.name),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_default_backend_comes_from_config(self):
+        """Test Config.OCR_BACKEND picks the engine and one instance is shared."""
+        backend = get_ocr_backend()
+        self.assertIsInstance(backend, FakeBackend)
+        self.assertIs(get_ocr_backend(FakeBackend.name), backend)
+
+    def test_unknown_backend_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, 'Unknown OCR backend'):
+            get_ocr_backend('abbyy')
+
+    def test_process_image_routes_uris_and_bytes(self):
+        """Test gs:// URIs are read by the engine and bytes are preprocessed first."""
+        backend = get_ocr_backend()
+        with mock.patch.object(ocr_service, 'preprocess_image', return_value=b'small') as preprocess:
+            self.assertTrue(process_image('gs://slips/a.png')['success'])
+            result = process_image(b'raw image')
+
+        self.assertEqual(backend.calls, [('uri', 'gs://slips/a.png'), ('bytes', b'small')])
+        preprocess.assert_called_once_with(b'raw image')
+        self.assertEqual(result['amount'], '$25')
+
+    def test_cascade_setting_runs_the_cascade(self):
+        """Test OCR_BACKEND=cascade sends bytes through process_image_cascade."""
+        with mock.patch.object(Config, 'OCR_BACKEND', 'cascade'), \
+                mock.patch.object(ocr_service, 'process_image_cascade', return_value={'success': True}) as cascade:
+            process_image(b'raw image', preprocess=False)
+        cascade.assert_called_once_with(b'raw image')
+
+class VisionBackendTestCase(unittest.TestCase):
+    """Tests for the Cloud Vision backend with a fake client."""
+
+    def setUp(self):
+        patch = mock.patch.object(ocr_service, 'vision', mock.Mock())
+        self.vision = patch.start()
+        self.addCleanup(patch.stop)
+        self.backend = VisionOCRBackend()
+        self.client = self.vision.ImageAnnotatorClient.return_value
+
+    def test_full_text_and_word_boxes(self):
+        """Test the first annotation is the text and the rest become word boxes."""
+        self.client.text_detection.return_value = SimpleNamespace(
+            error=SimpleNamespace(message=''),
+            text_annotations=[vision_annotation('Lakers -110'), vision_annotation('Lakers', (1, 2, 30, 12)),
+                              vision_annotation('-110', (35, 2, 60, 12))]
+        )
+
+        result = self.backend.detect_text(b'image')
+
+        self.assertEqual(result['text'], 'Lakers -110')
+        self.assertEqual(result['words'], [{'text': 'Lakers', 'box': (1, 2, 30, 12)},
+                                           {'text': '-110', 'box': (35, 2, 60, 12)}])
+
+    def test_client_is_created_once(self):
+        """Test every request reuses one ImageAnnotatorClient."""
+        self.client.text_detection.return_value = SimpleNamespace(error=SimpleNamespace(message=''), text_annotations=[])
+        self.assertEqual(self.backend.detect_text(b'a'), {'text': '', 'words': []})
+        self.backend.detect_text_uri('gs://slips/b.png')
+        self.vision.ImageAnnotatorClient.assert_called_once_with()
+
+    def test_api_error_raises(self):
+        self.client.text_detection.return_value = SimpleNamespace(error=SimpleNamespace(message='quota'), text_annotations=[])
+        with self.assertRaisesRegex(RuntimeError, 'quota'):
+            self.backend.detect_text(b'image')
+
+class TesseractBackendTestCase(unittest.TestCase):
+    """Tests for the Tesseract backend with a fake pytesseract."""
+
+    def test_words_are_grouped_into_lines(self):
+        """Test words keep their boxes and are joined per (block, paragraph, line)."""
+        data = {
+            'text': ['Lakers', 'vs', 'Celtics', '', '-110'],
+            'left': [0, 50, 80, 0, 0], 'top': [0, 0, 0, 0, 20], 'width': [40, 20, 50, 0, 30], 'height': [10] * 5,
+            'block_num': [1] * 5, 'par_num': [1] * 5, 'line_num': [1, 1, 1, 1, 2],
+        }
+        pytesseract = mock.Mock(**{'image_to_data.return_value': data})
+        with mock.patch.object(ocr_service, 'pytesseract', pytesseract), \
+                mock.patch.object(ocr_service, 'Image', mock.Mock()):
+            result = TesseractOCRBackend().detect_text(b'image')
+
+        self.assertEqual(result['text'], 'Lakers vs Celtics\n-110')
+        self.assertEqual(result['words'][2], {'text': 'Celtics', 'box': (80, 0, 130, 10)})
+        self.assertEqual(len(result['words']), 4)
+
+    def test_missing_dependencies_raise(self):
+        with mock.patch.object(ocr_service, 'pytesseract', None):
+            with self.assertRaises(RuntimeError):
+                TesseractOCRBackend()
+
+class PreprocessImageTestCase(unittest.TestCase):
+    """Tests for shrinking slips before OCR."""
+
+    @unittest.skipIf(ocr_service.Image is None, 'Pillow is not installed')
+    def test_crops_borders_downscales_and_grays(self):
+        """Test a large slip on a white margin comes back cropped, grayscale and within max_dimension."""
+        Image = ocr_service.Image
+        image = Image.new('RGB', (4000, 2000), 'white')
+        image.paste(Image.new('RGB', (3000, 1000), 'navy'), (500, 500))
+        source = io.BytesIO()
+        image.save(source, format='PNG')
+
+        processed = Image.open(io.BytesIO(preprocess_image(source.getvalue(), max_dimension=1500)))
+
+        self.assertEqual(processed.mode, 'L')
+        self.assertEqual(processed.size, (1500, 500))
+
+    def test_undecodable_or_unsupported_input_is_returned_unchanged(self):
+        """Test OCR still gets the original bytes when the image cannot be processed."""
+        self.assertEqual(preprocess_image(b'not an image'), b'not an image')
+        with mock.patch.object(ocr_service, 'Image', None):
+            self.assertEqual(preprocess_image(b'raw'), b'raw')
+
+if __name__ == '__main__':
+    unittest.main()
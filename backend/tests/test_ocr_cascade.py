@@ -0,0 +1,110 @@
+import unittest
+from app.services.ocr_service import OCRBackend, OCRCascadeStats, process_image_cascade
+from app.utils.slip_scoring import calculate_confidence, calculate_integrity_score
+
+CLEAN_SLIP = 'Lakers vs Celtics\nMoneyline -110\nStake $25'
+PARTIAL_SLIP = 'Lakers vs Celtics'
+UNTYPED_SLIP = 'Lakers vs Celtics\n-110\nStake $25'
+UNPRICED_SLIP = 'Lakers vs Celtics\nMoneyline\nStake $25'
+
+class FakeBackend(OCRBackend):
+    """OCR engine returning canned text, or raising, and counting calls"""
+
+    def __init__(self, name, text='', error=None):
+        self.name = name
+        self.text = text
+        self.error = error
+        self.calls = 0
+
+    def detect_text(self, content):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return {'text': self.text, 'words': []}
+
+class OCRCascadeTestCase(unittest.TestCase):
+    """Tests for the local-first OCR cascade with fake engines."""
+
+    def run_cascade(self, local, cloud, **kwargs):
+        options = {'threshold': 80, 'min_confidence': 50, 'cloud_cost': 0.002, **kwargs}
+        return process_image_cascade(b'image', local_backend=local, cloud_backend=cloud, **options)
+
+    def test_confident_local_result_is_not_escalated(self):
+        """Test a clean slip never reaches the cloud engine."""
+        local, cloud = FakeBackend('local', CLEAN_SLIP), FakeBackend('cloud', CLEAN_SLIP)
+
+        result = self.run_cascade(local, cloud)
+
+        self.assertEqual(cloud.calls, 0)
+        self.assertEqual(result['ocr_stats']['engine'], 'local')
+        self.assertEqual(result['ocr_stats']['cost_usd'], 0.0)
+        self.assertEqual(result['amount'], '$25')
+
+    def test_low_score_escalates_to_cloud(self):
+        """Test a partial local read is replaced by a better cloud read and costed."""
+        result = self.run_cascade(FakeBackend('local', PARTIAL_SLIP), FakeBackend('cloud', CLEAN_SLIP))
+
+        stats = result['ocr_stats']
+        self.assertTrue(stats['escalated'])
+        self.assertEqual((stats['engine'], stats['cost_usd']), ('cloud', 0.002))
+        self.assertGreater(stats['score'], stats['local_score'])
+
+    def test_low_confidence_escalates(self):
+        """Test the confidence gate escalates even when the integrity score passes."""
+        cloud = FakeBackend('cloud', CLEAN_SLIP)
+        process_image_cascade(b'image', local_backend=FakeBackend('local', UNTYPED_SLIP), cloud_backend=cloud,
+                              threshold=0, min_confidence=100)
+        self.assertEqual(cloud.calls, 1)
+
+    def test_thresholds_cover_only_fields_ocr_extracts(self):
+        """Test sport, which OCR never reads, does not push a complete slip below 100 or one gap below 80."""
+        result = self.run_cascade(FakeBackend('local', CLEAN_SLIP), FakeBackend('cloud'), threshold=100,
+                                  min_confidence=100)
+        self.assertEqual((calculate_integrity_score(result), calculate_confidence(result)), (90, 75))
+        self.assertFalse(result['ocr_stats']['escalated'])
+
+        result = self.run_cascade(FakeBackend('local', UNTYPED_SLIP), FakeBackend('cloud'))
+        self.assertEqual(result['ocr_stats']['local_score'], 80)
+        self.assertFalse(result['ocr_stats']['escalated'])
+
+        result = self.run_cascade(FakeBackend('local', UNPRICED_SLIP), FakeBackend('cloud'))
+        self.assertEqual(result['ocr_stats']['local_score'], 60)
+        self.assertTrue(result['ocr_stats']['escalated'])
+
+    def test_worse_cloud_result_keeps_local(self):
+        """Test the local read is kept when the cloud one scores lower."""
+        result = self.run_cascade(FakeBackend('local', PARTIAL_SLIP), FakeBackend('cloud', 'blurry'))
+
+        self.assertEqual(result['teams'], ['Lakers', 'Celtics'])
+        self.assertEqual(result['ocr_stats']['engine'], 'local')
+        self.assertTrue(result['ocr_stats']['escalated'])
+
+    def test_cloud_failure_keeps_local_result(self):
+        """Test a cloud quota error neither fails the upload nor costs anything."""
+        result = self.run_cascade(FakeBackend('local', PARTIAL_SLIP),
+                                  FakeBackend('cloud', error=RuntimeError('quota exceeded')))
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['teams'], ['Lakers', 'Celtics'])
+        self.assertEqual(result['ocr_stats']['cloud_error'], 'quota exceeded')
+        self.assertEqual(result['ocr_stats']['cost_usd'], 0.0)
+
+    def test_both_engines_failing_returns_failure(self):
+        """Test a failed result, not an exception, when neither engine reads the slip."""
+        result = self.run_cascade(FakeBackend('local', error=OSError('tesseract missing')),
+                                  FakeBackend('cloud', error=RuntimeError('network down')))
+        self.assertFalse(result['success'])
+
+    def test_stats_snapshot(self):
+        """Test escalation rate and cloud errors are aggregated."""
+        stats = OCRCascadeStats()
+        base = {'cost_usd': 0.0, 'latency_ms': {'total': 10.0}}
+        stats.record({**base, 'escalated': False, 'cloud_error': None})
+        stats.record({**base, 'escalated': True, 'cloud_error': 'quota'})
+
+        snapshot = stats.snapshot()
+        self.assertEqual((snapshot['escalation_rate'], snapshot['cloud_errors']), (0.5, 1))
+        self.assertEqual(snapshot['mean_latency_ms'], 10.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+import numpy as np
+from app.ml.odds import (
+    parse_odds, american_to_decimal, decimal_to_american, american_to_implied,
+    remove_vig, overround, expected_value, kelly_fraction
+)
+from app.ml.evaluation import calculate_ev
+from app.services.ev_service import score_ev_batch
+
+class OddsTestCase(unittest.TestCase):
+    """Tests for the vectorized odds and EV library."""
+    
+    def test_conversions(self):
+        """Test American, decimal and implied conversions round-trip."""
+        american = np.array([-200, -110, 100, 150])
+        decimal = american_to_decimal(american)
+        
+        np.testing.assert_allclose(decimal, [1.5, 1 + 100 / 110, 2.0, 2.5])
+        np.testing.assert_allclose(decimal_to_american(decimal), american)
+        np.testing.assert_allclose(american_to_implied(american), [2 / 3, 110 / 210, 0.5, 0.4])
+        self.assertTrue(np.isnan(american_to_decimal(0)))
+    
+    def test_parse_odds(self):
+        """Test mixed-format odds are parsed to American odds."""
+        np.testing.assert_allclose(parse_odds(['+150', '-110', '2.50', 120, None]), [150, -110, 150, 120, 0])
+    
+    def test_remove_vig(self):
+        """Test each market's fair probabilities sum to one."""
+        implied = american_to_implied(np.array([[-110, -110], [-150, 130]]))
+        fair = remove_vig(implied)
+        
+        np.testing.assert_allclose(fair.sum(axis=1), [1.0, 1.0])
+        np.testing.assert_allclose(fair[0], [0.5, 0.5])
+        self.assertAlmostEqual(overround(implied)[0], 220 / 210 - 1)
+    
+    def test_expected_value_and_kelly(self):
+        """Test EV per unit staked and the Kelly fraction."""
+        np.testing.assert_allclose(expected_value([0.5, 0.6], [2.0, 2.0]), [0.0, 0.2])
+        np.testing.assert_allclose(kelly_fraction([0.6, 0.4], [2.0, 2.0]), [0.2, 0.0])
+        np.testing.assert_allclose(kelly_fraction(0.6, 2.0, multiplier=0.5), 0.1)
+    
+    def test_calculate_ev_argument_order(self):
+        """Test calculate_ev takes (odds, win_probability) and accepts arrays."""
+        self.assertAlmostEqual(calculate_ev(150, 0.5), 0.25)
+        self.assertAlmostEqual(calculate_ev(-200, 0.7), 0.7 * 0.5 - 0.3)
+        np.testing.assert_allclose(calculate_ev(np.array([100, 0]), 0.6), [0.2, 0.0])
+    
+    def test_score_ev_batch(self):
+        """Test batch scoring with given probabilities and opposing lines."""
+        result = score_ev_batch([
+            {'id': 'a', 'odds': '-110', 'opposing_odds': '-110', 'win_probability': 0.55},
+            {'id': 'b', 'odds': '+150', 'win_probability': 0.3},
+        ], kelly_multiplier=0.5)
+        first, second = result['results']
+        
+        self.assertTrue(result['success'])
+        self.assertEqual(first['id'], 'a')
+        self.assertAlmostEqual(first['market_probability'], 0.5)
+        self.assertAlmostEqual(first['edge'], 0.05)
+        self.assertGreater(first['expected_value'], 0)
+        self.assertIsNone(second['market_probability'])
+        self.assertAlmostEqual(second['expected_value'], -0.25)
+        self.assertEqual(second['kelly_fraction'], 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
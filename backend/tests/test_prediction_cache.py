@@ -0,0 +1,73 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+import numpy as np
+from config import Config
+from app.ml import prediction_cache
+from app.ml.prediction_cache import (
+    MemoryCacheBackend, PredictionCache, feature_key, get_prediction_cache, ttl_until,
+    DEFAULT_TTL_SECONDS, MAX_TTL_SECONDS
+)
+
+class PredictionCacheTestCase(unittest.TestCase):
+    """Tests for the prediction result cache."""
+    
+    def setUp(self):
+        """Create a small in-memory cache."""
+        self.cache = PredictionCache(MemoryCacheBackend(max_entries=2))
+        self.features = np.array([0.1, 0.2, 0.0], dtype=np.float32)
+    
+    def test_key_depends_on_features_odds_and_version(self):
+        """Test identical picks share a key and a new model version misses."""
+        key = feature_key(self.features, '-110', 'v1')
+        
+        self.assertEqual(key, feature_key(self.features.copy(), -110, 'v1'))
+        self.assertNotEqual(key, feature_key(self.features, '-115', 'v1'))
+        self.assertNotEqual(key, feature_key(self.features, '-110', 'v2'))
+    
+    def test_get_or_compute(self):
+        """Test the value is computed once and served from cache after."""
+        compute = mock.Mock(return_value={'win_probability': 0.6})
+        
+        first, first_hit = self.cache.get_or_compute('a', compute, ttl=60)
+        second, second_hit = self.cache.get_or_compute('a', compute, ttl=60)
+        
+        self.assertEqual(first, second)
+        self.assertEqual((first_hit, second_hit), (False, True))
+        compute.assert_called_once()
+        self.assertEqual(self.cache.stats()['hits'], 1)
+    
+    def test_lru_eviction_and_expiry(self):
+        """Test the least recently used entry is evicted and expired entries miss."""
+        backend = self.cache.backend
+        backend.set('a', 1, 60)
+        backend.set('b', 2, 60)
+        backend.get('a')
+        backend.set('c', 3, 60)
+        
+        self.assertIsNone(backend.get('b'))
+        self.assertEqual(backend.get('a'), 1)
+        
+        with mock.patch('app.ml.prediction_cache.time.monotonic', return_value=float('inf')):
+            self.assertIsNone(backend.get('a'))
+    
+    def test_ttl_until_event_start(self):
+        """Test TTL runs to event start, capped, with a default when unknown."""
+        now = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+        
+        self.assertEqual(ttl_until(now + timedelta(minutes=30), now), 1800)
+        self.assertEqual(ttl_until((now + timedelta(days=2)).isoformat(), now), MAX_TTL_SECONDS)
+        self.assertEqual(ttl_until(now - timedelta(minutes=1), now), 0)
+        self.assertEqual(ttl_until(None, now), DEFAULT_TTL_SECONDS)
+
+    def test_settings_come_from_config(self):
+        """Test the backend choice and memory size are read from Config."""
+        with mock.patch.object(prediction_cache, '_cache', None):
+            with mock.patch.object(Config, 'PREDICTION_CACHE_BACKEND', 'none'):
+                self.assertIsNone(get_prediction_cache())
+            with mock.patch.object(Config, 'PREDICTION_CACHE_BACKEND', 'memory'), \
+                    mock.patch.object(Config, 'PREDICTION_CACHE_MAX_ENTRIES', 7):
+                self.assertEqual(get_prediction_cache().backend.max_entries, 7)
+
+if __name__ == '__main__':
+    unittest.main()
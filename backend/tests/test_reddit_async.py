@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+
+try:
+    import aiohttp
+    from aiohttp.test_utils import TestServer
+except ImportError:
+    aiohttp = None
+
+from app.services.reddit_async import TokenBucket
+
+@unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+class AsyncRedditScraperTestCase(unittest.TestCase):
+    """Tests for the asyncio Reddit scraper against the benchmark mock server."""
+    
+    def run_scrape(self, quota=1000, **scrape_args):
+        from app.scripts.benchmark_reddit_scraper import MOCK_STATE, create_mock_app
+        from app.services.reddit_async import AsyncRedditClient, AsyncRedditScraper
+        
+        async def scenario():
+            app = create_mock_app(['nba', 'nfl'], posts_per_subreddit=250, latency_ms=0, quota=quota, window_seconds=1)
+            async with TestServer(app) as server, aiohttp.ClientSession() as session:
+                client = AsyncRedditClient(session, base_url=str(server.make_url('')), bucket=TokenBucket(rate=100, capacity=100))
+                scraper = AsyncRedditScraper(client, {'basketball': ['nba'], 'football': ['nfl']}, concurrency=2)
+                posts = await scraper.scrape(**scrape_args)
+                return posts, client, scraper, app[MOCK_STATE]
+        
+        return asyncio.run(scenario())
+    
+    def test_streams_until_threshold(self):
+        """Test listings stop at the first post older than hours_back."""
+        # Posts are a minute apart, so two hours is 120 posts per subreddit: two pages each
+        posts, client, scraper, _ = self.run_scrape(hours_back=2, limit=1000)
+        
+        self.assertEqual(len([post for post in posts if post.subreddit == 'nba']), 120)
+        self.assertEqual(client.requests, 4)
+        self.assertGreater(scraper.velocity['nba'], 0)
+    
+    def test_extraction_runs_off_the_event_loop(self):
+        """Test bet extraction happens in executor threads, in batches, while the loop keeps fetching."""
+        from app.services import reddit_async
+        build_posts = reddit_async._build_reddit_posts
+        loop_thread = threading.get_ident()
+        threads = []
+        
+        def build(batch, subreddits_by_sport):
+            threads.append(threading.get_ident())
+            return build_posts(batch, subreddits_by_sport)
+        
+        with mock.patch.object(reddit_async, '_build_reddit_posts', side_effect=build) as extract:
+            posts, _, _, _ = self.run_scrape(hours_back=2, limit=1000)
+        
+        self.assertEqual(len(posts), 240)
+        self.assertNotIn(loop_thread, threads)
+        self.assertEqual(extract.call_count, 4)  # 120 posts per subreddit in batches of 64
+    
+    def test_stop_at_watermark(self):
+        """Test a subreddit stops at its already-stored fullname."""
+        posts, client, _, _ = self.run_scrape(hours_back=24, limit=1000, stop_at={'nba': 't3_nba10', 'nfl': 't3_nfl5'})
+        
+        self.assertEqual(sorted(post.id for post in posts if post.subreddit == 'nfl'), sorted(f'nfl{i}' for i in range(5)))
+        self.assertEqual(client.requests, 2)
+    
+    def test_retries_after_429(self):
+        """Test throttled requests are retried after Retry-After."""
+        posts, client, _, state = self.run_scrape(quota=3, hours_back=24, limit=250)
+        
+        self.assertEqual(len(posts), 500)
+        self.assertGreater(client.throttled, 0)
+    
+    def test_velocity_carries_over_between_calls(self):
+        """Test one-off scrapes share velocities, so a later call schedules the busiest subreddit first."""
+        from app.scripts.benchmark_reddit_scraper import create_mock_app
+        from app.services import reddit_async
+        
+        async def scenario():
+            app = create_mock_app(['nba', 'nfl'], posts_per_subreddit=30, latency_ms=0, quota=1000, window_seconds=1)
+            async with TestServer(app) as server:
+                with mock.patch.object(reddit_async, 'SUBREDDITS_BY_SPORT', {'football': ['nfl'], 'basketball': ['nba'],
+                                                                              'baseball': ['mlb']}):
+                    await reddit_async.scrape_latest_posts_async(hours_back=24, limit=100, base_url=str(server.make_url('')))
+        
+        with mock.patch.dict(reddit_async.subreddit_velocity, clear=True):
+            asyncio.run(scenario())
+            velocity = dict(reddit_async.subreddit_velocity)
+            scheduled = reddit_async.AsyncRedditScraper(object(), velocity=reddit_async.subreddit_velocity).schedule(['mlb', 'nba'])
+        
+        self.assertGreater(velocity['nba'], 0)
+        self.assertEqual(velocity['mlb'], 0)
+        self.assertEqual(scheduled, ['nba', 'mlb'])
+
+class TokenBucketTestCase(unittest.TestCase):
+    """Tests for the rate-limit token bucket."""
+    
+    def test_headers_set_rate_and_tokens(self):
+        """Test remaining/reset headers cap tokens and spread the quota."""
+        bucket = TokenBucket(rate=10, capacity=10)
+        bucket.update_from_headers({'X-Ratelimit-Remaining': '3', 'X-Ratelimit-Reset': '30'})
+        
+        self.assertLessEqual(bucket.tokens, 3)
+        self.assertAlmostEqual(bucket.rate, 0.1)
+    
+    def test_acquire_waits_for_refill(self):
+        """Test acquire blocks once the bucket is empty."""
+        bucket = TokenBucket(rate=20, capacity=1)
+        
+        async def take_two():
+            started = time.monotonic()
+            await bucket.acquire()
+            await bucket.acquire()
+            return time.monotonic() - started
+        
+        self.assertGreaterEqual(asyncio.run(take_two()), 0.04)
+
+if __name__ == '__main__':
+    unittest.main()
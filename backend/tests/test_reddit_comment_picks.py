@@ -0,0 +1,89 @@
+import time
+import unittest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.models.reddit_post import RedditPick
+from app.services.reddit_scraper import RedditScraper
+from fake_praw import FakeReddit, FakeSubmission, FakeComment, FakeMoreComments
+
+def chained_batches(batches, batch_size, now):
+    """Top-level forest of batches*batch_size comments, each batch behind a MoreComments stub"""
+    def load(batch):
+        comments = [
+            FakeComment(f'c{batch}_{index}', f'Lakers ML -{110 + index % 3}', now, author=f'user{index % 50}')
+            for index in range(batch_size)
+        ]
+        if batch + 1 < batches:
+            comments.append(FakeMoreComments(lambda: load(batch + 1)))
+        return comments
+    return load(0)
+
+class RedditCommentPicksTestCase(unittest.TestCase):
+    """Tests for streaming pick extraction from daily thread comments."""
+    
+    def setUp(self):
+        """Create an in-memory picks table and a fake daily thread."""
+        self.engine = create_engine('sqlite://')
+        RedditPick.__table__.create(self.engine)
+        self.session = Session(self.engine)
+        self.reddit = FakeReddit()
+        self.scraper = RedditScraper(reddit=self.reddit)
+        self.now = time.time()
+        FakeMoreComments.expanded = 0
+    
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+    
+    def test_comments_expand_lazily(self):
+        """Test load-more stubs are only fetched as the walk reaches them."""
+        submission = FakeSubmission('t1', 'Daily Picks Thread', self.now, comments=chained_batches(100, 100, self.now))
+        comments = self.scraper.iter_comments(submission)
+        
+        for _ in range(250):
+            next(comments)
+        self.assertEqual(FakeMoreComments.expanded, 2)
+        
+        self.assertEqual(250 + sum(1 for _ in comments), 10000)
+        self.assertEqual(FakeMoreComments.expanded, 99)
+    
+    def test_nested_replies_are_walked(self):
+        """Test replies and stubs inside replies are visited."""
+        reply_stub = FakeMoreComments(lambda: [FakeComment('r2', 'Nets ML +120', self.now)])
+        submission = FakeSubmission('t2', 'POTD thread', self.now, comments=[
+            FakeComment('c1', 'Celtics ML -200', self.now, replies=[FakeComment('r1', 'tail', self.now), reply_stub])
+        ])
+        
+        self.assertEqual([comment.id for comment in self.scraper.iter_comments(submission)], ['c1', 'r1', 'r2'])
+    
+    def test_picks_deduplicated_and_batched(self):
+        """Test repeated picks from one author are stored once, across runs."""
+        submission = FakeSubmission('t3', 'Daily Picks Thread', self.now, stickied=True,
+                                    comments=chained_batches(20, 100, self.now))
+        self.reddit.subreddit('sportsbook').add(submission)
+        
+        first = self.scraper.ingest_daily_thread_picks(self.session, batch_size=40)
+        submission.comments = chained_batches(20, 100, self.now)
+        self.scraper.ingest_daily_thread_picks(self.session, batch_size=40)
+        
+        # Every batch repeats the same 100 (author, line) pairs; the spread pattern also matches "ML -110"
+        stored = self.session.query(RedditPick).count()
+        self.assertEqual(first['threads']['t3'], stored)
+        self.assertEqual(self.session.query(RedditPick.team, RedditPick.bet_type, RedditPick.odds, RedditPick.author)
+                         .distinct().count(), stored)
+        self.assertEqual(self.session.query(RedditPick).filter(RedditPick.bet_type == 'moneyline').count(), 100)
+
+    def test_deleted_authors_are_skipped(self):
+        """Test comments whose author was deleted add no picks, rather than picks by 'None'."""
+        submission = FakeSubmission('t4', 'Daily Picks Thread', self.now, comments=[
+            FakeComment('c1', 'Lakers ML -110', self.now, author=None),
+            FakeComment('c2', 'Celtics ML +120', self.now, author=None),
+            FakeComment('c3', 'Nets ML +150', self.now, author='sharp'),
+        ])
+
+        self.scraper.ingest_thread_picks(self.session, submission, 'sportsbook')
+
+        self.assertEqual({pick.author for pick in self.session.query(RedditPick)}, {'sharp'})
+
+if __name__ == '__main__':
+    unittest.main()
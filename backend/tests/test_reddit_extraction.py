@@ -0,0 +1,65 @@
+import time
+import unittest
+from unittest import mock
+from config import Config
+from app.services.reddit_scraper import RedditScraper, ExtractionStage, extract_bet_info
+from fake_praw import FakeReddit, FakeSubmission
+
+class RedditExtractionTestCase(unittest.TestCase):
+    """Tests for linear-time bet patterns and the process-pool extraction stage."""
+
+    def setUp(self):
+        """Create a fake Reddit with two subreddits of pick posts."""
+        self.reddit = FakeReddit()
+        self.scraper = RedditScraper(reddit=self.reddit)
+        self.scraper.subreddits_by_sport = {'basketball': ['nba'], 'general': ['sportsbook']}
+        now = time.time()
+        for name in ('nba', 'sportsbook'):
+            for index in range(30):
+                title = f'Celtics ML -{110 + index}' if index % 3 else f'{name} discussion {index}'
+                self.reddit.subreddit(name).add(FakeSubmission(f'{name}{index}', title, now - index * 60))
+
+    def test_patterns_are_linear_on_pathological_text(self):
+        """Test long word runs with no line after them do not backtrack quadratically."""
+        started = time.perf_counter()
+        for text in ('lock of the day ' * 10000, 'Lakers ML ' * 10000, 'over ' * 20000):
+            self.assertEqual(extract_bet_info(text, ''), [])
+        self.assertLess(time.perf_counter() - started, 2.0)
+
+    def test_patterns_extract_picks(self):
+        """Test spreads, moneylines, totals and the stake are still extracted."""
+        bets = extract_bet_info('Golden State Warriors -3.5 and Nets ML +120', 'over 220.5 for $50')
+
+        found = {(bet.bet_type, bet.team, bet.odds) for bet in bets}
+        self.assertIn(('spread', 'Golden State Warriors', -3.5), found)
+        self.assertIn(('moneyline', 'and Nets', 120.0), found)
+        self.assertIn(('over_under', '', 220.5), found)
+        self.assertTrue(all(bet.stake == 50.0 for bet in bets))
+
+    def test_stage_matches_inline_extraction(self):
+        """Test worker processes and inline extraction produce the same posts."""
+        inline = self.scraper.scrape_latest_posts(hours_back=2, workers=0)
+        pooled = self.scraper.scrape_latest_posts(hours_back=2, workers=1)
+
+        self.assertEqual(len(inline), 40)
+        self.assertEqual(sorted(inline, key=lambda post: post.id), sorted(pooled, key=lambda post: post.id))
+        self.assertEqual({post.sport for post in inline if post.subreddit == 'nba'}, {'basketball'})
+
+    def test_stage_batches_queued_posts(self):
+        """Test every queued post comes back once, across partial batches."""
+        fields = {
+            'title': 'Lakers -5.5', 'text': '', 'url': '', 'subreddit': 'nba', 'author': 'a',
+            'created_utc': 0.0, 'score': 0, 'num_comments': 0
+        }
+        with ExtractionStage(self.scraper.subreddits_by_sport, workers=0, batch_size=8) as stage:
+            for index in range(21):
+                stage.put({**fields, 'id': str(index)})
+
+        self.assertEqual(sorted(int(post.id) for post in stage.results), list(range(21)))
+
+    def test_worker_count_comes_from_config(self):
+        with mock.patch.object(Config, 'REDDIT_EXTRACT_WORKERS', '0'):
+            self.assertEqual(ExtractionStage(self.scraper.subreddits_by_sport).workers, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import time
+import unittest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.models.reddit_post import RedditPostRecord, RedditWatermark
+# Mapper configuration is registry-wide, so the related models must be importable
+from app.models import user, subscription, betting_stats, bankroll, marketplace, bet, prediction  # noqa: F401
+from app.services.reddit_scraper import RedditScraper
+from fake_praw import FakeReddit, FakeSubmission
+
+class RedditIngestionTestCase(unittest.TestCase):
+    """Tests for watermark-based Reddit ingestion."""
+    
+    def setUp(self):
+        """Create an in-memory database and a fake Reddit with one subreddit."""
+        self.engine = create_engine('sqlite://')
+        RedditPostRecord.__table__.create(self.engine)
+        RedditWatermark.__table__.create(self.engine)
+        self.session = Session(self.engine)
+        
+        self.reddit = FakeReddit()
+        self.scraper = RedditScraper(reddit=self.reddit)
+        self.scraper.subreddits_by_sport = {'basketball': ['nba']}
+        self.now = time.time()
+        self.subreddit = self.reddit.subreddit('nba')
+        for index in range(5):
+            self.subreddit.add(FakeSubmission(f'a{index}', f'Lakers ML -150 pick {index}', self.now - 3600 + index))
+    
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+    
+    def test_first_run_sets_watermark(self):
+        """Test the first run stores recent posts and the newest fullname."""
+        result = self.scraper.ingest_latest_posts(self.session, hours_back=2, page_size=2)
+        
+        self.assertEqual(result['total'], 5)
+        self.assertEqual(self.session.query(RedditPostRecord).count(), 5)
+        watermark = self.session.get(RedditWatermark, 'nba')
+        self.assertEqual(watermark.last_fullname, 't3_a4')
+        stored = self.session.get(RedditPostRecord, 'a0')
+        self.assertEqual(stored.sport, 'basketball')
+        self.assertIn('moneyline', [bet['bet_type'] for bet in stored.bet_info])
+    
+    def test_next_run_fetches_only_newer_posts(self):
+        """Test later runs page forward from the watermark with before=."""
+        self.scraper.ingest_latest_posts(self.session, hours_back=2)
+        for index in range(5):
+            self.subreddit.add(FakeSubmission(f'b{index}', f'Celtics +3.5 {index}', self.now + index))
+        self.reddit.requests.clear()
+        
+        result = self.scraper.ingest_latest_posts(self.session, page_size=2)
+        
+        self.assertEqual(result['total'], 5)
+        self.assertEqual(self.session.query(RedditPostRecord).count(), 10)
+        self.assertEqual(self.session.get(RedditWatermark, 'nba').last_fullname, 't3_b4')
+        befores = [params.get('before') for _, _, params in self.reddit.requests]
+        self.assertEqual(befores, ['t3_a4', 't3_b1', 't3_b3', 't3_b4'])
+    
+    def test_upsert_updates_existing_posts(self):
+        """Test a re-fetched post updates its score instead of duplicating."""
+        self.scraper.ingest_latest_posts(self.session, hours_back=2)
+        post = self.subreddit.posts[-1]
+        post.score = 99
+        
+        self.scraper._store_page(self.session, 'nba', [post])
+        
+        self.assertEqual(self.session.query(RedditPostRecord).count(), 5)
+        self.assertEqual(self.session.get(RedditPostRecord, post.id).score, 99)
+    
+    def test_deleted_watermark_post(self):
+        """Test ingestion pages back past a deleted watermark post to everything newer."""
+        self.scraper.ingest_latest_posts(self.session, hours_back=2)
+        self.subreddit.posts = [post for post in self.subreddit.posts if post.id != 'a4']
+        for index in range(5):
+            self.subreddit.add(FakeSubmission(f'c{index}', f'Nets ML +120 {index}', self.now + 10 + index))
+        
+        result = self.scraper.ingest_latest_posts(self.session, page_size=2)
+        
+        self.assertEqual(result['total'], 5)
+        self.assertEqual(self.session.query(RedditPostRecord).count(), 10)
+        self.assertEqual(self.session.get(RedditWatermark, 'nba').last_fullname, 't3_c4')
+    
+    def test_idle_run_does_not_fall_back(self):
+        """Test an empty before= page with nothing newer does not re-read the listing."""
+        self.scraper.ingest_latest_posts(self.session, hours_back=2)
+        self.reddit.requests.clear()
+        
+        result = self.scraper.ingest_latest_posts(self.session)
+        
+        self.assertEqual(result['total'], 0)
+        self.assertEqual([params for _, _, params in self.reddit.requests], [{'before': 't3_a4'}, {}])
+
+if __name__ == '__main__':
+    unittest.main()
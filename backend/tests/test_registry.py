@@ -0,0 +1,139 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+import numpy as np
+from config import Config
+from app.ml.feature_engineering import FEATURE_VERSION
+from app.ml.model import LAYER_UNITS, LAYER_ACTIVATIONS
+from app.ml.numpy_model import NumpyMLP
+from app.ml.registry import ModelRegistry
+
+class ModelRegistryTestCase(unittest.TestCase):
+    """Tests for loading, pinning and sharing model artifacts."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.model_dir = directory.name
+        self.registry = ModelRegistry(model_dir=self.model_dir)
+        for setting, value in (('BET_MODEL_VERSION', None), ('MODEL_BACKEND', 'numpy')):
+            patch = mock.patch.object(Config, setting, value)
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.sample = np.random.default_rng(3).random((4, 10), dtype=np.float32)
+
+    def write_artifact(self, version, seed=0, feature_version=FEATURE_VERSION):
+        """Save a NumPy network and its metadata under bet_outcome/<version>"""
+        path = os.path.join(self.model_dir, 'bet_outcome', version)
+        os.makedirs(path)
+        network = NumpyMLP.initialize((10,) + LAYER_UNITS, LAYER_ACTIVATIONS, seed=seed)
+        network.save(os.path.join(path, 'weights.npz'))
+        with open(os.path.join(path, 'metadata.json'), 'w') as metadata_file:
+            json.dump({'version': version, 'input_dim': 10, 'feature_version': feature_version,
+                       'numpy_weights_file': 'weights.npz'}, metadata_file)
+        return network
+
+    def test_model_dir_defaults_to_config(self):
+        with mock.patch.object(Config, 'MODEL_DIR', self.model_dir):
+            self.assertEqual(ModelRegistry().model_dir, self.model_dir)
+
+    def test_untrained_fallback(self):
+        """Test a missing artifact serves an untrained network instead of failing."""
+        loaded = self.registry.get()
+        self.assertEqual((loaded.version, loaded.input_dim), ('untrained', 10))
+        self.assertEqual(np.asarray(loaded.model(self.sample, training=False)).shape, (4, 2))
+
+    def test_newest_complete_version_is_served(self):
+        """Test the greatest version with metadata.json wins and its weights are loaded."""
+        self.write_artifact('20240101T000000', seed=1)
+        newest = self.write_artifact('20240301T000000', seed=2)
+        os.makedirs(os.path.join(self.model_dir, 'bet_outcome', '20240401T000000'))  # half-written, no metadata
+
+        loaded = self.registry.get()
+
+        self.assertEqual(loaded.version, '20240301T000000')
+        np.testing.assert_allclose(loaded.model(self.sample), newest(self.sample), rtol=1e-6)
+
+    def test_pinned_version(self):
+        """Test BET_MODEL_VERSION overrides the newest artifact."""
+        self.write_artifact('20240101T000000')
+        self.write_artifact('20240301T000000')
+        with mock.patch.object(Config, 'BET_MODEL_VERSION', '20240101T000000'):
+            self.assertEqual(self.registry.get().version, '20240101T000000')
+
+    def test_missing_pinned_version_is_reported(self):
+        """Test pinning a version with no artifact fails at load with the version named."""
+        self.write_artifact('20240101T000000')
+        with mock.patch.object(Config, 'BET_MODEL_VERSION', '20990101T000000'):
+            with self.assertRaisesRegex(ValueError, '20990101T000000 \\(pinned by BET_MODEL_VERSION\\)'):
+                self.registry.get()
+
+    def test_loaded_once_and_shared(self):
+        """Test concurrent first calls load the artifact once and share it."""
+        self.write_artifact('20240101T000000')
+        with mock.patch.object(self.registry, '_load', wraps=self.registry._load) as load:
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(self.registry.get())) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        load.assert_called_once()
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_reload_and_uncached_load(self):
+        """Test reload swaps in a new artifact and load() never touches the cache."""
+        self.write_artifact('20240101T000000')
+        served = self.registry.get()
+        self.write_artifact('20240301T000000')
+
+        self.assertEqual(self.registry.load(version='20240101T000000').version, '20240101T000000')
+        self.assertIs(self.registry.get(), served)
+        self.assertEqual(self.registry.reload().version, '20240301T000000')
+        self.assertEqual(self.registry.get().version, '20240301T000000')
+
+    def test_newer_artifact_is_picked_up_without_restart(self):
+        """Test get() swaps in a newly deployed version once recheck_seconds have passed."""
+        registry = ModelRegistry(model_dir=self.model_dir, recheck_seconds=60)
+        self.write_artifact('20240101T000000')
+        self.assertEqual(registry.get().version, '20240101T000000')
+        self.write_artifact('20240301T000000')
+
+        self.assertEqual(registry.get().version, '20240101T000000')
+        with mock.patch('app.ml.registry.time.monotonic', return_value=time.monotonic() + 61):
+            self.assertEqual(registry.get().version, '20240301T000000')
+
+    def test_broken_deploy_keeps_serving_the_old_version(self):
+        """Test a new artifact that fails to load is logged and the served model stays."""
+        registry = ModelRegistry(model_dir=self.model_dir, recheck_seconds=60)
+        self.write_artifact('20240101T000000')
+        served = registry.get()
+        self.write_artifact('20240301T000000')
+        os.remove(os.path.join(self.model_dir, 'bet_outcome', '20240301T000000', 'weights.npz'))
+
+        with mock.patch('app.ml.registry.time.monotonic', return_value=time.monotonic() + 61), \
+                self.assertLogs('app.ml.registry', level='ERROR'):
+            self.assertIs(registry.get(), served)
+
+    def test_recheck_can_be_disabled(self):
+        registry = ModelRegistry(model_dir=self.model_dir, recheck_seconds=0)
+        self.write_artifact('20240101T000000')
+        registry.get()
+        self.write_artifact('20240301T000000')
+        with mock.patch('app.ml.registry.time.monotonic', return_value=time.monotonic() + 3600):
+            self.assertEqual(registry.get().version, '20240101T000000')
+
+    def test_feature_layout_mismatch_is_logged(self):
+        """Test an artifact trained on another feature layout still loads but warns."""
+        self.write_artifact('20240101T000000', feature_version=FEATURE_VERSION - 1)
+        with self.assertLogs('app.ml.registry', level='WARNING') as logs:
+            self.registry.get()
+        self.assertIn('feature layout', logs.output[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest import mock
+import numpy as np
+from click.testing import CliRunner
+from flask import Flask
+from flask.cli import ScriptInfo
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app import db
+from app.models import user, subscription, betting_stats, bankroll, marketplace, bet  # noqa: F401
+from app.models.consensus import EventConsensus
+from app.models.prediction import Prediction
+from app.Routes.predictions import predictions_bp
+from app.services.scoring_service import score_rows, score_upcoming_predictions
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def constant_model(win_probability, fail_after=None):
+    """Registry entry whose network gives every row the same win probability"""
+    calls = []
+    def model(features, training=False):
+        calls.append(len(features))
+        if fail_after is not None and len(calls) > fail_after:
+            raise RuntimeError('model crashed')
+        return np.column_stack([np.full(len(features), 1 - win_probability), np.full(len(features), win_probability)])
+    return SimpleNamespace(version='test-1', model=model, calls=calls)
+
+def load_cli():
+    """The management CLI from backend/app.py, which the app package shadows on import"""
+    spec = importlib.util.spec_from_file_location('manage', os.path.join(BACKEND_DIR, 'app.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.cli
+
+def add_predictions(session, now):
+    """Five upcoming active predictions, one past the horizon and one inactive"""
+    session.add_all([
+        Prediction(event_name=f'Game {index}', event_date=now + timedelta(hours=index + 1), sport='basketball',
+                   market_type='moneyline', selection=f'Team {index}', odds=100, status='active')
+        for index in range(5)
+    ] + [
+        Prediction(event_name='Far game', event_date=now + timedelta(days=30), sport='basketball',
+                   selection='Far', odds=100, status='active'),
+        Prediction(event_name='Void game', event_date=now + timedelta(hours=2), sport='basketball',
+                   selection='Void', odds=100, status='void'),
+    ])
+    session.commit()
+
+class ScoringServiceTestCase(unittest.TestCase):
+    """Tests for the score-predictions job on in-memory SQLite."""
+
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        for model in (Prediction, EventConsensus):
+            model.__table__.create(self.engine)
+        self.session = Session(self.engine)
+        add_predictions(self.session, datetime.utcnow())
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def scored(self):
+        self.session.expire_all()
+        return self.session.query(Prediction).filter(Prediction.scored_at.isnot(None)).order_by(Prediction.id).all()
+
+    def test_score_rows(self):
+        """Test one forward pass yields probability, EV and confidence per row."""
+        rows = [{'id': 1, 'sport': 'basketball', 'market_type': 'moneyline', 'odds': 100},
+                {'id': 2, 'sport': 'basketball', 'market_type': 'moneyline', 'odds': None}]
+        first, unpriced = score_rows(rows, constant_model(0.4).model)
+        self.assertAlmostEqual(first['win_probability'], 0.4)
+        self.assertAlmostEqual(first['expected_value'], -0.2)
+        self.assertAlmostEqual(first['confidence'], 0.6)
+        self.assertEqual(unpriced['expected_value'], 0.0)
+
+    def test_scores_each_chunk_within_horizon(self):
+        """Test chunks are scored and committed one at a time, skipping far and inactive events."""
+        loaded = constant_model(0.6)
+        with mock.patch('app.services.scoring_service.get_model', return_value=loaded), \
+                mock.patch.object(self.session, 'commit', wraps=self.session.commit) as commit:
+            result = score_upcoming_predictions(self.session, horizon_hours=72, chunk_size=2)
+
+        self.assertEqual(result['scored'], 5)
+        self.assertEqual(loaded.calls, [2, 2, 1])
+        self.assertEqual(commit.call_count, 3)
+        scored = self.scored()
+        self.assertEqual([prediction.event_name for prediction in scored], [f'Game {index}' for index in range(5)])
+        self.assertTrue(all(prediction.model_version == 'test-1' for prediction in scored))
+
+    def test_interrupted_run_keeps_finished_chunks(self):
+        """Test chunks committed before a failure stay scored."""
+        with mock.patch('app.services.scoring_service.get_model', return_value=constant_model(0.6, fail_after=1)):
+            with self.assertRaises(RuntimeError):
+                score_upcoming_predictions(self.session, chunk_size=2)
+        self.session.rollback()
+        self.assertEqual(len(self.scored()), 2)
+
+class ScoringCommandTestCase(unittest.TestCase):
+    """Tests for the score-predictions CLI command."""
+
+    def test_command_scores_database(self):
+        """Test --database-url scores that database and reports the count."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        url = f"sqlite:///{os.path.join(directory.name, 'predictions.db')}"
+        engine = create_engine(url)
+        for model in (Prediction, EventConsensus):
+            model.__table__.create(engine)
+        with Session(engine) as session:
+            add_predictions(session, datetime.utcnow())
+
+        with mock.patch('app.services.scoring_service.get_model', return_value=constant_model(0.6)):
+            # A bare app for the command's app context; --database-url is what it reads
+            result = CliRunner().invoke(load_cli(), ['score-predictions', '--database-url', url, '--chunk-size', '2'],
+                                        obj=ScriptInfo(create_app=lambda: Flask(__name__)))
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Scored 5 predictions with model test-1', result.output)
+        with Session(engine) as session:
+            self.assertEqual(session.query(Prediction).filter(Prediction.scored_at.isnot(None)).count(), 5)
+        engine.dispose()
+
+class PredictionRoutesTestCase(unittest.TestCase):
+    """Tests for the precomputed prediction endpoints."""
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        db.init_app(self.app)
+        self.app.register_blueprint(predictions_bp, url_prefix='/api/predictions')
+        self.client = self.app.test_client()
+        self.context = self.app.app_context()
+        self.context.push()
+        db.create_all()
+        add_predictions(db.session, datetime.utcnow())
+        with mock.patch('app.services.scoring_service.get_model', return_value=constant_model(0.6)):
+            score_upcoming_predictions(db.session)
+        db.session.get(Prediction, 2).expected_value = 0.5
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.context.pop()
+
+    def test_upcoming_filters_sorts_and_pages(self):
+        """Test only scored upcoming predictions are listed, by start or by EV."""
+        predictions = self.client.get('/api/predictions/upcoming').get_json()['predictions']
+        self.assertEqual([prediction['id'] for prediction in predictions], [1, 2, 3, 4, 5])
+
+        response = self.client.get('/api/predictions/upcoming?sort=ev&limit=2&min_ev=0.1')
+        self.assertEqual([prediction['id'] for prediction in response.get_json()['predictions']], [2, 1])
+
+        self.assertEqual(self.client.get('/api/predictions/upcoming?limit=many').status_code, 400)
+
+    def test_prediction_by_id(self):
+        """Test one stored prediction is returned and unknown ids are 404."""
+        response = self.client.get('/api/predictions/3')
+        self.assertEqual(response.get_json()['prediction']['model_version'], 'test-1')
+        self.assertEqual(self.client.get('/api/predictions/999').status_code, 404)
+
+if __name__ == '__main__':
+    unittest.main()
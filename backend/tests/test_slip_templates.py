@@ -0,0 +1,64 @@
+import glob
+import json
+import os
+import unittest
+from app.services.slip_templates import detect_template, parse_slip, group_lines
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'slip_layouts')
+
+class SlipTemplateTestCase(unittest.TestCase):
+    """Tests for sportsbook slip templates."""
+    
+    def setUp(self):
+        """Load recorded OCR fixtures."""
+        self.fixtures = {}
+        for path in glob.glob(os.path.join(FIXTURE_DIR, '*.json')):
+            with open(path) as fixture_file:
+                self.fixtures[os.path.basename(path)] = json.load(fixture_file)
+    
+    def test_fixtures_parse_to_expected(self):
+        """Test every fixture slip parses to its expected fields."""
+        self.assertTrue(self.fixtures)
+        for name, fixture in self.fixtures.items():
+            with self.subTest(fixture=name):
+                result = parse_slip(fixture['ocr']['text'], fixture['ocr']['words'])
+                expected = fixture['expected']
+                
+                self.assertIsNotNone(result)
+                self.assertEqual(result['sportsbook'], expected['sportsbook'])
+                self.assertEqual(result['amount'], expected['amount'])
+                self.assertEqual(result['payout'], expected['payout'])
+                self.assertEqual(result['odds'], expected['odds'])
+                self.assertEqual(result['bet_type'], expected['bet_type'])
+                self.assertEqual(
+                    [(leg['selection'], leg['odds']) for leg in result['legs']],
+                    [(leg['selection'], leg['odds']) for leg in expected['legs']]
+                )
+    
+    def test_parlay_total_is_not_a_leg(self):
+        """Test the combined parlay price is reported separately from the legs."""
+        fixture = self.fixtures['draftkings_parlay.json']
+        result = parse_slip(fixture['ocr']['text'], fixture['ocr']['words'])
+        
+        self.assertEqual(result['odds'], ['+596'])
+        self.assertNotIn('+596', [leg['odds'] for leg in result['legs']])
+        self.assertEqual(result['legs'][0]['teams'], ['LA Lakers', 'BOS Celtics'])
+    
+    def test_unknown_sportsbook_falls_back(self):
+        """Test slips from unrecognized books are left to the regex extractors."""
+        self.assertIsNone(detect_template('Some Local Bookie\nLakers -110'))
+        self.assertIsNone(parse_slip('Some Local Bookie', [{'text': 'x', 'box': [0, 0, 10, 10]}]))
+    
+    def test_group_lines(self):
+        """Test words are grouped into rows and ordered left to right."""
+        words = [
+            {'text': '-110', 'box': [900, 102, 970, 140]},
+            {'text': 'Lakers', 'box': [40, 100, 150, 140]},
+            {'text': 'Moneyline', 'box': [40, 160, 200, 200]},
+        ]
+        lines = group_lines(words)
+        
+        self.assertEqual([line.text for line in lines], ['Lakers -110', 'Moneyline'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import io
+import unittest
+from unittest import mock
+from werkzeug.datastructures import FileStorage
+from app.utils.storage import UploadBuffer
+
+try:
+    from app.services import storage_service
+except ImportError:  # google-cloud-storage is not installed
+    storage_service = None
+
+class CountingStream(io.BytesIO):
+    """BytesIO that counts read() calls"""
+
+    def __init__(self, content):
+        super().__init__(content)
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+def upload(content, mimetype='image/png'):
+    return FileStorage(stream=CountingStream(content), filename='slip.png', content_type=mimetype)
+
+class UploadBufferTestCase(unittest.TestCase):
+    """Tests for the single-read upload buffer."""
+
+    def test_small_upload_stays_in_memory(self):
+        """Test a small file is buffered in memory with its name, type and size."""
+        with UploadBuffer(upload(b'slip bytes'), max_memory_bytes=1024) as buffer:
+            self.assertFalse(buffer.spilled_to_disk)
+            self.assertEqual((buffer.filename, buffer.content_type, buffer.size), ('slip.png', 'image/png', 10))
+            self.assertEqual(buffer.getvalue(), b'slip bytes')
+
+    def test_large_upload_spills_to_disk(self):
+        """Test content past max_memory_bytes rolls over to a temp file and reads back intact."""
+        content = bytes(range(256)) * 1024
+        with UploadBuffer(upload(content), max_memory_bytes=1024) as buffer:
+            self.assertTrue(buffer.spilled_to_disk)
+            self.assertEqual(buffer.open().read(), content)
+
+    def test_request_stream_is_read_once(self):
+        """Test repeated consumers share the buffer instead of re-reading the upload."""
+        file = upload(b'x' * (UploadBuffer.CHUNK_SIZE + 1))
+        file.stream.read(5)  # a validator already peeked at the stream
+        buffer = UploadBuffer(file)
+        reads = file.stream.reads
+
+        self.assertEqual(buffer.size, UploadBuffer.CHUNK_SIZE + 1)
+        self.assertIs(buffer.getvalue(), buffer.getvalue())
+        self.assertEqual(buffer.open().read(3), b'xxx')
+        self.assertEqual(buffer.open().tell(), 0)
+        self.assertEqual(file.stream.reads, reads)
+        buffer.close()
+
+    def test_oversized_upload_is_rejected(self):
+        """Test max_bytes raises ValueError once exceeded, without buffering the rest."""
+        file = upload(b'x' * (4 * UploadBuffer.CHUNK_SIZE))
+        with self.assertRaisesRegex(ValueError, 'File too large'):
+            UploadBuffer(file, max_bytes=UploadBuffer.CHUNK_SIZE)
+        self.assertLess(file.stream.tell(), 4 * UploadBuffer.CHUNK_SIZE)
+
+@unittest.skipIf(storage_service is None, 'google-cloud-storage is not installed')
+class StreamUploadTestCase(unittest.TestCase):
+    """Tests for uploading buffers to Cloud Storage without a local file."""
+
+    def test_uploads_buffer_with_rewind_and_type(self):
+        """Test the open buffer is handed to the blob rewound, with its content type."""
+        with mock.patch.object(storage_service.storage, 'Client') as client:
+            service = storage_service.StorageService(bucket_name='slips')
+        blob = client.return_value.bucket.return_value.blob.return_value
+
+        with UploadBuffer(upload(b'slip bytes')) as buffer:
+            buffer.getvalue()
+            url = service.upload_stream_to_cloud_storage(buffer.open(), 'bets/1/slip.png', buffer.content_type)
+
+            blob.upload_from_file.assert_called_once_with(buffer.open(), rewind=True, content_type='image/png')
+        client.return_value.bucket.assert_called_with('slips')
+        client.return_value.bucket.return_value.blob.assert_called_with('bets/1/slip.png')
+        blob.upload_from_filename.assert_not_called()
+        self.assertEqual(url, 'gs://slips/bets/1/slip.png')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from app.utils.teams import TeamResolver, load_teams, resolve_team_ids, LEAGUES
+
+class TeamResolverTestCase(unittest.TestCase):
+    """Tests for the canonical team dictionary and resolver."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.resolver = TeamResolver()
+
+    def test_dictionary_covers_major_leagues(self):
+        """Test every league has a full roster and ids are unique."""
+        teams = load_teams()
+        counts = {league: sum(team.league == league for team in teams) for league in LEAGUES}
+        self.assertEqual((counts['nba'], counts['nfl'], counts['mlb'], counts['nhl']), (30, 32, 30, 32))
+        self.assertEqual(len({team.id for team in teams}), len(teams))
+
+    def test_aliases_resolve_to_one_id(self):
+        """Test abbreviation, nickname, city variants and pick text share an id."""
+        for mention in ('LAL', 'Lakers', 'LA Lakers', 'Los Angeles Lakers', 'Take the Lakers ML'):
+            self.assertEqual(self.resolver.resolve_id(mention), 'nba:lal', mention)
+
+    def test_fuzzy_matches_misspellings(self):
+        """Test typos resolve through the trigram index."""
+        match = self.resolver.resolve('Celtcs')
+        self.assertEqual((match.team.id, match.method), ('nba:bos', 'fuzzy'))
+        self.assertEqual(self.resolver.resolve_id('Manchester Utd'), 'soccer:mun')
+
+    def test_ambiguous_mentions_need_a_hint(self):
+        """Test names shared across leagues only resolve with a sport or league hint."""
+        self.assertIsNone(self.resolver.resolve_id('Giants'))
+        self.assertEqual(self.resolver.resolve_id('Giants', 'baseball'), 'mlb:sf')
+        self.assertEqual(self.resolver.resolve_id('Boston', 'nhl'), 'nhl:bos')
+        self.assertEqual(self.resolver.resolve_id('Lakers', 'ncaab'), 'nba:lal')
+
+    def test_non_teams_and_multi_team_mentions_resolve_to_none(self):
+        """Test stray words, short abbreviations inside text and matchups are not guessed."""
+        for mention in ('I was sure', 'random words here', 'Lakers vs Celtics', ''):
+            self.assertIsNone(self.resolver.resolve_id(mention), mention)
+
+    def test_batch_api_keeps_input_order(self):
+        """Test resolve_team_ids maps a list in order, sport labels included."""
+        self.assertEqual(
+            resolve_team_ids(['Chiefs', 'KC', 'nobody', 'Chiefs'], 'Football'),
+            ['nfl:kc', 'nfl:kc', None, 'nfl:kc']
+        )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import time
+import unittest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.models import user, subscription, betting_stats, bankroll, marketplace, bet  # noqa: F401
+from app.models.prediction import Prediction
+from app.models.reddit_post import RedditPick, TipsterStats
+from app.services.tipster_service import settle_reddit_picks, get_tipster_stats, pick_profit
+
+class TipsterServiceTestCase(unittest.TestCase):
+    """Tests for settling Reddit picks into tipster track records."""
+
+    def setUp(self):
+        """Create in-memory picks, predictions and tipster_stats tables."""
+        self.engine = create_engine('sqlite://')
+        for model in (RedditPick, TipsterStats, Prediction):
+            model.__table__.create(self.engine)
+        self.session = Session(self.engine)
+        self.posted = time.time() - 72 * 3600
+        self.posted_at = datetime.utcfromtimestamp(self.posted)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def add_pick(self, pick_id, author, team, odds=-110, bet_type='moneyline', posted=None, team_id=None):
+        self.session.add(RedditPick(
+            id=pick_id, pick_hash=f'h{pick_id}', comment_id=f'c{pick_id}', submission_id='s1',
+            subreddit='sportsbook', author=author, team=team, team_id=team_id, bet_type=bet_type, odds=odds,
+            created_utc=posted or self.posted
+        ))
+
+    def add_prediction(self, selection, outcome, hours_after=3, market_type=None):
+        self.session.add(Prediction(
+            event_name=f'{selection} game', event_date=self.posted_at + timedelta(hours=hours_after),
+            sport='basketball', selection=selection, status='settled', outcome=outcome, market_type=market_type
+        ))
+
+    def test_picks_settle_and_stats_accumulate(self):
+        """Test wins, losses and unmatched picks across two runs."""
+        self.add_prediction('Lakers', 'win')
+        self.add_prediction('Celtics', 'loss')
+        self.add_prediction('Nets', 'win', hours_after=100)  # outside the match window
+        self.add_pick(1, 'sharp', 'lakers', odds=150)
+        self.add_pick(2, 'sharp', 'Celtics')
+        self.add_pick(3, 'sharp', 'Nets')
+        self.session.commit()
+
+        result = settle_reddit_picks(self.session, batch_size=2)
+        self.assertEqual((result['settled'], result['unmatched']), (2, 1))
+
+        stats = get_tipster_stats(self.session, 'sharp')
+        self.assertEqual((stats.wins, stats.losses), (1, 1))
+        self.assertAlmostEqual(stats.units_profit, 0.5)
+
+        self.add_prediction('Heat', 'win')
+        self.add_pick(4, 'sharp', 'Heat', odds=-200)
+        self.session.commit()
+        settle_reddit_picks(self.session)
+        self.session.expire_all()
+
+        stats = get_tipster_stats(self.session, 'sharp')
+        self.assertEqual((stats.wins, stats.losses), (2, 1))
+        self.assertAlmostEqual(stats.units_profit, 1.0)
+        self.assertEqual(settle_reddit_picks(self.session)['settled'], 0)
+
+    def test_aliases_settle_against_one_prediction(self):
+        """Test 'LAL' and 'LA Lakers' picks settle with a 'Los Angeles Lakers' prediction."""
+        self.add_prediction('Los Angeles Lakers', 'win')
+        self.add_pick(1, 'sharp', 'LAL', team_id='nba:lal')
+        self.add_pick(2, 'sharp', 'LA Lakers')
+        self.session.commit()
+
+        self.assertEqual(settle_reddit_picks(self.session)['settled'], 2)
+        self.assertEqual(get_tipster_stats(self.session, 'sharp').wins, 2)
+
+    def test_only_moneyline_picks_are_graded(self):
+        """Test spread and total picks are left ungraded and moneylines meet only moneyline predictions."""
+        self.add_prediction('Lakers', 'loss', hours_after=2, market_type='Point Spread')
+        self.add_prediction('Lakers', 'win', hours_after=3, market_type='Moneyline')
+        self.add_pick(1, 'sharp', 'Lakers', odds=-3.5, bet_type='spread')
+        self.add_pick(2, 'sharp', 'Lakers', odds=7, bet_type='spread')
+        self.add_pick(3, 'sharp', 'Lakers', odds=215.5, bet_type='over_under')
+        self.add_pick(4, 'sharp', 'Lakers', odds=-150, bet_type='moneyline')
+        self.session.commit()
+
+        result = settle_reddit_picks(self.session)
+
+        self.assertEqual((result['settled'], result['ungraded']), (1, 3))
+        self.assertEqual([self.session.get(RedditPick, pick_id).outcome for pick_id in (1, 2, 3, 4)],
+                         ['ungraded', 'ungraded', 'ungraded', 'win'])
+        stats = get_tipster_stats(self.session, 'sharp')
+        self.assertEqual((stats.wins, stats.losses), (1, 0))
+
+    def test_deleted_authors_are_not_tipsters(self):
+        """Test a pick from a deleted account settles without creating a tipster."""
+        self.add_prediction('Lakers', 'win')
+        self.add_pick(1, None, 'Lakers')
+        self.session.commit()
+
+        self.assertEqual(settle_reddit_picks(self.session)['settled'], 1)
+        self.assertEqual(self.session.query(TipsterStats).count(), 0)
+
+    def test_weighted_win_rate_shrinks_small_samples(self):
+        """Test a 3-0 tipster is not rated above a 60-40 one."""
+        lucky = TipsterStats(author='lucky', wins=3, losses=0, pushes=0, units_profit=3)
+        proven = TipsterStats(author='proven', wins=60, losses=40, pushes=0, units_profit=10)
+        self.assertEqual(lucky.win_rate, 1.0)
+        self.assertLess(lucky.weighted_win_rate, proven.weighted_win_rate)
+
+    def test_pick_profit_assumes_standard_line_for_spreads(self):
+        """Test spread picks pay at -110 and moneylines at their own price."""
+        self.assertAlmostEqual(pick_profit('win', 'spread', 7.5), 100 / 110)
+        self.assertAlmostEqual(pick_profit('win', 'moneyline', 200), 2.0)
+        self.assertEqual(pick_profit('push', 'moneyline', 200), 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
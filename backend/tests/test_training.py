@@ -0,0 +1,159 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+import numpy as np
+from click.testing import CliRunner
+from flask import Flask
+from flask.cli import ScriptInfo
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.models import user, subscription, betting_stats, bankroll, marketplace, prediction  # noqa: F401
+from app.models.bet import Bet, BetLeg
+from app.ml.data_preprocessing import settled_range, stream_settled_bets
+from app.ml.train import evaluate_stream
+
+try:
+    import tensorflow
+except ImportError:
+    tensorflow = None
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+START = datetime(2024, 3, 1)
+
+def load_cli():
+    """The management CLI from backend/app.py, which the app package shadows on import"""
+    spec = importlib.util.spec_from_file_location('manage', os.path.join(BACKEND_DIR, 'app.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.cli
+
+def add_bets(session):
+    """Four settled bets out of id order, plus pending, pushed and undated ones"""
+    session.add_all([
+        Bet(id=1, user_id=1, amount=25, odds=-110, status='won', bet_type='parlay', settled_at=START + timedelta(days=1),
+            additional_data={'sport': 'basketball', 'sentiment_score': 0.4, 'consensus_share': 0.7,
+                             'tipster_win_rate': 0.55}),
+        Bet(id=2, user_id=1, amount=10, odds=150, status='lost', bet_type='moneyline',
+            settled_at=START + timedelta(days=2)),
+        Bet(id=3, user_id=1, amount=10, odds=120, status='pending'),
+        Bet(id=4, user_id=1, amount=5, odds=200, status='win', settled_at=START + timedelta(days=3)),
+        Bet(id=5, user_id=1, amount=5, odds=-105, status='push', settled_at=START + timedelta(days=4)),
+        Bet(id=6, user_id=1, amount=50, odds=-200, status='loss', settled_at=START),
+        Bet(id=7, user_id=1, amount=5, odds=100, status='won'),
+    ])
+    session.add_all([BetLeg(bet_id=1, team_name=team, odds=-110) for team in ('Lakers', 'Celtics')])
+    session.commit()
+
+def create_tables(engine):
+    for model in (Bet, BetLeg):
+        model.__table__.create(engine)
+
+class StreamSettledBetsTestCase(unittest.TestCase):
+    """Tests for reading settled bets in chunks on in-memory SQLite."""
+
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        create_tables(self.engine)
+        self.session = Session(self.engine)
+        add_bets(self.session)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def test_chunks_in_settlement_order(self):
+        """Test only won or lost bets with settled_at come back, oldest first, chunk_size at a time."""
+        chunks = list(stream_settled_bets(self.session, chunk_size=3))
+
+        self.assertEqual([[row['id'] for row in chunk] for chunk in chunks], [[6, 1, 2], [4]])
+        self.assertEqual([row['label'] for chunk in chunks for row in chunk], [0, 1, 0, 1])
+
+    def test_row_fields(self):
+        """Test legs are counted and additional_data fields are lifted onto each row."""
+        rows = {row['id']: row for chunk in stream_settled_bets(self.session) for row in chunk}
+
+        self.assertEqual(rows[1], {
+            'id': 1, 'odds': -110, 'amount': 25, 'bet_type': 'parlay', 'sport': 'basketball',
+            'sentiment_score': 0.4, 'leg_count': 2, 'consensus_share': 0.7, 'tipster_win_rate': 0.55,
+            'settled_at': START + timedelta(days=1), 'label': 1
+        })
+        self.assertEqual(rows[2]['leg_count'], 0)
+        self.assertIsNone(rows[2]['sport'])
+
+    def test_settlement_bounds(self):
+        """Test settled_after is inclusive and settled_before exclusive."""
+        chunks = stream_settled_bets(self.session, settled_after=START + timedelta(days=1),
+                                     settled_before=START + timedelta(days=3))
+        self.assertEqual([row['id'] for chunk in chunks for row in chunk], [1, 2])
+
+    def test_settled_range(self):
+        self.assertEqual(tuple(settled_range(self.session)), (START, START + timedelta(days=3), 4))
+
+    def test_evaluate_stream(self):
+        """Test holdout metrics are accumulated over the streamed window."""
+        def model(features, training=False):
+            return np.tile([0.2, 0.8], (len(features), 1))
+
+        metrics = evaluate_stream(model, self.session, settled_after=START + timedelta(days=1), chunk_size=2)
+
+        self.assertEqual(metrics['rows'], 3)
+        self.assertAlmostEqual(metrics['accuracy'], 2 / 3)
+
+class TrainModelCommandTestCase(unittest.TestCase):
+    """Tests for the train-model CLI command."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.model_dir = directory.name
+        self.url = f"sqlite:///{os.path.join(directory.name, 'bets.db')}"
+        engine = create_engine(self.url)
+        create_tables(engine)
+        with Session(engine) as session:
+            add_bets(session)
+        engine.dispose()
+
+    def invoke(self, *args):
+        # A bare app for the command's app context; --database-url is what it reads
+        return CliRunner().invoke(load_cli(), ['train-model', '--database-url', self.url] + list(args),
+                                  obj=ScriptInfo(create_app=lambda: Flask(__name__)))
+
+    def test_options_and_session_reach_train_model(self):
+        """Test the command trains against --database-url with its options and reports the artifact."""
+        def fake_train(session, **kwargs):
+            self.assertEqual(settled_range(session)[2], 4)
+            return {'path': '/models/bet_outcome/20240305T000000', 'holdout_metrics': {'accuracy': 0.5}}
+
+        with mock.patch('app.ml.train.train_model', side_effect=fake_train) as train_model:
+            result = self.invoke('--model-dir', self.model_dir, '--holdout-days', '2', '--epochs', '1',
+                                 '--chunk-size', '2')
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(train_model.call_args.kwargs, {
+            'model_dir': self.model_dir, 'holdout_days': 2, 'epochs': 1, 'batch_size': 1024, 'chunk_size': 2
+        })
+        self.assertIn('Wrote /models/bet_outcome/20240305T000000', result.output)
+        self.assertIn("Holdout metrics: {'accuracy': 0.5}", result.output)
+
+    def test_value_error_is_reported(self):
+        """Test a ValueError from training becomes a clean CLI error."""
+        with mock.patch('app.ml.train.train_model', side_effect=ValueError('No settled bets to train on')):
+            result = self.invoke()
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn('Error: No settled bets to train on', result.output)
+
+    @unittest.skipIf(tensorflow is None, 'TensorFlow is not installed')
+    def test_trains_and_writes_artifact(self):
+        """Test a real run writes a versioned artifact and evaluates the holdout window."""
+        result = self.invoke('--model-dir', self.model_dir, '--holdout-days', '1', '--epochs', '1',
+                             '--batch-size', '2', '--chunk-size', '2')
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn(os.path.join(self.model_dir, 'bet_outcome'), result.output)
+
+if __name__ == '__main__':
+    unittest.main()